@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""Benchmark the columnar CarTable against the list-of-dicts path.
+
+Drives the synthetic race field (`adapters.race_simulator`) at `--hz`
+standings + lap timing updates per second for `--seconds` of race time and
+measures, per update:
+
+  write   StateCache.set_standings + set_lap_timing (dict snapshots only)
+  load    refreshing the NumPy columns, paid by the first columnar read after
+          a write (`StateCache.car_table()`), not by the ingest path
+  read    after every update, each query both ways:
+            fastest  get_fastest_practice (dict scan + sort vs ranked columns)
+            pairs    cars within --gap-s of the car ahead (dict scan vs masks)
+
+and the resulting CPU budget per second of wall time at that rate.
+
+Run:
+    PYTHONPATH=src python scripts/bench_car_table.py --cars 64 --hz 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from sim_racecenter_agent.adapters.ingest_metrics import LatencyHistogram
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_fastest_practice import build_get_fastest_practice_tool
+
+
+def _fastest_dict(cache: StateCache, top_n: int) -> dict:
+    """get_fastest_practice as it was before the CarTable (per-row Python scan)."""
+    lap_timing = cache.lap_timing_view()
+    num_name: Dict[int, Dict[str, Any]] = {}
+    for d in cache.roster_view():
+        idx = d.get("CarIdx")
+        if isinstance(idx, int):
+            num_name[idx] = {"car_number": d.get("CarNumber"), "name": d.get("UserName")}
+    records: List[Dict[str, Any]] = []
+    for r in lap_timing:
+        car_idx = r.get("car_idx")
+        if not isinstance(car_idx, int):
+            continue
+        best = r.get("best_lap_s")
+        lap = r.get("lap")
+        if best is None or not isinstance(best, (int, float)) or best <= 0:
+            continue
+        if isinstance(lap, (int, float)) and lap < 0:
+            continue
+        enriched = {
+            "car_idx": car_idx,
+            "best_lap_s": best,
+            "last_lap_s": r.get("last_lap_s"),
+            "lap": lap,
+        }
+        enriched.update(num_name.get(car_idx, {}))
+        records.append(enriched)
+    records.sort(key=lambda x: x.get("best_lap_s", 9e9))
+    if records:
+        fastest = records[0]["best_lap_s"]
+        for r in records:
+            r["gap_fastest_s"] = round(r["best_lap_s"] - fastest, 3)
+    return {"fastest": records[0] if records else None, "top_n": records[:top_n]}
+
+
+def _pairs_dict(cache: StateCache, max_gap_s: float) -> list[tuple[int, int, float]]:
+    rows = [c for c in cache.standings_view() if isinstance(c.get("car_idx"), int)]
+    rows = [c for c in rows if isinstance(c.get("position") or c.get("pos"), int)]
+    rows.sort(key=lambda c: c.get("position") or c.get("pos"))
+    out = []
+    for ahead, car in zip(rows, rows[1:]):
+        gap = car.get("gap_ahead_s")
+        if isinstance(gap, (int, float)) and 0 < gap <= max_gap_s:
+            out.append((car["car_idx"], ahead["car_idx"], float(gap)))
+    return out
+
+
+def _timed(hist: LatencyHistogram, fn: Callable[[], Any]) -> Any:
+    t0 = time.perf_counter()
+    out = fn()
+    hist.record(time.perf_counter() - t0)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--cars", type=int, default=64)
+    ap.add_argument("--hz", type=float, default=20.0)
+    ap.add_argument("--seconds", type=float, default=60.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--top-n", type=int, default=10)
+    ap.add_argument("--gap-s", type=float, default=1.0)
+    args = ap.parse_args()
+
+    sim = RaceSimulator(cars=args.cars, seed=args.seed, start_ts=time.time())
+    cache = StateCache(1, 300)
+    cache.update_roster(sim.session()["drivers"])
+    fastest = build_get_fastest_practice_tool(cache)["handler"]
+    hists = {
+        name: LatencyHistogram()
+        for name in (
+            "write_total",
+            "load_columns",
+            "fastest_dict",
+            "fastest_columns",
+            "pairs_dict",
+            "pairs_columns",
+        )
+    }
+    mismatches = 0
+    dt = 1.0 / args.hz
+    updates = int(args.seconds * args.hz)
+    for _ in range(updates):
+        sim.step(dt)
+        standings = sim.standings()
+        timing = sim.lap_timing()
+        t0 = time.perf_counter()
+        cache.set_standings(standings["timestamp"], standings["cars"])
+        cache.set_lap_timing(timing["timestamp"], timing["cars"])
+        hists["write_total"].record(time.perf_counter() - t0)
+        _timed(hists["load_columns"], cache.car_table)
+        old = _timed(hists["fastest_dict"], lambda: _fastest_dict(cache, args.top_n))
+        new = _timed(hists["fastest_columns"], lambda: fastest({"top_n": args.top_n}))
+        # Compared by lap time: equal times may tie-break to a different car
+        if [r["best_lap_s"] for r in old["top_n"]] != [r["best_lap_s"] for r in new["top_n"]]:
+            mismatches += 1
+        _timed(hists["pairs_dict"], lambda: _pairs_dict(cache, args.gap_s))
+        _timed(hists["pairs_columns"], lambda: cache.car_table().close_pairs(args.gap_s))
+
+    report: dict = {
+        "cars": args.cars,
+        "hz": args.hz,
+        "updates": updates,
+        "best_lap_mismatches": mismatches,
+    }
+    for name, h in hists.items():
+        snap = h.snapshot()
+        report[name] = {k: snap[k] for k in ("mean_ms", "p50_ms", "p99_ms", "max_ms")}
+    # CPU milliseconds per wall-clock second at the update rate
+    report["cpu_ms_per_s"] = {
+        name: round(h.total_us / 1e3 / updates * args.hz, 3) for name, h in hists.items()
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
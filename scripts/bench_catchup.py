@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""Benchmark JetStream catch-up: legacy backward walk vs forward filtered fetch.
+
+Publishes an interleaved history (default 300k messages, ~1% of them on the
+target subject) into a scratch stream on a local nats-server, then times:
+
+* legacy   backwards `get_msg(seq)` walk until N target-subject msgs collected
+* forward  `jetstream_catchup.fetch_subject` (filtered ephemeral consumer)
+
+Requires a JetStream-enabled server, e.g. `nats-server -js`.
+
+Run:
+    PYTHONPATH=src python scripts/bench_catchup.py --messages 300000 --limit 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from nats.aio.client import Client as NATS
+
+from sim_racecenter_agent.adapters.jetstream_catchup import (
+    CatchupStart,
+    FetchStats,
+    fetch_subject,
+)
+
+STREAM = "BENCH_CATCHUP"
+PREFIX = "bench.catchup"
+
+
+async def _populate(nc, js, total: int, target_every: int) -> None:
+    try:
+        await js.delete_stream(STREAM)
+    except Exception:
+        pass
+    await js.add_stream(name=STREAM, subjects=[f"{PREFIX}.>"])
+    noise = [f"{PREFIX}.standings", f"{PREFIX}.telemetry", f"{PREFIX}.lap_timing"]
+    t0 = time.perf_counter()
+    for i in range(total):
+        subj = f"{PREFIX}.stint" if i % target_every == 0 else noise[i % len(noise)]
+        await nc.publish(subj, json.dumps({"timestamp": time.time(), "i": i}).encode())
+        if i % 5000 == 0:
+            await nc.flush()
+    await nc.flush()
+    # Wait for the stream to absorb everything
+    while True:
+        info = await js.stream_info(STREAM)
+        if info.state.messages >= total:
+            break
+        await asyncio.sleep(0.1)
+    print(f"populated {total} msgs in {time.perf_counter() - t0:.2f}s")
+
+
+async def _legacy_walk(js, subject: str, limit: int, budget_s: float) -> tuple[int, int, float]:
+    info = await js.stream_info(STREAM)
+    seq = info.state.last_seq
+    collected = 0
+    round_trips = 0
+    t0 = time.perf_counter()
+    while seq > 0 and collected < limit:
+        msg = await js.get_msg(stream_name=STREAM, seq=seq)
+        round_trips += 1
+        if msg.subject == subject:
+            collected += 1
+        seq -= 1
+        if time.perf_counter() - t0 > budget_s:
+            break
+    return collected, round_trips, time.perf_counter() - t0
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--url", default=os.environ.get("NATS_URL", "nats://localhost:4222"))
+    ap.add_argument("--messages", type=int, default=300_000)
+    ap.add_argument("--target-every", type=int, default=100)
+    ap.add_argument("--limit", type=int, default=300)
+    ap.add_argument("--batch", type=int, default=256)
+    ap.add_argument("--legacy-budget-s", type=float, default=60.0)
+    ap.add_argument("--skip-populate", action="store_true")
+    args = ap.parse_args()
+
+    nc = NATS()
+    await nc.connect(servers=[args.url])
+    js = nc.jetstream()
+    if not args.skip_populate:
+        await _populate(nc, js, args.messages, args.target_every)
+    subject = f"{PREFIX}.stint"
+
+    results: dict[str, dict] = {}
+    for label, start, limit in (
+        ("forward_last_n", CatchupStart(mode="last_n"), args.limit),
+        ("forward_last_1", CatchupStart(mode="last_n"), 1),
+        ("forward_since_seq", CatchupStart(mode="since_seq", since_seq=1), args.limit),
+    ):
+        stats = FetchStats()
+        t0 = time.perf_counter()
+        msgs = await fetch_subject(js, STREAM, subject, limit, start, args.batch, stats=stats)
+        results[label] = {
+            "collected": len(msgs),
+            "seconds": round(time.perf_counter() - t0, 4),
+            **stats.as_dict(),
+        }
+
+    collected, trips, secs = await _legacy_walk(js, subject, args.limit, args.legacy_budget_s)
+    results["legacy_walk"] = {
+        "collected": collected,
+        "round_trips": trips,
+        "seconds": round(secs, 4),
+        "budget_exhausted": collected < args.limit,
+    }
+    print(json.dumps(results, indent=2))
+    await nc.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""Benchmark the vectorized GapTracker against a per-pair Python implementation.
+
+Drives the synthetic race field (`adapters.race_simulator`) at `--hz`
+standings frames per second and feeds every frame to:
+
+  python      dict of (behind, ahead) -> deque of (t, gap) samples; the
+              regression is recomputed from the deque for every pair on read
+  vectorized  core.gaps.GapTracker (ring + running sums, NumPy over all rows)
+
+Measures per-frame update cost and the cost of ranking every battle within
+--max-gap-s by closing rate, and checks the two agree on the closing rates.
+
+Run:
+    PYTHONPATH=src python scripts/bench_gap_tracker.py --cars 64 --hz 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from collections import deque
+
+from sim_racecenter_agent.adapters.ingest_metrics import LatencyHistogram
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator
+from sim_racecenter_agent.core.gaps import GapTracker
+
+
+class _PythonGaps:
+    def __init__(self, window: int):
+        self.window = window
+        self.pairs: dict[int, tuple[int, deque]] = {}
+        self.latest: dict[int, dict] = {}
+
+    def observe(self, ts: float, cars: list[dict]) -> None:
+        by_pos = {c["pos"]: c["car_idx"] for c in cars}
+        seen = set()
+        for c in cars:
+            car = c["car_idx"]
+            ahead = by_pos.get(c["pos"] - 1)
+            seen.add(car)
+            self.latest[car] = c
+            if ahead is None:
+                self.pairs.pop(car, None)
+                continue
+            cur = self.pairs.get(car)
+            if cur is None or cur[0] != ahead:
+                cur = self.pairs[car] = (ahead, deque(maxlen=self.window))
+            if c.get("gap_ahead_s") is not None:
+                cur[1].append((ts, c["gap_ahead_s"]))
+        for car in list(self.pairs):
+            if car not in seen:
+                del self.pairs[car]
+
+    def battles(self, max_gap_s: float, min_samples: int) -> list[tuple[int, float]]:
+        out = []
+        for car, (_, samples) in self.pairs.items():
+            row = self.latest[car]
+            if len(samples) < min_samples or row["gap_ahead_s"] > max_gap_s:
+                continue
+            n = len(samples)
+            mx = sum(t for t, _ in samples) / n
+            my = sum(g for _, g in samples) / n
+            sxx = sum((t - mx) ** 2 for t, _ in samples)
+            sxy = sum((t - mx) * (g - my) for t, g in samples)
+            slope = sxy / sxx if sxx > 0 else math.nan
+            out.append((car, -slope * (row.get("last_lap_s") or math.nan)))
+        out.sort(key=lambda r: -r[1] if not math.isnan(r[1]) else math.inf)
+        return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--cars", type=int, default=64)
+    ap.add_argument("--hz", type=float, default=2.0)
+    ap.add_argument("--seconds", type=float, default=600.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--window", type=int, default=60)
+    ap.add_argument("--max-gap-s", type=float, default=1.5)
+    args = ap.parse_args()
+
+    sim = RaceSimulator(cars=args.cars, seed=args.seed, start_ts=time.time())
+    py, vec = _PythonGaps(args.window), GapTracker(window=args.window)
+    hists = {
+        name: LatencyHistogram()
+        for name in ("update_python", "update_vectorized", "rank_python", "rank_vectorized")
+    }
+    max_abs_diff = 0.0
+    frames = int(args.seconds * args.hz)
+    for _ in range(frames):
+        sim.step(1.0 / args.hz)
+        st = sim.standings()
+        t0 = time.perf_counter()
+        py.observe(st["timestamp"], st["cars"])
+        t1 = time.perf_counter()
+        vec.observe(st["timestamp"], st["cars"])
+        t2 = time.perf_counter()
+        ref = py.battles(args.max_gap_s, 5)
+        t3 = time.perf_counter()
+        rows, closing = vec.ranked(args.max_gap_s, 5, "closing")
+        t4 = time.perf_counter()
+        hists["update_python"].record(t1 - t0)
+        hists["update_vectorized"].record(t2 - t1)
+        hists["rank_python"].record(t3 - t2)
+        hists["rank_vectorized"].record(t4 - t3)
+        for car, rate in ref:
+            if not math.isnan(rate) and not math.isnan(closing[car]):
+                max_abs_diff = max(max_abs_diff, abs(rate - closing[car]))
+
+    report: dict = {
+        "cars": args.cars,
+        "hz": args.hz,
+        "frames": frames,
+        "window": args.window,
+        "max_abs_closing_rate_diff": max_abs_diff,
+    }
+    for name, h in hists.items():
+        snap = h.snapshot()
+        report[name] = {k: snap[k] for k in ("mean_ms", "p50_ms", "p99_ms", "max_ms")}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""Benchmark get_live_snapshot payload size and latency per query shape.
+
+Populates a StateCache from the synthetic race field (`adapters.race_simulator`:
+standings, lap timing, telemetry, session state, track conditions, pit and
+incident events) and calls `get_live_snapshot` with the query shapes agents
+use, from the full default snapshot down to single sections and byte budgets.
+
+Per shape it reports the serialized payload as FastMCP sends it (bytes of
+the text content, ~tokens at 4 bytes each), the handler alone, and
+end-to-end latency through `FastMCP.call_tool` (argument validation,
+dispatch, JSON serialization) with the response cache off (`miss`: every
+call assembles the snapshot) and on (`hit`: repeated calls, unchanged state).
+
+Run:
+    PYTHONPATH=src python scripts/bench_live_snapshot.py --cars 64 --calls 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable
+
+from mcp.server.fastmcp import FastMCP
+
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.dispatch import ToolDispatcher
+from sim_racecenter_agent.mcp.response_cache import ResponseCache
+from sim_racecenter_agent.mcp.tools.get_live_snapshot import build_get_live_snapshot_tool
+
+_SHAPES: dict[str, dict[str, Any]] = {
+    "full": {},
+    "standings_top10": {"fields": ["standings_top"], "top_n": 10},
+    "session_only": {"fields": ["session_state", "track_conditions"]},
+    "recent_events": {"fields": ["incidents_recent", "pits_recent"], "top_n": 5},
+    "director": {
+        "fields": ["session_state", "standings_top", "incidents_recent"],
+        "top_n": 10,
+    },
+    "budget_2k": {"max_bytes": 2048},
+    "budget_8k": {"max_bytes": 8192},
+    "director_budget_2k": {
+        "fields": ["session_state", "standings_top", "incidents_recent"],
+        "top_n": 10,
+        "max_bytes": 2048,
+    },
+}
+
+
+def _populate(cars: int, seconds: float, seed: int) -> StateCache:
+    sim = RaceSimulator(cars=cars, seed=seed, start_ts=time.time())
+    cache = StateCache(1, 50)
+    cache.update_roster(sim.session()["drivers"])
+    for _ in range(int(seconds * 2)):
+        sim.step(0.5)
+        st, lt = sim.standings(), sim.lap_timing()
+        cache.set_standings(st["timestamp"], st["cars"])
+        cache.set_lap_timing(lt["timestamp"], lt["cars"])
+        for frame in sim.telemetry():
+            cache.upsert_telemetry_frame(frame)
+        for _ts, subject, payload in sim.drain_events():
+            if subject == "iracing.incident":
+                cache.add_incident_event(payload)
+            elif subject == "iracing.pit":
+                cache.add_pit_event(payload)
+    cache.set_session_state(sim.session_state())
+    cache.set_track_conditions(sim.track_conditions())
+    return cache
+
+
+async def _p50_us(call: Callable[[], Any], n: int) -> float:
+    for _ in range(min(50, n)):
+        await call()
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return round(samples[len(samples) // 2] * 1e6, 1)
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    cache = _populate(args.cars, args.seconds, args.seed)
+    handler = build_get_live_snapshot_tool(cache)["handler"]
+    servers = {}
+    for mode, size in (("miss", 0), ("hit", 256)):
+        server = servers[mode] = FastMCP(mode)
+        d = ToolDispatcher(
+            [build_get_live_snapshot_tool], lambda s: cache, responses=ResponseCache(size)
+        )
+        server.tool(name="get_live_snapshot")(d.wrapper("get_live_snapshot"))
+
+    shapes: dict[str, dict] = {}
+    for shape, call_args in _SHAPES.items():
+        content = await servers["miss"].call_tool("get_live_snapshot", dict(call_args))
+        text = content[0].text  # type: ignore[index,union-attr]
+        body = json.loads(text)
+        row = {
+            "bytes": len(text.encode()),
+            "approx_tokens": len(text.encode()) // 4,
+            "sections": sorted(k for k in body if isinstance(body[k], (list, dict))),
+            "truncated": body.get("truncated"),
+        }
+
+        async def direct(a: dict = call_args) -> Any:
+            return handler(dict(a))
+
+        row["handler_us"] = await _p50_us(direct, args.calls)
+        for mode, server in servers.items():
+            row[f"call_tool_{mode}_us"] = await _p50_us(
+                lambda s=server, a=call_args: s.call_tool("get_live_snapshot", dict(a)), args.calls
+            )
+        shapes[shape] = row
+    full = shapes["full"]["bytes"]
+    for row in shapes.values():
+        row["bytes_vs_full"] = round(row["bytes"] / full, 3)
+    return {"cars": args.cars, "calls_per_shape": args.calls, "shapes": shapes}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--cars", type=int, default=64)
+    ap.add_argument("--seconds", type=float, default=600.0, help="simulated race time")
+    ap.add_argument("--calls", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    print(json.dumps(asyncio.run(_run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""Benchmark snapshot persistence: inline commits vs write-behind thread.
+
+Replays synthetic standings (default 60 cars at 20 Hz) through
+`NATSIngestor._handle_standings` and measures, for each mode:
+
+* event-loop lag (p50 / p99 / max overshoot of a 5 ms ticker)
+* handler wall time per message
+* persisted rows/s once the writer has drained
+
+Modes:
+  inline        pre write-behind behaviour (execute + commit on the loop)
+  write-behind  current `SnapshotWriter` path
+
+Run:
+    PYTHONPATH=src python scripts/bench_persistence.py --seconds 10 --hz 20 --cars 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sqlite3
+import tempfile
+import time
+
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.state_cache import StateCache
+
+
+class _Msg:
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class InlineIngestor(NATSIngestor):
+    """Reproduces the original per-message execute + commit on the event loop."""
+
+    def _persist(self, sql: str, rows: list[tuple]) -> None:
+        self._ensure_db()
+        conn = self._chat_conn
+        if conn is not None:
+            conn.executemany(sql, rows)
+            conn.commit()
+
+
+def _standings_payload(ts: float, cars: int) -> bytes:
+    order = list(range(cars))
+    random.shuffle(order)
+    gap = 0.0
+    rows = []
+    for pos, idx in enumerate(order, start=1):
+        step = 0.0 if pos == 1 else random.uniform(0.1, 2.0)
+        gap += step
+        rows.append(
+            {
+                "car_idx": idx,
+                "pos": pos,
+                "class_pos": pos,
+                "lap": 10,
+                "gap_leader_s": round(gap, 3),
+                "gap_ahead_s": round(step, 3),
+                "last_lap_s": round(random.uniform(88.0, 92.0), 3),
+            }
+        )
+    return json.dumps({"timestamp": ts, "leader_car_idx": order[0], "cars": rows}).encode()
+
+
+def _pct(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(p / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+async def _run_mode(ing_cls, db_path: str, seconds: float, hz: float, cars: int) -> dict:
+    os.environ["SQLITE_PATH"] = db_path
+    settings = Settings(sqlite_path=db_path)
+    ing = ing_cls(StateCache(1, 1), settings)
+    ing._ensure_db()
+    lags: list[float] = []
+    handler_ms: list[float] = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        interval = 0.005
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, (time.perf_counter() - t0 - interval) * 1000.0))
+
+    tick_task = asyncio.create_task(ticker())
+    period = 1.0 / hz
+    n_msgs = int(seconds * hz)
+    base_ts = time.time()
+    start = time.perf_counter()
+    for i in range(n_msgs):
+        msg = _Msg(_standings_payload(base_ts + i * period, cars))
+        h0 = time.perf_counter()
+        await ing._handle_standings(msg)
+        handler_ms.append((time.perf_counter() - h0) * 1000.0)
+        target = start + (i + 1) * period
+        await asyncio.sleep(max(0.0, target - time.perf_counter()))
+    stop.set()
+    await tick_task
+    if ing._writer is not None:
+        await asyncio.to_thread(ing._writer.flush, 30.0)
+    drained = time.perf_counter() - start
+    metrics = ing.persistence_metrics()
+    await ing.close()
+    conn = sqlite3.connect(db_path)
+    (rows,) = conn.execute("SELECT COUNT(*) FROM standings_snapshots").fetchone()
+    conn.close()
+    return {
+        "messages": n_msgs,
+        "rows": rows,
+        "rows_per_s": round(rows / drained, 1),
+        "handler_ms_p50": round(statistics.median(handler_ms), 3),
+        "handler_ms_p99": round(_pct(handler_ms, 99), 3),
+        "loop_lag_ms_p50": round(_pct(lags, 50), 3),
+        "loop_lag_ms_p99": round(_pct(lags, 99), 3),
+        "loop_lag_ms_max": round(max(lags) if lags else 0.0, 3),
+        "writer": {k: metrics.get(k) for k in ("batches", "dropped_rows", "max_commit_ms")},
+    }
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--hz", type=float, default=20.0)
+    ap.add_argument("--cars", type=int, default=60)
+    ap.add_argument("--mode", choices=["inline", "write-behind", "both"], default="both")
+    args = ap.parse_args()
+    modes = ["inline", "write-behind"] if args.mode == "both" else [args.mode]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in modes:
+            cls = InlineIngestor if mode == "inline" else NATSIngestor
+            db = os.path.join(tmp, f"{mode}.db")
+            results[mode] = await _run_mode(cls, db, args.seconds, args.hz, args.cars)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
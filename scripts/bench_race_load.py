@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+"""Load benchmark driven by the synthetic race field (`adapters.race_simulator`).
+
+Generates `--sim-seconds` of traffic for `--cars` cars, then:
+
+1. max rate   per subject, pushes that subject's messages as fast as possible
+              and reports sustained msgs/s (in-process: straight into the
+              handler; nats: published to the server, counted as delivered to
+              the ingestor's subscription, with coalesced / slow-consumer drops)
+2. under load replays the full mixed stream at `--speed` through the live
+              callbacks while a concurrent task calls the cache-backed tools,
+              and reports per-tool latency percentiles plus ingest stage p99s
+
+Modes:
+  inproc  no server needed; handlers are awaited directly
+  nats    needs a local nats-server (`nats-server -js`); JetStream catch-up and
+          chat persistence are disabled for the run
+
+Run:
+    PYTHONPATH=src python scripts/bench_race_load.py --cars 64 --sim-seconds 120
+    PYTHONPATH=src python scripts/bench_race_load.py --mode nats --speed 10x
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+from sim_racecenter_agent.adapters.capture import REPLAY_SPEEDS, CaptureRecord, replay
+from sim_racecenter_agent.adapters.ingest_metrics import LatencyHistogram
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator, TrafficRates, encode
+from sim_racecenter_agent.config.settings import NATSSettings, Settings
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_current_battle import build_get_current_battle_tool
+from sim_racecenter_agent.mcp.tools.get_fastest_practice import build_get_fastest_practice_tool
+from sim_racecenter_agent.mcp.tools.get_live_snapshot import build_get_live_snapshot_tool
+from sim_racecenter_agent.mcp.tools.get_roster import build_get_roster_tool
+from sim_racecenter_agent.mcp.tools.get_session_history import build_get_session_history_tool
+
+TOOL_BUILDERS = {
+    "get_live_snapshot": (build_get_live_snapshot_tool, {}),
+    "get_current_battle": (build_get_current_battle_tool, {"top_n_pairs": 3}),
+    "get_fastest_practice": (build_get_fastest_practice_tool, {"top_n": 10}),
+    "get_roster": (build_get_roster_tool, {}),
+    "get_session_history": (build_get_session_history_tool, {"limit": 10}),
+}
+
+
+def _settings(url: str, sqlite_path: str) -> Settings:
+    return Settings(
+        nats=NATSSettings(url=url, connect_timeout=3.0),
+        sqlite_path=sqlite_path,
+        enable_jetstream_catchup=False,
+        enable_chat_persist=False,
+    )
+
+
+def _generate(args) -> list[CaptureRecord]:
+    rates = TrafficRates(
+        telemetry_hz=args.telemetry_hz,
+        standings_hz=args.standings_hz,
+        lap_timing_hz=args.lap_timing_hz,
+        chat_hz=args.chat_hz,
+    )
+    sim = RaceSimulator(cars=args.cars, seed=args.seed, start_ts=time.time() - args.sim_seconds)
+    return [
+        CaptureRecord(ts, subject, encode(payload))
+        for ts, subject, payload in sim.traffic(args.sim_seconds, rates)
+    ]
+
+
+# ---------------- Phase 1: max rate -----------------
+async def _max_rate_inproc(records, settings) -> dict:
+    by_subject: dict[str, list[CaptureRecord]] = defaultdict(list)
+    for rec in records:
+        by_subject[rec.subject].append(rec)
+    out = {}
+    for subject, recs in sorted(by_subject.items()):
+        ing = NATSIngestor(StateCache(1, 300), settings)
+        handler = dict(ing.subject_handlers()).get(subject)
+        if handler is None:
+            continue
+        t0 = time.perf_counter()
+        for rec in recs:
+            await handler(rec)
+        elapsed = time.perf_counter() - t0
+        await ing.close()
+        out[subject] = {"msgs": len(recs), "msgs_per_s": round(len(recs) / elapsed, 1)}
+    return out
+
+
+async def _start_ingestor(settings) -> tuple[NATSIngestor, asyncio.Task]:
+    ing = NATSIngestor(StateCache(1, 300), settings)
+    task = asyncio.create_task(ing.run())
+    expected = {s for s, _ in ing.subject_handlers()}
+    for _ in range(200):
+        if expected <= set(ing.pending_metrics()):
+            return ing, task
+        await asyncio.sleep(0.025)
+    raise SystemExit(f"ingestor did not subscribe on {settings.nats.url}")
+
+
+async def _stop_ingestor(ing: NATSIngestor, task: asyncio.Task) -> None:
+    ing.stop()
+    await asyncio.wait_for(task, timeout=10)
+
+
+async def _max_rate_nats(records, settings) -> dict:
+    from nats.aio.client import Client as NATS
+
+    by_subject: dict[str, list[CaptureRecord]] = defaultdict(list)
+    for rec in records:
+        by_subject[rec.subject].append(rec)
+    pub = NATS()
+    await pub.connect(servers=[settings.nats.url])
+    out = {}
+    for subject, recs in sorted(by_subject.items()):
+        ing, task = await _start_ingestor(settings)
+        t0 = time.perf_counter()
+        for rec in recs:
+            await pub.publish(subject, rec.data)
+        await pub.flush()
+        # Wait for the subscription to drain (or stall)
+        last, stalled_at = -1, time.perf_counter()
+        while True:
+            pending = ing.pending_metrics().get(subject, {})
+            delivered = pending.get("delivered", 0)
+            if delivered >= len(recs) and not pending.get("pending_msgs"):
+                break
+            if delivered != last:
+                last, stalled_at = delivered, time.perf_counter()
+            elif time.perf_counter() - stalled_at > 2.0:
+                break
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - t0
+        m = ing.ingest_metrics()
+        sm = m["subjects"].get(subject, {})
+        out[subject] = {
+            "msgs": len(recs),
+            "delivered": delivered,
+            "msgs_per_s": round(delivered / elapsed, 1),
+            "applied": sm.get("applied", 0),
+            "coalesced": m["coalesced"].get(subject, 0),
+            "slow_consumer_events": m["slow_consumers"].get(subject, 0),
+        }
+        await _stop_ingestor(ing, task)
+    await pub.close()
+    return out
+
+
+# ---------------- Phase 2: tools under load -----------------
+async def _call_tools(cache, names, stop: asyncio.Event, interval: float) -> dict:
+    tools = {n: (TOOL_BUILDERS[n][0](cache)["handler"], TOOL_BUILDERS[n][1]) for n in names}
+    hists = {n: LatencyHistogram() for n in names}
+    while not stop.is_set():
+        for name, (handler, tool_args) in tools.items():
+            t0 = time.perf_counter()
+            handler(dict(tool_args))
+            hists[name].record(time.perf_counter() - t0)
+        await asyncio.sleep(interval)
+    return {n: h.snapshot() for n, h in hists.items()}
+
+
+async def _under_load(records, settings, mode: str, speed: float, tools, interval) -> dict:
+    if mode == "nats":
+        from nats.aio.client import Client as NATS
+
+        ing, task = await _start_ingestor(settings)
+        pub = NATS()
+        await pub.connect(servers=[settings.nats.url])
+
+        async def sink(rec) -> None:
+            await pub.publish(rec.subject, rec.data)
+
+    else:
+        ing = NATSIngestor(StateCache(1, 300), settings)
+        callbacks = ing.live_callbacks()
+        ing.start_mailboxes()
+
+        async def sink(rec) -> None:
+            cb = callbacks.get(rec.subject)
+            if cb is not None:
+                await cb(rec)
+
+    stop = asyncio.Event()
+    caller = asyncio.create_task(_call_tools(ing.cache, tools, stop, interval))
+    result = await replay(records, sink, speed)
+    if mode == "nats":
+        await pub.flush()
+        await asyncio.sleep(0.5)
+    stop.set()
+    tool_latency = await caller
+    metrics = ing.ingest_metrics()
+    if mode == "nats":
+        await pub.close()
+        await _stop_ingestor(ing, task)
+    else:
+        await ing.close()
+    result["tools"] = tool_latency
+    result["ingest_p99_ms"] = {
+        s: {stage: h.get("p99_ms") for stage, h in m["stages"].items()}
+        for s, m in metrics["subjects"].items()
+    }
+    result["coalesced"] = metrics["coalesced"]
+    result["slow_consumers"] = metrics["slow_consumers"]
+    return result
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--mode", choices=("inproc", "nats"), default="inproc")
+    ap.add_argument("--url", default=os.environ.get("NATS_URL", "nats://localhost:4222"))
+    ap.add_argument("--cars", type=int, default=64)
+    ap.add_argument("--sim-seconds", type=float, default=120.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--telemetry-hz", type=float, default=5.0)
+    ap.add_argument("--standings-hz", type=float, default=2.0)
+    ap.add_argument("--lap-timing-hz", type=float, default=2.0)
+    ap.add_argument("--chat-hz", type=float, default=0.5)
+    ap.add_argument("--speed", choices=tuple(REPLAY_SPEEDS), default="10x")
+    ap.add_argument("--tools", default=",".join(TOOL_BUILDERS))
+    ap.add_argument("--tool-interval", type=float, default=0.01)
+    ap.add_argument("--skip-max-rate", action="store_true")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    records = _generate(args)
+    counts: dict[str, int] = defaultdict(int)
+    for rec in records:
+        counts[rec.subject] += 1
+    report: dict = {
+        "mode": args.mode,
+        "cars": args.cars,
+        "sim_seconds": args.sim_seconds,
+        "generated": {"records": len(records), "seconds": round(time.perf_counter() - t0, 3)},
+        "subjects": dict(sorted(counts.items())),
+    }
+    tools = [t for t in args.tools.split(",") if t in TOOL_BUILDERS]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        os.environ["SQLITE_PATH"] = path
+        settings = _settings(args.url, path)
+        if not args.skip_max_rate:
+            if args.mode == "nats":
+                report["max_rate"] = await _max_rate_nats(records, settings)
+            else:
+                report["max_rate"] = await _max_rate_inproc(records, settings)
+        report["under_load"] = await _under_load(
+            records, settings, args.mode, REPLAY_SPEEDS[args.speed], tools, args.tool_interval
+        )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
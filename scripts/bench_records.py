@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""Benchmark the __slots__ ingest records against the per-frame dicts they replace.
+
+Drives the synthetic race field (`adapters.race_simulator`) and, from the
+JSON-decoded payloads the ingestor would see, compares:
+
+  telemetry  8-key subset dict + updated_at vs core.models.TelemetryFrame
+             (build + StateCache.upsert_telemetry_frame per frame)
+  stint      decoded payload dict vs core.models.StintRow (retained per car)
+  standings  ingestor row normalization: dict(c) copy per car vs in place, and
+             __slots__ rows vs dict rows through StateCache.set_standings (the
+             NumPy / pace / gap consumers read rows with .get)
+
+Memory is the tracemalloc size of the retained objects (per frame / row).
+
+Run:
+    PYTHONPATH=src python scripts/bench_records.py --cars 64 --frames 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator
+from sim_racecenter_agent.core.models import Record, StintRow, TelemetryFrame
+from sim_racecenter_agent.core.state_cache import StateCache
+
+
+def _subset_dict(frame: dict) -> dict:
+    """The telemetry subset the ingestor built before TelemetryFrame."""
+    return {
+        "driver_id": frame.get("driver_id") or frame.get("display_name"),
+        "display_name": frame.get("display_name") or frame.get("driver_id"),
+        "CarNumber": frame.get("CarNumber"),
+        "CarDistAhead": frame.get("CarDistAhead"),
+        "CarDistBehind": frame.get("CarDistBehind"),
+        "CarNumberAhead": frame.get("CarNumberAhead"),
+        "CarNumberBehind": frame.get("CarNumberBehind"),
+        "_emulator": frame.get("_emulator"),
+    }
+
+
+class _StandingsRow(Record):
+    __slots__ = (
+        "car_idx",
+        "pos",
+        "class_pos",
+        "lap",
+        "gap_leader_s",
+        "gap_ahead_s",
+        "last_lap_s",
+        "position",
+    )
+
+    def __init__(self, car_idx=None, pos=None, class_pos=None, lap=None, gap_leader_s=None,
+                 gap_ahead_s=None, last_lap_s=None, position=None):  # fmt: skip
+        self.car_idx = car_idx
+        self.pos = pos
+        self.class_pos = class_pos
+        self.lap = lap
+        self.gap_leader_s = gap_leader_s
+        self.gap_ahead_s = gap_ahead_s
+        self.last_lap_s = last_lap_s
+        self.position = position
+
+
+def _retained(build: Callable[[], Any], n: int) -> float:
+    """Bytes per object for `n` objects kept alive."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = [build() for _ in range(n)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del keep
+    return round(size / n, 1)
+
+
+def _summary(samples: list[float]) -> dict:
+    """mean / p50 / p99 in microseconds (finer than LatencyHistogram's buckets)."""
+    s = sorted(samples)
+    return {
+        "mean_us": round(sum(s) / len(s) * 1e6, 2),
+        "p50_us": round(s[len(s) // 2] * 1e6, 2),
+        "p99_us": round(s[int(len(s) * 0.99)] * 1e6, 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--cars", type=int, default=64)
+    ap.add_argument("--frames", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    sim = RaceSimulator(cars=args.cars, seed=args.seed, start_ts=time.time())
+    telemetry: list[dict] = []
+    standings: list[bytes] = []
+    stints: list[dict] = []
+    for _ in range(args.frames):
+        sim.step(0.5)
+        telemetry.extend(json.loads(json.dumps(f)) for f in sim.telemetry())
+        standings.append(json.dumps(sim.standings()).encode())
+        stints.extend(p for _, subject, p in sim.drain_events() if subject == "iracing.stint")
+    stints = stints or [sim._stint_payload(sim.order()[0])]
+
+    # Telemetry: build + upsert per frame
+    times: dict[str, list[float]] = {}
+    for name, build in (
+        ("telemetry_dict", _subset_dict),
+        ("telemetry_record", TelemetryFrame.from_payload),
+    ):
+        cache = StateCache(1, 50)
+        times[name] = []
+        for frame in telemetry:
+            t0 = time.perf_counter()
+            cache.upsert_telemetry_frame(build(frame))
+            times[name].append(time.perf_counter() - t0)
+
+    def fresh(build: Callable[[dict], Any], raw: str, stamp: bool = False) -> Callable[[], Any]:
+        """Build from a freshly decoded payload so values are not shared between objects."""
+
+        def one() -> Any:
+            row = build(json.loads(raw))
+            if stamp:
+                row["updated_at"] = time.time()
+            return row
+
+        return one
+
+    # Standings: normalization only, then whole set_standings with dict vs slots rows
+    for name in ("norm_copy", "norm_in_place", "cache_dict_rows", "cache_slots_rows"):
+        times[name] = []
+    caches = {"cache_dict_rows": StateCache(1, 50), "cache_slots_rows": StateCache(1, 50)}
+    for raw in standings:
+        payload = json.loads(raw)
+        t0 = time.perf_counter()
+        [dict(c, position=c["pos"]) for c in payload["cars"]]
+        t1 = time.perf_counter()
+        rows = payload["cars"]
+        for c in rows:
+            if c.get("position") is None:
+                c["position"] = c["pos"]
+        t2 = time.perf_counter()
+        times["norm_copy"].append(t1 - t0)
+        times["norm_in_place"].append(t2 - t1)
+        slots_rows = [_StandingsRow(**c) for c in json.loads(raw)["cars"]]
+        for c in slots_rows:
+            c.position = c.pos
+        for name, frame in (("cache_dict_rows", rows), ("cache_slots_rows", slots_rows)):
+            t0 = time.perf_counter()
+            caches[name].set_standings(payload["timestamp"], frame)
+            caches[name].car_table()
+            times[name].append(time.perf_counter() - t0)
+
+    tel, stint = json.dumps(telemetry[0]), json.dumps(stints[0])
+    row = json.dumps(json.loads(standings[-1])["cars"][0])
+    report = {
+        "cars": args.cars,
+        "telemetry_frames": len(telemetry),
+        "standings_frames": len(standings),
+        "cpu": {name: _summary(samples) for name, samples in times.items()},
+        "retained_bytes": {
+            "telemetry_dict": _retained(fresh(_subset_dict, tel, stamp=True), 5000),
+            "telemetry_record": _retained(fresh(TelemetryFrame.from_payload, tel, True), 5000),
+            "stint_dict": _retained(fresh(dict, stint), 5000),
+            "stint_record": _retained(fresh(StintRow.from_payload, stint), 5000),
+            "standings_row_dict": _retained(fresh(dict, row), 5000),
+            "standings_row_slots": _retained(fresh(lambda c: _StandingsRow(**c), row), 5000),
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""Benchmark search tool latency: connection per call vs pooled read-only connections.
+
+Builds a chat archive of `--messages` rows (Zipf-distributed vocabulary, so
+queries range from a handful of hits to a large share of the archive) plus a
+rules corpus in a temp SQLite DB (WAL, like the ingest writer leaves it), then
+calls the search tool handlers directly:
+
+  per_call  the previous path: os.path.exists, sqlite3.connect, sqlite_master
+            lookup, query, close, on every call
+  pooled    adapters.sqlite_reader.ReadPool (read-only connections with
+            pragmas, cached table checks, reused prepared statements)
+
+Reports p50 / p99 per tool and query shape.
+
+Run:
+    PYTHONPATH=src python scripts/bench_sqlite_reader.py --messages 1000000 --calls 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Any, Callable
+
+from sim_racecenter_agent.adapters import sqlite_reader
+from sim_racecenter_agent.mcp.tools import search_chat, search_corpus, search_rules
+
+_COMMON = ["pass", "nice", "crash", "pit", "fuel", "blue", "flag", "gg", "lap", "send", "it"]
+
+_SHAPES = {
+    "search_chat": {
+        "rare_term": {"query": "w15000"},
+        "mid_term": {"query": "w120"},
+        "common_term": {"query": "pit"},
+        "user_filter": {"query": "w40", "username": "user7"},
+    },
+    "search_rules": {"term": {"query": "blue flag"}},
+    "search_corpus": {"rare_term": {"query": "w15000"}, "mid_term": {"query": "w120"}},
+}
+
+
+class _ConnectPerCall:
+    """The tools' previous database access, behind the ReadPool interface."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def acquire(self) -> sqlite3.Connection | None:
+        if not os.path.exists(self.path):
+            return None
+        return sqlite3.connect(self.path)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        conn.close()
+
+    def has_table(self, conn: sqlite3.Connection, name: str) -> bool:
+        cur = conn.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{name}'")
+        return cur.fetchone() is not None
+
+
+def build_db(path: str, messages: int, vocab: int, seed: int) -> None:
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocab)]
+    weights = [1.0 / (i + 1) for i in range(vocab)]
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE chat_messages(id TEXT PRIMARY KEY, username TEXT, message TEXT,
+            avatar_url TEXT, yt_type TEXT, ts_iso TEXT, ts REAL, day TEXT);
+        CREATE VIRTUAL TABLE chat_messages_fts USING fts5(
+            message, username, content='chat_messages', content_rowid='rowid');
+        CREATE TABLE documents(id INTEGER PRIMARY KEY AUTOINCREMENT, doc_type TEXT,
+            session_id TEXT, chunk_idx INT, text TEXT, hash TEXT, updated_at REAL);
+        CREATE VIRTUAL TABLE documents_fts USING fts5(
+            text, content='documents', content_rowid='rowid');
+    """)  # fmt: skip
+    t0 = time.time() - messages
+
+    def rows():
+        for i in range(messages):
+            n = rng.randint(3, 12)
+            text = rng.choices(_COMMON, k=n // 3) + rng.choices(words, weights, k=n - n // 3)
+            ts = t0 + i
+            yield (
+                f"m{i}",
+                f"user{rng.randrange(5000)}",
+                " ".join(text),
+                None,
+                "textMessageEvent",
+                time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts)),
+                ts,
+                time.strftime("%Y-%m-%d", time.gmtime(ts)),
+            )
+
+    conn.executemany("INSERT INTO chat_messages VALUES (?,?,?,?,?,?,?,?)", rows())
+    conn.execute("INSERT INTO chat_messages_fts(chat_messages_fts) VALUES('rebuild')")
+    conn.executemany(
+        "INSERT INTO documents(doc_type, chunk_idx, text) VALUES ('sporting_code', ?, ?)",
+        (
+            (i, " ".join(rng.choices(_COMMON + words[:500], k=120)) + " blue flag")
+            for i in range(2000)
+        ),
+    )
+    conn.execute("INSERT INTO documents_fts(documents_fts) VALUES('rebuild')")
+    conn.commit()
+    conn.close()
+
+
+def _pcts(samples: list[float]) -> dict:
+    s = sorted(samples)
+    return {
+        "p50_ms": round(s[len(s) // 2] * 1e3, 3),
+        "p99_ms": round(s[min(len(s) - 1, int(len(s) * 0.99))] * 1e3, 3),
+    }
+
+
+def _measure(handler: Callable[[dict], Any], args: dict, calls: int) -> dict:
+    for _ in range(min(10, calls)):
+        handler(dict(args))
+    samples = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        handler(dict(args))
+        samples.append(time.perf_counter() - t0)
+    return _pcts(samples)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--messages", type=int, default=1_000_000)
+    ap.add_argument("--vocab", type=int, default=20_000)
+    ap.add_argument("--calls", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    modules = {
+        "search_chat": search_chat,
+        "search_rules": search_rules,
+        "search_corpus": search_corpus,
+    }
+    builders = {
+        "search_chat": search_chat.build_search_chat_tool,
+        "search_rules": search_rules.build_search_rules_tool,
+        "search_corpus": search_corpus.build_search_corpus_tool,
+    }
+    report: dict = {"messages": args.messages}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "agent.db")
+        t0 = time.perf_counter()
+        build_db(db, args.messages, args.vocab, args.seed)
+        report["build_s"] = round(time.perf_counter() - t0, 1)
+        os.environ["SQLITE_PATH"] = db
+        pooled = {name: module._pool for name, module in modules.items()}
+        for mode in ("per_call", "pooled"):
+            for name, module in modules.items():
+                module._pool = (lambda: _ConnectPerCall(db)) if mode == "per_call" else pooled[name]
+            out = report[mode] = {}
+            for name, shapes in _SHAPES.items():
+                handler = builders[name]()["handler"]
+                for shape, call_args in shapes.items():
+                    out[f"{name}.{shape}"] = _measure(handler, call_args, args.calls)
+        report["pool"] = sqlite_reader.pool_stats().get(db)
+    for key in report["pooled"]:
+        before, after = report["per_call"][key], report["pooled"][key]
+        after["p50_speedup"] = round(before["p50_ms"] / after["p50_ms"], 2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
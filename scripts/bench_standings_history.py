@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""Benchmark the in-memory standings history against keeping every frame and SQLite.
+
+Drives the synthetic race field (`adapters.race_simulator`) at `--hz`
+standings frames per second for `--minutes` of race time, recording each
+frame into `core.standings_history.StandingsHistory` and, for comparison, a
+list of the raw frames. Each frame is also written to a temporary
+`standings_snapshots` table using the ingestor's schema and indexes.
+
+Reports:
+
+  record      per-frame cost of StandingsHistory.record
+  memory      bytes held by the history vs the retained raw frames (tracemalloc)
+  state_at    "standings at time T" for random T in the window: memory vs SQLite
+  gap_series  gap between two cars over the last --gap-window-s: memory vs SQLite
+
+and checks that the reconstructed states match the raw frames.
+
+Run:
+    PYTHONPATH=src python scripts/bench_standings_history.py --cars 64 --hz 2 --minutes 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from sim_racecenter_agent.adapters import standings_archive
+from sim_racecenter_agent.adapters.ingest_metrics import LatencyHistogram
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator
+from sim_racecenter_agent.core.standings_history import StandingsHistory
+
+_DDL = (
+    "CREATE TABLE standings_snapshots(ts REAL, car_idx INT, position INT, car_number TEXT, "
+    "driver TEXT, last_lap_s REAL, best_lap_s REAL, lap INT, created_at REAL, "
+    "gap_leader_s REAL, gap_ahead_s REAL, PRIMARY KEY(ts, car_idx))",
+    "CREATE INDEX idx_standings_car_ts ON standings_snapshots(car_idx, ts)",
+)
+_INSERT = "INSERT INTO standings_snapshots VALUES(?,?,?,?,?,?,?,?,?,?,?)"
+
+
+def _snap(h: LatencyHistogram) -> dict:
+    s = h.snapshot()
+    return {k: s[k] for k in ("mean_ms", "p50_ms", "p99_ms", "max_ms")}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--cars", type=int, default=64)
+    ap.add_argument("--hz", type=float, default=2.0)
+    ap.add_argument("--minutes", type=float, default=30.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--queries", type=int, default=500)
+    ap.add_argument("--gap-window-s", type=float, default=60.0)
+    args = ap.parse_args()
+
+    sim = RaceSimulator(cars=args.cars, seed=args.seed, start_ts=time.time())
+    frames_n = int(args.minutes * 60 * args.hz)
+    window_s = args.minutes * 60
+    dt = 1.0 / args.hz
+    rec_hist = LatencyHistogram()
+
+    tmp = tempfile.mkdtemp()
+    db = os.path.join(tmp, "bench.db")
+    conn = sqlite3.connect(db)
+    for ddl in _DDL:
+        conn.execute(ddl)
+
+    tracemalloc.start()
+    history = StandingsHistory(window_s=window_s)
+    raw: list[tuple[float, list[dict]]] = []
+    history_bytes = raw_bytes = 0
+    for _ in range(frames_n):
+        sim.step(dt)
+        frame = sim.standings()
+        ts, cars = frame["timestamp"], frame["cars"]
+        before = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        history.record(ts, cars)
+        rec_hist.record(time.perf_counter() - t0)
+        mid = tracemalloc.get_traced_memory()[0]
+        raw.append((ts, [dict(c) for c in cars]))
+        history_bytes += mid - before
+        raw_bytes += tracemalloc.get_traced_memory()[0] - mid
+        conn.executemany(
+            _INSERT,
+            [
+                (
+                    ts,
+                    c["car_idx"],
+                    c["pos"],
+                    None,
+                    None,
+                    c.get("last_lap_s"),
+                    None,
+                    c.get("lap"),
+                    ts,
+                    c.get("gap_leader_s"),
+                    c.get("gap_ahead_s"),
+                )
+                for c in cars
+            ],
+        )
+    tracemalloc.stop()
+    conn.commit()
+    conn.close()
+
+    rng = random.Random(args.seed)
+    ro = standings_archive.connect_ro(db)
+    hists = {
+        name: LatencyHistogram()
+        for name in ("state_at_memory", "state_at_sqlite", "gap_memory", "gap_sqlite")
+    }
+    mismatches = 0
+    newest = raw[-1][0]
+    for _ in range(args.queries):
+        i = rng.randrange(len(raw))
+        ts, cars = raw[i]
+        t0 = time.perf_counter()
+        got = history.state_at(ts)
+        hists["state_at_memory"].record(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        standings_archive.standings_at(ro, ts)
+        hists["state_at_sqlite"].record(time.perf_counter() - t0)
+        expect = {c["car_idx"]: (c["pos"], c.get("gap_leader_s")) for c in cars}
+        if got is None or {r["car_idx"]: (r["position"], r["gap_leader_s"]) for r in got[1]} != (
+            expect
+        ):
+            mismatches += 1
+
+        a, b = rng.sample(range(args.cars), 2)
+        end = rng.uniform(raw[0][0] + args.gap_window_s, newest)
+        t0 = time.perf_counter()
+        mem = history.gap_series(a, b, end - args.gap_window_s, end)
+        hists["gap_memory"].record(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        disk = standings_archive.gap_series(ro, a, b, end - args.gap_window_s, end)
+        hists["gap_sqlite"].record(time.perf_counter() - t0)
+        if [p[1] for p in mem] != [p[1] for p in disk]:
+            mismatches += 1
+    ro.close()
+    os.remove(db)
+    os.rmdir(tmp)
+
+    report = {
+        "cars": args.cars,
+        "hz": args.hz,
+        "frames": frames_n,
+        "history": history.stats(),
+        "memory_bytes": {"history_traced": history_bytes, "raw_frames_traced": raw_bytes},
+        "record": _snap(rec_hist),
+        "mismatches": mismatches,
+    }
+    for name, h in hists.items():
+        report[name] = _snap(h)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
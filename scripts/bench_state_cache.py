@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""Benchmark StateCache reads: per-call list copies vs shared versioned views.
+
+A writer thread feeds the synthetic race field (`adapters.race_simulator`)
+into one cache at `--write-hz` (standings, lap timing, telemetry) while
+`--readers` threads build the `get_live_snapshot` response:
+
+  copy   the pre-view tool body: list-copying accessors, `roster()` twice and
+         the leaderboard projection rebuilt on every call
+  views  the current tool: shared tuples + leaderboard memoized per version
+
+Reports per-call latency percentiles under contention and, single-threaded
+under tracemalloc, the bytes allocated at peak per call plus the number of
+live allocation blocks a call leaves behind in its result.
+
+Run:
+    PYTHONPATH=src python scripts/bench_state_cache.py --cars 64 --readers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+import tracemalloc
+from functools import partial
+from typing import Callable
+
+from sim_racecenter_agent.adapters.ingest_metrics import LatencyHistogram
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_live_snapshot import build_get_live_snapshot_tool
+
+
+def _copy_snapshot(cache: StateCache) -> dict:
+    standings = cache.standings()
+    return {
+        "schema_version": 2,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "session_state": cache.session_state() or {},
+        "track_conditions": cache.track_conditions() or {},
+        "standings_top": standings[:15],
+        "leaderboard": list(cache._build_leaderboard()),
+        "lap_timing_top": cache.lap_timing()[:15],
+        "incidents_recent": cache.recent_incidents(20),
+        "pits_recent": cache.recent_pits(20),
+        "roster_size": len(cache.roster()),
+        "drivers_preview": [
+            {"CarIdx": d.get("CarIdx"), "car": d.get("CarNumber"), "name": d.get("UserName")}
+            for d in cache.roster()[:5]
+        ],
+    }
+
+
+def _feed(cache: StateCache, sim: RaceSimulator, dt: float) -> None:
+    sim.step(dt)
+    cache.set_standings(sim.now, sim.standings()["cars"])
+    cache.set_lap_timing(sim.now, sim.lap_timing()["cars"])
+    for frame in sim.telemetry():
+        cache.upsert_telemetry_frame(frame)
+    for _, subject, payload in sim.drain_events():
+        if subject == "iracing.incident":
+            cache.add_incident_event(payload)
+        elif subject == "iracing.pit":
+            cache.add_pit_event(payload)
+
+
+def _setup(cars: int, seed: int) -> tuple[StateCache, RaceSimulator]:
+    cache = StateCache(1, 300)
+    sim = RaceSimulator(cars=cars, seed=seed, start_ts=time.time())
+    cache.update_roster(sim.session()["drivers"])
+    cache.set_session_state(sim.session_state())
+    cache.set_track_conditions(sim.track_conditions())
+    _feed(cache, sim, 1.0)
+    return cache, sim
+
+
+_VARIANTS: dict[str, Callable[[StateCache], Callable[[], dict]]] = {
+    "copy": lambda cache: partial(_copy_snapshot, cache),
+    "views": lambda cache: partial(build_get_live_snapshot_tool(cache)["handler"], {}),
+}
+
+
+def _allocations(call: Callable[[], dict], calls: int) -> dict:
+    call()  # warm memoized projections
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = call()
+    after = tracemalloc.take_snapshot()
+    result_blocks = sum(d.count_diff for d in after.compare_to(before, "lineno"))
+    del result
+    peak_total = 0
+    for _ in range(calls):
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        call()
+        peak_total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return {"peak_bytes_per_call": peak_total // calls, "result_blocks": result_blocks}
+
+
+def _contended(call, cache, sim, readers: int, seconds: float, write_hz: float) -> dict:
+    stop = threading.Event()
+    hists = [LatencyHistogram() for _ in range(readers)]
+    writes = 0
+
+    def writer() -> None:
+        nonlocal writes
+        interval = 1.0 / write_hz if write_hz > 0 else 0.0
+        while not stop.is_set():
+            _feed(cache, sim, interval or 0.1)
+            writes += 1
+            if interval:
+                time.sleep(interval)
+
+    def reader(hist: LatencyHistogram) -> None:
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            call()
+            hist.record(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=writer)]
+    threads += [threading.Thread(target=reader, args=(h,)) for h in hists]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    merged = LatencyHistogram()
+    for h in hists:
+        merged.merge(h)
+    out = merged.snapshot()
+    out["calls_per_s"] = round(merged.count / seconds, 1)
+    out["writes"] = writes
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--cars", type=int, default=64)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--readers", type=int, default=4)
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--write-hz", type=float, default=10.0)
+    ap.add_argument("--alloc-calls", type=int, default=200)
+    args = ap.parse_args()
+
+    report: dict = {"cars": args.cars, "readers": args.readers, "write_hz": args.write_hz}
+    for name, variant in _VARIANTS.items():
+        cache, sim = _setup(args.cars, args.seed)
+        call = variant(cache)
+        report[name] = {
+            "alloc": _allocations(call, args.alloc_calls),
+            "contended": _contended(call, cache, sim, args.readers, args.seconds, args.write_hz),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
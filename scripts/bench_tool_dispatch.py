@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Benchmark pre-bound tool dispatch against rebuilding the tool spec per call.
+
+Populates a StateCache from the synthetic race field (`adapters.race_simulator`)
+and registers every cache-backed tool on two FastMCP instances:
+
+  rebuild   the previous wrapper: `build_*_tool(cache)` on every call, then
+            the fresh spec's handler
+  prebound  mcp.dispatch.ToolDispatcher (handlers bound once per cache)
+
+Both wrappers carry the same generated signature, so FastMCP argument
+validation is identical and the difference is the per-call spec rebuild.
+Reports calls/sec through `FastMCP.call_tool` per tool, the handler called
+directly as the ceiling, and the cost of the spec build the prebound path
+no longer pays. Long-poll tools (wait_live_snapshot) are skipped.
+
+Run:
+    PYTHONPATH=src python scripts/bench_tool_dispatch.py --cars 64 --calls 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import time
+from typing import Any, Callable
+
+from mcp.server.fastmcp import FastMCP
+
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp import sdk_server
+from sim_racecenter_agent.mcp.dispatch import ToolDispatcher
+
+_SKIP = {"wait_live_snapshot"}
+
+
+def _populate(cars: int, frames: int, seed: int) -> StateCache:
+    sim = RaceSimulator(cars=cars, seed=seed, start_ts=time.time())
+    cache = StateCache(1, 50)
+    cache.update_roster(sim.session()["drivers"])
+    for _ in range(frames):
+        sim.step(0.5)
+        st, lt = sim.standings(), sim.lap_timing()
+        cache.set_standings(st["timestamp"], st["cars"])
+        cache.set_lap_timing(lt["timestamp"], lt["cars"])
+        for frame in sim.telemetry():
+            cache.upsert_telemetry_frame(frame)
+    return cache
+
+
+def _rebuild_wrapper(dispatcher: ToolDispatcher, name: str, cache: StateCache) -> Callable:
+    """The pre-dispatcher call path: rebuild the spec from its builder on every call."""
+    build = dispatcher._cache_builders[name]
+    accepted = frozenset(dispatcher.specs[name].get("input_schema", {}).get("properties", {}))
+
+    async def _wrapper(**kwargs: Any) -> Any:
+        args = {k: v for k, v in kwargs.items() if v is not None and k in accepted}
+        result = build(cache)["handler"](args)
+        return await result if inspect.isawaitable(result) else result
+
+    _wrapper.__name__ = name
+    _wrapper.__signature__ = dispatcher.wrapper(name).__signature__  # type: ignore[attr-defined]
+    return _wrapper
+
+
+async def _rate(call: Callable[[], Any], n: int) -> float:
+    for _ in range(min(50, n)):
+        await call()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        await call()
+    return round(n / (time.perf_counter() - t0), 1)
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    cache = _populate(args.cars, args.frames, args.seed)
+    dispatcher = ToolDispatcher(sdk_server._existing_builders, lambda session: cache)
+    dispatcher.bind(cache)
+    rebuild, prebound = FastMCP("rebuild"), FastMCP("prebound")
+    names = [n for n in dispatcher._cache_builders if n not in _SKIP]
+    for name in names:
+        rebuild.tool(name=name)(_rebuild_wrapper(dispatcher, name, cache))
+        prebound.tool(name=name)(dispatcher.wrapper(name))
+
+    tools: dict[str, dict] = {}
+    for name in names:
+        handler = dispatcher.handler(name, cache)
+        build = dispatcher._cache_builders[name]
+        t0 = time.perf_counter()
+        for _ in range(args.calls):
+            build(cache)
+        build_us = (time.perf_counter() - t0) / args.calls * 1e6
+
+        async def direct(h: Callable = handler) -> Any:
+            result = h({})
+            return await result if inspect.isawaitable(result) else result
+
+        row = {
+            "handler_direct": await _rate(direct, args.calls),
+            "rebuild": await _rate(lambda n=name: rebuild.call_tool(n, {}), args.calls),
+            "prebound": await _rate(lambda n=name: prebound.call_tool(n, {}), args.calls),
+        }
+        row["speedup"] = round(row["prebound"] / row["rebuild"], 2)
+        row["spec_build_us"] = round(build_us, 2)
+        tools[name] = row
+    return {
+        "cars": args.cars,
+        "calls_per_tool": args.calls,
+        "binds": dispatcher.binds,
+        "calls_per_s": tools,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--cars", type=int, default=64)
+    ap.add_argument("--frames", type=int, default=120)
+    ap.add_argument("--calls", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    print(json.dumps(asyncio.run(_run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""Benchmark ingest lag while MCP clients run a search storm, inline vs pooled.
+
+Builds a chat archive (`--messages` rows + FTS5 index) in a temp SQLite DB,
+then replays synthetic standings (`adapters.race_simulator`, `--hz` frames/s)
+in real time through `NATSIngestor._handle_standings` while `--clients`
+concurrent callers loop `search_chat` through `FastMCP.call_tool`:
+
+  idle    no searches (baseline)
+  inline  search handler called on the event loop (the previous behaviour)
+  pooled  mcp.dispatch.ToolDispatcher + mcp.worker_pool.ToolWorkerPool
+
+Per mode it reports the ingestor's own payload-to-decode lag for standings,
+event-loop lag (overshoot of a 5 ms ticker), and search throughput / latency
+plus the pool's busy / timeout counts.
+
+Run:
+    PYTHONPATH=src python scripts/bench_tool_pool.py --messages 300000 --clients 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from mcp.server.fastmcp import FastMCP
+
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.dispatch import ToolDispatcher
+from sim_racecenter_agent.mcp.tools.search_chat import build_search_chat_tool
+from sim_racecenter_agent.mcp.worker_pool import ToolWorkerPool
+
+_WORDS = [
+    "pass", "nice", "overtake", "crash", "pit", "tyres", "fuel", "blue", "flag", "gg",
+    "lol", "wow", "send", "it", "dive", "bomb", "lap", "fastest", "sector", "purple",
+    "yellow", "safety", "car", "restart", "penalty", "track", "limits", "rain", "slicks", "wet",
+]  # fmt: skip
+_QUERIES = ["pass", "nice OR wow", "pit AND fuel", "blue flag", "crash", "send it", "lap"]
+
+
+class _Msg:
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def build_chat_db(path: str, messages: int, seed: int = 1) -> None:
+    """Chat schema from scripts/init_db.py filled with `messages` random rows."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE chat_messages(id TEXT PRIMARY KEY, username TEXT, message TEXT,
+            avatar_url TEXT, yt_type TEXT, ts_iso TEXT, ts REAL, day TEXT);
+        CREATE VIRTUAL TABLE chat_messages_fts USING fts5(
+            message, username, content='chat_messages', content_rowid='rowid');
+    """)  # fmt: skip
+    t0 = time.time() - messages
+    rows = (
+        (
+            f"m{i}",
+            f"user{rng.randrange(5000)}",
+            " ".join(rng.choices(_WORDS, k=rng.randint(3, 12))),
+            None,
+            "textMessageEvent",
+            time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t0 + i)),
+            t0 + i,
+            time.strftime("%Y-%m-%d", time.gmtime(t0 + i)),
+        )
+        for i in range(messages)
+    )
+    conn.executemany("INSERT INTO chat_messages VALUES (?,?,?,?,?,?,?,?)", rows)
+    conn.execute("INSERT INTO chat_messages_fts(chat_messages_fts) VALUES('rebuild')")
+    conn.commit()
+    conn.close()
+
+
+def _pct(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))]
+
+
+async def _run_mode(mode: str, db_path: str, args: argparse.Namespace) -> dict:
+    settings = Settings(sqlite_path=db_path)
+    ing = NATSIngestor(StateCache(1, 50), settings)
+    ing._ensure_db()
+    pool = ToolWorkerPool(max_workers=args.workers, limit=args.workers, queue_limit=1000)
+    server = FastMCP(mode)
+    d = ToolDispatcher([build_search_chat_tool], lambda s: None, pool if mode == "pooled" else None)
+    server.tool(name="search_chat")(d.wrapper("search_chat"))
+
+    stop = asyncio.Event()
+    loop_lag: list[float] = []
+    search_ms: list[float] = []
+
+    async def ticker() -> None:
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.005)
+            loop_lag.append(max(0.0, (time.perf_counter() - t0 - 0.005) * 1000.0))
+
+    async def client(i: int) -> None:
+        rng = random.Random(i)
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            await server.call_tool("search_chat", {"query": rng.choice(_QUERIES), "limit": 50})
+            search_ms.append((time.perf_counter() - t0) * 1000.0)
+            await asyncio.sleep(0)  # the transport round trip between requests
+
+    tasks = [asyncio.create_task(ticker())]
+    if mode != "idle":
+        tasks += [asyncio.create_task(client(i)) for i in range(args.clients)]
+    sim = RaceSimulator(cars=args.cars, seed=args.seed, start_ts=time.time())
+    period = 1.0 / args.hz
+    start, wall = time.perf_counter(), time.time()
+    i = 0
+    while time.perf_counter() - start < args.seconds:  # a stalled loop falls behind schedule
+        await asyncio.sleep(max(0.0, start + i * period - time.perf_counter()))
+        sim.step(period)
+        frame = sim.standings()
+        frame["timestamp"] = wall + i * period  # due time: lag = how late the loop got to it
+        await ing._handle_standings(_Msg(json.dumps(frame).encode()))
+        i += 1
+    stop.set()
+    await asyncio.gather(*tasks)
+    lag = ing.ingest_metrics()["subjects"]["iracing.standings"]["lag"]
+    await ing.close()
+    tool = pool.stats()["tools"].get("search_chat", {})
+    pool.shutdown()
+    return {
+        "ingest_lag_ms": {k: lag.get(k) for k in ("count", "p50_ms", "p99_ms", "max_ms")},
+        "loop_lag_ms": {
+            "p50": round(_pct(loop_lag, 50), 3),
+            "p99": round(_pct(loop_lag, 99), 3),
+            "max": round(max(loop_lag, default=0.0), 3),
+        },
+        "frames": i,
+        "searches": len(search_ms),
+        "searches_per_s": round(len(search_ms) / args.seconds, 1),
+        "search_ms": {"p50": round(_pct(search_ms, 50), 2), "p99": round(_pct(search_ms, 99), 2)},
+        "pool": {k: tool.get(k) for k in ("max_queued", "rejected", "timeouts")} if tool else None,
+    }
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--messages", type=int, default=300_000)
+    ap.add_argument("--clients", type=int, default=8)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--hz", type=float, default=20.0)
+    ap.add_argument("--cars", type=int, default=60)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    report: dict = {"messages": args.messages, "clients": args.clients, "workers": args.workers}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "agent.db")
+        t0 = time.perf_counter()
+        build_chat_db(db, args.messages, args.seed)
+        report["build_s"] = round(time.perf_counter() - t0, 2)
+        os.environ["SQLITE_PATH"] = db  # search tools and the ingestor both read it
+        for mode in ("idle", "inline", "pooled"):
+            report[mode] = await _run_mode(mode, db, args)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
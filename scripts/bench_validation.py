@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Micro-benchmark per-message schema validation cost for each mode.
+
+Runs every payload in `schemas.validation.EXAMPLES` through:
+
+  legacy   jsonschema.validate() per call (pre-registry behaviour)
+  full     compiled, cached validator
+  sampled  1-in-N full check, type guard otherwise (--sample-every)
+  off      type guard only
+
+Run:
+    PYTHONPATH=src python scripts/bench_validation.py --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import jsonschema
+
+from sim_racecenter_agent.schemas import validation
+
+
+def _legacy(subject: str, payload: dict) -> bool:
+    schema = validation._load_schema(validation.SCHEMA_MAP[subject])
+    try:
+        jsonschema.validate(instance=payload, schema=schema)
+        return True
+    except Exception:
+        return False
+
+
+def _time_per_msg(fn, iterations: int) -> dict[str, float]:
+    out: dict[str, float] = {}
+    for subject, payload in validation.EXAMPLES.items():
+        fn(subject, payload)  # warm
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            fn(subject, payload)
+        out[subject] = round((time.perf_counter() - t0) / iterations * 1e6, 2)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--iterations", type=int, default=2000)
+    ap.add_argument("--sample-every", type=int, default=10)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    compiled = validation.compile_all()
+    compile_ms = (time.perf_counter() - t0) * 1000.0
+
+    results: dict[str, dict[str, float]] = {
+        "legacy": _time_per_msg(_legacy, max(1, args.iterations // 10))
+    }
+    for mode in ("full", "sampled", "off"):
+        validation.configure(mode, args.sample_every)
+        results[mode] = _time_per_msg(validation.is_valid, args.iterations)
+    validation.configure("full")
+
+    print(f"compiled {compiled} schemas in {compile_ms:.1f} ms; values are us/message\n")
+    subjects = list(validation.EXAMPLES)
+    width = max(len(s) for s in subjects)
+    modes = list(results)
+    print(f"{'subject':<{width}}  " + "  ".join(f"{m:>9}" for m in modes))
+    for subj in subjects:
+        print(f"{subj:<{width}}  " + "  ".join(f"{results[m][subj]:>9.2f}" for m in modes))
+    print("\n" + json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""Capture live NATS traffic into a compressed, indexed capture file.
+
+Subscribes to every subject `NATSIngestor.run()` subscribes to with the
+current settings (plus any `--subject` extras) and appends each message with
+its receive timestamp via `adapters.capture.CaptureWriter`. Stop with Ctrl-C
+or `--duration`; the file can be appended to by a later capture.
+
+Run:
+    PYTHONPATH=src python scripts/capture_nats.py --out captures/race.cap --duration 3600
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import signal
+import time
+
+from nats.aio.client import Client as NATS
+
+from sim_racecenter_agent.adapters.capture import CaptureWriter
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import get_settings
+from sim_racecenter_agent.core.state_cache import StateCache
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--out", required=True, help="capture file (appended if it exists)")
+    ap.add_argument("--url", default=None, help="NATS url (default: settings)")
+    ap.add_argument("--subject", action="append", default=[], help="extra subject to capture")
+    ap.add_argument("--duration", type=float, default=0.0, help="seconds; 0 = until Ctrl-C")
+    ap.add_argument("--block-kb", type=int, default=256)
+    ap.add_argument("--flush-interval", type=float, default=1.0)
+    args = ap.parse_args()
+
+    settings = get_settings()
+    subjects = [s for s, _ in NATSIngestor(StateCache(1, 1), settings).subject_handlers()]
+    subjects += [s for s in args.subject if s not in subjects]
+
+    writer = CaptureWriter(
+        args.out, block_bytes=args.block_kb * 1024, flush_interval_s=args.flush_interval
+    )
+    nc = NATS()
+    opts = {}
+    if settings.nats.username and settings.nats.password:
+        opts["user"] = settings.nats.username
+        opts["password"] = settings.nats.password
+    await nc.connect(servers=[args.url or settings.nats.url], **opts)
+
+    async def _on_msg(msg) -> None:
+        writer.write(msg.subject, msg.data)
+
+    for subject in subjects:
+        await nc.subscribe(subject, cb=_on_msg)
+    print(f"capturing {len(subjects)} subjects -> {args.out}: {', '.join(subjects)}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # pragma: no cover - windows
+            pass
+    t0 = time.time()
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=args.duration or None)
+    except asyncio.TimeoutError:
+        pass
+    await nc.drain()
+    writer.close()
+    print(json.dumps({**writer.stats(), "duration_s": round(time.time() - t0, 3)}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
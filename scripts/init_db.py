@@ -131,9 +131,12 @@ CREATE TABLE IF NOT EXISTS standings_snapshots(
     best_lap_s REAL,
     lap INT,
     created_at REAL,
+    gap_leader_s REAL,
+    gap_ahead_s REAL,
     PRIMARY KEY(ts, car_idx)
 );
 CREATE INDEX IF NOT EXISTS idx_standings_snapshots_position ON standings_snapshots(position);
+CREATE INDEX IF NOT EXISTS idx_standings_car_ts ON standings_snapshots(car_idx, ts);
 """
 
 
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Replay a capture file into NATSIngestor handlers or a NATS server.
+
+Targets:
+  handlers  feed records straight into a fresh `NATSIngestor` (no server
+            needed), through the same callbacks live subscriptions use, and
+            print throughput plus the ingest stage metrics afterwards
+  nats      publish records to a (local) nats-server on their original subjects
+
+Speeds: 1x and 10x preserve (scaled) inter-arrival gaps; max replays as fast
+as the target accepts. `--start` / `--end` are offsets in seconds from the
+beginning of the capture.
+
+Run:
+    PYTHONPATH=src python scripts/replay_capture.py captures/race.cap --target handlers --speed max
+    PYTHONPATH=src python scripts/replay_capture.py captures/race.cap --target nats --speed 10x
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+
+from sim_racecenter_agent.adapters.capture import REPLAY_SPEEDS, CaptureReader, replay
+from sim_racecenter_agent.config.settings import get_settings
+
+
+async def _to_handlers(records, speed: float, sqlite_path: str) -> dict:
+    from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+    from sim_racecenter_agent.core.state_cache import StateCache
+
+    os.environ["SQLITE_PATH"] = sqlite_path
+    settings = get_settings().model_copy(update={"sqlite_path": sqlite_path})
+    cache = StateCache(settings.snapshot_pos_history, settings.incident_ring_size)
+    ing = NATSIngestor(cache, settings)
+    callbacks = ing.live_callbacks()
+    ing.start_mailboxes()
+    unrouted: dict[str, int] = {}
+
+    async def sink(rec) -> None:
+        cb = callbacks.get(rec.subject)
+        if cb is None:
+            unrouted[rec.subject] = unrouted.get(rec.subject, 0) + 1
+            return
+        await cb(rec)
+
+    result = await replay(records, sink, speed)
+    await ing.close()
+    result["unrouted"] = unrouted
+    result["ingest"] = {
+        s: {k: m[k] for k in ("received", "applied", "invalid", "decode_errors") if k in m}
+        | {f"{stage}_p99_ms": h.get("p99_ms") for stage, h in m["stages"].items()}
+        for s, m in ing.ingest_metrics()["subjects"].items()
+    }
+    result["coalesced"] = {s: m["skipped"] for s, m in ing.coalescing_metrics().items()}
+    return result
+
+
+async def _to_nats(records, speed: float, url: str) -> dict:
+    from nats.aio.client import Client as NATS
+
+    nc = NATS()
+    await nc.connect(servers=[url])
+
+    async def sink(rec) -> None:
+        await nc.publish(rec.subject, rec.data)
+
+    result = await replay(records, sink, speed)
+    await nc.flush()
+    await nc.close()
+    return result
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("capture")
+    ap.add_argument("--target", choices=("handlers", "nats"), default="handlers")
+    ap.add_argument("--speed", choices=tuple(REPLAY_SPEEDS), default="max")
+    ap.add_argument("--start", type=float, default=None, help="offset seconds into the capture")
+    ap.add_argument("--end", type=float, default=None, help="offset seconds into the capture")
+    ap.add_argument("--subject", action="append", default=None, help="only replay these subjects")
+    ap.add_argument("--url", default=None, help="NATS url for --target nats (default: settings)")
+    ap.add_argument(
+        "--sqlite", default=None, help="snapshot DB for --target handlers (default: temp)"
+    )
+    args = ap.parse_args()
+
+    reader = CaptureReader(args.capture)
+    base = reader.blocks[0].first_ts if reader.blocks else 0.0
+    records = reader.records(
+        start_ts=base + args.start if args.start is not None else None,
+        end_ts=base + args.end if args.end is not None else None,
+        subjects=args.subject,
+    )
+    speed = REPLAY_SPEEDS[args.speed]
+    if args.target == "nats":
+        result = await _to_nats(records, speed, args.url or get_settings().nats.url)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = args.sqlite or os.path.join(tmp, "replay.db")
+            result = await _to_handlers(records, speed, path)
+    print(json.dumps({"capture": args.capture, "target": args.target, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,308 @@
+"""Append-only compressed capture log of NATS traffic, with time-scaled replay.
+
+File layout (all integers little-endian)::
+
+    b"SRCCAP1\\n"                                    file magic
+    block*                                           appended as they fill
+      <IIIdd  comp_len, raw_len, count, first_ts, last_ts
+      zlib(record*)
+        <dHI  recv_ts, subject_len, payload_len
+        subject bytes, payload bytes
+
+Blocks are written whole, so a capture interrupted mid-block loses at most the
+unflushed tail and readers stop cleanly at the last complete block. Each block
+is also described in a ``<path>.idx`` sidecar (``<Qddi`` offset, first_ts,
+last_ts, count) so readers can seek to a time window without decompressing
+everything before it; a missing or short index is rebuilt by scanning headers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import struct
+import time
+import zlib
+from typing import Awaitable, Callable, Iterable, Iterator, NamedTuple, Optional
+
+MAGIC = b"SRCCAP1\n"
+_BLOCK = struct.Struct("<IIIdd")
+_RECORD = struct.Struct("<dHI")
+_INDEX = struct.Struct("<Qddi")
+
+REPLAY_SPEEDS = {"1x": 1.0, "10x": 10.0, "max": 0.0}
+
+
+class CaptureRecord(NamedTuple):
+    """One captured message; `data` makes it usable as a NATS msg for handlers."""
+
+    ts: float
+    subject: str
+    data: bytes
+
+
+class BlockInfo(NamedTuple):
+    offset: int
+    first_ts: float
+    last_ts: float
+    count: int
+
+
+def index_path(path: str) -> str:
+    return path + ".idx"
+
+
+class CaptureWriter:
+    """Buffers records and appends a compressed block per `block_bytes` / `flush_interval_s`."""
+
+    def __init__(
+        self,
+        path: str,
+        block_bytes: int = 256 * 1024,
+        flush_interval_s: float = 1.0,
+        level: int = 6,
+    ):
+        self.path = path
+        self.block_bytes = max(1024, int(block_bytes))
+        self.flush_interval_s = max(0.0, float(flush_interval_s))
+        self.level = level
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        fresh = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not fresh:
+            _check_magic(path)
+            # Drop a torn tail block and re-index so appends start on a block boundary
+            blocks = list(_scan_blocks(path))
+            end = _block_end(path, blocks[-1]) if blocks else len(MAGIC)
+            if os.path.getsize(path) > end:
+                os.truncate(path, end)
+            _write_index(path, blocks)
+        self._fh = open(path, "ab")
+        if fresh:
+            self._fh.write(MAGIC)
+            self._fh.flush()
+        self._idx = open(index_path(path), "ab")
+        self._buf = bytearray()
+        self._count = 0
+        self._first_ts = 0.0
+        self._last_ts = 0.0
+        self._opened_at = time.monotonic()
+        self.records = 0
+        self.blocks = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+
+    def write(self, subject: str, data: bytes, ts: Optional[float] = None) -> None:
+        ts = time.time() if ts is None else float(ts)
+        subj = subject.encode()
+        if not self._count:
+            self._first_ts = ts
+            self._opened_at = time.monotonic()
+        self._buf += _RECORD.pack(ts, len(subj), len(data))
+        self._buf += subj
+        self._buf += data
+        self._count += 1
+        self._last_ts = ts
+        self.records += 1
+        if len(self._buf) >= self.block_bytes or (
+            self.flush_interval_s and time.monotonic() - self._opened_at >= self.flush_interval_s
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._count:
+            return
+        raw = bytes(self._buf)
+        comp = zlib.compress(raw, self.level)
+        offset = self._fh.tell()
+        self._fh.write(_BLOCK.pack(len(comp), len(raw), self._count, self._first_ts, self._last_ts))
+        self._fh.write(comp)
+        self._fh.flush()
+        self._idx.write(_INDEX.pack(offset, self._first_ts, self._last_ts, self._count))
+        self._idx.flush()
+        self.blocks += 1
+        self.raw_bytes += len(raw)
+        self.compressed_bytes += len(comp)
+        self._buf.clear()
+        self._count = 0
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        self.flush()
+        self._fh.close()
+        self._idx.close()
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "records": self.records,
+            "blocks": self.blocks,
+            "raw_bytes": self.raw_bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "ratio": (
+                round(self.raw_bytes / self.compressed_bytes, 2) if self.compressed_bytes else None
+            ),
+        }
+
+
+def _check_magic(path: str) -> None:
+    with open(path, "rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a capture file")
+
+
+def _scan_blocks(path: str) -> Iterator[BlockInfo]:
+    size = os.path.getsize(path)
+    with open(path, "rb") as fh:
+        offset = len(MAGIC)
+        while offset + _BLOCK.size <= size:
+            fh.seek(offset)
+            comp_len, _, count, first_ts, last_ts = _BLOCK.unpack(fh.read(_BLOCK.size))
+            end = offset + _BLOCK.size + comp_len
+            if end > size:
+                break  # truncated tail
+            yield BlockInfo(offset, first_ts, last_ts, count)
+            offset = end
+
+
+def _write_index(path: str, blocks: list[BlockInfo]) -> None:
+    with open(index_path(path), "wb") as fh:
+        for b in blocks:
+            fh.write(_INDEX.pack(*b))
+
+
+def _read_index(path: str) -> list[BlockInfo]:
+    try:
+        with open(index_path(path), "rb") as fh:
+            raw = fh.read()
+    except FileNotFoundError:
+        return []
+    usable = len(raw) - len(raw) % _INDEX.size
+    return [BlockInfo(*_INDEX.unpack_from(raw, i)) for i in range(0, usable, _INDEX.size)]
+
+
+class CaptureReader:
+    """Random-access reader over a capture file and its index."""
+
+    def __init__(self, path: str):
+        _check_magic(path)
+        self.path = path
+        blocks = _read_index(path)
+        size = os.path.getsize(path)
+        if not blocks or _block_end(path, blocks[-1]) != size:
+            blocks = list(_scan_blocks(path))
+        self.blocks = blocks
+
+    def __len__(self) -> int:
+        return sum(b.count for b in self.blocks)
+
+    def _read_block(self, fh, block: BlockInfo) -> Iterator[CaptureRecord]:
+        fh.seek(block.offset)
+        comp_len, raw_len, count, _, _ = _BLOCK.unpack(fh.read(_BLOCK.size))
+        raw = zlib.decompress(fh.read(comp_len))
+        if len(raw) != raw_len:
+            raise ValueError(f"corrupt block at offset {block.offset}")
+        view = memoryview(raw)
+        pos = 0
+        for _ in range(count):
+            ts, slen, plen = _RECORD.unpack_from(raw, pos)
+            pos += _RECORD.size
+            subject = bytes(view[pos : pos + slen]).decode()
+            pos += slen
+            data = bytes(view[pos : pos + plen])
+            pos += plen
+            yield CaptureRecord(ts, subject, data)
+
+    def records(
+        self,
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        subjects: Optional[Iterable[str]] = None,
+    ) -> Iterator[CaptureRecord]:
+        """Records in capture order, optionally limited to a time window / subject set."""
+        wanted = set(subjects) if subjects else None
+        with open(self.path, "rb") as fh:
+            for block in self.blocks:
+                if start_ts is not None and block.last_ts < start_ts:
+                    continue
+                if end_ts is not None and block.first_ts > end_ts:
+                    break
+                for rec in self._read_block(fh, block):
+                    if start_ts is not None and rec.ts < start_ts:
+                        continue
+                    if end_ts is not None and rec.ts > end_ts:
+                        return
+                    if wanted is None or rec.subject in wanted:
+                        yield rec
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        return self.records()
+
+    def summary(self) -> dict:
+        counts: dict[str, int] = {}
+        for rec in self.records():
+            counts[rec.subject] = counts.get(rec.subject, 0) + 1
+        first = self.blocks[0].first_ts if self.blocks else None
+        last = self.blocks[-1].last_ts if self.blocks else None
+        return {
+            "path": self.path,
+            "records": sum(counts.values()),
+            "blocks": len(self.blocks),
+            "first_ts": first,
+            "last_ts": last,
+            "duration_s": round(last - first, 3) if first is not None and last is not None else 0.0,
+            "subjects": dict(sorted(counts.items())),
+        }
+
+
+def _block_end(path: str, block: BlockInfo) -> int:
+    with open(path, "rb") as fh:
+        fh.seek(block.offset)
+        comp_len = _BLOCK.unpack(fh.read(_BLOCK.size))[0]
+    return block.offset + _BLOCK.size + comp_len
+
+
+async def replay(
+    records: Iterable[CaptureRecord],
+    sink: Callable[[CaptureRecord], Awaitable[None]],
+    speed: float = 1.0,
+) -> dict:
+    """Feed `records` to `sink` preserving inter-arrival gaps divided by `speed`.
+
+    `speed <= 0` replays as fast as the sink accepts (yielding to the loop every
+    message so subscription-style consumers still get to run).
+    """
+    t0 = time.perf_counter()
+    first_ts: Optional[float] = None
+    n = 0
+    max_behind = 0.0
+    for rec in records:
+        if first_ts is None:
+            first_ts = rec.ts
+        if speed > 0:
+            due = (rec.ts - first_ts) / speed
+            now = time.perf_counter() - t0
+            if due > now:
+                await asyncio.sleep(due - now)
+            else:
+                max_behind = max(max_behind, now - due)
+        await sink(rec)
+        n += 1
+        if speed <= 0:
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - t0
+    return {
+        "records": n,
+        "elapsed_s": round(elapsed, 4),
+        "msgs_per_s": round(n / elapsed, 1) if elapsed > 0 else None,
+        "speed": speed,
+        "max_behind_s": round(max_behind, 4),
+    }
@@ -0,0 +1,112 @@
+"""Latest-wins coalescing mailboxes for full-state snapshot subjects.
+
+Standings, lap timing, track conditions and session state are complete
+replacements of the previous message, so a frame that has already been
+superseded is useless work. The NATS callback only drops the undecoded message
+into a single-slot `LatestMailbox`; a consumer task decodes / validates /
+applies whatever is newest when it gets to run. Under a burst the apply rate
+is bounded by how fast the cache can absorb frames, not by the message rate,
+and the number of frames that were never applied is counted as `skipped`.
+The optional `on_put` hook sees every arrival (and whether it superseded a
+pending frame), so ingest metrics count messages as they come in rather than
+only the ones that survive to be applied.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+from sim_racecenter_agent.logging import get_logger
+
+_LOGGER = get_logger(__name__)
+
+
+class LatestMailbox:
+    """Single-slot mailbox; `put` overwrites, the consumer applies the newest."""
+
+    def __init__(
+        self,
+        subject: str,
+        apply: Callable[[Any], Awaitable[None]],
+        on_put: Optional[Callable[[bool], None]] = None,
+    ):
+        self.subject = subject
+        self._apply = apply
+        self._on_put = on_put
+        self._latest: Any = None
+        self.applying: Any = None  # message being handed to `apply` right now
+        self._event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.received = 0
+        self.applied = 0
+        self.skipped = 0
+        self.errors = 0
+
+    def put(self, msg: Any) -> None:
+        superseded = self._latest is not None
+        if superseded:
+            self.skipped += 1
+        self._latest = msg
+        self.received += 1
+        self._event.set()
+        if self._on_put is not None:
+            self._on_put(superseded)
+
+    async def put_async(self, msg: Any) -> None:
+        """Coroutine form of `put`, usable directly as a NATS subscription callback."""
+        self.put(msg)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> bool:
+        return self._latest is not None
+
+    async def _apply_latest(self) -> None:
+        msg, self._latest = self._latest, None
+        if msg is None:
+            return
+        self.applying = msg
+        try:
+            await self._apply(msg)
+            self.applied += 1
+        except Exception as e:  # pragma: no cover - handlers swallow their own errors
+            self.errors += 1
+            _LOGGER.debug("[coalesce] apply failed subject=%s err=%s", self.subject, e)
+        finally:
+            self.applying = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._event.wait()
+            self._event.clear()
+            await self._apply_latest()
+            # Let queued subscription callbacks overwrite the slot before the next apply
+            await asyncio.sleep(0)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"coalesce:{self.subject}")
+
+    async def stop(self, drain: bool = True) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if drain:
+            await self._apply_latest()
+
+    def metrics(self) -> dict:
+        return {
+            "received": self.received,
+            "applied": self.applied,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "pending": self.pending,
+        }
@@ -0,0 +1,337 @@
+"""Per-subject ingest instrumentation: counters, rates and stage latency histograms.
+
+Every handled message is timed through four stages:
+
+* ``decode``    JSON decode of the raw NATS payload
+* ``validate``  schema validation (`schemas.validation.is_valid`)
+* ``apply``     StateCache update
+* ``persist``   building snapshot rows and handing them to the writer thread
+
+plus the end-to-end ``lag`` between the payload's publisher ``timestamp`` and
+the moment the message was decoded. Latencies go into `LatencyHistogram`, a
+fixed-size HDR-style log-linear histogram (16 sub-buckets per power of two,
+so any reported percentile is within ~6% of the true value) that records in
+O(1) without allocating. `render_prometheus` turns an `IngestMetrics.snapshot()`
+into Prometheus text exposition format for the HTTP ``/metrics`` endpoint.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Iterable
+
+STAGES = ("decode", "validate", "apply", "persist")
+COUNTERS = ("received", "superseded", "decode_errors", "invalid", "applied")
+
+# Payload timestamps below this are not epoch seconds (e.g. session time) -> no lag
+_MIN_EPOCH_TS = 1e9
+
+_SUB_BITS = 5
+_SUB = 1 << _SUB_BITS  # values below this get one bucket each (microseconds)
+_HALF = _SUB >> 1
+_MAX_BITS = 36  # ~19h in microseconds; larger values land in the last bucket
+_N_BUCKETS = _SUB + (_MAX_BITS - _SUB_BITS) * _HALF
+
+
+def _bucket_index(us: int) -> int:
+    if us < _SUB:
+        return us if us > 0 else 0
+    shift = us.bit_length() - _SUB_BITS
+    idx = _SUB + (shift - 1) * _HALF + ((us >> shift) - _HALF)
+    return idx if idx < _N_BUCKETS else _N_BUCKETS - 1
+
+
+def _bucket_upper(idx: int) -> int:
+    """Highest value (microseconds) that maps to bucket `idx`."""
+    if idx < _SUB:
+        return idx
+    j = idx - _SUB
+    shift = j // _HALF + 1
+    mantissa = j % _HALF + _HALF
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in microsecond resolution."""
+
+    __slots__ = ("counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self) -> None:
+        self.counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.total_us = 0
+        self.min_us: int | None = None
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        us = int(seconds * 1e6)
+        if us < 0:
+            us = 0
+        self.counts[_bucket_index(us)] += 1
+        self.count += 1
+        self.total_us += us
+        if self.min_us is None or us < self.min_us:
+            self.min_us = us
+        if us > self.max_us:
+            self.max_us = us
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add `other`'s samples into this histogram (e.g. per-thread histograms)."""
+        for idx, c in enumerate(other.counts):
+            if c:
+                self.counts[idx] += c
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        if other.max_us > self.max_us:
+            self.max_us = other.max_us
+
+    def percentile(self, q: float) -> float:
+        """Value (seconds) at quantile `q` in [0, 1]; 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            if not c:
+                continue
+            seen += c
+            if seen >= rank:
+                return min(_bucket_upper(idx), self.max_us) / 1e6
+        return self.max_us / 1e6
+
+    def snapshot(self) -> dict:
+        """Summary in milliseconds (the unit every other ingest metric uses)."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min_ms": round((self.min_us or 0) / 1e3, 3),
+            "mean_ms": round(self.total_us / self.count / 1e3, 3),
+            "p50_ms": round(self.percentile(0.5) * 1e3, 3),
+            "p90_ms": round(self.percentile(0.9) * 1e3, 3),
+            "p99_ms": round(self.percentile(0.99) * 1e3, 3),
+            "p999_ms": round(self.percentile(0.999) * 1e3, 3),
+            "max_ms": round(self.max_us / 1e3, 3),
+            "sum_s": round(self.total_us / 1e6, 6),
+        }
+
+
+class _RateWindow:
+    """Messages per second over the trailing `window_s` seconds (1s slots)."""
+
+    __slots__ = ("slots", "window_s", "second")
+
+    def __init__(self, window_s: int = 60) -> None:
+        self.window_s = window_s
+        self.slots = [0] * window_s
+        self.second = int(time.monotonic())
+
+    def _advance(self, now: int) -> None:
+        gap = now - self.second
+        if gap <= 0:
+            return
+        if gap >= self.window_s:
+            self.slots = [0] * self.window_s
+        else:
+            for s in range(self.second + 1, now + 1):
+                self.slots[s % self.window_s] = 0
+        self.second = now
+
+    def add(self, n: int = 1) -> None:
+        now = int(time.monotonic())
+        if now != self.second:
+            self._advance(now)
+        self.slots[now % self.window_s] += n
+
+    def rate(self) -> float:
+        self._advance(int(time.monotonic()))
+        return sum(self.slots) / self.window_s
+
+
+class SubjectMetrics:
+    __slots__ = ("counters", "stages", "lag", "last_lag_s", "last_ts", "rate")
+
+    def __init__(self) -> None:
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.stages = {stage: LatencyHistogram() for stage in STAGES}
+        self.lag = LatencyHistogram()
+        self.last_lag_s: float | None = None
+        self.last_ts: float | None = None
+        self.rate = _RateWindow()
+
+
+class IngestMetrics:
+    """Per-subject ingest counters, stage histograms, lag and rates."""
+
+    def __init__(self) -> None:
+        self._subjects: dict[str, SubjectMetrics] = {}
+        self.started_at = time.time()
+        # NATS slow-consumer events (messages dropped by the client) per subject
+        self.slow_consumers: dict[str, int] = {}
+        self.track_lag = True
+
+    def subject(self, subject: str) -> SubjectMetrics:
+        m = self._subjects.get(subject)
+        if m is None:
+            m = self._subjects[subject] = SubjectMetrics()
+        return m
+
+    def received(self, subject: str) -> SubjectMetrics:
+        m = self.subject(subject)
+        m.counters["received"] += 1
+        m.rate.add()
+        return m
+
+    def count(self, subject: str, counter: str, n: int = 1) -> None:
+        counters = self.subject(subject).counters
+        counters[counter] = counters.get(counter, 0) + n
+
+    def observe(self, subject: str, stage: str, seconds: float) -> None:
+        self.subject(subject).stages[stage].record(seconds)
+
+    def observe_lag(self, subject: str, payload_ts: float | None) -> None:
+        if not self.track_lag or payload_ts is None or payload_ts < _MIN_EPOCH_TS:
+            return
+        m = self.subject(subject)
+        lag = max(0.0, time.time() - payload_ts)
+        m.lag.record(lag)
+        m.last_lag_s = lag
+        m.last_ts = payload_ts
+
+    def slow_consumer(self, subject: str) -> None:
+        self.slow_consumers[subject] = self.slow_consumers.get(subject, 0) + 1
+
+    def snapshot(self) -> dict:
+        subjects = {}
+        for name, m in sorted(self._subjects.items()):
+            subjects[name] = {
+                **m.counters,
+                "rate_per_s_60s": round(m.rate.rate(), 3),
+                "stages": {stage: h.snapshot() for stage, h in m.stages.items() if h.count},
+                "lag": m.lag.snapshot(),
+                "last_lag_s": round(m.last_lag_s, 3) if m.last_lag_s is not None else None,
+                "last_payload_ts": m.last_ts,
+            }
+        return {
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "subjects": subjects,
+            "slow_consumers": dict(self.slow_consumers),
+        }
+
+
+# ---------------- Prometheus text exposition -----------------
+_QUANTILES = (("0.5", "p50_ms"), ("0.9", "p90_ms"), ("0.99", "p99_ms"), ("0.999", "p999_ms"))
+
+
+def _labels(**labels: Any) -> str:
+    parts = []
+    for k, v in labels.items():
+        s = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{k}="{s}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _summary(lines: list[str], name: str, snap: dict, **labels: Any) -> None:
+    if not snap.get("count"):
+        return
+    for q, key in _QUANTILES:
+        lines.append(f"{name}{_labels(**labels, quantile=q)} {snap[key] / 1e3:.6f}")
+    lines.append(f"{name}_sum{_labels(**labels)} {snap['sum_s']:.6f}")
+    lines.append(f"{name}_count{_labels(**labels)} {snap['count']}")
+
+
+def _family(lines: list[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def render_prometheus(
+    snapshot: dict,
+    pending: dict[str, dict] | None = None,
+    persistence: dict | None = None,
+    coalescing: dict[str, dict] | None = None,
+    duplicates: dict[str, int] | None = None,
+) -> str:
+    """Prometheus text format (version 0.0.4) for an ingest metrics snapshot."""
+    subjects: dict[str, dict] = snapshot.get("subjects", {})
+    lines: list[str] = []
+
+    def counter_family(name: str, help_text: str, values: Iterable[tuple[str, Any]]) -> None:
+        values = list(values)
+        if not values:
+            return
+        _family(lines, name, "counter", help_text)
+        for subject, v in values:
+            lines.append(f"{name}{_labels(subject=subject)} {v}")
+
+    for counter, help_text in (
+        ("received", "Messages received per subject"),
+        ("superseded", "Snapshot messages replaced by a newer one before they were decoded"),
+        ("decode_errors", "Messages that were not valid JSON"),
+        ("invalid", "Messages rejected by schema validation"),
+        ("applied", "Messages applied to the state cache"),
+    ):
+        counter_family(
+            f"sim_ingest_{counter}_total",
+            help_text,
+            ((s, m.get(counter, 0)) for s, m in subjects.items()),
+        )
+    counter_family(
+        "sim_ingest_duplicates_total",
+        "Replayed messages skipped as already applied",
+        sorted((duplicates or {}).items()),
+    )
+    counter_family(
+        "sim_ingest_coalesced_total",
+        "Snapshot frames superseded before they were applied",
+        sorted((s, m.get("skipped", 0)) for s, m in (coalescing or {}).items()),
+    )
+    counter_family(
+        "sim_ingest_slow_consumer_total",
+        "NATS slow-consumer events (client dropped messages)",
+        sorted(snapshot.get("slow_consumers", {}).items()),
+    )
+
+    if any(m.get("stages") for m in subjects.values()):
+        _family(lines, "sim_ingest_stage_seconds", "summary", "Per-stage handler latency")
+        for s, m in subjects.items():
+            for stage, snap in m.get("stages", {}).items():
+                _summary(lines, "sim_ingest_stage_seconds", snap, subject=s, stage=stage)
+    if any(m.get("lag", {}).get("count") for m in subjects.values()):
+        _family(lines, "sim_ingest_lag_seconds", "summary", "Payload timestamp to decode lag")
+        for s, m in subjects.items():
+            _summary(lines, "sim_ingest_lag_seconds", m.get("lag", {}), subject=s)
+
+    if pending:
+        for key, name, help_text in (
+            ("pending_msgs", "sim_nats_pending_messages", "Messages buffered in the NATS client"),
+            ("pending_bytes", "sim_nats_pending_bytes", "Bytes buffered in the NATS client"),
+        ):
+            _family(lines, name, "gauge", help_text)
+            for s, p in sorted(pending.items()):
+                lines.append(f"{name}{_labels(subject=s)} {p.get(key, 0)}")
+
+    if persistence and persistence.get("running") is not None:
+        for key, name, kind, help_text in (
+            ("queue_depth", "sim_persist_queue_depth", "gauge", "Pending snapshot writes"),
+            ("written_rows", "sim_persist_written_rows_total", "counter", "Snapshot rows written"),
+            (
+                "dropped_rows",
+                "sim_persist_dropped_rows_total",
+                "counter",
+                "Rows dropped on full queue",
+            ),
+        ):
+            if key in persistence:
+                _family(lines, name, kind, help_text)
+                lines.append(f"{name} {persistence[key]}")
+        commit = persistence.get("commit_latency") or {}
+        if commit.get("count"):
+            _family(lines, "sim_persist_commit_seconds", "summary", "SQLite batch commit latency")
+            _summary(lines, "sim_persist_commit_seconds", commit)
+
+    _family(lines, "sim_ingest_uptime_seconds", "gauge", "Seconds since ingest metrics started")
+    lines.append(f"sim_ingest_uptime_seconds {snapshot.get('uptime_s', 0)}")
+    return "\n".join(lines) + "\n"
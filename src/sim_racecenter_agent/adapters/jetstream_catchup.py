@@ -0,0 +1,243 @@
+"""Forward-range JetStream catch-up.
+
+Replaces the backwards `get_msg(seq)` walk (one round-trip per stream
+sequence, across every subject in the stream) with server-side filtered,
+ack-less ephemeral pull consumers that deliver only the requested subject in
+batches.
+
+Start points (`CatchupStart.mode`):
+
+* ``last_n``    newest N messages of the subject. N == 1 is a single direct
+                "last by subject" get; otherwise the start sequence is
+                estimated from the subject's share of the stream and widened
+                until the consumer reports at least N pending messages.
+* ``since_ts``  every message at or after a wall-clock timestamp.
+* ``since_seq`` every message at or after a stream sequence.
+
+In every mode at most `limit` (newest) messages are returned. When more than
+`limit` messages are pending from a `since_*` start, the consumer is replaced
+by a `last_n` one (floored at `since_seq`) so only the tail is fetched rather
+than the whole backlog.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from nats.js import api
+
+from sim_racecenter_agent.logging import get_logger
+
+_LOGGER = get_logger(__name__)
+
+CATCHUP_MODES = ("last_n", "since_ts", "since_seq")
+
+
+@dataclass
+class CatchupStart:
+    mode: str = "last_n"
+    since_ts: Optional[float] = None
+    since_seq: Optional[int] = None
+
+
+@dataclass
+class CatchupMsg:
+    """Replayed message; exposes `.data` like a live NATS message."""
+
+    subject: str
+    seq: int
+    data: bytes
+    time: Optional[float] = None
+
+
+@dataclass
+class FetchStats:
+    start_seq: Optional[int] = None
+    consumers: int = 0
+    fetches: int = 0
+    fetched: int = 0
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        out = {
+            "start_seq": self.start_seq,
+            "consumers": self.consumers,
+            "fetches": self.fetches,
+            "fetched": self.fetched,
+        }
+        out.update(self.extra)
+        return out
+
+
+def _from_js(m: Any) -> CatchupMsg:
+    md = getattr(m, "metadata", None)
+    seq = int(getattr(getattr(md, "sequence", None), "stream", 0) or 0)
+    ts = getattr(md, "timestamp", None)
+    return CatchupMsg(
+        subject=m.subject,
+        seq=seq,
+        data=m.data,
+        time=ts.timestamp() if isinstance(ts, datetime) else None,
+    )
+
+
+async def _create_consumer(js: Any, stream: str, subject: str, **cfg: Any) -> api.ConsumerInfo:
+    config = api.ConsumerConfig(
+        name=f"catchup_{uuid.uuid4().hex[:16]}",
+        filter_subject=subject,
+        ack_policy=api.AckPolicy.NONE,
+        inactive_threshold=30.0,
+        mem_storage=True,
+        **cfg,
+    )
+    return await js.add_consumer(stream, config=config)
+
+
+async def _delete_consumer(js: Any, stream: str, name: str) -> None:
+    try:
+        await js.delete_consumer(stream, name)
+    except Exception:
+        pass
+
+
+async def _last_n_consumer(
+    js: Any, stream: str, subject: str, limit: int, stats: FetchStats, floor: int = 1
+) -> Optional[api.ConsumerInfo]:
+    """Create a consumer positioned so roughly `limit` subject messages are pending.
+
+    The start sequence never goes below `floor`.
+    """
+    info = await js.stream_info(stream, subjects_filter=subject)
+    state = info.state
+    count = int((state.subjects or {}).get(subject, 0))
+    if count <= 0:
+        return None
+    first, last = max(int(state.first_seq or 1), floor), int(state.last_seq or 0)
+    if count <= limit:
+        stats.consumers += 1
+        return await _create_consumer(js, stream, subject, deliver_policy=api.DeliverPolicy.ALL)
+    density = count / max(1, last - first + 1)
+    span = math.ceil(limit / density * 1.25)
+    while True:
+        start = max(first, last - span + 1)
+        stats.consumers += 1
+        ci = await _create_consumer(
+            js,
+            stream,
+            subject,
+            deliver_policy=api.DeliverPolicy.BY_START_SEQUENCE,
+            opt_start_seq=start,
+        )
+        if (ci.num_pending or 0) >= limit or start == first:
+            return ci
+        await _delete_consumer(js, stream, ci.name)
+        span *= 2
+
+
+async def fetch_subject(
+    js: Any,
+    stream: str,
+    subject: str,
+    limit: int,
+    start: CatchupStart,
+    batch: int = 256,
+    fetch_timeout: float = 2.0,
+    stats: Optional[FetchStats] = None,
+) -> list[CatchupMsg]:
+    """Return up to `limit` newest messages of `subject` from `start`, oldest first."""
+    stats = stats if stats is not None else FetchStats()
+    if limit <= 0:
+        return []
+    if start.mode == "last_n" and limit == 1:
+        try:
+            raw = await js.get_last_msg(stream, subject)
+        except Exception:
+            return []
+        stats.fetches += 1
+        stats.fetched += 1
+        stats.start_seq = raw.seq
+        ts = raw.time.timestamp() if isinstance(raw.time, datetime) else None
+        return [CatchupMsg(subject=subject, seq=int(raw.seq or 0), data=raw.data or b"", time=ts)]
+
+    ci: Optional[api.ConsumerInfo] = None
+    if start.mode == "since_seq" and start.since_seq:
+        stats.consumers += 1
+        ci = await _create_consumer(
+            js,
+            stream,
+            subject,
+            deliver_policy=api.DeliverPolicy.BY_START_SEQUENCE,
+            opt_start_seq=int(start.since_seq),
+        )
+    elif start.mode == "since_ts" and start.since_ts:
+        stats.consumers += 1
+        ci = await _create_consumer(
+            js,
+            stream,
+            subject,
+            deliver_policy=api.DeliverPolicy.BY_START_TIME,
+            opt_start_time=datetime.fromtimestamp(float(start.since_ts), tz=timezone.utc),
+        )
+    if ci is not None and int(ci.num_pending or 0) > limit:
+        # Only the newest `limit` would be kept: start near the tail instead
+        stats.extra["backlog"] = int(ci.num_pending or 0)
+        await _delete_consumer(js, stream, ci.name)
+        ci = None
+    if ci is None:
+        floor = int(start.since_seq or 1) if start.mode == "since_seq" else 1
+        found = await _last_n_consumer(js, stream, subject, limit, stats, floor=floor)
+        if found is None:
+            return []
+        ci = found
+
+    pending = int(ci.num_pending or 0)
+    out: deque[CatchupMsg] = deque(maxlen=limit)
+    try:
+        if pending <= 0:
+            return []
+        psub = await js.pull_subscribe_bind(consumer=ci.name, stream=stream)
+        try:
+            received = 0
+            while received < pending:
+                want = min(max(1, batch), pending - received)
+                try:
+                    msgs = await psub.fetch(want, timeout=fetch_timeout)
+                except asyncio.TimeoutError:
+                    break
+                stats.fetches += 1
+                if not msgs:
+                    break
+                for m in msgs:
+                    cm = _from_js(m)
+                    if stats.start_seq is None:
+                        stats.start_seq = cm.seq
+                    out.append(cm)
+                received += len(msgs)
+            stats.fetched += received
+        finally:
+            try:
+                await psub.unsubscribe()
+            except Exception:
+                pass
+    finally:
+        await _delete_consumer(js, stream, ci.name)
+    return list(out)
+
+
+def resolve_start(mode: str, since_ts: float, lookback_s: float, since_seq: int) -> CatchupStart:
+    """Build a `CatchupStart` from settings values (unknown modes fall back to last_n)."""
+    if mode == "since_ts":
+        ts = since_ts if since_ts and since_ts > 0 else time.time() - max(0.0, lookback_s)
+        return CatchupStart(mode="since_ts", since_ts=ts)
+    if mode == "since_seq" and since_seq > 0:
+        return CatchupStart(mode="since_seq", since_seq=since_seq)
+    if mode not in CATCHUP_MODES:
+        _LOGGER.warning("[catchup] unknown mode %r; using last_n", mode)
+    return CatchupStart(mode="last_n")
@@ -3,47 +3,215 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Optional, Any
+from typing import Any, Optional
 
 from nats.aio.client import Client as NATS
 from nats.js.client import JetStreamContext
 from nats.aio.errors import ErrConnectionClosed, ErrNoServers
+from nats.errors import SlowConsumerError
 
 from sim_racecenter_agent.logging import get_logger
+from ..core.models import StintRow, TelemetryFrame, session_roster
+from ..core.session_registry import SessionRegistry, session_from_subject
 from ..core.state_cache import StateCache
 from ..config.settings import Settings
 from ..schemas import validation
+from .coalesce import LatestMailbox
+from .ingest_metrics import IngestMetrics, render_prometheus
+from .jetstream_catchup import CatchupMsg, CatchupStart, FetchStats, fetch_subject, resolve_start
+from .sqlite_writer import SnapshotWriter
 
 _LOGGER = get_logger(__name__)
 
+_SESSION_SNAPSHOT_SQL = "INSERT INTO session_snapshots(ts, data) VALUES(?, ?)"
+_SESSION_STATE_SNAPSHOT_SQL = "INSERT INTO session_state_snapshots(ts, data) VALUES(?, ?)"
+_STANDINGS_SNAPSHOT_SQL = (
+    "INSERT OR IGNORE INTO standings_snapshots(ts, car_idx, position, car_number, driver, "
+    "last_lap_s, best_lap_s, lap, created_at, gap_leader_s, gap_ahead_s) "
+    "VALUES(?,?,?,?,?,?,?,?,?,?,?)"
+)
+_POSITION_CHANGE_SQL = (
+    "INSERT OR IGNORE INTO position_changes(ts, type, car_idx, other_car_idx, from_pos, to_pos, "
+    "lap, gap_s, data) VALUES(?,?,?,?,?,?,?,?,?)"
+)
+_TRACK_CONDITIONS_SNAPSHOT_SQL = (
+    "INSERT OR IGNORE INTO track_conditions_snapshots(ts, data) VALUES(?, ?)"
+)
+_CHAT_INSERT_SQL = (
+    "INSERT OR IGNORE INTO chat_messages(id, username, message, avatar_url, yt_type, ts_iso, "
+    "ts, day) VALUES(?,?,?,?,?,?,?,?)"
+)
+_CHECKPOINT_SQL = (
+    "INSERT OR REPLACE INTO ingest_checkpoints(subject, stream, seq, seq_at, ts, updated_at) "
+    "VALUES(?,?,?,?,?,?)"
+)
+
+
+# Event subjects: raw-message hashes remembered per subject for duplicate suppression
+EVENT_DEDUPE_WINDOW = 4096
+
+
+class _RecentKeys:
+    """Insertion-ordered set of the last `size` keys."""
+
+    __slots__ = ("size", "_keys")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._keys: dict[int, None] = {}
+
+    def add(self, key: int) -> bool:
+        """Remember `key`; False if it is already among the recent keys."""
+        if key in self._keys:
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.size:
+            del self._keys[next(iter(self._keys))]
+        return True
+
+
+def _payload_ts(payload: dict) -> float | None:
+    """Publisher timestamp of a payload (epoch seconds), if it carries one."""
+    ts = payload.get("timestamp")
+    if isinstance(ts, (int, float)) and not isinstance(ts, bool):
+        return float(ts)
+    data = payload.get("data")
+    iso = data.get("timestamp") if isinstance(data, dict) else ts
+    if isinstance(iso, str):
+        try:
+            return datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def _position_change_row(ev: dict) -> tuple:
+    """position_changes row for a detector event (other_car_idx -1 = not an overtake)."""
+    return (
+        ev.get("ts"),
+        ev.get("type"),
+        ev.get("car_idx"),
+        ev.get("passed_car_idx", -1),
+        ev.get("from_pos"),
+        ev.get("to_pos", ev.get("position")),
+        ev.get("lap"),
+        ev.get("gap_s", ev.get("gap_ahead_s")),
+        json.dumps(ev),
+    )
+
+
+def _chat_row(payload: dict) -> tuple | None:
+    """chat_messages row for a validated chat payload; None when it has no id."""
+    data = payload.get("data") or {}
+    mid = data.get("id")
+    if not mid:
+        return None
+    iso_ts = data.get("timestamp")
+    try:
+        dt = (
+            datetime.fromisoformat(iso_ts.replace("Z", "+00:00"))
+            if iso_ts
+            else datetime.now(timezone.utc)
+        )
+    except Exception:
+        dt = datetime.now(timezone.utc)
+    return (
+        mid,
+        data.get("username"),
+        data.get("message") or "",
+        data.get("avatarUrl"),
+        data.get("type"),
+        iso_ts,
+        dt.timestamp(),
+        dt.strftime("%Y-%m-%d"),
+    )
+
+
+def _num_pending(msg) -> int | None:
+    """Messages still pending on the consumer after `msg` (JetStream metadata)."""
+    try:
+        return int(msg.metadata.num_pending)
+    except Exception:
+        return None
+
+
 _LAST_INGESTOR: "NATSIngestor | None" = None  # for diagnostics tools
 
 
 class NATSIngestor:
     """Ingests NATS live subjects, optional JetStream historical catch-up, and persists chat + snapshots."""
 
-    def __init__(self, cache: StateCache, settings: Settings):
+    def __init__(
+        self, cache: StateCache, settings: Settings, sessions: Optional[SessionRegistry] = None
+    ):
         self.cache = cache
         self.settings = settings
+        # Per-session shards fed from `<subject>.<session>`; None = single cache
+        self.sessions = sessions
+        if sessions is not None:
+            sessions.on_evict(self._drop_session)
         self.nc: Optional[NATS] = None
         self._js: Optional[JetStreamContext] = None
         self._stop = asyncio.Event()
         # Chat persistence / DB
         self._chat_task: Optional[asyncio.Task] = None
-        self._chat_conn = None  # sqlite3 connection
+        self._chat_conn = None  # sqlite3 connection (schema, checkpoints; loop thread only)
+        # Chat batches commit on a worker thread through their own connection
+        self._chat_write_conn = None
+        self._chat_write_lock = threading.Lock()
+        self._db_path: Optional[str] = None
         self._chat_sub = None  # JetStream pull subscription
+        # Snapshot persistence (write-behind thread, created lazily by _ensure_db)
+        self._writer: Optional[SnapshotWriter] = None
+        self._position_change_id = cache.position_changes().last_id  # last event persisted
         # Chat metrics
         self._chat_pulled = 0
         self._chat_persisted = 0
         self._chat_last_id: Optional[str] = None
         self._chat_last_pull_ts: Optional[float] = None
         self._chat_last_insert_ts: Optional[float] = None
+        self._chat_batches = 0
+        self._chat_last_batch = 0
+        self._chat_batch_size = max(1, int(settings.chat_pull_batch))
+        self._chat_backlog: Optional[int] = None
         # Catch-up metrics
         self._catchup_counts: dict[str, int] = {}
         self._catchup_started_ts: Optional[float] = None
         self._catchup_completed_ts: Optional[float] = None
         self._catchup_subject_metrics: dict[str, dict] = {}
+        # Resume checkpoints: subject -> {stream, seq, seq_at, ts, updated_at}
+        self._checkpoints: dict[str, dict[str, Any]] = {}
+        self._checkpoints_loaded = False
+        self._checkpoints_dirty: set[str] = set()
+        self._checkpoints_saved_at = 0.0
+        # Duplicate suppression: snapshot subjects keep their newest payload timestamp plus
+        # the raw hashes at it; event subjects the hashes of their recent messages
+        self._hw_keys: dict[str, set[int]] = {}
+        self._event_keys: dict[str, _RecentKeys] = {}
+        self._duplicates_skipped: dict[str, int] = {}
+        # Per-subject counters / stage latency histograms, live subscriptions for pending stats
+        self._metrics = IngestMetrics()
+        self._subs: dict[str, Any] = {}
+        # Latest-wins mailboxes for full-state snapshot subjects (live + catch-up)
+        self._mailboxes: dict[str, LatestMailbox] = {}
+        if settings.enable_coalescing:
+            for subject, handler in (
+                ("iracing.standings", self._handle_standings),
+                ("iracing.lap_timing", self._handle_lap_timing),
+                ("iracing.track_conditions", self._handle_track_conditions),
+                ("iracing.session_state", self._handle_session_state),
+            ):
+                self._mailboxes[subject] = self._new_mailbox(subject, subject, handler)
+        # Compile schema validators once up front instead of on the first message
+        try:
+            validation.configure(settings.validation_mode, settings.validation_sample_every)
+        except ValueError as e:
+            _LOGGER.warning("[validation] %s; using full", e)
+            validation.configure("full")
+        validation.compile_all()
         global _LAST_INGESTOR
         _LAST_INGESTOR = self
 
@@ -55,7 +223,7 @@ class NATSIngestor:
             opts["user"] = self.settings.nats.username
             opts["password"] = self.settings.nats.password
         await asyncio.wait_for(
-            nc.connect(servers=[self.settings.nats.url], **opts),
+            nc.connect(servers=[self.settings.nats.url], error_cb=self._on_nats_error, **opts),
             timeout=self.settings.nats.connect_timeout,
         )
         self.nc = nc
@@ -72,12 +240,27 @@ class NATSIngestor:
             except Exception:
                 pass
             self.nc = None
+        self._subs.clear()
+        for mailbox in self._mailboxes.values():
+            await mailbox.stop(drain=True)
         if self._chat_task:
             try:
                 await asyncio.wait_for(self._chat_task, timeout=2)
             except Exception:
                 pass
             self._chat_task = None
+        self._maybe_save_checkpoints(force=True)
+        if self._writer is not None:
+            # Flush-on-shutdown; join off-loop so a slow final commit does not stall it
+            try:
+                await asyncio.to_thread(self._writer.close)
+            except Exception:
+                pass
+            self._writer = None
+        try:
+            await asyncio.to_thread(self._close_chat_writer)
+        except Exception:
+            pass
         if self._chat_conn:
             try:
                 self._chat_conn.close()
@@ -88,6 +271,114 @@ class NATSIngestor:
     def stop(self):
         self._stop.set()
 
+    def _live_cb(self, subject: str, handler):
+        """Subscription callback: snapshot subjects only park the message in their mailbox."""
+        mailbox = self._mailboxes.get(subject)
+        if mailbox is not None:
+            return mailbox.put_async
+        if subject.endswith(".*") and subject[:-2] in self._mailboxes:
+            return self._session_mailbox_cb(subject[:-2], handler)
+        return handler
+
+    def _session_mailbox_cb(self, subject: str, handler):
+        """Per-session subjects get their own mailbox so sessions never coalesce together."""
+
+        async def _put(msg) -> None:
+            mailbox = self._mailboxes.get(msg.subject)
+            if mailbox is None:
+                mailbox = self._new_mailbox(msg.subject, subject, handler)
+                self._mailboxes[msg.subject] = mailbox
+                mailbox.start()
+            mailbox.put(msg)
+
+        return _put
+
+    def _new_mailbox(self, key: str, subject: str, handler) -> LatestMailbox:
+        """Mailbox for `key` whose arrivals are metered under `subject` as they are parked."""
+
+        def arrived(superseded: bool) -> None:
+            self._metrics.received(subject)
+            if superseded:
+                self._metrics.count(subject, "superseded")
+
+        return LatestMailbox(key, handler, on_put=arrived)
+
+    def _session_key(self, subject: str, msg) -> tuple[Optional[str], str]:
+        """(session, dedupe key) for a message on `subject` or on `subject.<session>`.
+
+        Only parses the subject: the registry is not touched, so a message that
+        is later rejected (malformed, stale, duplicate) never creates a shard.
+        """
+        if self.sessions is None:
+            return None, subject
+        session = session_from_subject(subject, getattr(msg, "subject", None))
+        if session is None:
+            return None, subject
+        return session, msg.subject
+
+    def _cache_for(self, session: Optional[str]) -> StateCache:
+        """Cache an accepted message is applied to; routing may create or evict a shard."""
+        if session is None or self.sessions is None:
+            return self.cache
+        return self.sessions.route(session)
+
+    def _shard(self, subject: str, msg) -> tuple[StateCache, str]:
+        """(cache, dedupe key) for a message that has already been decoded and accepted."""
+        session, key = self._session_key(subject, msg)
+        return self._cache_for(session), key
+
+    def _drop_session(self, session: str) -> None:
+        """Forget mailboxes / duplicate-suppression state of an evicted session shard."""
+        suffix = "." + session
+        for key in [k for k in self._mailboxes if k.endswith(suffix)]:
+            mailbox = self._mailboxes.pop(key)
+            try:
+                asyncio.get_running_loop().create_task(mailbox.stop(drain=False))
+            except RuntimeError:
+                pass
+        for key in [k for k in self._checkpoints if k.endswith(suffix)]:
+            self._checkpoints.pop(key, None)
+            self._hw_keys.pop(key, None)
+            self._event_keys.pop(key, None)
+            self._checkpoints_dirty.discard(key)
+
+    def start_mailboxes(self) -> None:
+        """Start the coalescing consumers (needs a running loop)."""
+        for mailbox in self._mailboxes.values():
+            mailbox.start()
+
+    def subject_handlers(self) -> list[tuple[str, Any]]:
+        """(subject, handler) for every live subscription enabled by settings."""
+        st = self.settings
+        pairs: list[tuple[str, Any, bool]] = [
+            (st.nats.telemetry_subject, self._handle_telemetry, True),
+            (st.nats.session_subject, self._handle_session, True),
+            ("iracing.standings", self._handle_standings, st.enable_extended_standings),
+            ("iracing.lap_timing", self._handle_lap_timing, st.enable_lap_timing),
+            ("iracing.session_state", self._handle_session_state, st.enable_session_state),
+            ("iracing.incident", self._handle_incident, st.enable_incident_events),
+            ("iracing.pit", self._handle_pit, st.enable_pit_events),
+            ("iracing.track_conditions", self._handle_track_conditions, st.enable_track_conditions),
+            ("iracing.stint", self._handle_stint, st.enable_stint),
+            (
+                st.nats.chat_input_subject,
+                self._handle_chat_passthrough,
+                bool(st.enable_chat and st.nats.chat_input_subject),
+            ),
+        ]
+        out = [(subject, handler) for subject, handler, enabled in pairs if enabled]
+        if self.sessions is not None:
+            chat = st.nats.chat_input_subject
+            out += [(f"{subject}.*", handler) for subject, handler in out if subject != chat]
+        return out
+
+    def live_callbacks(self) -> dict[str, Any]:
+        """subject -> callback exactly as subscribed live (snapshot subjects via mailbox)."""
+        return {subject: self._live_cb(subject, h) for subject, h in self.subject_handlers()}
+
+    def coalescing_metrics(self) -> dict:
+        return {subject: mb.metrics() for subject, mb in self._mailboxes.items()}
+
     # ---------------- Persistence DB -----------------
     def _ensure_db(self):
         if self._chat_conn is not None:
@@ -96,8 +387,11 @@ class NATSIngestor:
 
         path = os.environ.get("SQLITE_PATH", getattr(self.settings, "sqlite_path", "data/agent.db"))
         os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db_path = path
         self._chat_conn = sqlite3.connect(path)
         cur = self._chat_conn.cursor()
+        # WAL lets the snapshot writer thread commit while chat / tools read
+        cur.execute("PRAGMA journal_mode=WAL")
         # Chat
         cur.execute(
             "CREATE TABLE IF NOT EXISTS chat_messages( id TEXT PRIMARY KEY, username TEXT, message TEXT, avatar_url TEXT, yt_type TEXT, ts_iso TEXT, ts REAL, day TEXT )"
@@ -118,103 +412,214 @@ class NATSIngestor:
             "CREATE TABLE IF NOT EXISTS track_conditions_snapshots(ts REAL PRIMARY KEY, data TEXT)"
         )
         cur.execute("CREATE INDEX IF NOT EXISTS idx_standings_ts ON standings_snapshots(ts)")
+        # Migration: gap columns (older databases) + per-car range index for gap history
+        cols = {r[1] for r in cur.execute("PRAGMA table_info(standings_snapshots)")}
+        for col in ("gap_leader_s", "gap_ahead_s"):
+            if col not in cols:
+                cur.execute(f"ALTER TABLE standings_snapshots ADD COLUMN {col} REAL")
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_standings_car_ts ON standings_snapshots(car_idx, ts)"
+        )
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS position_changes(ts REAL, type TEXT, car_idx INT, "
+            "other_car_idx INT, from_pos INT, to_pos INT, lap INT, gap_s REAL, data TEXT, "
+            "PRIMARY KEY(ts, type, car_idx, other_car_idx))"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_position_changes_car ON position_changes(car_idx, ts)"
+        )
+        # Catch-up resume checkpoints
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS ingest_checkpoints(subject TEXT PRIMARY KEY, stream TEXT, "
+            "seq INT, seq_at REAL, ts REAL, updated_at REAL)"
+        )
         self._chat_conn.commit()
+        if self._writer is None:
+            self._writer = SnapshotWriter(
+                path,
+                max_rows=self.settings.persist_batch_rows,
+                max_delay_s=self.settings.persist_flush_interval,
+                queue_size=self.settings.persist_queue_size,
+            )
+            self._writer.start()
 
-    # ---------------- Handlers -----------------
-    async def _handle_telemetry(self, msg):  # pragma: no cover
+    def _persist(self, sql: str, rows: list[tuple]) -> None:
+        """Hand snapshot rows to the write-behind thread (never commits on the loop)."""
         try:
-            frame = json.loads(msg.data.decode())
+            self._ensure_db()
         except Exception:
             return
-        subset = {
-            "driver_id": frame.get("driver_id") or frame.get("display_name"),
-            "display_name": frame.get("display_name") or frame.get("driver_id"),
-            "CarNumber": frame.get("CarNumber"),
-            "CarDistAhead": frame.get("CarDistAhead"),
-            "CarDistBehind": frame.get("CarDistBehind"),
-            "CarNumberAhead": frame.get("CarNumberAhead"),
-            "CarNumberBehind": frame.get("CarNumberBehind"),
-            "_emulator": frame.get("_emulator"),
-        }
-        if subset.get("driver_id"):
-            self.cache.upsert_telemetry_frame(subset)
+        if self._writer is not None:
+            self._writer.submit(sql, rows)
 
-    async def _handle_session(self, msg):  # pragma: no cover
+    def _persist_position_changes(self) -> None:
+        """Queue position-change events detected since the last call for the writer thread."""
+        changes = self.cache.position_changes()
+        events = changes.since(self._position_change_id)
+        self._position_change_id = changes.last_id
+        if not events or not self.settings.enable_position_change_persist:
+            return
+        rows = [_position_change_row(ev) for ev in events]
+        self._persist(_POSITION_CHANGE_SQL, rows)
+
+    def persistence_metrics(self) -> dict:
+        if self._writer is None:
+            return {"running": False}
+        return self._writer.metrics()
+
+    # ---------------- Instrumentation -----------------
+    def _decode(self, subject: str, msg, schema: Optional[str] = None, validate: bool = True):
+        """JSON-decode and schema-check `msg`, timing both stages; None when rejected."""
+        metrics = self._metrics
+        mailbox = self._mailboxes.get(getattr(msg, "subject", None) or subject)
+        if mailbox is None or mailbox.applying is not msg:
+            metrics.received(subject)  # mailbox frames were counted when they were parked
+        t0 = time.perf_counter()
         try:
-            data = json.loads(msg.data.decode())
+            payload = json.loads(msg.data.decode())
         except Exception:
+            metrics.count(subject, "decode_errors")
+            return None
+        t1 = time.perf_counter()
+        metrics.observe(subject, "decode", t1 - t0)
+        if validate:
+            ok = validation.is_valid(schema or subject, payload)
+            metrics.observe(subject, "validate", time.perf_counter() - t1)
+            if not ok:
+                metrics.count(subject, "invalid")
+                return None
+        if isinstance(payload, dict):
+            metrics.observe_lag(subject, _payload_ts(payload))
+        return payload
+
+    def _stage_done(self, subject: str, stage: str, started: float) -> float:
+        now = time.perf_counter()
+        self._metrics.observe(subject, stage, now - started)
+        if stage == "apply":
+            self._metrics.count(subject, "applied")
+        return now
+
+    async def _on_nats_error(self, e: Exception):
+        if isinstance(e, SlowConsumerError):
+            self._metrics.slow_consumer(e.subject)
+            _LOGGER.warning("[nats] slow consumer subject=%s sid=%s", e.subject, e.sid)
+        else:
+            _LOGGER.debug("[nats] error %s", e)
+
+    async def _subscribe(self, subject: str, handler) -> None:
+        assert self.nc
+        self._subs[subject] = await self.nc.subscribe(subject, cb=self._live_cb(subject, handler))
+
+    def pending_metrics(self) -> dict:
+        """Per-subscription client-side backlog (messages delivered but not yet handled)."""
+        out = {}
+        for subject, sub in self._subs.items():
+            try:
+                out[subject] = {
+                    "pending_msgs": sub.pending_msgs,
+                    "pending_bytes": sub.pending_bytes,
+                    "delivered": sub.delivered,
+                }
+            except Exception:
+                continue
+        return out
+
+    def ingest_metrics(self) -> dict:
+        out = self._metrics.snapshot()
+        out["duplicates_skipped"] = dict(self._duplicates_skipped)
+        out["coalesced"] = {s: m["skipped"] for s, m in self.coalescing_metrics().items()}
+        out["pending"] = self.pending_metrics()
+        out["validation"] = {"mode": validation.mode()}
+        if self.nc is not None:
+            out["nats"] = dict(getattr(self.nc, "stats", {}) or {})
+        return out
+
+    def prometheus_metrics(self) -> str:
+        return render_prometheus(
+            self._metrics.snapshot(),
+            pending=self.pending_metrics(),
+            persistence=self.persistence_metrics(),
+            coalescing=self.coalescing_metrics(),
+            duplicates=self._duplicates_skipped,
+        )
+
+    # ---------------- Handlers -----------------
+    async def _handle_telemetry(self, msg):  # pragma: no cover
+        subject = self.settings.nats.telemetry_subject
+        frame = self._decode(subject, msg, validate=False)
+        if not isinstance(frame, dict):
             return
-        if not validation.is_valid("iracing.session", data):
+        subset = TelemetryFrame.from_payload(frame)
+        if subset.driver_id:
+            t0 = time.perf_counter()
+            cache, _ = self._shard(subject, msg)
+            cache.upsert_telemetry_frame(subset)
+            self._stage_done(subject, "apply", t0)
+
+    async def _handle_session(self, msg):  # pragma: no cover
+        subject = "iracing.session"
+        data = self._decode(subject, msg)
+        if data is None:
             return
-        drivers = data.get("drivers") or []
-        if drivers:
-            self.cache.update_roster(
-                [
-                    {
-                        "driver_id": d.get("UserName") or d.get("CarIdx"),
-                        "display_name": d.get("UserName") or d.get("CarIdx"),
-                        "CarNumber": d.get("CarNumber"),
-                    }
-                    for d in drivers
-                ]
-            )
+        t0 = time.perf_counter()
+        cache, _ = self._shard(self.settings.nats.session_subject, msg)
+        roster = session_roster(data)
+        if roster:
+            cache.update_roster(roster)
+        t0 = self._stage_done(subject, "apply", t0)
+        if cache is not self.cache:
+            return  # session shards are memory-only
         try:
-            self._ensure_db()
-            ts = float(data.get("timestamp") or data.get("ts") or 0.0)
-            conn = self._chat_conn
-            if conn is not None:
-                conn.execute(
-                    "INSERT INTO session_snapshots(ts, data) VALUES(?, ?)", (ts, json.dumps(data))
-                )
-                conn.commit()
+            # Session payloads usually carry no clock; receipt time dates the row for restore
+            ts = float(data.get("timestamp") or data.get("ts") or time.time())
+            self._persist(_SESSION_SNAPSHOT_SQL, [(ts, json.dumps(data))])
         except Exception:
             pass
+        self._stage_done(subject, "persist", t0)
 
     async def _handle_session_state(self, msg):  # pragma: no cover
-        try:
-            payload = json.loads(msg.data.decode())
-        except Exception:
+        subject = "iracing.session_state"
+        session, key = self._session_key(subject, msg)
+        payload = self._decode(subject, msg)
+        if payload is None or not self._accept(key, payload, msg):
             return
-        if not validation.is_valid("iracing.session_state", payload):
+        cache = self._cache_for(session)
+        t0 = time.perf_counter()
+        cache.set_session_state(payload)
+        t0 = self._stage_done(subject, "apply", t0)
+        if cache is not self.cache:
             return
-        self.cache.set_session_state(payload)
         try:
-            self._ensure_db()
             ts = float(payload.get("timestamp") or payload.get("ts") or 0.0)
-            conn = self._chat_conn
-            if conn is not None:
-                conn.execute(
-                    "INSERT INTO session_state_snapshots(ts, data) VALUES(?, ?)",
-                    (ts, json.dumps(payload)),
-                )
-                conn.commit()
+            self._persist(_SESSION_STATE_SNAPSHOT_SQL, [(ts, json.dumps(payload))])
         except Exception:
             pass
+        self._stage_done(subject, "persist", t0)
 
     async def _handle_standings(self, msg):  # pragma: no cover
-        try:
-            payload = json.loads(msg.data.decode())
-        except Exception:
-            return
-        if not validation.is_valid("iracing.standings", payload):
+        subject = "iracing.standings"
+        session, key = self._session_key(subject, msg)
+        payload = self._decode(subject, msg)
+        if payload is None or not self._accept(key, payload, msg):
             return
-        # Normalize cars list: tests may publish 'pos' instead of 'position'. Cache expects 'car_idx'
+        cache = self._cache_for(session)
+        t0 = time.perf_counter()
+        # Normalize cars: tests may publish 'pos' instead of 'position'. Cache expects 'car_idx'.
+        # Rows were just decoded and nothing else holds them, so 'position' is added in place.
         cars_raw = payload.get("cars", []) or []
         norm_cars: list[dict] = []
         for c in cars_raw:
-            if not isinstance(c, dict):
+            if not isinstance(c, dict) or c.get("car_idx") is None:
                 continue
-            car_idx = c.get("car_idx")
-            if car_idx is None:
-                continue
-            pos = c.get("position") if c.get("position") is not None else c.get("pos")
-            norm = dict(c)
-            if pos is not None:
-                norm["position"] = pos
-            norm_cars.append(norm)
-        self.cache.set_standings(payload.get("timestamp", 0.0), norm_cars)
+            if c.get("position") is None and c.get("pos") is not None:
+                c["position"] = c["pos"]
+            norm_cars.append(c)
+        cache.set_standings(payload.get("timestamp", 0.0), norm_cars)
+        t0 = self._stage_done(subject, "apply", t0)
+        if cache is not self.cache:
+            return
+        self._persist_position_changes()
         try:
-            self._ensure_db()
             ts = float(payload.get("timestamp") or 0.0)
             cars = norm_cars
             import time as _t
@@ -231,86 +636,89 @@ class NATSIngestor:
                     c.get("best_lap_s"),
                     c.get("lap"),
                     now,
+                    c.get("gap_leader_s"),
+                    c.get("gap_ahead_s"),
                 )
                 for c in cars
                 if c.get("car_idx") is not None
             ]
             if rows:
-                conn = self._chat_conn
-                if conn is not None:
-                    conn.executemany(
-                        "INSERT OR IGNORE INTO standings_snapshots(ts, car_idx, position, car_number, driver, last_lap_s, best_lap_s, lap, created_at) VALUES(?,?,?,?,?,?,?,?,?)",
-                        rows,
-                    )
-                    conn.commit()
+                self._persist(_STANDINGS_SNAPSHOT_SQL, rows)
         except Exception:
             pass
+        self._stage_done(subject, "persist", t0)
 
     async def _handle_lap_timing(self, msg):  # pragma: no cover
-        try:
-            payload = json.loads(msg.data.decode())
-        except Exception:
-            return
-        if not validation.is_valid("iracing.lap_timing", payload):
+        subject = "iracing.lap_timing"
+        session, key = self._session_key(subject, msg)
+        payload = self._decode(subject, msg)
+        if payload is None or not self._accept(key, payload, msg):
             return
-        self.cache.set_lap_timing(payload.get("timestamp", 0.0), payload.get("cars", []))
+        cache = self._cache_for(session)
+        t0 = time.perf_counter()
+        cache.set_lap_timing(payload.get("timestamp", 0.0), payload.get("cars", []))
+        self._stage_done(subject, "apply", t0)
 
     async def _handle_track_conditions(self, msg):  # pragma: no cover
-        try:
-            payload = json.loads(msg.data.decode())
-        except Exception:
+        subject = "iracing.track_conditions"
+        session, key = self._session_key(subject, msg)
+        payload = self._decode(subject, msg)
+        if payload is None or not self._accept(key, payload, msg):
             return
-        if not validation.is_valid("iracing.track_conditions", payload):
+        cache = self._cache_for(session)
+        t0 = time.perf_counter()
+        cache.set_track_conditions(payload)
+        t0 = self._stage_done(subject, "apply", t0)
+        if cache is not self.cache:
             return
-        self.cache.set_track_conditions(payload)
         try:
-            self._ensure_db()
             ts = float(payload.get("timestamp") or payload.get("ts") or 0.0)
-            conn = self._chat_conn
-            if conn is not None:
-                conn.execute(
-                    "INSERT OR IGNORE INTO track_conditions_snapshots(ts, data) VALUES(?, ?)",
-                    (ts, json.dumps(payload)),
-                )
-                conn.commit()
+            self._persist(_TRACK_CONDITIONS_SNAPSHOT_SQL, [(ts, json.dumps(payload))])
         except Exception:
             pass
+        self._stage_done(subject, "persist", t0)
 
     async def _handle_incident(self, msg):  # pragma: no cover
-        try:
-            payload = json.loads(msg.data.decode())
-        except Exception:
-            return
-        if not validation.is_valid("iracing.incident", payload):
+        subject = "iracing.incident"
+        session, key = self._session_key(subject, msg)
+        payload = self._decode(subject, msg)
+        if payload is None or not self._accept(key, payload, msg, event=True):
             return
-        self.cache.add_incident_event(payload)
+        cache = self._cache_for(session)
+        t0 = time.perf_counter()
+        cache.add_incident_event(payload)
+        self._stage_done(subject, "apply", t0)
 
     async def _handle_pit(self, msg):  # pragma: no cover
-        try:
-            payload = json.loads(msg.data.decode())
-        except Exception:
+        subject = "iracing.pit"
+        session, key = self._session_key(subject, msg)
+        payload = self._decode(subject, msg)
+        if payload is None or not self._accept(key, payload, msg, event=True):
             return
-        if not validation.is_valid("iracing.pit", payload):
-            return
-        self.cache.add_pit_event(payload)
+        cache = self._cache_for(session)
+        t0 = time.perf_counter()
+        cache.add_pit_event(payload)
+        self._stage_done(subject, "apply", t0)
 
     async def _handle_stint(self, msg):  # pragma: no cover
-        try:
-            payload = json.loads(msg.data.decode())
-        except Exception:
-            return
-        if not validation.is_valid("iracing.stint", payload):
+        subject = "iracing.stint"
+        session, key = self._session_key(subject, msg)
+        payload = self._decode(subject, msg)
+        if payload is None or not self._accept(key, payload, msg, event=True):
             return
-        self.cache.update_stint(payload.get("car_idx"), payload)
+        cache = self._cache_for(session)
+        t0 = time.perf_counter()
+        cache.update_stint(payload.get("car_idx"), StintRow.from_payload(payload))
+        self._stage_done(subject, "apply", t0)
 
     async def _handle_chat_passthrough(self, msg):  # pragma: no cover
         # Accept chat messages for real-time UI even if persistence disabled
-        try:
-            payload = json.loads(msg.data.decode())
-        except Exception:
-            return
-        if validation.is_valid("youtube.chat.message", payload):
+        subject = self.settings.nats.chat_input_subject
+        payload = self._decode(subject, msg, schema="youtube.chat.message")
+        if payload is not None and self._accept(subject, payload, msg, event=True):
+            t0 = time.perf_counter()
             self.cache.add_chat_message(payload)
+            self._stage_done(subject, "apply", t0)
 
     # ---------------- Chat persistence (JetStream pull) -----------------
     async def _ensure_chat_stream(self):  # pragma: no cover
@@ -348,9 +756,11 @@ class NATSIngestor:
     async def _chat_pull_loop(self):  # pragma: no cover
         assert self._js
         self._ensure_db()
-        insert_sql = "INSERT OR IGNORE INTO chat_messages(id, username, message, avatar_url, yt_type, ts_iso, ts, day) VALUES(?,?,?,?,?,?,?,?)"
-        batch = max(1, int(self.settings.chat_pull_batch))
+        base = max(1, int(self.settings.chat_pull_batch))
+        ceiling = max(base, int(self.settings.chat_pull_batch_max))
         interval = max(0.1, float(self.settings.chat_pull_interval))
+        subject = self.settings.nats.chat_input_subject
+        self._chat_batch_size = base
         while not self._stop.is_set():
             try:
                 if self._chat_sub is None:
@@ -358,88 +768,108 @@ class NATSIngestor:
                 msgs = []
                 if self._chat_sub is not None:
                     # type: ignore[attr-defined]
-                    msgs = await self._chat_sub.fetch(batch, timeout=interval)
+                    msgs = await self._chat_sub.fetch(self._chat_batch_size, timeout=interval)
             except Exception:
                 await asyncio.sleep(interval)
                 continue
-            changed = False
-            if msgs:
-                import time as _t
-
-                self._chat_pulled += len(msgs)
-                self._chat_last_pull_ts = _t.time()
+            if not msgs:
+                continue
+            self._chat_pulled += len(msgs)
+            self._chat_last_pull_ts = time.time()
+            rows: list[tuple] = []
+            done: list = []  # parsed (valid or not): ack once the batch is committed
+            undecodable: list = []  # never redeliver
             for m in msgs:
                 try:
                     payload = json.loads(m.data.decode())
-                    if not validation.is_valid("youtube.chat.message", payload):
-                        await m.ack()
-                        continue
-                    self.cache.add_chat_message(payload)
-                    data = payload.get("data") or {}
-                    mid = data.get("id")
-                    if mid:
-                        username = data.get("username")
-                        message = data.get("message") or ""
-                        avatar = data.get("avatarUrl")
-                        yttype = data.get("type")
-                        iso_ts = data.get("timestamp")
-                        try:
-                            dt = (
-                                datetime.fromisoformat(iso_ts.replace("Z", "+00:00"))
-                                if iso_ts
-                                else datetime.now(timezone.utc)
-                            )
-                        except Exception:
-                            dt = datetime.now(timezone.utc)
-                        epoch = dt.timestamp()
-                        day = dt.strftime("%Y-%m-%d")
-                        try:
-                            conn = self._chat_conn
-                            if conn is not None:
-                                conn.execute(
-                                    insert_sql,
-                                    (mid, username, message, avatar, yttype, iso_ts, epoch, day),
-                                )
-                                # Defensive: ensure FTS row exists even if trigger creation failed earlier
-                                try:
-                                    conn.execute(
-                                        "INSERT INTO chat_messages_fts(rowid, message) SELECT rowid, message FROM chat_messages WHERE id=?",
-                                        (mid,),
-                                    )
-                                except Exception:
-                                    pass
-                                changed = True
-                                self._chat_persisted += 1
-                                self._chat_last_id = mid
-                                import time as _t
-
-                                self._chat_last_insert_ts = _t.time()
-                        except Exception:
-                            pass
-                    await m.ack()
                 except Exception:
-                    try:
-                        await m.term()
-                    except Exception:
-                        pass
-            if changed:
-                conn = self._chat_conn
-                if conn is not None:
-                    try:
-                        conn.commit()
-                    except Exception:
-                        pass
-        conn = self._chat_conn
-        if conn is not None:
+                    undecodable.append(m)
+                    continue
+                done.append(m)
+                if not validation.is_valid("youtube.chat.message", payload):
+                    continue
+                self.cache.add_chat_message(payload)
+                row = _chat_row(payload)
+                if row is not None:
+                    rows.append(row)
+            t0 = time.perf_counter()
             try:
-                conn.commit()
-            except Exception:
-                pass
+                inserted = await self._persist_chat_batch(rows)
+            except Exception as e:
+                _LOGGER.warning("[chat] batch insert failed rows=%d err=%s", len(rows), e)
+                # Redeliver the batch later instead of acknowledging rows that were not stored
+                await asyncio.gather(
+                    *(m.nak() for m in done),
+                    *(m.term() for m in undecodable),
+                    return_exceptions=True,
+                )
+                await asyncio.sleep(interval)
+                continue
+            self._stage_done(subject, "persist", t0)
+            self._chat_batches += 1
+            self._chat_last_batch = len(msgs)
+            if inserted:
+                self._chat_persisted += inserted
+                self._chat_last_id = rows[-1][0]
+                self._chat_last_insert_ts = time.time()
+            # Acks are fire-and-forget publishes; send the whole batch concurrently
+            await asyncio.gather(
+                *(m.ack() for m in done), *(m.term() for m in undecodable), return_exceptions=True
+            )
+            # Size the next fetch to the backlog so floods drain in a few round trips
+            backlog = _num_pending(msgs[-1])
+            self._chat_backlog = backlog
+            self._chat_batch_size = min(ceiling, max(base, backlog or 0))
+
+    async def _persist_chat_batch(self, rows: list[tuple]) -> int:
+        """Commit chat rows off the event loop; returns once the batch is durable.
+
+        Callers ack the JetStream messages only after this returns, so a
+        failed commit (which raises) leaves them for redelivery.
+        """
+        if not rows:
+            return 0
+        self._ensure_db()
+        return await asyncio.to_thread(self._persist_chat_rows, rows)
+
+    def _persist_chat_rows(self, rows: list[tuple]) -> int:
+        """Insert chat rows in one transaction; returns how many were new.
+
+        Runs on a worker thread. Full-text indexing is left to the
+        `chat_messages_ai` trigger so each new row is indexed exactly once
+        (ignored duplicates never reach the index). Raises when the batch could
+        not be committed.
+        """
+        if not rows:
+            return 0
+        import sqlite3
+
+        with self._chat_write_lock:
+            conn = self._chat_write_conn
+            if conn is None:
+                if self._db_path is None:
+                    raise RuntimeError("chat database unavailable")
+                # Same busy timeout as the snapshot writer: wait out its commits
+                conn = sqlite3.connect(self._db_path, timeout=30, check_same_thread=False)
+                self._chat_write_conn = conn
+            with conn:
+                cur = conn.executemany(_CHAT_INSERT_SQL, rows)
+        return max(0, cur.rowcount)
+
+    def _close_chat_writer(self) -> None:
+        with self._chat_write_lock:
+            if self._chat_write_conn is not None:
+                self._chat_write_conn.close()
+                self._chat_write_conn = None
 
     def chat_persistence_metrics(self) -> dict:
         return {
             "pulled": self._chat_pulled,
             "persisted": self._chat_persisted,
+            "batches": self._chat_batches,
+            "last_batch": self._chat_last_batch,
+            "batch_size": self._chat_batch_size,
+            "backlog": self._chat_backlog,
             "last_id": self._chat_last_id,
             "last_pull_ts": self._chat_last_pull_ts,
             "last_insert_ts": self._chat_last_insert_ts,
@@ -448,6 +878,131 @@ class NATSIngestor:
             "enabled": self.settings.enable_chat and self.settings.enable_chat_persist,
         }
 
+    # ---------------- Checkpoints -----------------
+    def _accept(self, subject: str, payload: dict, msg, event: bool = False) -> bool:
+        """Record a payload as applied; False if it was already applied (duplicate).
+
+        Event subjects (incidents, pits, stints, chat) carry many cars' events
+        and arrive out of order, so they are deduplicated by identity: the raw
+        bytes of the last `EVENT_DEDUPE_WINDOW` messages applied.
+
+        Snapshot subjects replace the previous state: a frame older than the
+        subject's newest applied timestamp is stale, and frames at exactly that
+        timestamp are compared by raw bytes. A high-water mark loaded from a
+        persisted checkpoint only filters catch-up replays; a live frame older
+        than it (a restarted or replayed feed) starts a new high-water.
+        """
+        raw = msg.data
+        ts = _payload_ts(payload)
+        if ts is None and not event:
+            return True
+        cp = self._checkpoints.setdefault(subject, {})
+        if event:
+            seen = self._event_keys.get(subject)
+            if seen is None:
+                seen = self._event_keys[subject] = _RecentKeys(EVENT_DEDUPE_WINDOW)
+            if not seen.add(hash(raw)):
+                self._duplicates_skipped[subject] = self._duplicates_skipped.get(subject, 0) + 1
+                return False
+            if ts is not None and (cp.get("ts") is None or ts > cp["ts"]):
+                cp["ts"] = ts
+        else:
+            hw = cp.get("ts")
+            key = hash(raw)
+            keys = self._hw_keys.get(subject)
+            if hw is not None and ts <= hw and (keys is not None or isinstance(msg, CatchupMsg)):
+                # No hash set means the high-water came from a persisted checkpoint
+                if ts < hw or keys is None or key in keys:
+                    self._duplicates_skipped[subject] = self._duplicates_skipped.get(subject, 0) + 1
+                    return False
+                keys.add(key)
+            else:
+                cp["ts"] = ts
+                self._hw_keys[subject] = {key}
+        cp["updated_at"] = time.time()
+        self._checkpoints_dirty.add(subject)
+        self._maybe_save_checkpoints()
+        return True
+
+    def _note_seq(self, stream: str, subject: str, seq: int) -> None:
+        if not seq:
+            return
+        cp = self._checkpoints.setdefault(subject, {})
+        if seq > int(cp.get("seq") or 0):
+            cp["stream"] = stream
+            cp["seq"] = seq
+            cp["seq_at"] = time.time()
+            self._checkpoints_dirty.add(subject)
+
+    def _resume_start(self, subject: str, default: CatchupStart) -> CatchupStart:
+        """Start just after the checkpoint; falls back to `default` when none exists.
+
+        Live subscriptions carry no stream sequence, so when live messages were
+        applied after the last replayed sequence we resume from the last apply
+        time (minus a skew margin) and rely on `_accept` to drop the overlap.
+        """
+        cp = self._checkpoints.get(subject)
+        if not self.settings.catchup_resume or not cp:
+            return default
+        seq = int(cp.get("seq") or 0)
+        seq_at = float(cp.get("seq_at") or 0.0)
+        updated_at = float(cp.get("updated_at") or 0.0)
+        if updated_at > seq_at:
+            since = updated_at - max(0.0, self.settings.catchup_resume_skew_s)
+            return CatchupStart(mode="since_ts", since_ts=since)
+        if seq > 0:
+            return CatchupStart(mode="since_seq", since_seq=seq + 1)
+        return default
+
+    def _load_checkpoints(self) -> None:
+        if self._checkpoints_loaded:
+            return
+        self._checkpoints_loaded = True
+        if not self.settings.catchup_resume:
+            return
+        try:
+            self._ensure_db()
+            conn = self._chat_conn
+            if conn is None:
+                return
+            rows = conn.execute(
+                "SELECT subject, stream, seq, seq_at, ts, updated_at FROM ingest_checkpoints"
+            ).fetchall()
+        except Exception as e:
+            _LOGGER.debug("[catchup] checkpoint load failed %s", e)
+            return
+        for subject, stream, seq, seq_at, ts, updated_at in rows:
+            cp = self._checkpoints.setdefault(subject, {})
+            if int(seq or 0) > int(cp.get("seq") or 0):
+                cp.update(stream=stream, seq=int(seq or 0), seq_at=seq_at)
+            if ts is not None and (cp.get("ts") is None or ts > cp["ts"]):
+                cp.update(ts=ts, updated_at=updated_at)
+        if rows:
+            _LOGGER.info("[catchup] loaded %d resume checkpoints", len(rows))
+
+    def _maybe_save_checkpoints(self, force: bool = False) -> None:
+        if not self._checkpoints_dirty:
+            return
+        now = time.time()
+        if not force and now - self._checkpoints_saved_at < self.settings.checkpoint_interval_s:
+            return
+        rows = []
+        for subject in self._checkpoints_dirty:
+            cp = self._checkpoints.get(subject) or {}
+            rows.append(
+                (
+                    subject,
+                    cp.get("stream"),
+                    cp.get("seq"),
+                    cp.get("seq_at"),
+                    cp.get("ts"),
+                    cp.get("updated_at"),
+                )
+            )
+        self._checkpoints_dirty.clear()
+        self._checkpoints_saved_at = now
+        self._persist(_CHECKPOINT_SQL, rows)
+
     # ---------------- JetStream catch-up -----------------
     async def _catchup_jetstream(self):  # pragma: no cover
         if not self._js:
@@ -455,6 +1010,9 @@ class NATSIngestor:
         import time as _t
 
         self._catchup_started_ts = _t.time()
+        self._load_checkpoints()
+        # Replayed history would swamp the live publish->decode lag histogram
+        self._metrics.track_lag = False
         subjects = [
             (
                 "IRACING_HISTORY",
@@ -515,13 +1073,21 @@ class NATSIngestor:
             ),
         ]
 
+        start_point = resolve_start(
+            self.settings.catchup_mode,
+            self.settings.catchup_since_ts,
+            self.settings.catchup_lookback_s,
+            self.settings.catchup_since_seq,
+        )
+
         async def _run_one(stream: str, subject: str, limit: int, handler):
             import time as _t2
 
             try:
                 start = _t2.time()
                 before = self._catchup_counts.get(subject, 0)
-                await self._replay_last(stream, subject, limit, handler)
+                sub_start = self._resume_start(subject, start_point)
+                stats = await self._replay_subject(stream, subject, limit, handler, sub_start)
                 after = self._catchup_counts.get(subject, 0)
                 delta = after - before
                 end = _t2.time()
@@ -531,16 +1097,19 @@ class NATSIngestor:
                         "duration_s": round(end - start, 6),
                         "start_ts": start,
                         "end_ts": end,
+                        "mode": sub_start.mode,
+                        **stats.as_dict(),
                     }
                     _LOGGER.info(
-                        "[catchup] subject=%s replayed=%d total=%d time=%.3fs",
+                        "[catchup] subject=%s replayed=%d total=%d time=%.3fs fetches=%d",
                         subject,
                         delta,
                         sum(self._catchup_counts.values()),
                         end - start,
+                        stats.fetches,
                     )
-            except Exception:
-                pass
+            except Exception as e:
+                _LOGGER.debug("[catchup] subject=%s failed %s", subject, e)
 
         tasks = [
             asyncio.create_task(_run_one(s, subj, lim, h))
@@ -549,7 +1118,9 @@ class NATSIngestor:
         ]
         if tasks:
             await asyncio.gather(*tasks)
+        self._metrics.track_lag = True
         self._catchup_completed_ts = _t.time()
+        self._maybe_save_checkpoints(force=True)
         if self._catchup_counts:
             _LOGGER.info(
                 "[catchup] complete subjects=%d total_msgs=%d duration=%.3fs",
@@ -560,96 +1131,49 @@ class NATSIngestor:
                 else -1.0,
             )
 
-    async def _replay_last(
-        self, stream: str, subject: str, max_msgs: int, handler
-    ):  # pragma: no cover
+    async def _replay_subject(
+        self, stream: str, subject: str, max_msgs: int, handler, start: CatchupStart
+    ) -> FetchStats:  # pragma: no cover
         assert self._js
-        try:
-            info = await self._js.stream_info(stream)
-        except Exception:
-            return
-        last_seq = getattr(info.state, "last_seq", 0)
-        if not last_seq:
-            return
-        collected: list[Any] = []
-        seq = last_seq
-        while seq > 0 and len(collected) < max_msgs:
-            try:
-                msg = await self._js.get_msg(stream_name=stream, seq=seq)
-            except Exception:
-                break
-            if msg.subject == subject:
-                collected.append(msg)
-            seq -= 1
-        for m in reversed(collected):
-
-            class _Wrap:
-                def __init__(self, data: bytes):
-                    self.data = data
-
-            # Use handler (updates cache) AND persist if chat subject
-            await handler(_Wrap(m.data))
-            if subject == self.settings.nats.chat_input_subject:
+        stats = FetchStats()
+        collected = await fetch_subject(
+            self._js,
+            stream,
+            subject,
+            max_msgs,
+            start,
+            batch=self.settings.catchup_fetch_batch,
+            stats=stats,
+        )
+        mailbox = self._mailboxes.get(subject)
+        is_chat = subject == self.settings.nats.chat_input_subject
+        chat_rows: list[tuple] = []
+        for m in collected:
+            # Use handler (updates cache) AND persist if chat subject (one batch at the end).
+            # Snapshot subjects go through their mailbox so only the newest frame is applied.
+            if mailbox is not None and mailbox.running:
+                mailbox.put(m)
+            else:
+                await handler(m)
+            self._note_seq(stream, subject, m.seq)
+            if is_chat:
                 try:
                     payload = json.loads(m.data.decode())
                     if validation.is_valid("youtube.chat.message", payload):
-                        data = payload.get("data") or {}
-                        mid = data.get("id")
-                        if mid:
-                            username = data.get("username")
-                            message = data.get("message") or ""
-                            avatar = data.get("avatarUrl")
-                            yttype = data.get("type")
-                            iso_ts = data.get("timestamp")
-                            try:
-                                dt = (
-                                    datetime.fromisoformat(iso_ts.replace("Z", "+00:00"))
-                                    if iso_ts
-                                    else datetime.now(timezone.utc)
-                                )
-                            except Exception:
-                                dt = datetime.now(timezone.utc)
-                            epoch = dt.timestamp()
-                            day = dt.strftime("%Y-%m-%d")
-                            self._ensure_db()
-                            conn = self._chat_conn
-                            if conn is not None:
-                                try:
-                                    conn.execute(
-                                        "INSERT OR IGNORE INTO chat_messages(id, username, message, avatar_url, yt_type, ts_iso, ts, day) VALUES(?,?,?,?,?,?,?,?)",
-                                        (
-                                            mid,
-                                            username,
-                                            message,
-                                            avatar,
-                                            yttype,
-                                            iso_ts,
-                                            epoch,
-                                            day,
-                                        ),
-                                    )
-                                    try:
-                                        conn.execute(
-                                            "INSERT INTO chat_messages_fts(rowid, message) SELECT rowid, message FROM chat_messages WHERE id=?",
-                                            (mid,),
-                                        )
-                                    except Exception:
-                                        pass
-                                    conn.commit()
-                                    self._chat_persisted += 1
-                                    self._chat_last_id = mid
-                                except Exception:
-                                    pass
+                        row = _chat_row(payload)
+                        if row is not None:
+                            chat_rows.append(row)
                 except Exception:
                     pass
-            # Best-effort ack if this is a JetStream Msg instance with ack() method
-            try:  # pragma: no cover
-                if hasattr(m, "ack"):
-                    await m.ack()
-            except Exception:
-                pass
+        if chat_rows:
+            try:
+                self._chat_persisted += await self._persist_chat_batch(chat_rows)
+                self._chat_last_id = chat_rows[-1][0]
+            except Exception as e:
+                _LOGGER.debug("[catchup] chat persist failed %s", e)
         if collected:
             self._catchup_counts[subject] = self._catchup_counts.get(subject, 0) + len(collected)
+        return stats
 
     def catchup_metrics(self) -> dict:
         import time as _t
@@ -665,6 +1189,8 @@ class NATSIngestor:
             else None,
             "age_s": (now - self._catchup_completed_ts) if self._catchup_completed_ts else None,
             "subjects": self._catchup_subject_metrics,
+            "checkpoints": {k: dict(v) for k, v in self._checkpoints.items()},
+            "duplicates_skipped": dict(self._duplicates_skipped),
         }
 
     # ---------------- Run loop -----------------
@@ -674,36 +1200,15 @@ class NATSIngestor:
             try:
                 await self.connect()
                 assert self.nc
+                self.start_mailboxes()
                 if self.settings.enable_jetstream_catchup:
                     try:
                         await self._catchup_jetstream()
                     except Exception:
                         pass
                 # Live subscriptions
-                await self.nc.subscribe(
-                    self.settings.nats.telemetry_subject, cb=self._handle_telemetry
-                )
-                await self.nc.subscribe(self.settings.nats.session_subject, cb=self._handle_session)
-                if self.settings.enable_extended_standings:
-                    await self.nc.subscribe("iracing.standings", cb=self._handle_standings)
-                if self.settings.enable_lap_timing:
-                    await self.nc.subscribe("iracing.lap_timing", cb=self._handle_lap_timing)
-                if self.settings.enable_session_state:
-                    await self.nc.subscribe("iracing.session_state", cb=self._handle_session_state)
-                if self.settings.enable_incident_events:
-                    await self.nc.subscribe("iracing.incident", cb=self._handle_incident)
-                if self.settings.enable_pit_events:
-                    await self.nc.subscribe("iracing.pit", cb=self._handle_pit)
-                if self.settings.enable_track_conditions:
-                    await self.nc.subscribe(
-                        "iracing.track_conditions", cb=self._handle_track_conditions
-                    )
-                if self.settings.enable_stint:
-                    await self.nc.subscribe("iracing.stint", cb=self._handle_stint)
-                if self.settings.enable_chat and self.settings.nats.chat_input_subject:
-                    await self.nc.subscribe(
-                        self.settings.nats.chat_input_subject, cb=self._handle_chat_passthrough
-                    )
+                for subject, handler in self.subject_handlers():
+                    await self._subscribe(subject, handler)
                 # Chat persistence
                 if self.settings.enable_chat and self.settings.enable_chat_persist:
                     self._ensure_db()
@@ -725,9 +1230,12 @@ class NATSIngestor:
 
 
 async def run_telemetry_listener(
-    cache: StateCache, settings: Settings, stop_event: asyncio.Event
+    cache: StateCache,
+    settings: Settings,
+    stop_event: asyncio.Event,
+    sessions: Optional[SessionRegistry] = None,
 ):  # pragma: no cover
-    ing = NATSIngestor(cache, settings)
+    ing = NATSIngestor(cache, settings, sessions)
     task = asyncio.create_task(ing.run())
     try:
         await stop_event.wait()
@@ -0,0 +1,437 @@
+"""Synthetic race field producing schema-valid publisher traffic.
+
+`RaceSimulator` models N cars lapping a track: each car has a base pace, per-lap
+noise, tyre degradation over its stint and fuel burn that eventually sends it
+to the pits. A car that closes to within a few tenths of the car ahead loses
+time in dirty air and only gets past with a small per-second probability, so
+trains and battles form and dissolve the way they do in real races. Incidents
+are more likely in close company.
+
+`traffic()` turns the simulation into a time-ordered stream of
+``(ts, subject, payload)`` for every subject `NATSIngestor` consumes, at the
+rates in `TrafficRates`. Every payload validates against its JSON schema. The
+simulation is deterministic for a given ``seed``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+_FIRST = (
+    "Alex Max Lewis Charles Lando Oscar Carlos George Fernando Sergio Kimi Nico Valtteri "
+    "Daniel Pierre Esteban Yuki Lance Logan Zhou Kevin Mick Sebastian Jenson Mika Ayrton"
+).split()
+_LAST = (
+    "Verstappen Hamilton Leclerc Norris Piastri Sainz Russell Alonso Perez Raikkonen Rosberg "
+    "Bottas Ricciardo Gasly Ocon Tsunoda Stroll Sargeant Magnussen Schumacher Vettel Button"
+).split()
+_CHAT = (
+    "what a move by {a}!",
+    "{a} is so much faster than {b} right now",
+    "come on {a} 🏎️",
+    "is {a} pitting this lap?",
+    "gap to the leader?",
+    "{a} vs {b} for P{p} is the battle to watch",
+    "tyres are going off for {a}",
+    "show the battle for P{p}!",
+)
+
+# Simulation constants (seconds / fraction of a lap unless stated)
+_PIT_LOSS_S = 24.0
+_FUEL_TANK_L = 60.0
+_DIRTY_AIR_GAP_S = 0.8
+_DIRTY_AIR_PENALTY = 0.004  # fraction of lap time lost while following closely
+_BLOCK_GAP_S = 0.25  # closest a blocked follower gets to the car ahead
+_CORNERS = ("LF", "RF", "LR", "RR")
+
+
+@dataclass
+class TrafficRates:
+    """Publish rates in Hz (telemetry is per car, i.e. `cars * telemetry_hz` msgs/s)."""
+
+    telemetry_hz: float = 5.0
+    standings_hz: float = 2.0
+    lap_timing_hz: float = 2.0
+    session_state_hz: float = 1.0
+    track_conditions_hz: float = 0.1
+    chat_hz: float = 0.5
+
+
+@dataclass
+class _Car:
+    car_idx: int
+    number: str
+    name: str
+    pace_s: float
+    consistency: float
+    lap: int = 0
+    pct: float = 0.0
+    lap_started: float = 0.0
+    lap_target_s: float = 0.0
+    last_lap_s: Optional[float] = None
+    best_lap_s: Optional[float] = None
+    fuel_l: float = _FUEL_TANK_L
+    burn_l: float = 2.4
+    stint_laps: int = 0
+    incidents: int = 0
+    pit_until: Optional[float] = None
+    pit_entered: Optional[float] = None
+    wear: dict[str, float] = field(default_factory=lambda: dict.fromkeys(_CORNERS, 0.0))
+
+    @property
+    def dist(self) -> float:
+        return self.lap + self.pct
+
+
+class RaceSimulator:
+    """Deterministic N-car race model; see module docstring."""
+
+    def __init__(
+        self,
+        cars: int = 20,
+        seed: int = 0,
+        base_lap_s: float = 90.0,
+        track_length_m: float = 5000.0,
+        start_ts: Optional[float] = None,
+        pass_prob_per_s: float = 0.08,
+        incident_rate_per_h: float = 6.0,
+    ):
+        self.rng = random.Random(seed)
+        self.base_lap_s = base_lap_s
+        self.track_length_m = track_length_m
+        self.now = float(start_ts if start_ts is not None else time.time())
+        self.started = self.now
+        self.pass_prob_per_s = pass_prob_per_s
+        self.incident_rate_per_s = incident_rate_per_h / 3600.0
+        self._events: list[tuple[float, str, dict]] = []
+        self._chat_seq = 0
+        names = [f"{first} {last}" for first in _FIRST for last in _LAST]
+        self.rng.shuffle(names)
+        self.cars: list[_Car] = []
+        for i in range(cars):
+            # Field spread of ~2% of lap time, grid order roughly by pace
+            pace = base_lap_s * (1.0 + self.rng.uniform(0.0, 0.02))
+            car = _Car(
+                car_idx=i,
+                number=str(self.rng.randint(1, 99)) if cars <= 99 else str(i + 1),
+                name=names[i % len(names)] + ("" if i < len(names) else f" {i}"),
+                pace_s=pace,
+                consistency=self.rng.uniform(0.001, 0.004),
+                burn_l=self.rng.uniform(2.2, 2.6),
+                fuel_l=self.rng.uniform(0.5, 1.0) * _FUEL_TANK_L,
+                lap_started=self.now,
+            )
+            self.cars.append(car)
+        self.cars.sort(key=lambda c: c.pace_s)
+        for grid, car in enumerate(self.cars):
+            car.pct = -grid * 0.002  # staggered grid behind the line
+            car.lap_target_s = self._lap_target(car)
+        self._order = list(self.cars)
+
+    # ---------------- Model -----------------
+    def _lap_target(self, car: _Car) -> float:
+        noise = self.rng.gauss(0.0, car.consistency)
+        degradation = 0.0012 * car.stint_laps
+        return car.pace_s * (1.0 + noise + degradation)
+
+    def _gap_s(self, ahead: _Car, behind: _Car) -> float:
+        return max(0.0, (ahead.dist - behind.dist) * behind.lap_target_s)
+
+    def step(self, dt: float) -> None:
+        """Advance the race by `dt` seconds, queueing any lap / pit / incident events."""
+        if dt <= 0:
+            return
+        self.now += dt
+        ahead: Optional[_Car] = None
+        for car in self._order:
+            if car.pit_until is not None:
+                if self.now >= car.pit_until:
+                    self._pit_exit(car)
+                ahead = car
+                continue
+            rate = 1.0 / car.lap_target_s
+            if ahead is not None and ahead.pit_until is None:
+                gap = self._gap_s(ahead, car)
+                if gap < _DIRTY_AIR_GAP_S:
+                    rate *= 1.0 - _DIRTY_AIR_PENALTY
+                    if self.rng.random() < self.incident_rate_per_s * 2 * dt:
+                        self._incident(car)
+            elif self.rng.random() < self.incident_rate_per_s * dt:
+                self._incident(car)
+            new_pct = car.pct + rate * dt
+            # Blocked unless the pass sticks this step
+            if ahead is not None and ahead.pit_until is None:
+                limit = ahead.dist - _BLOCK_GAP_S / car.lap_target_s - car.lap
+                if new_pct > limit and self.rng.random() > self.pass_prob_per_s * dt:
+                    new_pct = max(car.pct, limit)
+            car.pct = new_pct
+            if car.pct >= 1.0:
+                self._complete_lap(car, rate)
+            ahead = car
+        self._order.sort(key=lambda c: c.dist, reverse=True)
+
+    def _complete_lap(self, car: _Car, rate: float) -> None:
+        car.pct -= 1.0
+        car.lap += 1
+        # Interpolate the line crossing inside the step so lap times are not tick-quantised
+        crossed = self.now - car.pct / rate
+        lap_time = crossed - car.lap_started
+        car.lap_started = crossed
+        if car.lap > 1:  # first crossing is the start, not a timed lap
+            car.last_lap_s = round(lap_time, 3)
+            if car.best_lap_s is None or lap_time < car.best_lap_s:
+                car.best_lap_s = car.last_lap_s
+        car.stint_laps += 1
+        car.fuel_l = max(0.0, car.fuel_l - car.burn_l)
+        for k in car.wear:
+            car.wear[k] = min(100.0, car.wear[k] + self.rng.uniform(1.5, 2.5))
+        car.lap_target_s = self._lap_target(car)
+        self._emit("iracing.stint", self._stint_payload(car))
+        if car.fuel_l < car.burn_l * 1.5:
+            self._pit_enter(car)
+
+    def _pit_enter(self, car: _Car) -> None:
+        car.pit_entered = self.now
+        car.pit_until = self.now + _PIT_LOSS_S + self.rng.uniform(-2.0, 4.0)
+        self._emit(
+            "iracing.pit",
+            {"timestamp": self.now, "event": "enter", "car_idx": car.car_idx, "lap": car.lap},
+        )
+
+    def _pit_exit(self, car: _Car) -> None:
+        added = round(_FUEL_TANK_L - car.fuel_l, 2)
+        duration = round(self.now - (car.pit_entered or self.now), 2)
+        car.fuel_l = _FUEL_TANK_L
+        car.stint_laps = 0
+        car.wear = dict.fromkeys(car.wear, 0.0)
+        car.pit_until = car.pit_entered = None
+        # Pit lane time is lost from the lap in progress
+        car.lap_target_s = self._lap_target(car)
+        self._emit(
+            "iracing.pit",
+            {
+                "timestamp": self.now,
+                "event": "exit",
+                "car_idx": car.car_idx,
+                "lap": car.lap,
+                "stop_duration_s": duration,
+                "fuel_added_l": added,
+                "fast_repair_used": False,
+            },
+        )
+
+    def _incident(self, car: _Car) -> None:
+        delta = self.rng.choice((1, 1, 2, 4))
+        car.incidents += delta
+        self._emit(
+            "iracing.incident",
+            {
+                "timestamp": self.now,
+                "car_idx": car.car_idx,
+                "delta": delta,
+                "total": car.incidents,
+                "team_total": car.incidents,
+            },
+        )
+
+    def _emit(self, subject: str, payload: dict) -> None:
+        self._events.append((self.now, subject, payload))
+
+    def drain_events(self) -> list[tuple[float, str, dict]]:
+        out, self._events = self._events, []
+        return out
+
+    # ---------------- Payloads -----------------
+    def order(self) -> list[_Car]:
+        return list(self._order)
+
+    def session(self) -> dict:
+        return {
+            "drivers": [
+                {"CarIdx": c.car_idx, "UserName": c.name, "CarNumber": c.number}
+                for c in sorted(self.cars, key=lambda c: c.car_idx)
+            ],
+        }
+
+    def standings(self) -> dict:
+        order = self._order
+        leader = order[0]
+        cars = []
+        for pos, car in enumerate(order, start=1):
+            ahead = order[pos - 2] if pos > 1 else None
+            cars.append(
+                {
+                    "car_idx": car.car_idx,
+                    "pos": pos,
+                    "class_pos": pos,
+                    "lap": car.lap,
+                    "gap_leader_s": round(self._gap_s(leader, car), 3),
+                    "gap_ahead_s": round(self._gap_s(ahead, car), 3) if ahead else 0.0,
+                    "last_lap_s": car.last_lap_s,
+                }
+            )
+        return {"timestamp": self.now, "leader_car_idx": leader.car_idx, "cars": cars}
+
+    def lap_timing(self) -> dict:
+        cars = []
+        for car in self.cars:
+            current = round(self.now - car.lap_started, 3) if car.lap else None
+            delta = None
+            if current is not None and car.best_lap_s:
+                delta = round(current - car.best_lap_s * max(0.0, car.pct), 3)
+            cars.append(
+                {
+                    "car_idx": car.car_idx,
+                    "lap": car.lap,
+                    "last_lap_s": car.last_lap_s,
+                    "best_lap_s": car.best_lap_s,
+                    "current_lap_time_s": current,
+                    "delta_best_s": delta,
+                }
+            )
+        return {"timestamp": self.now, "cars": cars}
+
+    def _stint_payload(self, car: _Car) -> dict:
+        return {
+            "timestamp": self.now,
+            "car_idx": car.car_idx,
+            "lap": car.lap,
+            "fuel_level_l": round(car.fuel_l, 2),
+            "fuel_pct": round(car.fuel_l / _FUEL_TANK_L, 4),
+            "avg_fuel_lap_l": round(car.burn_l, 3),
+            "est_laps_remaining": round(car.fuel_l / car.burn_l, 1),
+            "stint_laps": car.stint_laps,
+            "tire_wear_pct": {k: round(v, 1) for k, v in car.wear.items()},
+        }
+
+    def telemetry(self) -> list[dict]:
+        """One frame per car (CarDistAhead / CarDistBehind in metres)."""
+        order = self._order
+        frames = []
+        for i, car in enumerate(order):
+            ahead = order[i - 1] if i > 0 else None
+            behind = order[i + 1] if i + 1 < len(order) else None
+            frames.append(
+                {
+                    "CarIdx": car.car_idx,
+                    "driver_id": car.name,
+                    "display_name": car.name,
+                    "PlayerName": car.name,
+                    "CarNumber": car.number,
+                    "CarNumberAhead": ahead.number if ahead else None,
+                    "DriverAhead": ahead.name if ahead else None,
+                    "CarNumberBehind": behind.number if behind else None,
+                    "DriverBehind": behind.name if behind else None,
+                    "CarDistAhead": (
+                        round((ahead.dist - car.dist) * self.track_length_m, 1) if ahead else None
+                    ),
+                    "CarDistBehind": (
+                        round((car.dist - behind.dist) * self.track_length_m, 1) if behind else None
+                    ),
+                    "Lap": car.lap,
+                    "LapDistPct": round(max(0.0, car.pct), 5),
+                    "OnPitRoad": car.pit_until is not None,
+                    "timestamp": self.now,
+                }
+            )
+        return frames
+
+    def session_state(self, duration_s: float = 3600.0) -> dict:
+        return {
+            "timestamp": self.now,
+            "session_type": "RACE",
+            "time_remaining_s": round(max(0.0, duration_s - (self.now - self.started)), 1),
+            "flag_bits": 4,
+            "caution": False,
+            "green": True,
+            "pits_open": True,
+            "pace_mode": "NONE",
+        }
+
+    def track_conditions(self) -> dict:
+        elapsed_h = (self.now - self.started) / 3600.0
+        return {
+            "timestamp": self.now,
+            "air_temp_c": round(22.0 + 1.5 * elapsed_h, 2),
+            "air_pressure_pa": 101325.0,
+            "air_density": 1.2,
+            "track_temp_c": round(31.0 + 3.0 * elapsed_h, 2),
+            "fog_pct": 0.0,
+            "precip_pct": 0.0,
+        }
+
+    def chat_message(self) -> dict:
+        order = self._order
+        p = self.rng.randrange(1, max(2, len(order)))
+        a, b = order[p - 1], order[min(p, len(order) - 1)]
+        self._chat_seq += 1
+        text = self.rng.choice(_CHAT).format(a=a.name.split()[-1], b=b.name.split()[-1], p=p)
+        iso = datetime.fromtimestamp(self.now, timezone.utc).isoformat().replace("+00:00", "Z")
+        return {
+            "type": "youtube_chat_message",
+            "data": {
+                "id": f"sim-{self._chat_seq}-{uuid.UUID(int=self.rng.getrandbits(128)).hex[:12]}",
+                "username": f"fan{self.rng.randint(1, 5000)}",
+                "message": text,
+                "avatarUrl": None,
+                "timestamp": iso,
+                "type": "textMessageEvent",
+            },
+        }
+
+    # ---------------- Traffic -----------------
+    def traffic(
+        self, duration_s: float, rates: Optional[TrafficRates] = None
+    ) -> Iterator[tuple[float, str, dict]]:
+        """Time-ordered ``(ts, subject, payload)`` for `duration_s` simulated seconds."""
+        rates = rates or TrafficRates()
+        end = self.now + duration_s
+        yield self.now, "iracing.session", self.session()
+        streams = {
+            "iracing.telemetry": rates.telemetry_hz,
+            "iracing.standings": rates.standings_hz,
+            "iracing.lap_timing": rates.lap_timing_hz,
+            "iracing.session_state": rates.session_state_hz,
+            "iracing.track_conditions": rates.track_conditions_hz,
+            "youtube.chat.message": rates.chat_hz,
+        }
+        due = [(self.now, subject) for subject, hz in streams.items() if hz > 0]
+        heapq.heapify(due)
+        while due:
+            at, subject = heapq.heappop(due)
+            if at > end:
+                break
+            self.step(at - self.now)
+            for ev in self.drain_events():
+                yield ev
+            if subject == "iracing.telemetry":
+                for frame in self.telemetry():
+                    yield self.now, subject, frame
+            else:
+                yield self.now, subject, self._payload(subject)
+            if subject == "youtube.chat.message":
+                # Chat arrives in bursts, not on a metronome
+                nxt = at + self.rng.expovariate(streams[subject])
+            else:
+                nxt = at + 1.0 / streams[subject]
+            heapq.heappush(due, (nxt, subject))
+
+    def _payload(self, subject: str) -> dict:
+        return {
+            "iracing.standings": self.standings,
+            "iracing.lap_timing": self.lap_timing,
+            "iracing.session_state": self.session_state,
+            "iracing.track_conditions": self.track_conditions,
+            "youtube.chat.message": self.chat_message,
+        }[subject]()
+
+
+def encode(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
@@ -0,0 +1,198 @@
+"""Pooled read-only SQLite connections for the search tools.
+
+The search tools used to check the path, open a connection, look the FTS table
+up in sqlite_master, run one query and close, all on every call. `ReadPool`
+keeps idle connections per database path instead:
+
+* opened read-only (``mode=ro`` URI) with ``query_only`` and tuned pragmas
+  (mmap, page cache, in-memory temp store); the writer keeps the file in WAL
+  mode, so readers never block ingest commits
+* reused with their statement cache, so the tools' fixed SQL strings are
+  prepared once per connection
+* table presence cached per pool; a missing table is looked up again after
+  ``recheck_s`` (init scripts may create it later)
+
+The pool holds a descriptor on the database file: when the file is deleted or
+replaced (its link count drops to 0, or the path points at another inode),
+idle connections and the schema cache are dropped and the next checkout opens
+the new file. Connections are shared across the tool worker threads but used
+by one thread at a time.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_IDLE = 4
+MMAP_BYTES = 256 * 1024 * 1024
+CACHE_KIB = 16 * 1024
+STATEMENT_CACHE = 64
+RECHECK_S = 2.0
+
+
+class _ReadConnection(sqlite3.Connection):
+    generation = 0
+
+
+class ReadPool:
+    """Idle read-only connections to one SQLite file plus its table cache."""
+
+    def __init__(
+        self,
+        path: str,
+        max_idle: int = MAX_IDLE,
+        mmap_bytes: int = MMAP_BYTES,
+        cache_kib: int = CACHE_KIB,
+        recheck_s: float = RECHECK_S,
+    ):
+        self.path = path
+        self.max_idle = max(0, int(max_idle))
+        self.mmap_bytes = int(mmap_bytes)
+        self.cache_kib = int(cache_kib)
+        self.recheck_s = float(recheck_s)
+        self._lock = threading.Lock()
+        self._idle: List[sqlite3.Connection] = []
+        self._fd: Optional[int] = None
+        self._identity: Optional[Tuple[int, int]] = None
+        self._tables: Dict[str, Tuple[bool, float]] = {}
+        self._generation = 0  # bumped when the file changes; older connections are closed
+        self.opened = 0
+        self.reused = 0
+        self.invalidations = 0
+        self.schema_queries = 0
+
+    # ---- File identity ----
+    def _current(self) -> bool:
+        """True while the descriptor we hold is still the file at `path`."""
+        if self._fd is None:
+            return False
+        try:
+            if os.fstat(self._fd).st_nlink == 0:
+                return False
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return (st.st_dev, st.st_ino) == self._identity
+
+    def _reset(self, count: bool = True) -> None:
+        """Drop idle connections, the schema cache and the descriptor (lock held)."""
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+        self._tables.clear()
+        self._generation += 1
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            if count:
+                self.invalidations += 1
+        self._identity = None
+
+    def _attach(self) -> None:
+        """Hold the file at `path` (lock held); FileNotFoundError when it is missing."""
+        fd = os.open(self.path, os.O_RDONLY)
+        st = os.fstat(fd)
+        self._fd, self._identity = fd, (st.st_dev, st.st_ino)
+
+    def _connect(self) -> _ReadConnection:
+        conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE,
+            factory=_ReadConnection,
+        )
+        conn.execute("PRAGMA query_only=1")
+        conn.execute(f"PRAGMA mmap_size={self.mmap_bytes}")
+        conn.execute(f"PRAGMA cache_size=-{self.cache_kib}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        self.opened += 1
+        return conn
+
+    # ---- Checkout ----
+    def acquire(self) -> Optional[sqlite3.Connection]:
+        """A read-only connection (pass it back to `release`), None when the file is missing."""
+        with self._lock:
+            if not self._current():
+                self._reset()
+                try:
+                    self._attach()
+                except FileNotFoundError:
+                    return None
+            conn = self._idle.pop() if self._idle else None
+            if conn is not None:
+                self.reused += 1
+                return conn
+            generation = self._generation
+        conn = self._connect()
+        conn.generation = generation
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if (
+                getattr(conn, "generation", None) == self._generation
+                and len(self._idle) < self.max_idle
+            ):
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def has_table(self, conn: sqlite3.Connection, name: str) -> bool:
+        now = time.monotonic()
+        cached = self._tables.get(name)
+        if cached is not None and (cached[0] or now - cached[1] < self.recheck_s):
+            return cached[0]
+        self.schema_queries += 1
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+        ).fetchone()
+        self._tables[name] = (row is not None, now)
+        return row is not None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "idle": len(self._idle),
+            "max_idle": self.max_idle,
+            "opened": self.opened,
+            "reused": self.reused,
+            "invalidations": self.invalidations,
+            "schema_queries": self.schema_queries,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._reset(count=False)
+
+
+_POOLS: Dict[str, ReadPool] = {}
+_POOLS_LOCK = threading.Lock()
+_DEFAULTS: Dict[str, Any] = {}
+
+
+def configure(**defaults: Any) -> None:
+    """Set ReadPool keyword defaults (max_idle, mmap_bytes, cache_kib) for new pools."""
+    with _POOLS_LOCK:
+        _DEFAULTS.update(defaults)
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
+
+
+def read_pool(path: str) -> ReadPool:
+    """Process-wide pool for the database at `path`."""
+    pool = _POOLS.get(path)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(path)
+            if pool is None:
+                pool = _POOLS[path] = ReadPool(path, **_DEFAULTS)
+    return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {path: pool.stats() for path, pool in list(_POOLS.items())}
@@ -0,0 +1,223 @@
+"""Write-behind SQLite persistence for ingest snapshots.
+
+NATS handlers run on the asyncio event loop; committing every message there
+stalls every other subscription callback. `SnapshotWriter` moves the writes to
+a dedicated thread: handlers enqueue `(sql, rows)` pairs into a bounded queue
+and the writer groups them into a single transaction per window (row count or
+elapsed time, whichever comes first).
+
+The queue never blocks the caller. When it is full the rows are dropped and
+counted so backpressure is visible in `metrics()` instead of as loop lag.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Sequence
+
+from sim_racecenter_agent.logging import get_logger
+from .ingest_metrics import LatencyHistogram
+
+_LOGGER = get_logger(__name__)
+
+_STOP = object()
+
+
+class _Flush:
+    __slots__ = ("done",)
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class SnapshotWriter:
+    """Batching SQLite writer running on its own thread.
+
+    `queue_size` bounds the number of pending `submit()` calls; a batch is
+    committed once `max_rows` rows are pending or `max_delay_s` has elapsed
+    since the first pending row.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_rows: int = 500,
+        max_delay_s: float = 0.25,
+        queue_size: int = 10000,
+    ):
+        self.path = path
+        self.max_rows = max(1, int(max_rows))
+        self.max_delay_s = max(0.001, float(max_delay_s))
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        # Counters (rows unless stated otherwise)
+        self._submitted = 0
+        self._written = 0
+        self._dropped = 0
+        self._batches = 0
+        self._errors = 0
+        self._queue_high_water = 0
+        self._last_batch_rows = 0
+        self._last_commit_ms: float | None = None
+        self._max_commit_ms = 0.0
+        self._last_commit_ts: float | None = None
+        self._commit_latency = LatencyHistogram()
+
+    # ---------------- Lifecycle -----------------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until everything submitted so far is committed."""
+        if not self.running:
+            return False
+        marker = _Flush()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending rows and stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        if thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                _LOGGER.warning("[persist] writer queue full on close; pending rows lost")
+            thread.join(timeout)
+        self._thread = None
+
+    # ---------------- Producer side -----------------
+    def submit(self, sql: str, rows: Sequence[tuple]) -> bool:
+        """Enqueue rows for `sql` without blocking; returns False when dropped."""
+        if not rows:
+            return True
+        n = len(rows)
+        try:
+            self._queue.put_nowait((sql, rows))
+        except queue.Full:
+            with self._lock:
+                self._dropped += n
+            return False
+        with self._lock:
+            self._submitted += n
+            depth = self._queue.qsize()
+            if depth > self._queue_high_water:
+                self._queue_high_water = depth
+        return True
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "submitted_rows": self._submitted,
+                "written_rows": self._written,
+                "dropped_rows": self._dropped,
+                "batches": self._batches,
+                "errors": self._errors,
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "queue_high_water": self._queue_high_water,
+                "last_batch_rows": self._last_batch_rows,
+                "last_commit_ms": self._last_commit_ms,
+                "max_commit_ms": round(self._max_commit_ms, 3),
+                "last_commit_ts": self._last_commit_ts,
+                "commit_latency": self._commit_latency.snapshot(),
+                "max_rows": self.max_rows,
+                "max_delay_s": self.max_delay_s,
+            }
+
+    # ---------------- Writer thread -----------------
+    def _connect(self) -> sqlite3.Connection:
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _commit(self, conn: sqlite3.Connection, pending: dict[str, list[tuple]], n: int) -> None:
+        if not pending:
+            return
+        start = time.perf_counter()
+        try:
+            with conn:  # one transaction per batch
+                for sql, rows in pending.items():
+                    conn.executemany(sql, rows)
+            ok = True
+        except Exception as e:  # pragma: no cover - disk / schema failures
+            ok = False
+            _LOGGER.warning("[persist] batch commit failed rows=%d err=%s", n, e)
+        elapsed = time.perf_counter() - start
+        elapsed_ms = elapsed * 1000.0
+        with self._lock:
+            self._commit_latency.record(elapsed)
+            self._batches += 1
+            self._last_batch_rows = n
+            self._last_commit_ms = round(elapsed_ms, 3)
+            self._max_commit_ms = max(self._max_commit_ms, elapsed_ms)
+            self._last_commit_ts = time.time()
+            if ok:
+                self._written += n
+            else:
+                self._errors += 1
+        pending.clear()
+
+    def _run(self) -> None:
+        try:
+            conn = self._connect()
+        except Exception as e:  # pragma: no cover
+            _LOGGER.error("[persist] writer failed to open %s: %s", self.path, e)
+            return
+        pending: dict[str, list[tuple]] = {}
+        n_pending = 0
+        deadline: float | None = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    self._commit(conn, pending, n_pending)
+                    break
+                if isinstance(item, _Flush):
+                    self._commit(conn, pending, n_pending)
+                    n_pending, deadline = 0, None
+                    item.done.set()
+                    continue
+                if item is not None:
+                    sql, rows = item
+                    pending.setdefault(sql, []).extend(rows)
+                    n_pending += len(rows)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.max_delay_s
+                if n_pending and (
+                    n_pending >= self.max_rows
+                    or (deadline is not None and time.monotonic() >= deadline)
+                ):
+                    self._commit(conn, pending, n_pending)
+                    n_pending, deadline = 0, None
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
@@ -0,0 +1,73 @@
+"""Range queries over persisted standings (`standings_snapshots`).
+
+Fallback for `core.standings_history` when a question reaches further back
+than the in-memory window. Both queries are index-backed: the state at time T
+walks the (ts, car_idx) primary key, a pair's gap history the (car_idx, ts)
+index the ingestor creates. Databases written before the gap columns were
+added return None gaps.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+_GAP_COLUMNS = ("gap_leader_s", "gap_ahead_s")
+
+
+def connect_ro(sqlite_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{sqlite_path}?mode=ro", uri=True)
+
+
+def _gap_select(conn: sqlite3.Connection) -> str:
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(standings_snapshots)")}
+    return ", ".join(c if c in cols else f"NULL AS {c}" for c in _GAP_COLUMNS)
+
+
+def standings_at(
+    conn: sqlite3.Connection, ts: float
+) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+    """(snapshot ts, rows ordered by position) of the newest snapshot at or before `ts`."""
+    row = conn.execute("SELECT MAX(ts) FROM standings_snapshots WHERE ts <= ?", (ts,)).fetchone()
+    if row is None or row[0] is None:
+        return None
+    snap_ts = float(row[0])
+    sql = (
+        f"SELECT car_idx, position, lap, {_gap_select(conn)}, last_lap_s, car_number, driver "
+        "FROM standings_snapshots WHERE ts = ? ORDER BY position IS NULL, position, car_idx"
+    )
+    rows = [
+        {
+            "car_idx": car_idx,
+            "position": position,
+            "lap": lap,
+            "gap_leader_s": gap_leader,
+            "gap_ahead_s": gap_ahead,
+            "last_lap_s": last_lap,
+            "car_number": car_number,
+            "name": driver,
+        }
+        for car_idx, position, lap, gap_leader, gap_ahead, last_lap, car_number, driver in (
+            conn.execute(sql, (snap_ts,))
+        )
+    ]
+    return snap_ts, rows
+
+
+def gap_series(
+    conn: sqlite3.Connection, car_a: int, car_b: int, start: float, end: float
+) -> List[Tuple[float, Optional[float], Optional[int], Optional[int]]]:
+    """(ts, gap of B behind A in s, pos A, pos B) for snapshots in [start, end] with both cars."""
+    sql = (
+        f"SELECT ts, car_idx, position, {_gap_select(conn)} FROM standings_snapshots "
+        "WHERE car_idx = ? AND ts BETWEEN ? AND ? ORDER BY ts"
+    )
+    a = {ts: (pos, gap) for ts, _, pos, gap, _ in conn.execute(sql, (car_a, start, end))}
+    out: List[Tuple[float, Optional[float], Optional[int], Optional[int]]] = []
+    for ts, _, pos_b, gap_b, _ in conn.execute(sql, (car_b, start, end)):
+        if ts not in a:
+            continue
+        pos_a, gap_a = a[ts]
+        gap = round(gap_b - gap_a, 3) if gap_a is not None and gap_b is not None else None
+        out.append((float(ts), gap, pos_a, pos_b))
+    return out
@@ -0,0 +1,176 @@
+"""Warm restore of the StateCache from the local SQLite snapshot tables.
+
+On boot the cache is empty until NATS / JetStream catch-up delivers the next
+frame of every subject. The ingestor already persists the last known session,
+session state, standings and track conditions, so `restore_state_cache` loads
+the newest row of each into the cache before the listener connects. Lap timing
+is not persisted on its own; it is rebuilt from the restored standings rows
+that carry a ``best_lap_s``.
+
+Restored domains are marked in the cache (`StateCache.mark_restored`): replayed
+frames older than the restored snapshot are ignored, and the first frame that
+is not older replaces it, so live data always wins by timestamp.
+
+Snapshots older than ``max_age_s`` (`Settings.warm_restore_max_age_s`) are not
+restored: after a long outage they describe a session that has ended, and
+serving them as current would be worse than an empty cache. Rows without a
+timestamp have no known age and are skipped too while the limit is on.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any
+
+from sim_racecenter_agent.logging import get_logger
+from ..core.models import session_roster
+from ..core.state_cache import StateCache
+
+_LOGGER = get_logger(__name__)
+
+_LATEST_SQL = "SELECT ts, data FROM {table} ORDER BY ts DESC, rowid DESC LIMIT 1"
+_STANDINGS_SQL = (
+    "SELECT car_idx, position, car_number, driver, last_lap_s, best_lap_s, lap "
+    "FROM standings_snapshots WHERE ts = ? ORDER BY position IS NULL, position, car_idx"
+)
+
+
+def _latest(conn: sqlite3.Connection, table: str) -> tuple[float, dict] | None:
+    row = conn.execute(_LATEST_SQL.format(table=table)).fetchone()
+    if row is None:
+        return None
+    data = json.loads(row[1])
+    return (float(row[0] or 0.0), data) if isinstance(data, dict) else None
+
+
+def _apply_session(cache: StateCache, ts: float, data: dict) -> int:
+    roster = session_roster(data)
+    if roster:
+        cache.update_roster(roster)
+    return len(roster)
+
+
+def _apply_session_state(cache: StateCache, ts: float, data: dict) -> int:
+    cache.set_session_state(data)
+    cache.mark_restored("session_state", ts)
+    return 1
+
+
+def _apply_track_conditions(cache: StateCache, ts: float, data: dict) -> int:
+    cache.set_track_conditions(data)
+    cache.mark_restored("track_conditions", ts)
+    return 1
+
+
+# (domain, table, apply) for the tables that store one JSON payload per row
+_JSON_SNAPSHOTS = (
+    ("session", "session_snapshots", _apply_session),
+    ("session_state", "session_state_snapshots", _apply_session_state),
+    ("track_conditions", "track_conditions_snapshots", _apply_track_conditions),
+)
+
+
+def _expired(domain: str, ts: float, cutoff: float | None, skipped: dict[str, Any]) -> bool:
+    """True (and recorded in `skipped`) when a snapshot at `ts` is older than `cutoff`."""
+    if cutoff is None or ts >= cutoff:
+        return False
+    skipped[domain] = {"ts": ts, "age_s": round(time.time() - ts, 1) if ts > 0 else None}
+    return True
+
+
+def _restore_standings(
+    conn: sqlite3.Connection, cache: StateCache, cutoff: float | None, skipped: dict[str, Any]
+) -> dict[str, Any]:
+    ts = conn.execute("SELECT MAX(ts) FROM standings_snapshots").fetchone()[0]
+    if ts is None or _expired("standings", float(ts), cutoff, skipped):
+        return {}
+    cars: list[dict] = []
+    timing: list[dict] = []
+    for car_idx, position, car_number, driver, last_lap_s, best_lap_s, lap in conn.execute(
+        _STANDINGS_SQL, (ts,)
+    ):
+        cars.append(
+            {
+                "car_idx": car_idx,
+                "position": position,
+                "pos": position,
+                "car_number": car_number,
+                "driver": driver,
+                "last_lap_s": last_lap_s,
+                "best_lap_s": best_lap_s,
+                "lap": lap,
+            }
+        )
+        # Rows without a best lap would hide the tools' standings fallback
+        if best_lap_s is not None:
+            timing.append(
+                {"car_idx": car_idx, "lap": lap, "last_lap_s": last_lap_s, "best_lap_s": best_lap_s}
+            )
+    out: dict[str, Any] = {}
+    if cars:
+        cache.set_standings(ts, cars)
+        cache.mark_restored("standings", ts)
+        out["standings"] = {"ts": ts, "rows": len(cars)}
+    if timing:
+        cache.set_lap_timing(ts, timing)
+        cache.mark_restored("lap_timing", ts)
+        out["lap_timing"] = {"ts": ts, "rows": len(timing), "source": "standings"}
+    return out
+
+
+def restore_state_cache(
+    cache: StateCache, sqlite_path: str, max_age_s: float = 0.0
+) -> dict[str, Any]:
+    """Load the newest persisted snapshots into `cache`; returns a summary.
+
+    Snapshots older than `max_age_s` seconds (0 = no limit) are listed under
+    ``skipped`` instead. Never raises: a missing database or a failing table is
+    reported in the summary and the remaining tables are still restored.
+    """
+    t0 = time.perf_counter()
+    cutoff = time.time() - max_age_s if max_age_s > 0 else None
+    result: dict[str, Any] = {
+        "sqlite_path": sqlite_path,
+        "restored": {},
+        "skipped": {},
+        "errors": {},
+    }
+    if not os.path.exists(sqlite_path):
+        result["errors"]["sqlite"] = "sqlite_missing"
+        result["elapsed_ms"] = round((time.perf_counter() - t0) * 1e3, 3)
+        return result
+    restored: dict[str, Any] = result["restored"]
+    skipped: dict[str, Any] = result["skipped"]
+    try:
+        # Read-only: never create the file or contend with the writer's schema setup
+        conn = sqlite3.connect(f"file:{sqlite_path}?mode=ro", uri=True)
+    except sqlite3.Error as e:
+        result["errors"]["sqlite"] = f"sqlite_open_failed:{e}"
+        result["elapsed_ms"] = round((time.perf_counter() - t0) * 1e3, 3)
+        return result
+    try:
+        for domain, table, apply in _JSON_SNAPSHOTS:
+            try:
+                latest = _latest(conn, table)
+                if latest is not None and not _expired(domain, latest[0], cutoff, skipped):
+                    restored[domain] = {"ts": latest[0], "rows": apply(cache, *latest)}
+            except Exception as e:
+                result["errors"][domain] = str(e)
+        try:
+            restored.update(_restore_standings(conn, cache, cutoff, skipped))
+        except Exception as e:
+            result["errors"]["standings"] = str(e)
+    finally:
+        conn.close()
+    result["elapsed_ms"] = round((time.perf_counter() - t0) * 1e3, 3)
+    _LOGGER.info(
+        "[restore] warm restore domains=%s stale=%s errors=%d in %.1fms",
+        ",".join(sorted(restored)) or "-",
+        ",".join(sorted(skipped)) or "-",
+        len(result["errors"]),
+        result["elapsed_ms"],
+    )
+    return result
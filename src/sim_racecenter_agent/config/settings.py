@@ -29,6 +29,36 @@ class Settings(BaseModel):
     mcp_stdio_only: bool = Field(default=False)
     snapshot_pos_history: int = Field(default=900)
     incident_ring_size: int = Field(default=300)
+    # Laps of history kept per car and the rolling window for pace statistics
+    pace_history_laps: int = Field(default=50)
+    pace_window: int = Field(default=5)
+    # Overtake / position-change events kept in memory; optionally persisted to SQLite
+    position_change_ring_size: int = Field(default=500)
+    enable_position_change_persist: bool = Field(default=True)
+    # Seconds of standings frames kept in memory for time-travel queries (older: SQLite)
+    standings_history_s: float = Field(default=1800.0)
+    # Standings samples per adjacent pair in the gap trend (closing rate) regression
+    gap_trend_samples: int = Field(default=60)
+    # Cache TTLs (s, 0 = never expire) for entries not refreshed, and the sweep period
+    telemetry_ttl_s: float = Field(default=60.0)
+    stint_ttl_s: float = Field(default=900.0)
+    names_ttl_s: float = Field(default=3600.0)
+    cache_sweep_interval_s: float = Field(default=15.0)
+    # Per-session cache shards fed from `<subject>.<session>` subjects (tools take `session`)
+    enable_session_shards: bool = Field(default=False)
+    max_sessions: int = Field(default=8)
+    session_idle_ttl_s: float = Field(default=1800.0)
+    # Worker threads for blocking (SQLite) tools: per-tool concurrency, queue and timeout
+    tool_pool_workers: int = Field(default=4)
+    tool_pool_concurrency: int = Field(default=2)
+    tool_pool_queue_limit: int = Field(default=32)
+    tool_pool_timeout_s: float = Field(default=10.0)
+    # Read-only SQLite connections kept open per DB for the search tools, and their pragmas
+    sqlite_read_pool_size: int = Field(default=4)
+    sqlite_read_mmap_mb: int = Field(default=256)
+    sqlite_read_cache_mb: int = Field(default=16)
+    # Responses kept per cache for snapshot-style tools, reused until their domains change (0 = off)
+    response_cache_size: int = Field(default=256)
     # Feature flags for extended subjects
     enable_extended_standings: bool = Field(default=True)
     enable_session_state: bool = Field(default=True)
@@ -43,6 +73,8 @@ class Settings(BaseModel):
     chat_stream: str = Field(default="YOUTUBE_CHAT")
     chat_durable: str = Field(default="director_chat")
     chat_pull_batch: int = Field(default=100)
+    # Upper bound for the backlog-adaptive chat fetch size
+    chat_pull_batch_max: int = Field(default=1000)
     chat_pull_interval: float = Field(default=0.5)
     # JetStream catch-up
     enable_jetstream_catchup: bool = Field(default=True)
@@ -55,6 +87,29 @@ class Settings(BaseModel):
     catchup_max_standings: int = Field(default=5)
     catchup_max_lap_timing: int = Field(default=5)
     catchup_max_track_conditions: int = Field(default=3)
+    # Catch-up start point: last_n | since_ts | since_seq (catchup_max_* caps every mode)
+    catchup_mode: str = Field(default="last_n")
+    catchup_since_ts: float = Field(default=0.0)  # epoch seconds; 0 -> now - lookback
+    catchup_lookback_s: float = Field(default=900.0)
+    catchup_since_seq: int = Field(default=0)
+    catchup_fetch_batch: int = Field(default=256)
+    # Resume from per-subject checkpoints (kept in memory, persisted to SQLite)
+    catchup_resume: bool = Field(default=True)
+    catchup_resume_skew_s: float = Field(default=2.0)
+    checkpoint_interval_s: float = Field(default=5.0)
+    # Apply only the newest pending frame of full-state snapshot subjects
+    enable_coalescing: bool = Field(default=True)
+    # Load the newest SQLite snapshots into the cache before NATS connects
+    enable_warm_restore: bool = Field(default=True)
+    # ...but not snapshots older than this many seconds (0 = no limit)
+    warm_restore_max_age_s: float = Field(default=3600.0)
+    # Schema validation of ingested payloads: full | sampled (1-in-N full) | off (type guards)
+    validation_mode: str = Field(default="full")
+    validation_sample_every: int = Field(default=10)
+    # Snapshot persistence (write-behind thread): commit every N rows or T seconds
+    persist_batch_rows: int = Field(default=500)
+    persist_flush_interval: float = Field(default=0.25)
+    persist_queue_size: int = Field(default=10000)
     # LLM models (planner + answer). Mode B is the only mode now.
     llm_planner_model: str = Field(default="gemini-2.5-flash")
     llm_answer_model: str = Field(default="gemini-2.5-flash")
@@ -111,6 +166,62 @@ def get_settings() -> Settings:
         incident_ring_size=int(
             os.environ.get("INCIDENT_RING_SIZE", data.get("incident_ring_size", 300))
         ),
+        pace_history_laps=int(
+            os.environ.get("PACE_HISTORY_LAPS", data.get("pace_history_laps", 50))
+        ),
+        pace_window=int(os.environ.get("PACE_WINDOW", data.get("pace_window", 5))),
+        position_change_ring_size=int(
+            os.environ.get("POSITION_CHANGE_RING_SIZE", data.get("position_change_ring_size", 500))
+        ),
+        enable_position_change_persist=os.environ.get(
+            "ENABLE_POSITION_CHANGE_PERSIST",
+            str(int(data.get("enable_position_change_persist", True))),
+        )
+        == "1",
+        standings_history_s=float(
+            os.environ.get("STANDINGS_HISTORY_S", data.get("standings_history_s", 1800.0))
+        ),
+        gap_trend_samples=int(
+            os.environ.get("GAP_TREND_SAMPLES", data.get("gap_trend_samples", 60))
+        ),
+        telemetry_ttl_s=float(os.environ.get("TELEMETRY_TTL_S", data.get("telemetry_ttl_s", 60.0))),
+        stint_ttl_s=float(os.environ.get("STINT_TTL_S", data.get("stint_ttl_s", 900.0))),
+        names_ttl_s=float(os.environ.get("NAMES_TTL_S", data.get("names_ttl_s", 3600.0))),
+        cache_sweep_interval_s=float(
+            os.environ.get("CACHE_SWEEP_INTERVAL_S", data.get("cache_sweep_interval_s", 15.0))
+        ),
+        enable_session_shards=os.environ.get(
+            "ENABLE_SESSION_SHARDS", str(int(data.get("enable_session_shards", False)))
+        )
+        == "1",
+        max_sessions=int(os.environ.get("MAX_SESSIONS", data.get("max_sessions", 8))),
+        session_idle_ttl_s=float(
+            os.environ.get("SESSION_IDLE_TTL_S", data.get("session_idle_ttl_s", 1800.0))
+        ),
+        tool_pool_workers=int(
+            os.environ.get("TOOL_POOL_WORKERS", data.get("tool_pool_workers", 4))
+        ),
+        tool_pool_concurrency=int(
+            os.environ.get("TOOL_POOL_CONCURRENCY", data.get("tool_pool_concurrency", 2))
+        ),
+        tool_pool_queue_limit=int(
+            os.environ.get("TOOL_POOL_QUEUE_LIMIT", data.get("tool_pool_queue_limit", 32))
+        ),
+        tool_pool_timeout_s=float(
+            os.environ.get("TOOL_POOL_TIMEOUT_S", data.get("tool_pool_timeout_s", 10.0))
+        ),
+        sqlite_read_pool_size=int(
+            os.environ.get("SQLITE_READ_POOL_SIZE", data.get("sqlite_read_pool_size", 4))
+        ),
+        sqlite_read_mmap_mb=int(
+            os.environ.get("SQLITE_READ_MMAP_MB", data.get("sqlite_read_mmap_mb", 256))
+        ),
+        sqlite_read_cache_mb=int(
+            os.environ.get("SQLITE_READ_CACHE_MB", data.get("sqlite_read_cache_mb", 16))
+        ),
+        response_cache_size=int(
+            os.environ.get("RESPONSE_CACHE_SIZE", data.get("response_cache_size", 256))
+        ),
         enable_extended_standings=os.environ.get(
             "ENABLE_EXTENDED_STANDINGS", str(int(data.get("enable_extended_standings", True)))
         )
@@ -146,6 +257,9 @@ def get_settings() -> Settings:
         chat_stream=os.environ.get("CHAT_STREAM", data.get("chat_stream", "YOUTUBE_CHAT")),
         chat_durable=os.environ.get("CHAT_DURABLE", data.get("chat_durable", "director_chat")),
         chat_pull_batch=int(os.environ.get("CHAT_PULL_BATCH", data.get("chat_pull_batch", 100))),
+        chat_pull_batch_max=int(
+            os.environ.get("CHAT_PULL_BATCH_MAX", data.get("chat_pull_batch_max", 1000))
+        ),
         chat_pull_interval=float(
             os.environ.get("CHAT_PULL_INTERVAL", data.get("chat_pull_interval", 0.5))
         ),
@@ -177,6 +291,51 @@ def get_settings() -> Settings:
                 "CATCHUP_MAX_TRACK_CONDITIONS", data.get("catchup_max_track_conditions", 3)
             )
         ),
+        catchup_mode=os.environ.get("CATCHUP_MODE", data.get("catchup_mode", "last_n")),
+        catchup_since_ts=float(
+            os.environ.get("CATCHUP_SINCE_TS", data.get("catchup_since_ts", 0.0))
+        ),
+        catchup_lookback_s=float(
+            os.environ.get("CATCHUP_LOOKBACK_S", data.get("catchup_lookback_s", 900.0))
+        ),
+        catchup_since_seq=int(
+            os.environ.get("CATCHUP_SINCE_SEQ", data.get("catchup_since_seq", 0))
+        ),
+        catchup_fetch_batch=int(
+            os.environ.get("CATCHUP_FETCH_BATCH", data.get("catchup_fetch_batch", 256))
+        ),
+        catchup_resume=os.environ.get("CATCHUP_RESUME", str(int(data.get("catchup_resume", True))))
+        == "1",
+        catchup_resume_skew_s=float(
+            os.environ.get("CATCHUP_RESUME_SKEW_S", data.get("catchup_resume_skew_s", 2.0))
+        ),
+        checkpoint_interval_s=float(
+            os.environ.get("CHECKPOINT_INTERVAL_S", data.get("checkpoint_interval_s", 5.0))
+        ),
+        enable_coalescing=os.environ.get(
+            "ENABLE_COALESCING", str(int(data.get("enable_coalescing", True)))
+        )
+        == "1",
+        enable_warm_restore=os.environ.get(
+            "ENABLE_WARM_RESTORE", str(int(data.get("enable_warm_restore", True)))
+        )
+        == "1",
+        warm_restore_max_age_s=float(
+            os.environ.get("WARM_RESTORE_MAX_AGE_S", data.get("warm_restore_max_age_s", 3600.0))
+        ),
+        validation_mode=os.environ.get("VALIDATION_MODE", data.get("validation_mode", "full")),
+        validation_sample_every=int(
+            os.environ.get("VALIDATION_SAMPLE_EVERY", data.get("validation_sample_every", 10))
+        ),
+        persist_batch_rows=int(
+            os.environ.get("PERSIST_BATCH_ROWS", data.get("persist_batch_rows", 500))
+        ),
+        persist_flush_interval=float(
+            os.environ.get("PERSIST_FLUSH_INTERVAL", data.get("persist_flush_interval", 0.25))
+        ),
+        persist_queue_size=int(
+            os.environ.get("PERSIST_QUEUE_SIZE", data.get("persist_queue_size", 10000))
+        ),
         llm_planner_model=os.environ.get(
             "LLM_PLANNER_MODEL", data.get("llm_planner_model", "gemini-2.5-flash")
         ),
@@ -0,0 +1,209 @@
+"""Columnar per-car state indexed by ``car_idx``.
+
+`StateCache` keeps the standings / lap timing / stint payloads as dicts for
+tools that return them verbatim; `CarTable` mirrors their numeric fields into
+fixed-capacity float64 arrays (NaN = missing) so whole-field queries (rank by
+best lap, filter by gap, ...) are a handful of NumPy operations instead of a
+Python loop with per-row type checks.
+
+Each source has its own validity mask (``standings``, ``lap_timing``,
+``stint``); loading a full-state frame (standings, lap timing) replaces its
+columns and mask in one scatter, a stint update touches one row. Arrays are
+updated in place, so readers should finish with them before yielding to the
+event loop.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+
+_NAN = float("nan")
+
+# source -> ((column, payload key), ...)
+GROUPS: dict[str, tuple[tuple[str, str], ...]] = {
+    "standings": (
+        ("position", "pos"),  # schema field; the ingestor adds 'position' alongside
+        ("class_pos", "class_pos"),
+        ("lap", "lap"),
+        ("gap_leader_s", "gap_leader_s"),
+        ("gap_ahead_s", "gap_ahead_s"),
+        ("last_lap_s", "last_lap_s"),
+    ),
+    "lap_timing": (
+        ("timing_lap", "lap"),
+        ("timing_last_lap_s", "last_lap_s"),
+        ("best_lap_s", "best_lap_s"),
+        ("current_lap_time_s", "current_lap_time_s"),
+        ("delta_best_s", "delta_best_s"),
+    ),
+    "stint": (
+        ("stint_lap", "lap"),
+        ("fuel_level_l", "fuel_level_l"),
+        ("fuel_pct", "fuel_pct"),
+        ("avg_fuel_lap_l", "avg_fuel_lap_l"),
+        ("est_laps_remaining", "est_laps_remaining"),
+        ("stint_laps", "stint_laps"),
+    ),
+}
+INT_COLUMNS = frozenset({"position", "class_pos", "lap", "timing_lap", "stint_lap", "stint_laps"})
+
+DEFAULT_CAPACITY = 64  # iRacing car_idx range
+_MAX_CAR_IDX = 1023  # larger indexes are ignored rather than grown into
+
+
+def _car_idx(row: Any) -> int | None:
+    if not isinstance(row, dict):
+        return None
+    idx = row.get("car_idx")
+    if isinstance(idx, int) and not isinstance(idx, bool) and 0 <= idx <= _MAX_CAR_IDX:
+        return idx
+    return None
+
+
+def _number(v: Any) -> float:
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return v
+    return _NAN
+
+
+def _frame(rows: list[dict], keys: list[str]) -> np.ndarray:
+    """(len(rows) x len(keys)) float64 array; missing / non-numeric values become NaN."""
+    count = len(rows) * len(keys)
+    try:
+        flat = np.fromiter(
+            (_NAN if (v := r.get(k)) is None else v for r in rows for k in keys),
+            dtype=np.float64,
+            count=count,
+        )
+    except (TypeError, ValueError):
+        flat = np.fromiter(
+            (_number(r.get(k)) for r in rows for k in keys), dtype=np.float64, count=count
+        )
+    return flat.reshape(len(rows), len(keys))
+
+
+class CarTable:
+    """Fixed-capacity NumPy columns indexed by car_idx, one validity mask per source."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = max(1, int(capacity))
+        # One (fields x capacity) block per source; columns are row views into it
+        self._blocks: dict[str, np.ndarray] = {
+            group: np.full((len(fields), self.capacity), np.nan) for group, fields in GROUPS.items()
+        }
+        self._masks: dict[str, np.ndarray] = {
+            group: np.zeros(self.capacity, dtype=bool) for group in GROUPS
+        }
+        self._columns: dict[str, np.ndarray] = {}
+        self._bind_columns()
+
+    def _bind_columns(self) -> None:
+        for group, fields in GROUPS.items():
+            block = self._blocks[group]
+            for row, (col, _) in enumerate(fields):
+                self._columns[col] = block[row]
+
+    def _grow(self, max_idx: int) -> None:
+        if max_idx < self.capacity:
+            return
+        new_cap = self.capacity
+        while new_cap <= max_idx:
+            new_cap *= 2
+        for group, block in self._blocks.items():
+            grown = np.full((block.shape[0], new_cap), np.nan)
+            grown[:, : self.capacity] = block
+            self._blocks[group] = grown
+            grown_mask = np.zeros(new_cap, dtype=bool)
+            grown_mask[: self.capacity] = self._masks[group]
+            self._masks[group] = grown_mask
+        self.capacity = new_cap
+        self._bind_columns()
+
+    # ---- Writes ----
+    def load(self, group: str, rows: Iterable[dict]) -> int:
+        """Replace every column of `group` with `rows`; returns the number of cars loaded."""
+        keys = [key for _, key in GROUPS[group]]
+        ids: list[int] = []
+        kept: list[dict] = []
+        for r in rows:
+            idx = _car_idx(r)
+            if idx is not None:
+                ids.append(idx)
+                kept.append(r)
+        if ids:
+            self._grow(max(ids))
+        block = self._blocks[group]
+        mask = self._masks[group]
+        block.fill(np.nan)
+        mask.fill(False)
+        if not ids:
+            return 0
+        # One conversion for the whole (cars x fields) frame, one scatter into the block
+        block[:, ids] = _frame(kept, keys).T
+        mask[ids] = True
+        return len(ids)
+
+    def load_standings(self, cars: Iterable[dict]) -> int:
+        return self.load("standings", cars)
+
+    def load_lap_timing(self, cars: Iterable[dict]) -> int:
+        return self.load("lap_timing", cars)
+
+    def update_stint(self, car_idx: int, payload: dict) -> None:
+        if _car_idx({"car_idx": car_idx}) is None:
+            return
+        self._grow(car_idx)
+        for col, key in GROUPS["stint"]:
+            self._columns[col][car_idx] = _number(payload.get(key))
+        self._masks["stint"][car_idx] = True
+
+    def drop(self, group: str, car_idx: int) -> None:
+        """Clear one car's row of `group` (e.g. an evicted stint)."""
+        if 0 <= car_idx < self.capacity:
+            self._blocks[group][:, car_idx] = np.nan
+            self._masks[group][car_idx] = False
+
+    # ---- Reads ----
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def mask(self, group: str) -> np.ndarray:
+        return self._masks[group]
+
+    def count(self, group: str) -> int:
+        return int(self._masks[group].sum())
+
+    def value(self, name: str, car_idx: int) -> int | float | None:
+        """Python scalar for JSON output (None for missing)."""
+        v = self._columns[name][car_idx]
+        if np.isnan(v):
+            return None
+        return int(v) if name in INT_COLUMNS else float(v)
+
+    def ranked(self, name: str, group: str, positive: bool = False) -> np.ndarray:
+        """car_idx of `group` rows with a value for `name`, ascending (ties by car_idx)."""
+        col = self._columns[name]
+        sel = self._masks[group] & ~np.isnan(col)
+        if positive:
+            sel &= col > 0
+        idx = np.flatnonzero(sel)
+        return idx[np.argsort(col[idx], kind="stable")]
+
+    def close_pairs(self, max_gap_s: float) -> list[tuple[int, int, float]]:
+        """(car_idx, car_ahead_idx, gap_ahead_s) for cars within `max_gap_s` of the car ahead."""
+        pos = self._columns["position"]
+        gap = self._columns["gap_ahead_s"]
+        cars = np.flatnonzero(self._masks["standings"] & ~np.isnan(pos))
+        if cars.size < 2:
+            return []
+        cars = cars[np.argsort(pos[cars], kind="stable")]
+        gaps = gap[cars[1:]]
+        close = np.flatnonzero((gaps > 0) & (gaps <= max_gap_s))
+        return [(int(cars[i + 1]), int(cars[i]), float(gaps[i])) for i in close]
+
+    def nbytes(self) -> int:
+        return sum(b.nbytes for b in self._blocks.values()) + sum(
+            m.nbytes for m in self._masks.values()
+        )
@@ -0,0 +1,254 @@
+"""Gap trend per adjacent car pair, fed by standings ``gap_ahead_s``.
+
+Every car with a car directly ahead of it in the running order forms a pair
+(row = trailing car's ``car_idx``). Each row keeps the last ``window``
+(timestamp, gap) samples in a ring plus running sums, so adding a sample and
+dropping the oldest one keeps an ordinary least-squares fit of gap over time
+current in O(1); all rows are updated together with NumPy on every frame.
+
+A row restarts whenever the car ahead changes (a pass, a pit stop), so a
+trend always describes one pair. The slope (s of gap per s) times the trailing
+car's last lap time is the closing rate in s/lap (positive = closing), and
+gap / closing rate the laps until it catches up. Ranking the whole field is a
+mask + argsort over the rows.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .car_table import DEFAULT_CAPACITY, _MAX_CAR_IDX, _frame
+
+_KEYS = ["pos", "gap_ahead_s", "last_lap_s", "lap"]
+SORT_KEYS = ("gap", "closing")
+STABLE_S_PER_LAP = 0.05  # |closing rate| below this is reported as "stable"
+
+
+class GapTracker:
+    """Rolling gap regression for every adjacent pair, indexed by the trailing car."""
+
+    def __init__(self, window: int = 60, capacity: int = DEFAULT_CAPACITY):
+        self.window = max(2, int(window))
+        self.capacity = max(1, int(capacity))
+        self._origin: Optional[float] = None  # timestamps are stored relative to this
+        self._last_ts: Optional[float] = None
+        self.frames = 0
+        self._alloc(self.capacity)
+
+    def _alloc(self, capacity: int) -> None:
+        self.ahead = np.full(capacity, -1, dtype=np.int64)
+        self.n = np.zeros(capacity, dtype=np.int64)
+        self._head = np.zeros(capacity, dtype=np.int64)
+        self._xs = np.zeros((capacity, self.window))
+        self._ys = np.zeros((capacity, self.window))
+        self._sx = np.zeros(capacity)
+        self._sy = np.zeros(capacity)
+        self._sxx = np.zeros(capacity)
+        self._sxy = np.zeros(capacity)
+        # Latest frame values per trailing car (NaN when not in the last frame)
+        self.gap = np.full(capacity, np.nan)
+        self.lap_time = np.full(capacity, np.nan)
+        self.lap = np.full(capacity, np.nan)
+        self.position = np.full(capacity, np.nan)
+
+    def _grow(self, max_idx: int) -> None:
+        if max_idx < self.capacity:
+            return
+        old = {name: getattr(self, name) for name in self._arrays()}
+        new_cap = self.capacity
+        while new_cap <= max_idx:
+            new_cap *= 2
+        self._alloc(new_cap)
+        for name, arr in old.items():
+            getattr(self, name)[: self.capacity] = arr
+        self.capacity = new_cap
+
+    @staticmethod
+    def _arrays() -> tuple[str, ...]:
+        return (
+            "ahead",
+            "n",
+            "_head",
+            "_xs",
+            "_ys",
+            "_sx",
+            "_sy",
+            "_sxx",
+            "_sxy",
+            "gap",
+            "lap_time",
+            "lap",
+            "position",
+        )
+
+    def _clear(self, rows: np.ndarray) -> None:
+        self.n[rows] = 0
+        self._head[rows] = 0
+        for arr in (self._sx, self._sy, self._sxx, self._sxy):
+            arr[rows] = 0.0
+
+    # ---- Writes ----
+    def observe(self, timestamp: Any, cars: Iterable[dict]) -> int:
+        """Add one standings frame; returns the number of pairs that got a sample."""
+        if not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool):
+            return 0
+        ts = float(timestamp)
+        if self._last_ts is not None and ts <= self._last_ts:
+            return 0
+        ids: List[int] = []
+        kept: List[dict] = []
+        for c in cars:
+            idx = c.get("car_idx")
+            if isinstance(idx, int) and not isinstance(idx, bool) and 0 <= idx <= _MAX_CAR_IDX:
+                ids.append(idx)
+                kept.append(c)
+        self._last_ts = ts
+        self.frames += 1
+        if self._origin is None:
+            self._origin = ts
+        if ids:
+            self._grow(max(ids))
+        frame = _frame(kept, _KEYS) if ids else np.empty((0, len(_KEYS)))
+        car = np.asarray(ids, dtype=np.int64)
+        pos, gap, lap_time, lap = frame.T
+
+        # Car directly ahead by position (positions are 1-based and may have holes)
+        ahead = np.full(car.size, -1, dtype=np.int64)
+        ok = ~np.isnan(pos) & (pos >= 1)
+        if ok.any():
+            p = pos[ok].astype(np.int64)
+            by_pos = np.full(int(p.max()) + 1, -1, dtype=np.int64)
+            by_pos[p] = car[ok]
+            ahead[ok] = by_pos[p - 1]
+
+        present = np.zeros(self.capacity, dtype=bool)
+        present[car] = True
+        # Rows whose car left the frame or whose car ahead changed restart
+        changed = np.flatnonzero(~present & (self.ahead >= 0))
+        self.ahead[changed] = -1
+        self._clear(changed)
+        self.gap[~present] = np.nan
+        self.position[~present] = np.nan
+        switched = car[self.ahead[car] != ahead]
+        self._clear(switched)
+        self.ahead[car] = ahead
+        self.gap[car] = gap
+        self.lap_time[car] = lap_time
+        self.lap[car] = lap
+        self.position[car] = pos
+
+        valid = (ahead >= 0) & ~np.isnan(gap) & (gap >= 0)
+        rows = car[valid]
+        if not rows.size:
+            return 0
+        x = ts - self._origin
+        y = gap[valid]
+        # Drop the oldest sample of full rings, then write the new one at the head
+        full = rows[self.n[rows] == self.window]
+        if full.size:
+            h = self._head[full]
+            ox, oy = self._xs[full, h], self._ys[full, h]
+            self._sx[full] -= ox
+            self._sy[full] -= oy
+            self._sxx[full] -= ox * ox
+            self._sxy[full] -= ox * oy
+        h = self._head[rows]
+        self._xs[rows, h] = x
+        self._ys[rows, h] = y
+        self._sx[rows] += x
+        self._sy[rows] += y
+        self._sxx[rows] += x * x
+        self._sxy[rows] += x * y
+        self._head[rows] = (h + 1) % self.window
+        self.n[rows] = np.minimum(self.n[rows] + 1, self.window)
+        return int(rows.size)
+
+    def reset(self) -> None:
+        self._alloc(self.capacity)
+        self._origin = None
+        self._last_ts = None
+
+    # ---- Reads ----
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self._arrays())
+
+    def slope(self) -> np.ndarray:
+        """d gap / d t per row (NaN with fewer than two samples or no time spread)."""
+        n = self.n.astype(np.float64)
+        den = n * self._sxx - self._sx * self._sx
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = (n * self._sxy - self._sx * self._sy) / den
+        out[(self.n < 2) | ~(den > 1e-9)] = np.nan
+        return out
+
+    def closing_rate(self) -> np.ndarray:
+        """Seconds per lap the trailing car gains (positive) or loses (negative)."""
+        return -self.slope() * self.lap_time
+
+    def ranked(
+        self, max_gap_s: float = 1.5, min_samples: int = 5, sort_by: str = "gap"
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """(rows, closing rates): pairs within `max_gap_s`, closest first (`gap`) or
+        fastest closing first (`closing`)."""
+        closing = self.closing_rate()
+        sel = (self.ahead >= 0) & (self.n >= min_samples) & (self.gap <= max_gap_s)
+        rows = np.flatnonzero(sel)
+        if sort_by == "closing":
+            key = np.where(np.isnan(closing[rows]), -np.inf, closing[rows])
+            rows = rows[np.lexsort((self.gap[rows], -key))]
+        else:
+            rows = rows[np.lexsort((rows, self.gap[rows]))]
+        return rows, closing
+
+    def battles(
+        self,
+        max_gap_s: float = 1.5,
+        min_samples: int = 5,
+        sort_by: str = "gap",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        rows, closing = self.ranked(max_gap_s, min_samples, sort_by)
+        return [self.describe(int(r), closing[r]) for r in rows[:limit]]
+
+    def pair(self, car_idx: int) -> Optional[Dict[str, Any]]:
+        """Trend of `car_idx` against the car ahead of it, if it has one."""
+        if not 0 <= car_idx < self.capacity or self.ahead[car_idx] < 0:
+            return None
+        return self.describe(car_idx, self.closing_rate()[car_idx])
+
+    def describe(self, r: int, closing: float) -> Dict[str, Any]:
+        gap = float(self.gap[r])
+        n = int(self.n[r])
+        span = 0.0
+        if n:
+            # Oldest sample sits at the head once the ring is full, at 0 before that
+            oldest = self._xs[r, self._head[r]] if n == self.window else self._xs[r, 0]
+            newest = self._xs[r, (self._head[r] - 1) % self.window]
+            span = float(newest - oldest)
+        out: Dict[str, Any] = {
+            "car_idx": r,
+            "ahead_car_idx": int(self.ahead[r]),
+            "position": None if np.isnan(self.position[r]) else int(self.position[r]),
+            "gap_s": round(gap, 3),
+            "samples": n,
+            "span_s": round(span, 3),
+            "closing_rate_s_per_lap": None,
+            "trend": None,
+            "laps_to_catch": None,
+            "projected_catch_lap": None,
+        }
+        if np.isnan(closing):
+            return out
+        out["closing_rate_s_per_lap"] = round(float(closing), 3) + 0.0  # no -0.0
+        if abs(closing) < STABLE_S_PER_LAP:
+            out["trend"] = "stable"
+        else:
+            out["trend"] = "closing" if closing > 0 else "pulling_away"
+        if closing >= STABLE_S_PER_LAP:
+            laps = gap / float(closing)
+            out["laps_to_catch"] = round(laps, 1)
+            if not np.isnan(self.lap[r]):
+                out["projected_catch_lap"] = int(np.ceil(self.lap[r] + laps))
+        return out
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional
 
 
 @dataclass
@@ -41,3 +41,153 @@ class SessionMeta:
     flag: str
     track: Optional[str]
     started_at: float
+
+
+class Record:
+    """Fixed-field row with the read side of a dict.
+
+    Subclasses list their fields in ``__slots__``: no per-instance ``__dict__``,
+    so a row costs a pointer per field instead of a hash table. ``get`` /
+    ``[]`` / ``in`` keep existing ``row.get("key")`` consumers working;
+    `to_dict()` builds a plain dict only when a row is serialized.
+    """
+
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def keys(self) -> tuple[str, ...]:
+        return self.__slots__
+
+    def to_dict(self) -> dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class TelemetryFrame(Record):
+    """Per-driver subset of an ``iracing.telemetry`` frame kept by StateCache."""
+
+    __slots__ = (
+        "driver_id",
+        "display_name",
+        "CarNumber",
+        "CarDistAhead",
+        "CarDistBehind",
+        "CarNumberAhead",
+        "CarNumberBehind",
+        "_emulator",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        driver_id: Any = None,
+        display_name: Any = None,
+        CarNumber: Any = None,
+        CarDistAhead: Any = None,
+        CarDistBehind: Any = None,
+        CarNumberAhead: Any = None,
+        CarNumberBehind: Any = None,
+        _emulator: Any = None,
+        updated_at: float | None = None,
+    ):
+        self.driver_id = driver_id
+        self.display_name = display_name
+        self.CarNumber = CarNumber
+        self.CarDistAhead = CarDistAhead
+        self.CarDistBehind = CarDistBehind
+        self.CarNumberAhead = CarNumberAhead
+        self.CarNumberBehind = CarNumberBehind
+        self._emulator = _emulator
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_payload(cls, frame: dict) -> "TelemetryFrame":
+        get = frame.get
+        driver_id, display_name = get("driver_id"), get("display_name")
+        return cls(
+            driver_id or display_name,
+            display_name or driver_id,
+            get("CarNumber"),
+            get("CarDistAhead"),
+            get("CarDistBehind"),
+            get("CarNumberAhead"),
+            get("CarNumberBehind"),
+            get("_emulator"),
+        )
+
+
+class StintRow(Record):
+    """One ``iracing.stint`` message (schema fields; absent optional fields are None)."""
+
+    __slots__ = (
+        "timestamp",
+        "car_idx",
+        "lap",
+        "fuel_level_l",
+        "fuel_pct",
+        "avg_fuel_lap_l",
+        "est_laps_remaining",
+        "stint_laps",
+        "tire_wear_pct",
+    )
+
+    def __init__(
+        self,
+        timestamp: Any = None,
+        car_idx: Any = None,
+        lap: Any = None,
+        fuel_level_l: Any = None,
+        fuel_pct: Any = None,
+        avg_fuel_lap_l: Any = None,
+        est_laps_remaining: Any = None,
+        stint_laps: Any = None,
+        tire_wear_pct: Any = None,
+    ):
+        self.timestamp = timestamp
+        self.car_idx = car_idx
+        self.lap = lap
+        self.fuel_level_l = fuel_level_l
+        self.fuel_pct = fuel_pct
+        self.avg_fuel_lap_l = avg_fuel_lap_l
+        self.est_laps_remaining = est_laps_remaining
+        self.stint_laps = stint_laps
+        self.tire_wear_pct = tire_wear_pct
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "StintRow":
+        return cls(*map(payload.get, cls.__slots__))
+
+
+def session_roster(data: dict) -> list[dict]:
+    """Roster entries for an ``iracing.session`` payload (live ingest and warm restore)."""
+    return [
+        {
+            "driver_id": d.get("UserName") or d.get("CarIdx"),
+            "display_name": d.get("UserName") or d.get("CarIdx"),
+            "CarNumber": d.get("CarNumber"),
+        }
+        for d in data.get("drivers") or []
+        if isinstance(d, dict)
+    ]
+
+
+def as_dict(row: Any) -> Any:
+    """Plain dict for a Record (other values unchanged), for tool output / copies."""
+    return row.to_dict() if isinstance(row, Record) else row
@@ -0,0 +1,259 @@
+"""Per-car lap history with incremental rolling pace statistics.
+
+`PaceTracker` watches the standings / lap timing frames StateCache receives
+and records a lap whenever a car's ``lap`` counter advances. The time recorded
+is that frame's ``last_lap_s``, stored against the lap just completed
+(counter - 1). Publishers can bump the counter a frame before the new
+``last_lap_s`` arrives, so a counter advance with an unchanged time is held
+until the time changes.
+
+Every car keeps:
+
+* a bounded ring of recent laps (``history`` laps)
+* a rolling window of the last ``window`` *clean* laps (laps within
+  ``slow_lap_pct`` of the car's best; in / out laps and incidents are kept in
+  the history but skipped), with running sums for mean / std dev / trend
+  slope and a sorted copy for the median
+* a heap of the ``best_n`` fastest laps seen (for the best-N average)
+
+so recording a lap and reading the statistics are O(1) in the history length
+(the median insert is O(window), with window a handful of laps).
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+import sys
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, NamedTuple, Optional
+
+from .memory import approx_size, estimate
+
+
+class LapRecord(NamedTuple):
+    lap: int
+    lap_time_s: float
+    ts: float
+    clean: bool
+
+
+class CarPace:
+    """Lap ring + rolling-window statistics for one car."""
+
+    __slots__ = (
+        "car_idx",
+        "laps",
+        "window",
+        "best_n",
+        "slow_lap_pct",
+        "best_lap_s",
+        "last_counter",
+        "last_time",
+        "pending_lap",
+        "_win",
+        "_sorted",
+        "_best",
+        "_x0",
+        "_y0",
+        "_sx",
+        "_sy",
+        "_sxx",
+        "_syy",
+        "_sxy",
+    )
+
+    def __init__(self, car_idx: int, history: int, window: int, best_n: int, slow_lap_pct: float):
+        self.car_idx = car_idx
+        self.laps: Deque[LapRecord] = deque(maxlen=max(1, history))
+        self.window = max(2, window)
+        self.best_n = max(1, best_n)
+        self.slow_lap_pct = slow_lap_pct
+        self.best_lap_s: Optional[float] = None
+        self.last_counter: Optional[int] = None
+        self.last_time: Optional[float] = None
+        self.pending_lap: Optional[int] = None
+        self._win: Deque[tuple[float, float]] = deque()
+        self._sorted: List[float] = []
+        self._best: List[float] = []  # negated max-heap of the best_n laps
+        # Sums are taken relative to the first clean lap to avoid cancellation
+        self._x0: Optional[float] = None
+        self._y0 = 0.0
+        self._sx = self._sy = self._sxx = self._syy = self._sxy = 0.0
+
+    # ---- Updates ----
+    def observe(self, counter: int, lap_time_s: Any, ts: float) -> bool:
+        """Feed one frame's lap counter / last lap time; True when a lap was recorded."""
+        valid = isinstance(lap_time_s, (int, float)) and lap_time_s > 0
+        if self.last_counter is None or counter > self.last_counter:
+            first = self.last_counter is None
+            self.last_counter = counter
+            if not valid:
+                self.pending_lap = None if first else counter - 1
+                return False
+            if not first and lap_time_s == self.last_time:
+                self.pending_lap = counter - 1  # time not updated yet
+                return False
+            return self._record(counter - 1, float(lap_time_s), ts)
+        if self.pending_lap is not None and valid and lap_time_s != self.last_time:
+            return self._record(self.pending_lap, float(lap_time_s), ts)
+        return False
+
+    def _record(self, lap: int, lap_time_s: float, ts: float) -> bool:
+        self.pending_lap = None
+        self.last_time = lap_time_s
+        if self.best_lap_s is None or lap_time_s < self.best_lap_s:
+            self.best_lap_s = lap_time_s
+        clean = lap_time_s <= self.best_lap_s * (1.0 + self.slow_lap_pct)
+        self.laps.append(LapRecord(lap, lap_time_s, ts, clean))
+        if len(self._best) < self.best_n:
+            heapq.heappush(self._best, -lap_time_s)
+        elif lap_time_s < -self._best[0]:
+            heapq.heapreplace(self._best, -lap_time_s)
+        if clean:
+            self._push(float(lap), lap_time_s)
+        return True
+
+    def _push(self, x: float, y: float) -> None:
+        if self._x0 is None:
+            self._x0, self._y0 = x, y
+        if len(self._win) == self.window:
+            ox, oy = self._win.popleft()
+            self._add(ox, oy, -1.0)
+            del self._sorted[bisect.bisect_left(self._sorted, oy)]
+        self._win.append((x, y))
+        self._add(x, y, 1.0)
+        bisect.insort(self._sorted, y)
+
+    def _add(self, x: float, y: float, sign: float) -> None:
+        dx = x - (self._x0 or 0.0)
+        dy = y - self._y0
+        self._sx += sign * dx
+        self._sy += sign * dy
+        self._sxx += sign * dx * dx
+        self._syy += sign * dy * dy
+        self._sxy += sign * dx * dy
+
+    # ---- Statistics ----
+    @property
+    def window_laps(self) -> int:
+        return len(self._win)
+
+    def rolling_mean(self) -> Optional[float]:
+        n = len(self._win)
+        return self._y0 + self._sy / n if n else None
+
+    def rolling_median(self) -> Optional[float]:
+        s = self._sorted
+        n = len(s)
+        if not n:
+            return None
+        mid = n // 2
+        return s[mid] if n % 2 else (s[mid - 1] + s[mid]) / 2.0
+
+    def std_dev(self) -> Optional[float]:
+        n = len(self._win)
+        if n < 2:
+            return None
+        var = (self._syy - self._sy * self._sy / n) / (n - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def trend_slope(self) -> Optional[float]:
+        """Seconds per lap across the window (negative = getting faster)."""
+        n = len(self._win)
+        if n < 2:
+            return None
+        den = n * self._sxx - self._sx * self._sx
+        if den <= 0:
+            return None
+        return (n * self._sxy - self._sx * self._sy) / den
+
+    def best_n_avg(self) -> Optional[float]:
+        if not self._best:
+            return None
+        return -sum(self._best) / len(self._best)
+
+    def summary(self) -> Dict[str, Any]:
+        last = self.laps[-1] if self.laps else None
+
+        def r3(v: Optional[float]) -> Optional[float]:
+            return round(v, 3) if v is not None else None
+
+        return {
+            "car_idx": self.car_idx,
+            "laps_recorded": len(self.laps),
+            "last_lap": last.lap if last else None,
+            "last_lap_s": last.lap_time_s if last else None,
+            "best_lap_s": self.best_lap_s,
+            "window_laps": len(self._win),
+            "rolling_mean_s": r3(self.rolling_mean()),
+            "rolling_median_s": r3(self.rolling_median()),
+            "std_dev_s": r3(self.std_dev()),
+            "trend_s_per_lap": r3(self.trend_slope()),
+            "best_n_avg_s": r3(self.best_n_avg()),
+            "best_n_laps": len(self._best),
+        }
+
+    def nbytes(self) -> int:
+        return (
+            sys.getsizeof(self)
+            + estimate(self.laps)
+            + approx_size(self._win, 2)
+            + approx_size(self._sorted, 1)
+            + approx_size(self._best, 1)
+        )
+
+    def recent(self, n: int) -> List[Dict[str, Any]]:
+        if n <= 0:
+            return []
+        return [rec._asdict() for rec in list(self.laps)[-n:]]
+
+
+class PaceTracker:
+    """CarPace per car_idx, fed from full standings / lap timing frames."""
+
+    def __init__(
+        self,
+        history: int = 50,
+        window: int = 5,
+        best_n: int = 5,
+        slow_lap_pct: float = 0.07,
+    ):
+        self.history = history
+        self.window = max(2, window)
+        self.best_n = best_n
+        self.slow_lap_pct = slow_lap_pct
+        self._cars: Dict[int, CarPace] = {}
+        self.laps_recorded = 0
+
+    def observe_frame(self, timestamp: Any, cars: Iterable[dict]) -> int:
+        """Record completed laps found in one frame; returns how many were recorded."""
+        ts = float(timestamp) if isinstance(timestamp, (int, float)) else 0.0
+        recorded = 0
+        for c in cars:
+            car_idx = c.get("car_idx")
+            counter = c.get("lap")
+            if not isinstance(car_idx, int) or not isinstance(counter, int):
+                continue
+            pace = self._cars.get(car_idx)
+            if pace is None:
+                pace = self._cars[car_idx] = CarPace(
+                    car_idx, self.history, self.window, self.best_n, self.slow_lap_pct
+                )
+            if pace.observe(counter, c.get("last_lap_s"), ts):
+                recorded += 1
+        self.laps_recorded += recorded
+        return recorded
+
+    def nbytes(self) -> int:
+        return sum(c.nbytes() for c in self._cars.values())
+
+    def car(self, car_idx: int) -> Optional[CarPace]:
+        return self._cars.get(car_idx)
+
+    def cars(self) -> List[CarPace]:
+        return list(self._cars.values())
+
+    def reset(self) -> None:
+        self._cars.clear()
@@ -0,0 +1,202 @@
+"""Position-change events derived from consecutive standings frames.
+
+`PositionChangeDetector.apply` diffs the previous running order against the
+new one by ``car_idx`` and records:
+
+* ``position_gain`` / ``position_loss`` for every classified car whose
+  position moved (``from_pos`` -> ``to_pos``, ``delta`` > 0 = places gained)
+* ``overtake`` for every (passer, passed) pair that swapped order: for a car
+  that moved up from ``from_pos`` to ``to_pos`` only the cars now occupying
+  ``to_pos + 1 .. from_pos`` can have been passed, so the diff is
+  O(cars + places changed) rather than pairwise.
+
+Events carry the gap context of the frame they were detected in and a
+monotonically increasing ``id`` so consumers (the SQLite writer, pollers) can
+ask for everything after the last id they saw. The first frame, and cars that
+are new, unclassified (no positive position) or missing, produce no events.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from .memory import estimate
+
+EVENT_TYPES = ("overtake", "position_gain", "position_loss")
+
+
+def _position(car: dict) -> Optional[int]:
+    pos = car.get("position")
+    if pos is None:
+        pos = car.get("pos")
+    if isinstance(pos, int) and not isinstance(pos, bool) and pos > 0:
+        return pos
+    return None
+
+
+def _gap(car: dict, key: str) -> Optional[float]:
+    v = car.get(key)
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return float(v)
+    return None
+
+
+def _matches(
+    ev: Dict[str, Any],
+    types: Optional[frozenset],
+    car_idx: Optional[int],
+    since_ts: Optional[float],
+) -> bool:
+    """Event filter shared by `recent` and `since`; `car_idx` matches either side of an overtake."""
+    if since_ts is not None and ev["ts"] < since_ts:
+        return False
+    if types is not None and ev["type"] not in types:
+        return False
+    return car_idx is None or car_idx in (ev["car_idx"], ev.get("passed_car_idx"))
+
+
+class PositionChangeDetector:
+    """Bounded ring of position-change events, fed one standings frame at a time."""
+
+    def __init__(self, ring_size: int = 500):
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max(1, ring_size))
+        self._prev: Dict[int, int] = {}  # car_idx -> position in the last frame
+        self._next_id = 1
+        self.frames = 0
+
+    @property
+    def last_id(self) -> int:
+        return self._next_id - 1
+
+    def apply(self, timestamp: Any, cars: Iterable[dict]) -> List[Dict[str, Any]]:
+        """Diff `cars` against the previous frame; returns the events recorded."""
+        ts = float(timestamp) if isinstance(timestamp, (int, float)) else 0.0
+        pos_by_car: Dict[int, int] = {}
+        rows: Dict[int, dict] = {}
+        by_pos: Dict[int, int] = {}
+        for c in cars:
+            car_idx = c.get("car_idx")
+            pos = _position(c)
+            if not isinstance(car_idx, int) or pos is None:
+                continue
+            pos_by_car[car_idx] = pos
+            rows[car_idx] = c
+            by_pos[pos] = car_idx
+        prev = self._prev
+        self._prev = pos_by_car
+        self.frames += 1
+        if not prev:
+            return []
+
+        out: List[Dict[str, Any]] = []
+        for car_idx, pos in pos_by_car.items():
+            old = prev.get(car_idx)
+            if old is None or old == pos:
+                continue
+            row = rows[car_idx]
+            out.append(
+                {
+                    "type": "position_gain" if pos < old else "position_loss",
+                    "ts": ts,
+                    "car_idx": car_idx,
+                    "from_pos": old,
+                    "to_pos": pos,
+                    "delta": old - pos,
+                    "lap": row.get("lap"),
+                    "gap_ahead_s": _gap(row, "gap_ahead_s"),
+                    "gap_leader_s": _gap(row, "gap_leader_s"),
+                }
+            )
+            if pos > old:
+                continue
+            # Cars now between the passer and its old position that used to be ahead of it
+            gap_leader = _gap(row, "gap_leader_s")
+            for p in range(pos + 1, old + 1):
+                passed = by_pos.get(p)
+                if passed is None or prev.get(passed, old + 1) >= old:
+                    continue
+                passed_row = rows[passed]
+                if p == pos + 1:
+                    gap = _gap(passed_row, "gap_ahead_s")
+                else:
+                    other = _gap(passed_row, "gap_leader_s")
+                    gap = (
+                        round(other - gap_leader, 3)
+                        if other is not None and gap_leader is not None
+                        else None
+                    )
+                out.append(
+                    {
+                        "type": "overtake",
+                        "ts": ts,
+                        "car_idx": car_idx,
+                        "passed_car_idx": passed,
+                        "position": pos,
+                        "passed_position": p,
+                        "lap": row.get("lap"),
+                        "gap_s": gap,
+                    }
+                )
+        for ev in out:
+            ev["id"] = self._next_id
+            self._next_id += 1
+            self._events.append(ev)
+        return out
+
+    def since(
+        self,
+        event_id: int,
+        n: Optional[int] = None,
+        types: Optional[Iterable[str]] = None,
+        car_idx: Optional[int] = None,
+        since_ts: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Up to `n` (default: all) events with id > `event_id` that match, oldest first."""
+        if event_id >= self.last_id:
+            return []
+        wanted = frozenset(types) if types else None
+        out: List[Dict[str, Any]] = []
+        for ev in self._events:
+            if n is not None and len(out) >= n:
+                break
+            if ev["id"] <= event_id or not _matches(ev, wanted, car_idx, since_ts):
+                continue
+            out.append(ev)
+        return out
+
+    def recent(
+        self,
+        n: int = 25,
+        types: Optional[Iterable[str]] = None,
+        car_idx: Optional[int] = None,
+        since_ts: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Up to `n` most recent events matching the filters, newest first.
+
+        `car_idx` matches either side of an overtake.
+        """
+        wanted = frozenset(types) if types else None
+        out: List[Dict[str, Any]] = []
+        for ev in reversed(self._events):
+            if len(out) >= n:
+                break
+            if since_ts is not None and ev["ts"] < since_ts:
+                break
+            if _matches(ev, wanted, car_idx, None):
+                out.append(ev)
+        return out
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def nbytes(self) -> int:
+        return estimate(self._events)
+
+    def rebase(self) -> None:
+        """Forget the previous order so the next frame only seeds the baseline."""
+        self._prev = {}
+
+    def reset(self) -> None:
+        self._events.clear()
+        self._prev = {}
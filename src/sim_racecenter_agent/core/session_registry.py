@@ -0,0 +1,148 @@
+"""Session-sharded StateCache registry.
+
+One process can ingest several iRacing sessions (practice servers plus a race)
+from the same NATS cluster. Each session gets its own `StateCache` shard, so
+standings, pace, gaps and events never mix between sessions, and every shard
+keeps the bounds (rings, TTLs, history window) of a single cache.
+
+Publishers tag a session by appending its id as the last subject token
+(``iracing.standings.<session>``); messages on the bare subject go to the
+default shard, which is the process-wide cache the server always had. Shards
+other than the default are created on first write, evicted after
+``idle_ttl_s`` without writes, and capped at ``max_sessions`` (the least
+recently written one is dropped to make room).
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from .state_cache import StateCache
+
+DEFAULT_SESSION = "default"
+_MAX_SESSION_ID_LEN = 64
+
+
+def session_from_subject(base: str, subject: Any) -> Optional[str]:
+    """Session id carried by `subject` as a token after `base`, or None for the bare subject."""
+    if not isinstance(subject, str) or not subject.startswith(base + "."):
+        return None
+    token = subject[len(base) + 1 :]
+    if not token or "." in token or len(token) > _MAX_SESSION_ID_LEN:
+        return None
+    return token
+
+
+class _Shard:
+    __slots__ = ("cache", "created_at", "last_write", "writes")
+
+    def __init__(self, cache: StateCache, now: float):
+        self.cache = cache
+        self.created_at = now
+        self.last_write = now
+        self.writes = 0
+
+
+class SessionRegistry:
+    """session id -> StateCache, with idle eviction and a shard cap."""
+
+    def __init__(
+        self,
+        factory: Callable[[], StateCache],
+        default: Optional[StateCache] = None,
+        max_sessions: int = 8,
+        idle_ttl_s: float = 1800.0,
+    ):
+        self._factory = factory
+        self.max_sessions = max(1, int(max_sessions))
+        self.idle_ttl_s = float(idle_ttl_s)
+        now = time.time()
+        # Ordered by last write (oldest first) so the cap evicts from the front
+        self._shards: "OrderedDict[str, _Shard]" = OrderedDict()
+        self._shards[DEFAULT_SESSION] = _Shard(default or factory(), now)
+        self._evict_listeners: List[Callable[[str], None]] = []
+        self.created = 0
+        self.evicted = 0
+
+    @property
+    def default(self) -> StateCache:
+        return self._shards[DEFAULT_SESSION].cache
+
+    def __len__(self) -> int:
+        return len(self._shards)
+
+    def __contains__(self, session: object) -> bool:
+        return session in self._shards
+
+    def on_evict(self, callback: Callable[[str], None]) -> None:
+        """Call `callback(session)` whenever a shard is dropped."""
+        self._evict_listeners.append(callback)
+
+    # ---- Writes ----
+    def route(self, session: Optional[str]) -> StateCache:
+        """Shard that a message for `session` should be applied to (created on demand)."""
+        key = session or DEFAULT_SESSION
+        shard = self._shards.get(key)
+        now = time.time()
+        if shard is None:
+            while len(self._shards) >= self.max_sessions + 1:  # +1: the default shard
+                oldest = next(k for k in self._shards if k != DEFAULT_SESSION)
+                self._drop(oldest)
+            shard = self._shards[key] = _Shard(self._factory(), now)
+            self.created += 1
+        else:
+            self._shards.move_to_end(key)
+        shard.last_write = now
+        shard.writes += 1
+        return shard.cache
+
+    def sweep(self, now: Optional[float] = None) -> List[str]:
+        """Run every shard's TTL sweep and drop shards idle longer than `idle_ttl_s`."""
+        now = time.time() if now is None else now
+        idle = [
+            key
+            for key, shard in self._shards.items()
+            if key != DEFAULT_SESSION
+            and self.idle_ttl_s > 0
+            and now - shard.last_write > self.idle_ttl_s
+        ]
+        for key in idle:
+            self._drop(key)
+        for shard in self._shards.values():
+            shard.cache.sweep(now)
+        return idle
+
+    def _drop(self, key: str) -> None:
+        del self._shards[key]
+        self.evicted += 1
+        for callback in self._evict_listeners:
+            callback(key)
+
+    # ---- Reads ----
+    def get(self, session: Optional[str] = None) -> Optional[StateCache]:
+        """Shard for `session` (default shard for None / ""), None when unknown."""
+        shard = self._shards.get(session or DEFAULT_SESSION)
+        return shard.cache if shard is not None else None
+
+    def sessions(self) -> List[str]:
+        return list(self._shards)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "max_sessions": self.max_sessions,
+            "idle_ttl_s": self.idle_ttl_s,
+            "created": self.created,
+            "evicted": self.evicted,
+            "sessions": {
+                key: {
+                    "created_at": shard.created_at,
+                    "idle_s": round(now - shard.last_write, 3),
+                    "writes": shard.writes,
+                    "approx_bytes": shard.cache.memory_report()["total_approx_bytes"],
+                }
+                for key, shard in self._shards.items()
+            },
+        }
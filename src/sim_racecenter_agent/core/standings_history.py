@@ -0,0 +1,261 @@
+"""Delta-compressed in-memory history of standings frames.
+
+Every frame `StateCache.set_standings` accepts is folded into a
+(car_idx x field) float64 state (NaN = missing, plus a presence column).
+Frames are grouped into blocks: the first frame of a block is stored as a
+full keyframe, the rest only as the flat indexes and values of the cells that
+changed since the previous frame. Positions and laps rarely change between
+frames, so a delta is mostly the two gap columns of the cars that moved.
+
+Reading the state at time T is a bisect to the block and frame, a copy of the
+keyframe and at most ``keyframe_every - 1`` vectorized scatters. Whole blocks
+are evicted once their newest frame falls out of ``window_s``, so the history
+always covers at least the configured window.
+"""
+
+from __future__ import annotations
+
+import bisect
+from math import isnan
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .car_table import DEFAULT_CAPACITY, _MAX_CAR_IDX, _frame
+
+# (field, payload key); standings rows carry the schema's "pos" (the ingestor adds "position")
+FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("position", "pos"),
+    ("lap", "lap"),
+    ("gap_leader_s", "gap_leader_s"),
+    ("gap_ahead_s", "gap_ahead_s"),
+    ("last_lap_s", "last_lap_s"),
+)
+_INT_FIELDS = frozenset({"position", "lap"})
+_WIDTH = len(FIELDS) + 1  # + presence column
+_PRESENT = len(FIELDS)
+_COL = {name: i for i, (name, _) in enumerate(FIELDS)}
+
+
+class _Block:
+    """A keyframe plus the deltas of the frames after it.
+
+    Deltas are appended as per-frame arrays while the block is open and packed
+    into one codes / values pair with frame end offsets once it is full, so a
+    closed block is four arrays regardless of its frame count.
+    """
+
+    __slots__ = ("ts", "key", "_codes", "_values", "_packed")
+
+    def __init__(self, ts: float, key: np.ndarray):
+        self.ts: List[float] = [ts]
+        self.key = key
+        # Per frame after the keyframe: flat cell indexes + their new values
+        self._codes: List[np.ndarray] = []
+        self._values: List[np.ndarray] = []
+        self._packed: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def append(self, ts: float, codes: np.ndarray, values: np.ndarray) -> None:
+        self.ts.append(ts)
+        self._codes.append(codes)
+        self._values.append(values)
+
+    def close(self) -> None:
+        self._packed = self.deltas()
+        self._codes, self._values = [], []
+
+    def deltas(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(codes, values, ends): delta i is codes[ends[i-1]:ends[i]] (ends[-1] = 0)."""
+        if self._packed is not None:
+            return self._packed
+        if not self._codes:
+            return np.empty(0, np.int32), np.empty(0), np.zeros(0, np.int64)
+        ends = np.cumsum([len(c) for c in self._codes])
+        return np.concatenate(self._codes), np.concatenate(self._values), ends
+
+    def nbytes(self) -> int:
+        codes, values, ends = self.deltas()
+        return self.key.nbytes + codes.nbytes + values.nbytes + ends.nbytes + 8 * len(self.ts)
+
+
+class StandingsHistory:
+    """Standings frames over the last `window_s` seconds, keyframe + delta encoded."""
+
+    def __init__(self, window_s: float = 1800.0, keyframe_every: int = 60):
+        self.window_s = float(window_s)
+        self.keyframe_every = max(1, int(keyframe_every))
+        self._blocks: List[_Block] = []
+        self._starts: List[float] = []  # first ts of each block (bisect index)
+        self._state = self._empty(DEFAULT_CAPACITY)
+        self.frames = 0
+
+    @staticmethod
+    def _empty(capacity: int) -> np.ndarray:
+        state = np.full((capacity, _WIDTH), np.nan)
+        state[:, _PRESENT] = 0.0
+        return state
+
+    def _fit(self, arr: np.ndarray, capacity: int) -> np.ndarray:
+        if arr.shape[0] >= capacity:
+            return arr.copy()
+        out = self._empty(capacity)
+        out[: arr.shape[0]] = arr
+        return out
+
+    # ---- Writes ----
+    def record(self, timestamp: Any, cars: Iterable[dict]) -> bool:
+        """Append one frame; frames not newer than the last one are ignored."""
+        if not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool):
+            return False
+        ts = float(timestamp)
+        if self._blocks and ts <= self._blocks[-1].ts[-1]:
+            return False
+        ids: List[int] = []
+        kept: List[dict] = []
+        for c in cars:
+            idx = c.get("car_idx")
+            if isinstance(idx, int) and not isinstance(idx, bool) and 0 <= idx <= _MAX_CAR_IDX:
+                ids.append(idx)
+                kept.append(c)
+        capacity = self._state.shape[0]
+        while ids and max(ids) >= capacity:
+            capacity *= 2
+        new = self._empty(capacity)
+        if ids:
+            new[ids, :_PRESENT] = _frame(kept, [key for _, key in FIELDS])
+            new[ids, _PRESENT] = 1.0
+        prev = self._fit(self._state, capacity)
+        self._state = new
+
+        block = self._blocks[-1] if self._blocks else None
+        if block is None or len(block.ts) >= self.keyframe_every:
+            if block is not None:
+                block.close()
+            self._blocks.append(_Block(ts, new.copy()))
+            self._starts.append(ts)
+        else:
+            same = (new == prev) | (np.isnan(new) & np.isnan(prev))
+            codes = np.flatnonzero(~same).astype(np.int32)
+            block.append(ts, codes, new.ravel()[codes])
+        self.frames += 1
+        self._evict(ts - self.window_s)
+        return True
+
+    def _evict(self, cutoff: float) -> None:
+        drop = 0
+        while drop < len(self._blocks) - 1 and self._blocks[drop].ts[-1] < cutoff:
+            drop += 1
+        if drop:
+            del self._blocks[:drop]
+            del self._starts[:drop]
+
+    def reset(self) -> None:
+        self._blocks.clear()
+        self._starts.clear()
+        self._state = self._empty(self._state.shape[0])
+
+    # ---- Reads ----
+    def oldest_ts(self) -> Optional[float]:
+        return self._starts[0] if self._starts else None
+
+    def newest_ts(self) -> Optional[float]:
+        return self._blocks[-1].ts[-1] if self._blocks else None
+
+    def covers(self, ts: float) -> bool:
+        oldest = self.oldest_ts()
+        return oldest is not None and ts >= oldest
+
+    def _locate(self, ts: float) -> Optional[Tuple[int, int]]:
+        b = bisect.bisect_right(self._starts, ts) - 1
+        if b < 0:
+            return None
+        return b, bisect.bisect_right(self._blocks[b].ts, ts) - 1
+
+    def _state_in(self, block: _Block, frame: int) -> np.ndarray:
+        state = self._fit(block.key, self._state.shape[0])
+        flat = state.ravel()
+        codes, values, ends = block.deltas()
+        start = 0
+        # One scatter per frame: a cell can change in several frames, last one must win
+        for end in ends[:frame].tolist():
+            flat[codes[start:end]] = values[start:end]
+            start = end
+        return state
+
+    def state_at(self, ts: float) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        """(frame ts, rows ordered by position) of the newest frame at or before `ts`."""
+        loc = self._locate(ts)
+        if loc is None:
+            return None
+        b, f = loc
+        block = self._blocks[b]
+        return block.ts[f], _rows(self._state_in(block, f))
+
+    def gap_series(
+        self, car_a: int, car_b: int, start: float, end: float
+    ) -> List[Tuple[float, Optional[float], Optional[int], Optional[int]]]:
+        """(ts, gap of B behind A in s, pos A, pos B) for each frame in [start, end].
+
+        The gap is the difference of the cars' ``gap_leader_s`` in that frame.
+        """
+        g, p = _COL["gap_leader_s"], _COL["position"]
+        cells = (car_a * _WIDTH + g, car_b * _WIDTH + g, car_a * _WIDTH + p, car_b * _WIDTH + p)
+        out: List[Tuple[float, Optional[float], Optional[int], Optional[int]]] = []
+        first = max(0, bisect.bisect_right(self._starts, start) - 1)
+        for block in self._blocks[first:]:
+            if block.ts[0] > end:
+                break
+            if block.ts[-1] < start:
+                continue
+            lo = bisect.bisect_left(block.ts, start)
+            hi = bisect.bisect_right(block.ts, end)
+            ga, gb, pa, pb = (_cell_series(block, c)[lo:hi].tolist() for c in cells)
+            for i, ts in enumerate(block.ts[lo:hi]):
+                gap = None if isnan(ga[i]) or isnan(gb[i]) else round(gb[i] - ga[i], 3)
+                out.append(
+                    (
+                        ts,
+                        gap,
+                        None if isnan(pa[i]) else int(pa[i]),
+                        None if isnan(pb[i]) else int(pb[i]),
+                    )
+                )
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        oldest, newest = self.oldest_ts(), self.newest_ts()
+        return {
+            "frames": sum(len(b.ts) for b in self._blocks),
+            "blocks": len(self._blocks),
+            "span_s": round(newest - oldest, 3) if oldest is not None and newest else 0.0,
+            "bytes": sum(b.nbytes() for b in self._blocks),
+        }
+
+
+def _cell_series(block: _Block, cell: int) -> np.ndarray:
+    """Value of one flat cell in every frame of `block` (forward-filled from the deltas)."""
+    frames = len(block.ts)
+    key = block.key.ravel()
+    initial = key[cell] if cell < key.size else np.nan
+    codes, values, ends = block.deltas()
+    hits = np.flatnonzero(codes == cell)
+    if not hits.size:
+        return np.full(frames, initial)
+    # Delta i belongs to frame i + 1; a cell appears at most once per delta
+    last = np.zeros(frames, dtype=np.int64)
+    last[np.searchsorted(ends, hits, side="right") + 1] = hits + 1
+    np.maximum.accumulate(last, out=last)
+    return np.where(last > 0, values[last - 1], initial)
+
+
+def _rows(state: np.ndarray) -> List[Dict[str, Any]]:
+    present = np.flatnonzero(state[:, _PRESENT] == 1.0)
+    pos = state[present, _COL["position"]]
+    order = present[np.lexsort((present, np.where(np.isnan(pos), np.inf, pos)))]
+    rows: List[Dict[str, Any]] = []
+    for car_idx, values in zip(order.tolist(), state[order, :_PRESENT].tolist()):
+        row: Dict[str, Any] = {"car_idx": car_idx}
+        for (name, _), v in zip(FIELDS, values):
+            row[name] = None if isnan(v) else (int(v) if name in _INT_FIELDS else v)
+        rows.append(row)
+    return rows
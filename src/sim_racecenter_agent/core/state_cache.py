@@ -1,8 +1,51 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from collections import deque
-from typing import Any, Dict, List, Deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Tuple
+
+from .car_table import CarTable
+from .gaps import GapTracker
+from .memory import approx_size, estimate
+from .models import StintRow, TelemetryFrame, as_dict
+from .pace import PaceTracker
+from .position_changes import PositionChangeDetector
+from .standings_history import StandingsHistory
+
+# Versioned domains; every write bumps the domain's version by one
+DOMAINS = (
+    "telemetry",
+    "roster",
+    "standings",
+    "lap_timing",
+    "session_state",
+    "incidents",
+    "pits",
+    "track_conditions",
+    "stints",
+    "chat",
+    "pace",
+    "position_changes",
+)
+# A session_state whose time_remaining_s jumps up by more than this (same session
+# type) is a restarted / new session rather than a publisher hiccup
+SESSION_RESTART_JUMP_S = 60.0
+# Domains that make up the live snapshot (everything but per-frame telemetry / stints / chat)
+SNAPSHOT_DOMAINS = (
+    "roster",
+    "standings",
+    "lap_timing",
+    "session_state",
+    "incidents",
+    "pits",
+    "track_conditions",
+)
+
+
+def _resolve(fut: asyncio.Future):
+    if not fut.done():
+        fut.set_result(None)
 
 
 class StateCache:
@@ -10,24 +53,67 @@ class StateCache:
 
     Provides backward-compatible snapshot_leaderboard() for existing tools
     by projecting standings + roster mappings.
+
+    Each domain carries a monotonically increasing version. Writers replace
+    whole snapshots instead of mutating them, so the `*_view()` accessors hand
+    out shared tuples without copying; treat them (and the dicts inside) as
+    read-only. Derived projections (leaderboard, telemetry / event tuples) are
+    built at most once per version. The list accessors remain for callers that
+    want a private copy.
+
+    `wait_for_change` lets async consumers block until a domain moves past a
+    version they have already seen instead of polling.
+
+    Keyed domains that only grow (telemetry by driver, stints and car names by
+    car_idx) expire entries not refreshed within their TTL when `sweep()` runs
+    (0 disables a TTL). A session boundary seen by `set_session_state`, or an
+    explicit `reset_session()`, drops all per-session live state; the standings
+    history, incident / pit / chat rings and the roster survive it.
+    `memory_report()` gives entries and approximate bytes per domain.
     """
 
-    def __init__(self, _max_positions_history: int, incident_ring_size: int):  # legacy arg ignored
+    def __init__(
+        self,
+        _max_positions_history: int,  # legacy arg ignored
+        incident_ring_size: int,
+        pace_history_laps: int = 50,
+        pace_window: int = 5,
+        position_change_ring_size: int = 500,
+        standings_history_s: float = 1800.0,
+        gap_trend_samples: int = 60,
+        telemetry_ttl_s: float = 60.0,
+        stint_ttl_s: float = 900.0,
+        names_ttl_s: float = 3600.0,
+    ):
         # Base real-time subsets
-        self._telemetry: Dict[str, Dict[str, Any]] = {}
-        self._roster: List[Dict[str, Any]] = []  # session roster (CarIdx, UserName, CarNumber)
+        # Ingested frames / stints are __slots__ records (core.models); tests may pass dicts
+        self._telemetry: Dict[str, Dict[str, Any] | TelemetryFrame] = {}
+        # Session roster (CarIdx, UserName, CarNumber)
+        self._roster: Tuple[Dict[str, Any], ...] = ()
 
         # Extended snapshots / events
         self._standings_timestamp: float | None = None
-        self._standings_list: List[Dict[str, Any]] = []
+        self._standings_list: Tuple[Dict[str, Any], ...] = ()
         self._lap_timing_timestamp: float | None = None
-        self._lap_timing_list: List[Dict[str, Any]] = []
+        self._lap_timing_list: Tuple[Dict[str, Any], ...] = ()
         self._session_state: Dict[str, Any] | None = None
         self._session_state_history: Deque[Dict[str, Any]] = deque(maxlen=100)  # recent states
         self._incident_events: Deque[Dict[str, Any]] = deque(maxlen=incident_ring_size)
         self._pit_events: Deque[Dict[str, Any]] = deque(maxlen=incident_ring_size)
         self._track_conditions: Dict[str, Any] | None = None
-        self._stints: Dict[int, Dict[str, Any]] = {}
+        self._stints: Dict[int, Dict[str, Any] | StintRow] = {}
+        # Numeric standings / lap timing / stint fields as NumPy columns by car_idx.
+        # Full-state sources are loaded on the first read after a write (see car_table()).
+        self._cars = CarTable()
+        self._cars_loaded: Dict[str, int] = {"standings": 0, "lap_timing": 0}
+        # Per-car lap history + rolling pace stats, fed by standings / lap timing frames
+        self._pace = PaceTracker(history=pace_history_laps, window=pace_window)
+        # Overtake / position gain / loss events diffed from consecutive standings frames
+        self._positions = PositionChangeDetector(ring_size=position_change_ring_size)
+        # Keyframe + delta encoded standings frames for "state at time T" / gap history
+        self._history = StandingsHistory(window_s=standings_history_s)
+        # Rolling gap regression per adjacent pair (closing rate / projected catch)
+        self._gaps = GapTracker(window=gap_trend_samples)
         # Live chat (recent) messages (if chat ingestion enabled)
         self._chat_messages: Deque[Dict[str, Any]] = deque(maxlen=500)
 
@@ -36,85 +122,470 @@ class StateCache:
         self._car_idx_to_number: Dict[int, str] = {}
         self._car_idx_to_name: Dict[int, str] = {}
 
+        # Eviction: TTLs (s, 0 = keep forever) and wall-clock last-seen times
+        self._ttl_s: Dict[str, float] = {
+            "telemetry": float(telemetry_ttl_s),
+            "stints": float(stint_ttl_s),
+            "names": float(names_ttl_s),
+        }
+        self._stint_seen: Dict[int, float] = {}
+        self._name_seen: Dict[int, float] = {}
+        self._evicted: Dict[str, int] = dict.fromkeys(self._ttl_s, 0)
+        self._last_sweep: Dict[str, Any] | None = None
+        self._session_resets = 0
+        # Objects consumers bind to this cache (e.g. MCP tool handlers); they may close
+        # over the cache, so they live here and are collected together with it
+        self.attached: Dict[Any, Any] = {}
+        self._last_session_reset: Dict[str, Any] | None = None
+
+        # Warm-restore markers: domain -> timestamp of the snapshot loaded from SQLite.
+        # Cleared by the first live/replayed update that is not older than it.
+        self._restored: Dict[str, float] = {}
+
+        # Snapshot versions; "names" tracks the car_idx -> number / name maps
+        self._versions: Dict[str, int] = dict.fromkeys(DOMAINS + ("names",), 0)
+        # name -> (version key, value) for projections built once per version
+        self._memo: Dict[str, Tuple[Any, Any]] = {}
+        # Pending wait_for_change futures with the domains they watch (None = all)
+        self._waiters: List[Tuple[frozenset[str] | None, asyncio.Future]] = []
+
     # ---- Telemetry & Roster ----
-    def upsert_telemetry_frame(self, frame: dict):
+    def upsert_telemetry_frame(self, frame: dict | TelemetryFrame):
         did = frame.get("driver_id") or frame.get("display_name")
         if not did:
             return
-        frame["updated_at"] = time.time()
+        if isinstance(frame, TelemetryFrame):
+            frame.updated_at = time.time()
+        else:
+            frame["updated_at"] = time.time()
         self._telemetry[did] = frame
+        self._bump("telemetry")
         car_idx = frame.get("CarIdx")
         if isinstance(car_idx, int):
-            if frame.get("CarNumber"):
-                self._car_idx_to_number[car_idx] = str(frame.get("CarNumber"))
-            if frame.get("display_name"):
-                self._car_idx_to_name[car_idx] = str(frame.get("display_name"))
+            self._set_names(car_idx, frame.get("CarNumber"), frame.get("display_name"))
 
     def update_roster(self, drivers: list[dict]):
-        self._roster = drivers
+        self._roster = tuple(drivers)
+        self._bump("roster")
         for d in drivers:
             if isinstance(d.get("CarIdx"), int):
                 idx = int(d["CarIdx"])  # type: ignore[arg-type]
-                if d.get("CarNumber"):
-                    self._car_idx_to_number[idx] = str(d.get("CarNumber"))
-                if d.get("UserName"):
-                    self._car_idx_to_name[idx] = str(d.get("UserName"))
+                self._set_names(idx, d.get("CarNumber"), d.get("UserName"))
+
+    def _set_names(self, car_idx: int, number: Any, name: Any):
+        if number or name:
+            self._name_seen[car_idx] = time.time()
+        changed = False
+        if number and self._car_idx_to_number.get(car_idx) != str(number):
+            self._car_idx_to_number[car_idx] = str(number)
+            changed = True
+        if name and self._car_idx_to_name.get(car_idx) != str(name):
+            self._car_idx_to_name[car_idx] = str(name)
+            changed = True
+        if changed:
+            self._bump("names")
 
     # ---- Standings ----
     def set_standings(self, timestamp: float, cars: list[dict]):
+        resumed = "standings" in self._restored
+        if not self._supersedes("standings", timestamp):
+            return
         self._standings_timestamp = timestamp
-        self._standings_list = cars
-        self._gap_leader_by_car = {}
+        self._standings_list = tuple(cars)
+        gaps: Dict[int, float | None] = {}
         for c in cars:
             car_idx = c.get("car_idx")
             if isinstance(car_idx, int):
-                self._gap_leader_by_car[car_idx] = c.get("gap_leader_s")
+                gaps[car_idx] = c.get("gap_leader_s")
+        self._gap_leader_by_car = gaps
+        if self._pace.observe_frame(timestamp, cars):
+            self._bump("pace")
+        self._history.record(timestamp, cars)
+        if resumed:
+            # Restored order may be minutes old; don't report the difference as passes
+            # or fit a gap trend across it
+            self._positions.rebase()
+            self._gaps.reset()
+        self._gaps.observe(timestamp, cars)
+        if self._positions.apply(timestamp, cars):
+            self._bump("position_changes")
+        self._bump("standings")
 
     # ---- Lap Timing ----
     def set_lap_timing(self, timestamp: float, cars: list[dict]):
+        if not self._supersedes("lap_timing", timestamp):
+            return
         self._lap_timing_timestamp = timestamp
-        self._lap_timing_list = cars
+        self._lap_timing_list = tuple(cars)
+        if self._pace.observe_frame(timestamp, cars):
+            self._bump("pace")
+        self._bump("lap_timing")
 
     # ---- Session State ----
     def set_session_state(self, state: dict):
+        if not self._supersedes("session_state", state.get("timestamp")):
+            return
+        boundary = self._session_boundary(self._session_state, state)
+        if boundary:
+            self.reset_session(boundary)
         self._session_state = state
         stamped = dict(state)
         stamped.setdefault("_received_ts", time.time())
         self._session_state_history.append(stamped)
+        self._bump("session_state")
 
     # ---- Events ----
     def add_incident_event(self, event: dict):
         self._incident_events.append(event)
+        self._bump("incidents")
 
     def add_pit_event(self, event: dict):
         self._pit_events.append(event)
+        self._bump("pits")
 
     # ---- Track Conditions ----
     def set_track_conditions(self, payload: dict):
+        if not self._supersedes("track_conditions", payload.get("timestamp")):
+            return
         self._track_conditions = payload
+        self._bump("track_conditions")
 
     # ---- Stints ----
-    def update_stint(self, car_idx: int | None, payload: dict):
+    def update_stint(self, car_idx: int | None, payload: dict | StintRow):
         if car_idx is None:
             return
         self._stints[car_idx] = payload
+        self._stint_seen[car_idx] = time.time()
+        self._cars.update_stint(car_idx, payload)
+        self._bump("stints")
 
     # ---- Chat Messages ----
     def add_chat_message(self, payload: dict):
         """Append a validated chat message payload (already schema-checked)."""
         self._chat_messages.append(payload)
+        self._bump("chat")
 
     def recent_chat(self, n: int = 50) -> list[dict]:
         if n <= 0:
             return []
         return list(self._chat_messages)[-n:]
 
+    # ---- Eviction / session lifecycle ----
+    @staticmethod
+    def _session_boundary(prev: Dict[str, Any] | None, new: Dict[str, Any]) -> str | None:
+        """Reason `new` starts a different session than `prev`, or None."""
+        if not prev:
+            return None
+        old_type, new_type = prev.get("session_type"), new.get("session_type")
+        if old_type and new_type and old_type != new_type:
+            return f"session_type {old_type} -> {new_type}"
+        old_left, new_left = prev.get("time_remaining_s"), new.get("time_remaining_s")
+        if (
+            isinstance(old_left, (int, float))
+            and isinstance(new_left, (int, float))
+            and new_left - old_left > SESSION_RESTART_JUMP_S
+        ):
+            return "time_remaining_s jumped up"
+        return None
+
+    def sweep(self, now: float | None = None) -> Dict[str, int]:
+        """Evict telemetry / stint / name entries older than their TTL.
+
+        Returns the number of entries evicted per domain and bumps the version
+        of every domain that lost entries.
+        """
+        now = time.time() if now is None else now
+        start = time.perf_counter()
+        evicted = dict.fromkeys(self._ttl_s, 0)
+        ttl = self._ttl_s
+        if ttl["telemetry"] > 0:
+            cutoff = now - ttl["telemetry"]
+            stale = [k for k, f in self._telemetry.items() if f.get("updated_at", 0.0) < cutoff]
+            for k in stale:
+                del self._telemetry[k]
+            evicted["telemetry"] = len(stale)
+        if ttl["stints"] > 0:
+            cutoff = now - ttl["stints"]
+            stale_idx = [k for k, seen in self._stint_seen.items() if seen < cutoff]
+            for k in stale_idx:
+                del self._stint_seen[k]
+                self._stints.pop(k, None)
+                self._cars.drop("stint", k)
+            evicted["stints"] = len(stale_idx)
+        if ttl["names"] > 0:
+            cutoff = now - ttl["names"]
+            # Cars still on the roster keep their names whatever their age
+            rostered = self.roster_by_car_idx()
+            stale_idx = [
+                k for k, seen in self._name_seen.items() if seen < cutoff and k not in rostered
+            ]
+            for k in stale_idx:
+                del self._name_seen[k]
+                self._car_idx_to_number.pop(k, None)
+                self._car_idx_to_name.pop(k, None)
+            evicted["names"] = len(stale_idx)
+        for domain, n in evicted.items():
+            if n:
+                self._evicted[domain] += n
+                self._bump(domain)
+        self._last_sweep = {
+            "at": now,
+            "evicted": evicted,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000.0, 3),
+        }
+        return evicted
+
+    def reset_session(self, reason: str = "manual"):
+        """Drop live per-session state (telemetry, standings, lap timing, stints,
+        pace, position tracking, gap trends, car names) at a session boundary.
+
+        The roster is kept and its names re-applied; standings history and the
+        incident / pit / chat rings are kept so earlier sessions stay queryable.
+        """
+        self._telemetry.clear()
+        self._standings_timestamp = None
+        self._standings_list = ()
+        self._lap_timing_timestamp = None
+        self._lap_timing_list = ()
+        self._gap_leader_by_car = {}
+        self._stints.clear()
+        self._stint_seen.clear()
+        self._cars = CarTable(self._cars.capacity)
+        self._cars_loaded = {"standings": 0, "lap_timing": 0}
+        self._pace.reset()
+        self._positions.rebase()
+        self._gaps.reset()
+        self._car_idx_to_number.clear()
+        self._car_idx_to_name.clear()
+        self._name_seen.clear()
+        for domain in ("standings", "lap_timing"):
+            self._restored.pop(domain, None)
+        for domain in ("telemetry", "standings", "lap_timing", "stints", "pace", "names"):
+            self._bump(domain)
+        for d in self._roster:
+            if isinstance(d.get("CarIdx"), int):
+                self._set_names(int(d["CarIdx"]), d.get("CarNumber"), d.get("UserName"))
+        self._session_resets += 1
+        self._last_session_reset = {"at": time.time(), "reason": reason}
+
+    def eviction_stats(self) -> Dict[str, Any]:
+        return {
+            "ttl_s": dict(self._ttl_s),
+            "evicted_total": dict(self._evicted),
+            "last_sweep": self._last_sweep,
+            "session_resets": self._session_resets,
+            "last_session_reset": self._last_session_reset,
+        }
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Entries and approximate bytes held per domain (sampled, see core.memory)."""
+        hist = self._history.stats()
+        domains: Dict[str, Tuple[int, int]] = {
+            "telemetry": (len(self._telemetry), estimate(self.telemetry_view())),
+            "roster": (len(self._roster), estimate(self._roster)),
+            "standings": (len(self._standings_list), estimate(self._standings_list)),
+            "lap_timing": (len(self._lap_timing_list), estimate(self._lap_timing_list)),
+            "session_state": (
+                len(self._session_state_history),
+                estimate(self._session_state_history) + approx_size(self._session_state),
+            ),
+            "incidents": (len(self._incident_events), estimate(self.incidents_view())),
+            "pits": (len(self._pit_events), estimate(self.pits_view())),
+            "track_conditions": (
+                int(self._track_conditions is not None),
+                approx_size(self._track_conditions),
+            ),
+            "stints": (len(self._stints), estimate(tuple(self._stints.values()))),
+            "chat": (len(self._chat_messages), estimate(self._chat_messages)),
+            "pace": (sum(len(c.laps) for c in self._pace.cars()), self._pace.nbytes()),
+            "position_changes": (len(self._positions), self._positions.nbytes()),
+            "names": (
+                len(self._name_seen),
+                approx_size(self._car_idx_to_number) + approx_size(self._car_idx_to_name),
+            ),
+            "standings_history": (hist["frames"], hist["bytes"]),
+            "gap_trends": (int((self._gaps.ahead >= 0).sum()), self._gaps.nbytes()),
+            "car_table": (self._cars.capacity, self._cars.nbytes()),
+            "memo": (len(self._memo), 0),  # shares the objects counted above
+        }
+        return {
+            "domains": {
+                name: {"entries": n, "approx_bytes": b} for name, (n, b) in domains.items()
+            },
+            "total_approx_bytes": sum(b for _, b in domains.values()),
+        }
+
+    # ---- Versions ----
+    def _bump(self, domain: str):
+        self._versions[domain] += 1
+        if self._waiters:
+            self._wake(domain)
+
+    def _wake(self, domain: str):
+        pending = []
+        for watched, fut in self._waiters:
+            if fut.done():
+                continue
+            if watched is not None and domain not in watched:
+                pending.append((watched, fut))
+                continue
+            loop = fut.get_loop()
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                _resolve(fut)
+            else:  # writer on another thread / outside the loop
+                loop.call_soon_threadsafe(_resolve, fut)
+        self._waiters = pending
+
+    def version(self, domain: str) -> int:
+        return self._versions[domain]
+
+    def versions(self) -> dict[str, int]:
+        return {d: self._versions[d] for d in DOMAINS}
+
+    def snapshot_version(self) -> int:
+        """Single monotonic version for the live snapshot (sum of its domain versions)."""
+        return sum(self._versions[d] for d in SNAPSHOT_DOMAINS)
+
+    async def wait_for_change(
+        self,
+        domains: Iterable[str] | None = None,
+        after: Dict[str, int] | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, int]:
+        """Wait until one of `domains` (all when None) has a version newer than `after`.
+
+        `after` is a `versions()` mapping the caller already has; without it the
+        call waits for the next write. Returns the current versions of the
+        watched domains, unchanged when `timeout` elapsed first.
+        """
+        watched = tuple(domains) if domains is not None else DOMAINS
+        for d in watched:
+            if d not in DOMAINS:
+                raise ValueError(f"unknown domain {d!r}")
+        if after is not None and any(self._versions[d] > after.get(d, 0) for d in watched):
+            return {d: self._versions[d] for d in watched}
+        entry = (
+            frozenset(watched) if domains is not None else None,
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait_for(entry[1], timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+        return {d: self._versions[d] for d in watched}
+
+    def _memoized(self, name: str, key: Any, build: Callable[[], Any]) -> Any:
+        hit = self._memo.get(name)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        value = build()
+        self._memo[name] = (key, value)
+        return value
+
+    # ---- Zero-copy views (shared, read-only) ----
+    def roster_view(self) -> Tuple[Dict[str, Any], ...]:
+        return self._roster
+
+    def standings_view(self) -> Tuple[Dict[str, Any], ...]:
+        return self._standings_list
+
+    def lap_timing_view(self) -> Tuple[Dict[str, Any], ...]:
+        return self._lap_timing_list
+
+    def car_table(self) -> CarTable:
+        """Columnar view of standings / lap timing / stints, current as of this call.
+
+        Standings and lap timing columns are reloaded at most once per version, so
+        frames nobody queries never pay for the conversion. The arrays are updated
+        in place: use them before the next write.
+        """
+        loaded = self._cars_loaded
+        if loaded["standings"] != self._versions["standings"]:
+            self._cars.load_standings(self._standings_list)
+            loaded["standings"] = self._versions["standings"]
+        if loaded["lap_timing"] != self._versions["lap_timing"]:
+            self._cars.load_lap_timing(self._lap_timing_list)
+            loaded["lap_timing"] = self._versions["lap_timing"]
+        return self._cars
+
+    def pace(self) -> PaceTracker:
+        return self._pace
+
+    def position_changes(self) -> PositionChangeDetector:
+        return self._positions
+
+    def standings_history(self) -> StandingsHistory:
+        return self._history
+
+    def gaps(self) -> GapTracker:
+        return self._gaps
+
+    def roster_by_car_idx(self) -> Dict[int, Dict[str, Any]]:
+        """car_idx -> {"car_number", "name"} from the roster, memoized per roster version."""
+
+        def build() -> Dict[int, Dict[str, Any]]:
+            out: Dict[int, Dict[str, Any]] = {}
+            for d in self._roster:
+                idx = d.get("CarIdx")
+                if isinstance(idx, int):
+                    out[idx] = {
+                        "car_number": d.get("CarNumber"),
+                        "name": d.get("UserName") or d.get("display_name") or d.get("driver_id"),
+                    }
+            return out
+
+        return self._memoized("roster_by_car_idx", self._versions["roster"], build)
+
+    def telemetry_view(self) -> Tuple[Dict[str, Any], ...]:
+        return self._memoized(
+            "telemetry", self._versions["telemetry"], lambda: tuple(self._telemetry.values())
+        )
+
+    def incidents_view(self) -> Tuple[Dict[str, Any], ...]:
+        return self._memoized(
+            "incidents", self._versions["incidents"], lambda: tuple(self._incident_events)
+        )
+
+    def pits_view(self) -> Tuple[Dict[str, Any], ...]:
+        return self._memoized("pits", self._versions["pits"], lambda: tuple(self._pit_events))
+
+    def leaderboard_view(self) -> Tuple[Dict[str, Any], ...]:
+        """`snapshot_leaderboard` rows, rebuilt only when standings or car names change."""
+        key = (self._versions["standings"], self._versions["names"])
+        return self._memoized("leaderboard", key, self._build_leaderboard)
+
+    # ---- Warm restore ----
+    def mark_restored(self, domain: str, timestamp: float | None):
+        """Flag `domain` as holding a restored snapshot taken at `timestamp`."""
+        self._restored[domain] = float(timestamp or 0.0)
+
+    def restored(self) -> dict[str, float]:
+        """Domains still serving warm-restored data (no newer update seen yet)."""
+        return dict(self._restored)
+
+    def _supersedes(self, domain: str, timestamp: Any) -> bool:
+        restored = self._restored.get(domain)
+        if restored is None:
+            return True
+        if isinstance(timestamp, (int, float)) and 0 < timestamp < restored:
+            return False  # replayed data older than what was restored
+        del self._restored[domain]
+        return True
+
     # ---- Accessors ----
     def roster(self) -> list[dict]:
         return list(self._roster)
 
     def telemetry_frames(self) -> list[dict]:
-        return list(self._telemetry.values())
+        return [as_dict(f) for f in self.telemetry_view()]
 
     def standings(self) -> list[dict]:
         return list(self._standings_list)
@@ -134,13 +605,13 @@ class StateCache:
         return self._track_conditions.copy() if self._track_conditions else None
 
     def recent_incidents(self, n: int = 25) -> list[dict]:
-        return list(self._incident_events)[-n:]
+        return list(self.incidents_view()[-n:])
 
     def recent_pits(self, n: int = 25) -> list[dict]:
-        return list(self._pit_events)[-n:]
+        return list(self.pits_view()[-n:])
 
     def stint_for(self, car_idx: int) -> dict | None:
-        return self._stints.get(car_idx)
+        return as_dict(self._stints.get(car_idx))
 
     def leader(self) -> dict | None:
         if self._standings_list:
@@ -155,8 +626,9 @@ class StateCache:
 
     # Backward-compatible projection for existing tools expecting 'leaderboard'
     def snapshot_leaderboard(self) -> list[dict]:
-        if not self._standings_list:
-            return []
+        return list(self.leaderboard_view())
+
+    def _build_leaderboard(self) -> Tuple[Dict[str, Any], ...]:
         out: List[Dict[str, Any]] = []
         for entry in self._standings_list:
             car_idx = entry.get("car_idx")
@@ -176,4 +648,4 @@ class StateCache:
                     "pit_stops": None,
                 }
             )
-        return out
+        return tuple(out)
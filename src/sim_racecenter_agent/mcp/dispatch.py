@@ -0,0 +1,158 @@
+"""Pre-bound tool dispatch for the FastMCP server.
+
+The tool builders (`mcp/tools/build_*_tool`) return a spec whose handler
+closes over a StateCache. `ToolDispatcher` builds every cache-backed tool
+once per cache — the process cache when the lifespan context is ready, a
+session shard on its first call — and keeps those handlers on the cache
+(`StateCache.attached`): the handlers close over the cache, so holding them
+anywhere else would keep an evicted shard alive. A call is then a dict
+lookup plus the handler itself instead of rebuilding the spec, schemas and
+closure.
+
+FastMCP derives a tool's argument model from the callable's signature; each
+wrapper is a plain ``async def _wrapper(**kwargs)`` with a ``__signature__``
+listing the spec's input properties, typed from their JSON schema and all
+optional, so no source is generated. Cache-free specs marked
+``"blocking": True`` (SQLite search) run on the `ToolWorkerPool` when one is
+given; cache-backed handlers always run on the loop that mutates the cache,
+and hand any SQLite fallback back as an `Offload` that runs on the pool.
+Cache-backed specs that list ``"cache_domains"`` are answered through the
+`ResponseCache` when one is given, reusing a response until one of those
+StateCache domain versions changes.
+"""
+
+from __future__ import annotations
+
+import inspect
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..core.state_cache import StateCache
+from .response_cache import ResponseCache
+from .tools._meta import add_meta
+from .worker_pool import Offload, ToolPoolError, ToolWorkerPool
+
+Handler = Callable[[Dict[str, Any]], Any]
+Resolver = Callable[[Any], Optional[StateCache]]
+
+# JSON schema type -> annotation for the generated signature (anything else: Any)
+_JSON_TYPES: Dict[str, Any] = {
+    "integer": int,
+    "number": float,
+    "string": str,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+_SESSION_SCHEMA = {"type": "string"}
+
+
+def _needs_cache(build: Callable[..., dict]) -> bool:
+    return build.__code__.co_argcount == 1
+
+
+def _parameter(name: str, schema: Any) -> inspect.Parameter:
+    kind = schema.get("type") if isinstance(schema, dict) else None
+    annotation = _JSON_TYPES.get(kind, Any) if isinstance(kind, str) else Any
+    return inspect.Parameter(
+        name, inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[annotation]
+    )
+
+
+class ToolDispatcher:
+    """Tool specs built once; handlers bound once per StateCache."""
+
+    def __init__(
+        self,
+        builders: list[Callable[..., dict]],
+        resolve_cache: Resolver,
+        pool: Optional[ToolWorkerPool] = None,
+        responses: Optional[ResponseCache] = None,
+    ):
+        self._resolve = resolve_cache
+        self._pool = pool
+        self._responses = responses
+        placeholder = StateCache(1, 1)  # specs (names / schemas) do not depend on the cache
+        self.specs: Dict[str, dict] = {}
+        self._cache_builders: Dict[str, Callable[[StateCache], dict]] = {}
+        self._static: Dict[str, Handler] = {}
+        for build in builders:
+            if _needs_cache(build):
+                spec = build(placeholder)
+                self._cache_builders[spec["name"]] = build
+            else:
+                spec = build()
+                self._static[spec["name"]] = spec["handler"]
+            self.specs[spec["name"]] = spec
+        self._bound: "weakref.WeakSet[StateCache]" = weakref.WeakSet()
+        self.binds = 0
+
+    def bind(self, cache: StateCache) -> Dict[str, Handler]:
+        """Handlers of every cache-backed tool for `cache` (built on first use)."""
+        handlers = cache.attached.get(self)
+        if handlers is None:
+            handlers = {
+                name: build(cache)["handler"] for name, build in self._cache_builders.items()
+            }
+            cache.attached[self] = handlers
+            self._bound.add(cache)
+            self.binds += 1
+        return handlers
+
+    def bound_caches(self) -> int:
+        """Caches (process cache + live session shards) with handlers bound."""
+        return len(self._bound)
+
+    def handler(self, name: str, cache: Optional[StateCache] = None) -> Handler:
+        static = self._static.get(name)
+        if static is not None:
+            return static
+        if cache is None:
+            raise ValueError(f"tool {name!r} needs a cache")
+        return self.bind(cache)[name]
+
+    def wrapper(self, name: str) -> Callable[..., Awaitable[Any]]:
+        """Async callable for FastMCP: optional keyword args -> handler(args)."""
+        props = dict(self.specs[name].get("input_schema", {}).get("properties", {}))
+        accepted = frozenset(props)
+        static = self._static.get(name)
+        params = dict(props)
+        if static is None and "session" not in accepted:
+            params["session"] = _SESSION_SCHEMA  # cache-backed tools can target a session shard
+        resolve, bind, offload_pool = self._resolve, self.bind, self._pool
+        pool = self._pool if self.specs[name].get("blocking") else None
+        domains = self.specs[name].get("cache_domains")
+        responses = self._responses if domains and static is None else None
+
+        async def _wrapper(**kwargs: Any) -> Any:
+            args = {k: v for k, v in kwargs.items() if v is not None and k in accepted}
+            if static is not None and pool is not None:
+                try:
+                    return await pool.run(name, static, args)
+                except ToolPoolError as e:
+                    return add_meta(e.as_dict())
+            if static is not None:
+                result = static(args)
+            else:
+                session = kwargs.get("session")
+                cache = resolve(session)
+                if cache is None:
+                    return add_meta({"error": "unknown_session", "session": session})
+                handlers = cache.attached.get(self) or bind(cache)
+                if responses is not None:
+                    return responses.fetch(cache, name, args, domains, handlers[name])
+                result = handlers[name](args)
+                if isinstance(result, Offload):
+                    if offload_pool is None:
+                        return result()
+                    try:
+                        return await offload_pool.run(name, result.fn, *result.args)
+                    except ToolPoolError as e:
+                        return add_meta(e.as_dict())
+            return await result if inspect.isawaitable(result) else result
+
+        _wrapper.__name__ = name
+        _wrapper.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+            [_parameter(k, schema) for k, schema in params.items()]
+        )
+        return _wrapper
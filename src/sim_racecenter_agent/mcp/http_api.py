@@ -1,5 +1,6 @@
 from __future__ import annotations
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 import logging
 import inspect
 from pydantic import BaseModel
@@ -10,6 +11,7 @@ from sim_racecenter_agent.mcp.sdk_server import mcp  # type: ignore
 Endpoints:
     GET /mcp/list_tools -> {"tools": [{name, description, input_schema}]}
     POST /mcp/call_tool {"name": str, "arguments": {}} -> {"result": {...}}
+    GET /metrics -> ingest metrics in Prometheus text format
 """
 
 _LOG = logging.getLogger("mcp_http_api")
@@ -71,3 +73,12 @@ async def call_tool(req: CallToolRequest):  # type: ignore[override]
     except Exception as e:
         _LOG.debug("call_tool error name=%s args=%s err=%s", req.name, req.arguments, e)
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():  # type: ignore[override]
+    from sim_racecenter_agent.adapters import nats_listener as _nl
+
+    ingestor = _nl._LAST_INGESTOR
+    body = ingestor.prometheus_metrics() if ingestor is not None else ""
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,117 @@
+"""Version-keyed cache of tool responses.
+
+Agents poll the snapshot-style tools (live snapshot, roster, fastest lap,
+closest battle) far more often than the domains they read change. A tool opts
+in by listing those domains in its spec (``"cache_domains": (...)``); the
+dispatcher then looks the call up by (tool, normalized arguments) and reuses
+the stored response while every listed `StateCache.version` is unchanged. A
+write to any of them makes the next call rebuild and replace the entry, so
+nothing is invalidated explicitly and a response is never older than the
+domains it was built from.
+
+Entries live on the StateCache they were built from (`StateCache.attached`),
+one LRU of ``max_entries`` per cache, so an evicted session shard drops its
+responses with it. Hits return a shallow copy with a fresh ``generated_at``:
+the cached dict itself is never handed out, and nested values are the same
+immutable-by-convention views the handlers already return.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from ..core.state_cache import StateCache
+from .tools._meta import utc_now
+
+MAX_ENTRIES = 256
+
+_Entry = Tuple[Tuple[int, ...], Dict[str, Any]]
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    hash(value)  # TypeError for anything else unhashable
+    return value
+
+
+def args_key(args: Dict[str, Any]) -> Optional[Hashable]:
+    """Order-independent key for tool arguments; None when they cannot be hashed."""
+    try:
+        return _freeze(args)
+    except TypeError:
+        return None
+
+
+class ResponseCache:
+    """Per-StateCache LRU of tool responses, validated against domain versions."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max(0, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0  # misses that replaced an entry built at older versions
+        self.evictions = 0
+        self.bypassed = 0
+
+    def configure(self, max_entries: Optional[int] = None) -> None:
+        if max_entries is not None:
+            self.max_entries = max(0, int(max_entries))
+
+    def _entries(self, cache: StateCache) -> "OrderedDict[Hashable, _Entry]":
+        entries = cache.attached.get(self)
+        if entries is None:
+            entries = cache.attached[self] = OrderedDict()
+        return entries
+
+    def fetch(
+        self,
+        cache: StateCache,
+        tool: str,
+        args: Dict[str, Any],
+        domains: Sequence[str],
+        handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """`handler(args)`, or the response stored for the same call at the same versions."""
+        key = args_key(args)
+        if self.max_entries == 0 or key is None:
+            self.bypassed += 1
+            return handler(args)
+        key = (tool, key)
+        versions = tuple(cache.version(d) for d in domains)
+        entries = self._entries(cache)
+        entry = entries.get(key)
+        if entry is not None and entry[0] == versions:
+            self.hits += 1
+            entries.move_to_end(key)
+            return dict(entry[1], generated_at=utc_now())
+        self.misses += 1
+        if entry is not None:
+            self.invalidations += 1
+        response = handler(args)
+        if not isinstance(response, dict):
+            return response
+        entries[key] = (versions, response)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return dict(response)
+
+    def entries(self, cache: StateCache) -> int:
+        return len(cache.attached.get(self) or ())
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "bypassed": self.bypassed,
+        }
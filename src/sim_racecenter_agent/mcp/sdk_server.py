@@ -6,9 +6,23 @@ from sim_racecenter_agent.mcp.tools.search_corpus import build_search_corpus_too
 from sim_racecenter_agent.mcp.tools.get_fastest_practice import build_get_fastest_practice_tool
 from sim_racecenter_agent.mcp.tools.get_current_battle import build_get_current_battle_tool
 from sim_racecenter_agent.mcp.tools.get_live_snapshot import build_get_live_snapshot_tool
+from sim_racecenter_agent.mcp.tools.wait_live_snapshot import build_wait_live_snapshot_tool
+from sim_racecenter_agent.mcp.tools.get_pace_analysis import build_get_pace_analysis_tool
+from sim_racecenter_agent.mcp.tools.get_standings_at import build_get_standings_at_tool
+from sim_racecenter_agent.mcp.tools.get_gap_history import build_get_gap_history_tool
+from sim_racecenter_agent.mcp.tools.get_battles import build_get_battles_tool
+from sim_racecenter_agent.mcp.tools.get_recent_position_changes import (
+    build_get_recent_position_changes_tool,
+)
 from sim_racecenter_agent.mcp.tools._meta import add_meta
+from sim_racecenter_agent.mcp.dispatch import ToolDispatcher
+from sim_racecenter_agent.mcp.response_cache import ResponseCache
+from sim_racecenter_agent.mcp.worker_pool import ToolPoolError, ToolWorkerPool
+from sim_racecenter_agent.adapters import sqlite_reader
 from sim_racecenter_agent.adapters.nats_listener import run_telemetry_listener
+from sim_racecenter_agent.adapters.warm_restore import restore_state_cache
 from sim_racecenter_agent.config.settings import get_settings
+from sim_racecenter_agent.core.session_registry import DEFAULT_SESSION, SessionRegistry
 from sim_racecenter_agent.core.state_cache import StateCache
 
 # ruff: noqa: E402  (intentional sys.path manipulation before imports for flexible invocation)
@@ -19,9 +33,11 @@ Maintains same tool names & semantics for compatibility.
 """
 
 import asyncio
+import inspect
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from typing import Any
+import os
 import sys
 import pathlib
 import json
@@ -48,19 +64,87 @@ class AppContext:
         import time as _t
 
         self.started_at = _t.time()
+        self.warm_restore: dict | None = None
+        self.sessions: SessionRegistry | None = None
 
 
 _LAST_APP_CONTEXT: AppContext | None = None
 
 
+async def _sweep_loop(
+    cache: StateCache | SessionRegistry, interval_s: float, stop_event: asyncio.Event
+):
+    """Expire stale cache entries (and idle session shards) every `interval_s`."""
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval_s)
+        except asyncio.TimeoutError:
+            cache.sweep()
+
+
 @asynccontextmanager
 # type: ignore[override]
 async def lifespan(_server: FastMCP) -> AsyncIterator[AppContext]:
     settings = get_settings()
-    cache = StateCache(settings.snapshot_pos_history, settings.incident_ring_size)
+
+    def new_cache() -> StateCache:
+        return StateCache(
+            settings.snapshot_pos_history,
+            settings.incident_ring_size,
+            pace_history_laps=settings.pace_history_laps,
+            pace_window=settings.pace_window,
+            position_change_ring_size=settings.position_change_ring_size,
+            standings_history_s=settings.standings_history_s,
+            gap_trend_samples=settings.gap_trend_samples,
+            telemetry_ttl_s=settings.telemetry_ttl_s,
+            stint_ttl_s=settings.stint_ttl_s,
+            names_ttl_s=settings.names_ttl_s,
+        )
+
+    cache = new_cache()
+    sessions = None
+    if settings.enable_session_shards:
+        # The process cache stays the default shard (bare subjects, SQLite, warm restore)
+        sessions = SessionRegistry(
+            new_cache,
+            default=cache,
+            max_sessions=settings.max_sessions,
+            idle_ttl_s=settings.session_idle_ttl_s,
+        )
+    warm_restore = None
+    if settings.enable_warm_restore:
+        # Serve the last persisted state until JetStream / live frames supersede it
+        warm_restore = restore_state_cache(
+            cache,
+            os.environ.get("SQLITE_PATH", settings.sqlite_path),
+            max_age_s=settings.warm_restore_max_age_s,
+        )
     stop_event = asyncio.Event()
-    listener_task = asyncio.create_task(run_telemetry_listener(cache, settings, stop_event))
+    listener_task = asyncio.create_task(
+        run_telemetry_listener(cache, settings, stop_event, sessions)
+    )
+    sweep_task = None
+    if settings.cache_sweep_interval_s > 0:
+        sweep_task = asyncio.create_task(
+            _sweep_loop(sessions or cache, settings.cache_sweep_interval_s, stop_event)
+        )
     ctx = AppContext(cache, stop_event, listener_task)
+    ctx.warm_restore = warm_restore
+    ctx.sessions = sessions
+    if _DISPATCHER is not None:
+        _DISPATCHER.bind(cache)  # session shards bind on their first call
+    _TOOL_POOL.configure(
+        max_workers=settings.tool_pool_workers,
+        limit=settings.tool_pool_concurrency,
+        timeout_s=settings.tool_pool_timeout_s,
+        queue_limit=settings.tool_pool_queue_limit,
+    )
+    sqlite_reader.configure(
+        max_idle=settings.sqlite_read_pool_size,
+        mmap_bytes=settings.sqlite_read_mmap_mb * 1024 * 1024,
+        cache_kib=settings.sqlite_read_cache_mb * 1024,
+    )
+    _RESPONSE_CACHE.configure(max_entries=settings.response_cache_size)
     global _LAST_APP_CONTEXT
     _LAST_APP_CONTEXT = ctx
     try:
@@ -71,12 +155,21 @@ async def lifespan(_server: FastMCP) -> AsyncIterator[AppContext]:
             await asyncio.wait_for(listener_task, timeout=10)
         except asyncio.TimeoutError:  # pragma: no cover
             pass
+        if sweep_task is not None:
+            await sweep_task
+        _TOOL_POOL.shutdown()
 
 
 _existing_builders = [
     build_get_live_snapshot_tool,
+    build_wait_live_snapshot_tool,
     build_get_current_battle_tool,
     build_get_fastest_practice_tool,
+    build_get_pace_analysis_tool,
+    build_get_recent_position_changes_tool,
+    build_get_standings_at_tool,
+    build_get_gap_history_tool,
+    build_get_battles_tool,
     build_search_corpus_tool,
     build_search_chat_tool,
     build_get_roster_tool,
@@ -84,45 +177,40 @@ _existing_builders = [
 ]
 
 
+# Answers tool calls made before the lifespan has started (tests, catalog listing)
+_EMPTY_CACHE = StateCache(1, 1)
+
+
+def _session_cache(session: Any = None) -> StateCache | None:
+    """Cache a tool call reads: the `session` shard, the process cache without one.
+
+    None for a session that is not (or no longer) being ingested.
+    """
+    ctx = _LAST_APP_CONTEXT
+    if ctx is None:
+        return _EMPTY_CACHE
+    if not session:
+        return ctx.cache
+    if ctx.sessions is None:
+        return ctx.cache if session == DEFAULT_SESSION else None
+    return ctx.sessions.get(str(session))
+
+
+_DISPATCHER: ToolDispatcher | None = None
+# Threads for tools that block on SQLite, so searches never stall the ingest loop
+_TOOL_POOL = ToolWorkerPool()
+_TOOL_POOL.set_tool("get_session_persistence_status", limit=1)
+# Snapshot-style responses reused until a StateCache domain they read changes
+_RESPONSE_CACHE = ResponseCache()
+
+
 def _register_legacy_tools():
-    dummy_cache = StateCache(1, 1)
-    for build in _existing_builders:
-        needs_cache = build.__code__.co_argcount == 1
-        spec = build(dummy_cache) if needs_cache else build()
-        name = spec["name"]
+    global _DISPATCHER
+    _DISPATCHER = ToolDispatcher(_existing_builders, _session_cache, _TOOL_POOL, _RESPONSE_CACHE)
+    for name, spec in _DISPATCHER.specs.items():
         description = spec.get("description", name)
-        input_props_local = spec.get("input_schema", {}).get("properties", {})
-        # Simpler closure-based wrapper; no context parameter so FastMCP won't require one.
-
-        def _make(active_spec: dict, needs_cache_flag: bool, input_props: dict[str, Any]):
-            # Build explicit parameter list so pydantic model doesn't create a 'kwargs' required field.
-            params = ", ".join(f"{k}: Any | None = None" for k in input_props.keys())
-            header = f"async def _wrapper({params}):" if params else "async def _wrapper():"
-            body = [
-                "    from sim_racecenter_agent.mcp.sdk_server import _LAST_APP_CONTEXT, StateCache",
-                "    cache = _LAST_APP_CONTEXT.cache if _LAST_APP_CONTEXT else StateCache(1,1)",
-                "    spec_local = build(cache) if needs_cache_flag else active_spec",
-                "    handler = spec_local['handler']",
-                "    args: dict[str, Any] = {}",
-            ]
-            for k in input_props.keys():
-                body.append(f"    if {k} is not None: args['{k}'] = {k}")
-            body.append("    return handler(args)")
-            src = "\n".join([header] + body)
-            local_ns: dict[str, Any] = {
-                "Any": Any,
-                "build": build,
-                "needs_cache_flag": needs_cache_flag,
-                "active_spec": active_spec,
-            }
-            exec(src, local_ns, local_ns)
-            fn = local_ns["_wrapper"]
-            fn.__name__ = active_spec["name"]  # type: ignore[attr-defined]
-            return fn
-
-        tool_fn = _make(spec, needs_cache, input_props_local)
         if mcp is not None:
-            mcp.tool(name=name, description=description)(tool_fn)  # type: ignore[misc]
+            mcp.tool(name=name, description=description)(_DISPATCHER.wrapper(name))  # type: ignore[misc]
 
 
 def _init_server():
@@ -141,7 +229,7 @@ mcp = _init_server()
 # type: ignore[misc]
 @mcp.tool(
     name="get_operational_status",
-    description="Operational status: ingest running, cache stats, uptime",
+    description="Operational status: ingest running, cache stats and memory, uptime",
 )
 async def get_operational_status() -> dict:
     import time as _t
@@ -160,12 +248,44 @@ async def get_operational_status() -> dict:
         "telemetry_ingest": {"enabled": telemetry_enabled, "running": telemetry_running},
         "uptime_s": round(uptime_s, 3) if uptime_s is not None else None,
         "cache": {
-            "roster_size": len(cache.roster()),
-            "lap_timing_records": len(cache.lap_timing()),
-            "standings_records": len(cache.standings()),
+            "roster_size": len(cache.roster_view()),
+            "lap_timing_records": len(cache.lap_timing_view()),
+            "standings_records": len(cache.standings_view()),
             "has_session_state": bool(cache.session_state()),
+            "versions": cache.versions(),
+            "memory": cache.memory_report(),
+            "eviction": cache.eviction_stats(),
         },
     }
+    if ctx is not None and ctx.sessions is not None:
+        result["sessions"] = ctx.sessions.stats()
+    result["tool_pool"] = _TOOL_POOL.stats()
+    result["sqlite_read_pools"] = sqlite_reader.pool_stats()
+    result["response_cache"] = dict(_RESPONSE_CACHE.stats(), entries=_RESPONSE_CACHE.entries(cache))
+    if ctx is not None and ctx.warm_restore is not None:
+        result["warm_restore"] = dict(ctx.warm_restore, still_serving=cache.restored())
+    from sim_racecenter_agent.adapters import nats_listener as _nl
+
+    ingestor = _nl._LAST_INGESTOR
+    if ingestor is not None:
+        result["persistence"] = ingestor.persistence_metrics()
+        result["coalescing"] = ingestor.coalescing_metrics()
+    return add_meta(result)
+
+
+# type: ignore[misc]
+@mcp.tool(
+    name="get_ingest_metrics",
+    description="Per-subject ingest rates, lag, stage latency percentiles and NATS backlog",
+)
+async def get_ingest_metrics() -> dict:
+    from sim_racecenter_agent.adapters import nats_listener as _nl
+
+    ingestor = _nl._LAST_INGESTOR
+    if ingestor is None:
+        return add_meta({"subjects": {}, "error": "no_ingestor"})
+    result = ingestor.ingest_metrics()
+    result["persistence"] = ingestor.persistence_metrics()
     return add_meta(result)
 
 
@@ -191,6 +311,14 @@ async def get_recent_chat_messages(limit: int = 25) -> dict:
     description="Snapshot table row counts & latest timestamps",
 )
 async def get_session_persistence_status() -> dict:
+    try:
+        out = await _TOOL_POOL.run("get_session_persistence_status", _persistence_status)
+    except ToolPoolError as e:
+        out = e.as_dict()
+    return add_meta(out)
+
+
+def _persistence_status() -> dict:
     import sqlite3
     import os
     import time as _t
@@ -206,7 +334,7 @@ async def get_session_persistence_status() -> dict:
     ]
     if not os.path.exists(path):
         out["error"] = "sqlite_missing"
-        return add_meta(out)
+        return out
     try:
         conn = sqlite3.connect(path)
         try:
@@ -222,7 +350,7 @@ async def get_session_persistence_status() -> dict:
     except Exception as e:  # pragma: no cover
         out["error"] = f"sqlite_open_failed:{e}"
     out["queried_ts"] = f"{_t.time():.6f}"
-    return add_meta(out)
+    return out
 
 
 def run_stdio():
@@ -284,6 +412,8 @@ def run_stdio():
                             else:
                                 try:
                                     res = tools[name]["handler"](args)
+                                    if inspect.isawaitable(res):
+                                        res = asyncio.run(res)
                                     sys.stdout.write(
                                         json.dumps({"jsonrpc": "2.0", "id": rid, "result": res})
                                         + "\n"
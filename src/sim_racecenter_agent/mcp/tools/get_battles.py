@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+# Tool: get_battles
+# Every adjacent pair in the running order within `max_gap_s`, from standings gap_ahead_s
+# (whole field, unlike get_current_battle which needs telemetry CarDist*). Each pair carries the
+# closing rate (s/lap, positive = closing) from a rolling regression over the last
+# GAP_TREND_SAMPLES frames and, when closing, laps to catch / projected catch lap.
+
+import time
+from typing import Any, Dict
+
+from ...core.gaps import SORT_KEYS
+from ...core.state_cache import StateCache
+
+
+def build_get_battles_tool(cache: StateCache):
+    def handler(args: Dict[str, Any]) -> Dict[str, Any]:
+        gaps = cache.gaps()
+        names = cache.roster_by_car_idx()
+        base: Dict[str, Any] = {
+            "schema_version": 1,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "window_samples": gaps.window,
+        }
+
+        def enrich(row: Dict[str, Any]) -> Dict[str, Any]:
+            row.update(names.get(row["car_idx"], {}))
+            ahead = names.get(row["ahead_car_idx"], {})
+            row["ahead_car_number"] = ahead.get("car_number")
+            row["ahead_name"] = ahead.get("name")
+            return row
+
+        if args.get("car_idx") is not None:
+            row = gaps.pair(int(args["car_idx"]))
+            return {**base, "battle": enrich(row) if row else None}
+
+        max_gap_s = max(0.0, min(float(args.get("max_gap_s", 1.5)), 10.0))
+        top_n = max(1, min(int(args.get("top_n", 10)), 64))
+        min_samples = max(1, int(args.get("min_samples", 5)))
+        sort_by = args.get("sort_by") if args.get("sort_by") in SORT_KEYS else "gap"
+        rows, closing = gaps.ranked(max_gap_s, min_samples, sort_by)
+        return {
+            **base,
+            "max_gap_s": max_gap_s,
+            "sort_by": sort_by,
+            "count": int(rows.size),
+            # Only the returned pairs are turned into dicts
+            "battles": [enrich(gaps.describe(int(r), closing[r])) for r in rows[:top_n]],
+        }
+
+    return {
+        "name": "get_battles",
+        "description": (
+            "Close adjacent pairs across the whole field from standings gaps, ranked by gap or "
+            "closing rate (s/lap) with projected catch lap; or one car vs the car ahead"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "max_gap_s": {"type": "number", "minimum": 0, "maximum": 10, "default": 1.5},
+                "top_n": {"type": "integer", "minimum": 1, "maximum": 64, "default": 10},
+                "sort_by": {"type": "string", "enum": list(SORT_KEYS), "default": "gap"},
+                "min_samples": {"type": "integer", "minimum": 1, "default": 5},
+                "car_idx": {"type": "integer", "minimum": 0},
+            },
+        },
+        "output_schema": {"type": "object"},
+        "handler": handler,
+    }
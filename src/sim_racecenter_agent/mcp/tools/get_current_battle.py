@@ -10,7 +10,7 @@ def build_get_current_battle_tool(cache: StateCache):
     def handler(args: dict) -> dict:
         top_n = int(args.get("top_n_pairs", 1))
         max_dist = float(args.get("max_distance_m", 50.0))
-        frames = cache.telemetry_frames()
+        frames = cache.telemetry_view()
         pairs: Dict[tuple[str, str], dict] = {}
         emulator_any = False
         for fr in frames:
@@ -63,7 +63,7 @@ def build_get_current_battle_tool(cache: StateCache):
             "schema_version": 1,
             "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             "pairs": pair_list,
-            "roster_size": len(cache.roster()),
+            "roster_size": len(cache.roster_view()),
             "emulator": bool(emulator_any),
             "top_n_requested": top_n,
             "max_distance_m": max_dist,
@@ -81,4 +81,5 @@ def build_get_current_battle_tool(cache: StateCache):
         },
         "output_schema": {"type": "object"},
         "handler": handler,
+        "cache_domains": ("telemetry", "roster"),
     }
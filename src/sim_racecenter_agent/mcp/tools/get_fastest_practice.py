@@ -3,6 +3,7 @@ from __future__ import annotations
 # Tool: get_fastest_practice
 # Select the fastest driver in the current (practice) session based on best lap time when
 # available (lap_timing snapshot). Falls back to standings last_lap_s if lap timing not present.
+# Ranking runs on the cache's columnar CarTable; only the returned rows become dicts.
 
 import time
 from typing import Any, Dict, List
@@ -13,63 +14,21 @@ from ...core.state_cache import StateCache
 def build_get_fastest_practice_tool(cache: StateCache):
     def handler(args: Dict[str, Any]) -> Dict[str, Any]:
         top_n = int(args.get("top_n", 5))
-        lap_timing = cache.lap_timing()
-        standings = cache.standings()
-        roster = cache.roster()
-        # Build car_idx -> (car_number, name) mapping
-        num_name: Dict[int, Dict[str, Any]] = {}
-        for d in roster:
-            idx = d.get("CarIdx")
-            if isinstance(idx, int):
-                num_name[idx] = {
-                    "car_number": d.get("CarNumber"),
-                    "name": d.get("UserName") or d.get("display_name") or d.get("driver_id"),
-                }
+        table = cache.car_table()
+        # car_idx -> (car_number, name), built once per roster version
+        num_name = cache.roster_by_car_idx()
         # Use lap_timing priority
-        records: List[Dict[str, Any]] = []
-        source = "lap_timing" if lap_timing else "standings"
-        if lap_timing:
-            for r in lap_timing:
-                car_idx = r.get("car_idx")
-                if not isinstance(car_idx, int):
-                    continue
-                best = r.get("best_lap_s")
-                last = r.get("last_lap_s")
-                lap = r.get("lap")
-                # Exclude sentinel / invalid values (None, <=0, negative lap index)
-                if best is None or not isinstance(best, (int, float)) or best <= 0:
-                    continue
-                if isinstance(lap, (int, float)) and lap < 0:
-                    continue
-                enriched = {
-                    "car_idx": car_idx,
-                    "best_lap_s": best,
-                    "last_lap_s": last,
-                    "lap": lap,
-                }
-                enriched.update(num_name.get(car_idx, {}))
-                # Add gap to current provisional fastest later
-                records.append(enriched)
-            records.sort(key=lambda x: x.get("best_lap_s", 9e9))
+        source = "lap_timing" if table.count("lap_timing") else "standings"
+        if source == "lap_timing":
+            # Exclude sentinel / invalid values (None, <=0, negative lap index)
+            ranked = table.ranked("best_lap_s", "lap_timing", positive=True)
+            ranked = ranked[~(table.column("timing_lap")[ranked] < 0)]
+            best_col, last_col, lap_col = "best_lap_s", "timing_last_lap_s", "timing_lap"
         else:
             # Fallback: derive "best" from last_lap_s standings if present
-            for s in standings:
-                car_idx = s.get("car_idx")
-                if not isinstance(car_idx, int):
-                    continue
-                last = s.get("last_lap_s")
-                if last is None or not isinstance(last, (int, float)) or last <= 0:
-                    continue
-                enriched = {
-                    "car_idx": car_idx,
-                    "best_lap_s": last,
-                    "last_lap_s": last,
-                    "lap": s.get("lap"),
-                }
-                enriched.update(num_name.get(car_idx, {}))
-                records.append(enriched)
-            records.sort(key=lambda x: x.get("best_lap_s", 9e9))
-        if not records:
+            ranked = table.ranked("last_lap_s", "standings", positive=True)
+            best_col, last_col, lap_col = "last_lap_s", "last_lap_s", "lap"
+        if not len(ranked):
             return {
                 "schema_version": 1,
                 "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -78,17 +37,28 @@ def build_get_fastest_practice_tool(cache: StateCache):
                 "top_n": [],
                 "message": "No lap timing data yet.",
             }
-        fastest_time = records[0]["best_lap_s"]
-        for r in records:
-            if r.get("best_lap_s") is not None and fastest_time is not None:
-                r["gap_fastest_s"] = round(r["best_lap_s"] - fastest_time, 3)
+        fastest_time = table.value(best_col, int(ranked[0]))
+        records: List[Dict[str, Any]] = []
+        # Only the rows that are returned get materialized
+        for car_idx in ranked[: max(1, top_n)].tolist():
+            best = table.value(best_col, car_idx)
+            enriched = {
+                "car_idx": car_idx,
+                "best_lap_s": best,
+                "last_lap_s": table.value(last_col, car_idx),
+                "lap": table.value(lap_col, car_idx),
+            }
+            enriched.update(num_name.get(car_idx, {}))
+            if best is not None and fastest_time is not None:
+                enriched["gap_fastest_s"] = round(best - fastest_time, 3)
+            records.append(enriched)
         return {
             "schema_version": 1,
             "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             "source": source,
             "fastest": records[0],
             "top_n": records[:top_n],
-            "count": len(records),
+            "count": len(ranked),
         }
 
     return {
@@ -101,4 +71,5 @@ def build_get_fastest_practice_tool(cache: StateCache):
         },
         "output_schema": {"type": "object"},
         "handler": handler,
+        "cache_domains": ("standings", "lap_timing", "roster"),
     }
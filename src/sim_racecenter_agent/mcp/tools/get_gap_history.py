@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+# Tool: get_gap_history
+# Gap between two cars over the last `seconds` (or a [start_ts, end_ts] window): one point per
+# standings frame, gap = car_b.gap_leader_s - car_a.gap_leader_s (positive: B behind A).
+# In-memory standings history first; windows older than it are read from SQLite on the tool
+# worker pool through the shared read-only connection pool.
+
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from ...adapters import standings_archive
+from ...adapters.sqlite_reader import read_pool
+from ...core.state_cache import StateCache
+from ..worker_pool import Offload
+
+DB_PATH_ENV = "SQLITE_PATH"
+DEFAULT_DB = "data/agent.db"
+MAX_POINTS = 600
+
+
+def _summary(series: List[tuple]) -> Optional[Dict[str, Any]]:
+    """Over every frame in the window (before downsampling)."""
+    gaps = [gap for _, gap, _, _ in series if gap is not None]
+    if not gaps:
+        return None
+    return {
+        "first_gap_s": gaps[0],
+        "last_gap_s": gaps[-1],
+        "min_gap_s": min(gaps),
+        "max_gap_s": max(gaps),
+        "change_s": round(gaps[-1] - gaps[0], 3),
+    }
+
+
+def _respond(
+    base: Dict[str, Any], source: str, series: List[tuple], max_points: int
+) -> Dict[str, Any]:
+    frames = len(series)
+    summary = _summary(series)
+    if frames > max_points:
+        # Even stride, always keeping the newest frame
+        step = frames / max_points
+        series = [series[int(i * step)] for i in range(max_points - 1)] + [series[-1]]
+    points = [
+        {"ts": ts, "gap_s": gap, "pos_a": pos_a, "pos_b": pos_b} for ts, gap, pos_a, pos_b in series
+    ]
+    return {**base, "source": source, "frames": frames, "points": points, "summary": summary}
+
+
+def _from_sqlite(base: Dict[str, Any], max_points: int) -> Dict[str, Any]:
+    """SQLite fallback; blocking, so the dispatcher runs it on the tool worker pool."""
+    pool = read_pool(os.environ.get(DB_PATH_ENV, DEFAULT_DB))
+    try:
+        conn = pool.acquire()
+        if conn is None:
+            return {**base, "source": None, "points": [], "error": "database_missing"}
+        try:
+            series = standings_archive.gap_series(
+                conn, base["car_a"], base["car_b"], base["start_ts"], base["end_ts"]
+            )
+        finally:
+            pool.release(conn)
+    except sqlite3.Error as e:
+        return {**base, "source": None, "points": [], "error": f"sqlite_error:{e}"}
+    return _respond(base, "sqlite", series, max_points)
+
+
+def build_get_gap_history_tool(cache: StateCache):
+    def handler(args: Dict[str, Any]) -> Any:
+        base: Dict[str, Any] = {
+            "schema_version": 1,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        if args.get("car_a") is None or args.get("car_b") is None:
+            return {**base, "points": [], "error": "car_a and car_b are required"}
+        car_a, car_b = int(args["car_a"]), int(args["car_b"])
+        history = cache.standings_history()
+        end = float(args["end_ts"]) if args.get("end_ts") is not None else None
+        end = end if end is not None else (history.newest_ts() or time.time())
+        if args.get("start_ts") is not None:
+            start = float(args["start_ts"])
+        else:
+            start = end - max(0.0, float(args.get("seconds", 60.0)))
+        max_points = max(2, min(int(args.get("max_points", 120)), MAX_POINTS))
+        names = cache.roster_by_car_idx()
+        base.update(
+            {
+                "car_a": car_a,
+                "car_b": car_b,
+                "start_ts": start,
+                "end_ts": end,
+                "car_a_info": names.get(car_a),
+                "car_b_info": names.get(car_b),
+            }
+        )
+        if not history.covers(start):
+            return Offload(_from_sqlite, base, max_points)
+        return _respond(base, "memory", history.gap_series(car_a, car_b, start, end), max_points)
+
+    return {
+        "name": "get_gap_history",
+        "description": (
+            "Gap between two cars over time (per standings frame): last N seconds or a ts "
+            "window, with first/last/min/max and net change; positive gap = car_b behind car_a"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "car_a": {"type": "integer", "minimum": 0},
+                "car_b": {"type": "integer", "minimum": 0},
+                "seconds": {"type": "number", "minimum": 0, "default": 60},
+                "start_ts": {"type": "number"},
+                "end_ts": {"type": "number"},
+                "max_points": {
+                    "type": "integer",
+                    "minimum": 2,
+                    "maximum": MAX_POINTS,
+                    "default": 120,
+                },
+            },
+        },
+        "output_schema": {"type": "object"},
+        "handler": handler,
+    }
@@ -1,36 +1,155 @@
 from __future__ import annotations
 
 import time
+from typing import Any, Callable, Dict, List, Tuple
 
-from ...core.state_cache import StateCache
+import pydantic_core
+
+from ...core.state_cache import SNAPSHOT_DOMAINS, StateCache
+
+# Section -> (default cap, keep the tail). Ranked lists keep their head, event
+# lists their most recent (tail) entries; a None cap means the whole list.
+LIST_SECTIONS: Dict[str, Tuple[int | None, bool]] = {
+    "standings_top": (15, False),
+    "leaderboard": (None, False),
+    "lap_timing_top": (15, False),
+    "incidents_recent": (20, True),
+    "pits_recent": (20, True),
+    "drivers_preview": (5, False),
+}
+DICT_SECTIONS = ("session_state", "track_conditions")
+SECTIONS = DICT_SECTIONS + tuple(LIST_SECTIONS)
+MIN_BYTES = 512  # fixed fields plus a `truncated` entry for every section
+MAX_TOP_N = 100
+
+
+def _json_size(value: Any) -> int:
+    """Bytes of `value` as FastMCP sends a tool result (2-space indented JSON)."""
+    return len(pydantic_core.to_json(value, fallback=str, indent=2))
+
+
+def _item_size(item: Any) -> int:
+    # An element of a top-level list sits two levels deep: 4 more spaces per line, plus ",\n"
+    raw = pydantic_core.to_json(item, fallback=str, indent=2)
+    return len(raw) + 4 * (raw.count(b"\n") + 1) + 2
+
+
+def _fit(out: Dict[str, Any], max_bytes: int) -> None:
+    """Trim `out` in place until it serializes to at most `max_bytes`.
+
+    One item at a time comes off whichever list section is currently largest
+    (ranked lists lose their tail, event lists their oldest entries); the dict
+    sections are dropped whole only once every list is empty. A section
+    trimmed to nothing is omitted. Items dropped per section (1 for a dict
+    section) are reported under ``truncated``.
+    """
+    sizes: Dict[str, List[int]] = {}
+    dropped: Dict[str, int] = {}
+    while True:
+        excess = _json_size(out) - max_bytes
+        if excess <= 0:
+            return
+        if not sizes:
+            sizes = {k: [_item_size(i) for i in out[k]] for k in LIST_SECTIONS if out.get(k)}
+        totals = {k: sum(v) for k, v in sizes.items() if v}
+        if totals:
+            cut = {k: 0 for k in totals}
+            while excess > 0 and totals:
+                k = max(totals, key=totals.__getitem__)
+                tail = LIST_SECTIONS[k][1]
+                size = sizes[k].pop(0 if tail else -1)
+                cut[k] += 1
+                excess -= size
+                totals[k] -= size
+                if not sizes[k]:
+                    del totals[k]
+            for k, n in cut.items():
+                if not n:
+                    continue
+                kept = len(out[k]) - n
+                if kept:
+                    out[k] = out[k][n:] if LIST_SECTIONS[k][1] else out[k][:kept]
+                else:
+                    del out[k]
+                dropped[k] = dropped.get(k, 0) + n
+        else:
+            present = [k for k in SECTIONS if k in out]
+            if not present:
+                return  # only the fixed fields are left
+            k = max(present, key=lambda s: _json_size(out[s]))
+            del out[k]
+            dropped[k] = dropped.get(k, 0) + int(k in DICT_SECTIONS)
+        out["truncated"] = dict(dropped)
 
 
 def build_get_live_snapshot_tool(cache: StateCache):
+    def roster_preview(cap: int | None) -> List[Dict[str, Any]]:
+        return [
+            {"CarIdx": d.get("CarIdx"), "car": d.get("CarNumber"), "name": d.get("UserName")}
+            for d in cache.roster_view()[:cap]
+        ]
+
+    # Section -> full (uncapped) source; lists are shared read-only views
+    sources: Dict[str, Callable[[], Any]] = {
+        "session_state": lambda: cache.session_state() or {},
+        "track_conditions": lambda: cache.track_conditions() or {},
+        "standings_top": cache.standings_view,
+        "leaderboard": cache.leaderboard_view,  # backward compatible
+        "lap_timing_top": cache.lap_timing_view,
+        "incidents_recent": cache.incidents_view,
+        "pits_recent": cache.pits_view,
+    }
+
     def handler(args: dict) -> dict:
-        sess_state = cache.session_state() or {}
-        tc = cache.track_conditions() or {}
-        standings = cache.standings()
-        return {
+        fields = args.get("fields")
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+        wanted = SECTIONS if not fields else [f for f in SECTIONS if f in fields]
+        top_n = args.get("top_n")
+        top_n = min(max(int(top_n), 1), MAX_TOP_N) if top_n is not None else None
+        out: Dict[str, Any] = {
             "schema_version": 2,
             "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "session_state": sess_state,
-            "track_conditions": tc,
-            "standings_top": standings[:15],
-            "leaderboard": cache.snapshot_leaderboard(),  # backward compatible
-            "lap_timing_top": cache.lap_timing()[:15],
-            "incidents_recent": cache.recent_incidents(20),
-            "pits_recent": cache.recent_pits(20),
-            "roster_size": len(cache.roster()),
-            "drivers_preview": [
-                {"CarIdx": d.get("CarIdx"), "car": d.get("CarNumber"), "name": d.get("UserName")}
-                for d in cache.roster()[:5]
-            ],
+            "version": cache.snapshot_version(),
         }
+        # Only the requested sections are assembled; only their slices are new lists
+        for name in wanted:
+            if name in DICT_SECTIONS:
+                out[name] = sources[name]()
+                continue
+            cap, tail = LIST_SECTIONS[name]
+            cap = top_n if top_n is not None else cap
+            if name == "drivers_preview":
+                out[name] = roster_preview(cap)
+            elif tail:
+                out[name] = list(sources[name]()[-cap:]) if cap else []
+            else:
+                out[name] = list(sources[name]()[:cap])
+        out["roster_size"] = len(cache.roster_view())
+        if fields:
+            unknown = [f for f in fields if f not in SECTIONS]
+            if unknown:
+                out["unknown_fields"] = unknown
+        max_bytes = args.get("max_bytes")
+        if max_bytes is not None:
+            _fit(out, max(int(max_bytes), MIN_BYTES))
+        return out
 
     return {
         "name": "get_live_snapshot",
-        "description": "Return current composite live snapshot (standings, session, timing, events)",
-        "input_schema": {"type": "object", "properties": {}},
+        "description": (
+            "Return current composite live snapshot (standings, session, timing, events); "
+            "fields selects sections, top_n caps every list, max_bytes trims to a size budget"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "fields": {"type": "array", "items": {"type": "string", "enum": list(SECTIONS)}},
+                "top_n": {"type": "integer", "minimum": 1, "maximum": MAX_TOP_N},
+                "max_bytes": {"type": "integer", "minimum": MIN_BYTES},
+            },
+        },
         "output_schema": {"type": "object"},
         "handler": handler,
+        "cache_domains": SNAPSHOT_DOMAINS + ("names",),  # leaderboard shows names
     }
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+# Tool: get_pace_analysis
+# Rolling pace per car from the in-memory lap history (core/pace.py): rolling mean / median
+# over the last N clean laps, std dev (consistency), best-N average and trend slope.
+# Field mode ranks cars by `sort_by`; with `car_idx` it returns that car plus its recent laps.
+
+import time
+from typing import Any, Dict, List
+
+from ...core.state_cache import StateCache
+
+SORT_KEYS = ("rolling_mean_s", "rolling_median_s", "best_n_avg_s", "std_dev_s", "trend_s_per_lap")
+
+
+def build_get_pace_analysis_tool(cache: StateCache):
+    def handler(args: Dict[str, Any]) -> Dict[str, Any]:
+        pace = cache.pace()
+        names = cache.roster_by_car_idx()
+        base: Dict[str, Any] = {
+            "schema_version": 1,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "window": pace.window,
+            "best_n": pace.best_n,
+        }
+        car_idx = args.get("car_idx")
+        if car_idx is not None:
+            car = pace.car(int(car_idx))
+            if car is None:
+                return {**base, "car": None, "laps": [], "message": "No laps recorded for car."}
+            summary = car.summary()
+            summary.update(names.get(car.car_idx, {}))
+            laps = car.recent(max(0, min(int(args.get("laps", 10)), pace.history)))
+            return {**base, "car": summary, "laps": laps}
+
+        sort_by = args.get("sort_by") or "rolling_mean_s"
+        if sort_by not in SORT_KEYS:
+            sort_by = "rolling_mean_s"
+        top_n = max(1, min(int(args.get("top_n", 10)), 64))
+        min_laps = max(1, int(args.get("min_laps", 3)))
+        rows: List[Dict[str, Any]] = []
+        for car in pace.cars():
+            if car.window_laps < min_laps:
+                continue
+            summary = car.summary()
+            if summary.get(sort_by) is None:
+                continue
+            summary.update(names.get(car.car_idx, {}))
+            rows.append(summary)
+        if not rows:
+            return {
+                **base,
+                "sort_by": sort_by,
+                "cars": [],
+                "quickest": None,
+                "most_consistent": None,
+                "message": "Not enough laps recorded yet.",
+            }
+        rows.sort(key=lambda r: r[sort_by])
+        quickest = min(rows, key=lambda r: r["rolling_mean_s"])
+        consistent = [r for r in rows if r.get("std_dev_s") is not None]
+        return {
+            **base,
+            "sort_by": sort_by,
+            "count": len(rows),
+            "cars": rows[:top_n],
+            "quickest": quickest,
+            "most_consistent": (
+                min(consistent, key=lambda r: r["std_dev_s"]) if consistent else None
+            ),
+        }
+
+    return {
+        "name": "get_pace_analysis",
+        "description": (
+            "Rolling pace per car over the last N clean laps: mean, median, std dev "
+            "(consistency), best-N average and trend; or one car's stats and recent laps"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "car_idx": {"type": "integer", "minimum": 0},
+                "sort_by": {"type": "string", "enum": list(SORT_KEYS)},
+                "top_n": {"type": "integer", "minimum": 1, "maximum": 64, "default": 10},
+                "min_laps": {"type": "integer", "minimum": 1, "default": 3},
+                "laps": {"type": "integer", "minimum": 0, "default": 10},
+            },
+        },
+        "output_schema": {"type": "object"},
+        "handler": handler,
+    }
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+# Tool: get_recent_position_changes
+# Overtakes and position gains / losses detected by diffing consecutive standings frames
+# (core/position_changes.py), newest first. Answers "what just happened" from recorded events
+# instead of comparing raw snapshots. `since_id` lets a poller fetch only events it hasn't seen:
+# those pages are oldest first and `last_id` is the cursor for the next call.
+
+import time
+from typing import Any, Dict, List
+
+from ...core.position_changes import EVENT_TYPES
+from ...core.state_cache import StateCache
+
+MAX_LIMIT = 200
+
+
+def build_get_recent_position_changes_tool(cache: StateCache):
+    def handler(args: Dict[str, Any]) -> Dict[str, Any]:
+        changes = cache.position_changes()
+        names = cache.roster_by_car_idx()
+        limit = max(1, min(int(args.get("limit", 20)), MAX_LIMIT))
+        types = [t for t in args.get("types") or () if t in EVENT_TYPES] or None
+        car_idx = args.get("car_idx")
+        since_ts = args.get("since_ts")
+        since_id = args.get("since_id")
+        filters = {
+            "types": types,
+            "car_idx": int(car_idx) if car_idx is not None else None,
+            "since_ts": float(since_ts) if since_ts is not None else None,
+        }
+        last_id = changes.last_id
+        if since_id is None:
+            events = changes.recent(limit, **filters)
+        else:
+            events = changes.since(int(since_id), limit, **filters)
+            # A full page stops at its last event; otherwise every event up to last_id was seen
+            if len(events) == limit:
+                last_id = events[-1]["id"]
+        out: List[Dict[str, Any]] = []
+        for ev in events:
+            row = dict(ev)
+            row.update(names.get(ev["car_idx"], {}))
+            passed = ev.get("passed_car_idx")
+            if passed is not None:
+                info = names.get(passed, {})
+                row["passed_car_number"] = info.get("car_number")
+                row["passed_name"] = info.get("name")
+            out.append(row)
+        return {
+            "schema_version": 1,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "last_id": last_id,
+            "count": len(out),
+            "events": out,
+        }
+
+    return {
+        "name": "get_recent_position_changes",
+        "description": (
+            "Recent overtakes and position gains/losses (newest first) with gap context; "
+            "filter by type, car_idx or since_ts. since_id pages oldest first: pass back last_id"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "minimum": 1, "maximum": MAX_LIMIT, "default": 20},
+                "types": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": list(EVENT_TYPES)},
+                },
+                "car_idx": {"type": "integer", "minimum": 0},
+                "since_ts": {"type": "number"},
+                "since_id": {"type": "integer", "minimum": 0},
+            },
+        },
+        "output_schema": {"type": "object"},
+        "handler": handler,
+    }
@@ -8,7 +8,7 @@ from ...core.state_cache import StateCache
 
 def build_get_roster_tool(cache: StateCache):
     def handler(args: Dict[str, Any]) -> Dict[str, Any]:  # pragma: no cover - trivial
-        drivers = cache.roster()
+        drivers = cache.roster_view()
         # Normalize keys exposed
         out = [
             {
@@ -31,4 +31,5 @@ def build_get_roster_tool(cache: StateCache):
         "input_schema": {"type": "object", "properties": {}},
         "output_schema": {"type": "object"},
         "handler": handler,
+        "cache_domains": ("roster",),
     }
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+# Tool: get_standings_at
+# Running order as it was at a past moment: `ts` (publisher epoch seconds) or `seconds_ago`
+# (relative to the newest standings frame). Served from the in-memory standings history
+# (core/standings_history.py); older moments fall back to the indexed SQLite snapshots, read
+# on the tool worker pool through the shared read-only connection pool.
+
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ...adapters import standings_archive
+from ...adapters.sqlite_reader import read_pool
+from ...core.state_cache import StateCache
+from ..worker_pool import Offload
+
+DB_PATH_ENV = "SQLITE_PATH"
+DEFAULT_DB = "data/agent.db"
+
+
+def _respond(
+    base: Dict[str, Any], source: Optional[str], found: Optional[Tuple[float, list]], top_n: int
+) -> Dict[str, Any]:
+    if found is None:
+        return {**base, "source": source, "cars": [], "message": "No standings at that time."}
+    frame_ts, rows = found
+    return {
+        **base,
+        "source": source,
+        "frame_ts": frame_ts,
+        "age_s": round(base["requested_ts"] - frame_ts, 3),
+        "count": len(rows),
+        "cars": rows[:top_n],
+    }
+
+
+def _from_sqlite(base: Dict[str, Any], top_n: int) -> Dict[str, Any]:
+    """SQLite fallback; blocking, so the dispatcher runs it on the tool worker pool."""
+    pool = read_pool(os.environ.get(DB_PATH_ENV, DEFAULT_DB))
+    try:
+        conn = pool.acquire()
+        if conn is None:
+            return _respond(base, None, None, top_n)
+        try:
+            found = standings_archive.standings_at(conn, base["requested_ts"])
+        finally:
+            pool.release(conn)
+    except sqlite3.Error as e:
+        return {**base, "source": None, "cars": [], "error": f"sqlite_error:{e}"}
+    return _respond(base, "sqlite", found, top_n)
+
+
+def build_get_standings_at_tool(cache: StateCache):
+    def handler(args: Dict[str, Any]) -> Any:
+        history = cache.standings_history()
+        now = history.newest_ts() or time.time()
+        if args.get("ts") is not None:
+            ts = float(args["ts"])
+        else:
+            ts = now - max(0.0, float(args.get("seconds_ago", 0.0)))
+        top_n = max(1, min(int(args.get("top_n", 64)), 64))
+        base: Dict[str, Any] = {
+            "schema_version": 1,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "requested_ts": ts,
+            "history_oldest_ts": history.oldest_ts(),
+        }
+        if not history.covers(ts):
+            return Offload(_from_sqlite, base, top_n)
+        found = history.state_at(ts)
+        if found is not None:
+            names = cache.roster_by_car_idx()
+            for r in found[1]:
+                r.update(names.get(r["car_idx"], {}))
+        return _respond(base, "memory", found, top_n)
+
+    return {
+        "name": "get_standings_at",
+        "description": (
+            "Running order (positions, laps, gaps) at a past moment given as ts or seconds_ago; "
+            "recent history from memory, older from the SQLite archive"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "ts": {"type": "number"},
+                "seconds_ago": {"type": "number", "minimum": 0},
+                "top_n": {"type": "integer", "minimum": 1, "maximum": 64, "default": 64},
+            },
+        },
+        "output_schema": {"type": "object"},
+        "handler": handler,
+    }
@@ -1,20 +1,17 @@
 from __future__ import annotations
 
 import os
-import sqlite3
 import time
 from typing import Any
 
+from ...adapters.sqlite_reader import ReadPool, read_pool
+
 DB_PATH_ENV = "SQLITE_PATH"
 DEFAULT_DB = "data/agent.db"
 
 
-def _open_conn():
-    path = os.environ.get(DB_PATH_ENV, DEFAULT_DB)
-    # read-only URI if possible
-    if not os.path.exists(path):
-        return None
-    return sqlite3.connect(path)
+def _pool() -> ReadPool:
+    return read_pool(os.environ.get(DB_PATH_ENV, DEFAULT_DB))
 
 
 def build_search_chat_tool():
@@ -48,7 +45,8 @@ def build_search_chat_tool():
             limit = 100
         username = args.get("username")
         day = args.get("day")
-        conn = _open_conn()
+        pool = _pool()
+        conn = pool.acquire()
         if conn is None:
             return {
                 "schema_version": 1,
@@ -61,10 +59,7 @@ def build_search_chat_tool():
             }
         try:
             # Check if FTS table exists
-            cur = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='chat_messages_fts'"
-            )
-            if not cur.fetchone():
+            if not pool.has_table(conn, "chat_messages_fts"):
                 return {
                     "schema_version": 1,
                     "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -109,7 +104,7 @@ def build_search_chat_tool():
                 "results": results,
             }
         finally:
-            conn.close()
+            pool.release(conn)
 
     return {
         "name": "search_chat",
@@ -126,4 +121,6 @@ def build_search_chat_tool():
         },
         "output_schema": {"type": "object"},
         "handler": handler,
+        # Synchronous SQLite: the server runs it on the tool worker pool
+        "blocking": True,
     }
@@ -5,22 +5,20 @@ import sqlite3
 import time
 from typing import Any, Dict, List
 
+from ...adapters.sqlite_reader import ReadPool, read_pool
+
 DB_PATH_ENV = "SQLITE_PATH"
 DEFAULT_DB = "data/agent.db"
 
 
-def _open_conn():
-    path = os.environ.get(DB_PATH_ENV, DEFAULT_DB)
-    if not os.path.exists(path):
-        return None
-    return sqlite3.connect(path)
+def _pool() -> ReadPool:
+    return read_pool(os.environ.get(DB_PATH_ENV, DEFAULT_DB))
 
 
 def _search_rules(
-    conn: sqlite3.Connection, q: str, limit: int
+    pool: ReadPool, conn: sqlite3.Connection, q: str, limit: int
 ) -> tuple[List[Dict[str, Any]], int, str | None]:
-    cur = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='documents_fts'")
-    if not cur.fetchone():
+    if not pool.has_table(conn, "documents_fts"):
         return [], 0, "fts_missing"
     sql = (
         "SELECT d.id, d.chunk_idx, bm25(documents_fts) as score, substr(d.text, max(1, instr(lower(d.text), lower(?)) - 60), 180) "
@@ -42,12 +40,9 @@ def _search_rules(
 
 
 def _search_chat(
-    conn: sqlite3.Connection, q: str, limit: int
+    pool: ReadPool, conn: sqlite3.Connection, q: str, limit: int
 ) -> tuple[List[Dict[str, Any]], int, str | None]:
-    cur = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='chat_messages_fts'"
-    )
-    if not cur.fetchone():
+    if not pool.has_table(conn, "chat_messages_fts"):
         return [], 0, "fts_missing"
     sql = (
         "SELECT cm.id, cm.username, cm.message, cm.ts_iso, bm25(chat_messages_fts) as score "
@@ -109,7 +104,8 @@ def build_search_corpus_tool():
         requested_scopes = [s for s in requested_scopes if s in {"rules", "chat"}]
         if not requested_scopes:
             requested_scopes = ["rules", "chat"]
-        conn = _open_conn()
+        pool = _pool()
+        conn = pool.acquire()
         if conn is None:
             return {
                 "schema_version": 1,
@@ -128,9 +124,9 @@ def build_search_corpus_tool():
             errors: Dict[str, str] = {}
             for scope in requested_scopes:
                 if scope == "rules":
-                    res, cnt, err = _search_rules(conn, q, per_scope_limit)
+                    res, cnt, err = _search_rules(pool, conn, q, per_scope_limit)
                 elif scope == "chat":
-                    res, cnt, err = _search_chat(conn, q, per_scope_limit)
+                    res, cnt, err = _search_chat(pool, conn, q, per_scope_limit)
                 else:  # unreachable due to filtering
                     continue
                 if err:
@@ -153,7 +149,7 @@ def build_search_corpus_tool():
                 "errors": errors,
             }
         finally:
-            conn.close()
+            pool.release(conn)
 
     return {
         "name": "search_corpus",
@@ -170,4 +166,6 @@ def build_search_corpus_tool():
         },
         "output_schema": {"type": "object"},
         "handler": handler,
+        # Synchronous SQLite: the server runs it on the tool worker pool
+        "blocking": True,
     }
@@ -1,18 +1,16 @@
 from __future__ import annotations
 
 import os
-import sqlite3
 import time
 
+from ...adapters.sqlite_reader import ReadPool, read_pool
+
 DB_PATH_ENV = "SQLITE_PATH"
 DEFAULT_DB = "data/agent.db"
 
 
-def _open_conn():
-    path = os.environ.get(DB_PATH_ENV, DEFAULT_DB)
-    if not os.path.exists(path):
-        return None
-    return sqlite3.connect(path)
+def _pool() -> ReadPool:
+    return read_pool(os.environ.get(DB_PATH_ENV, DEFAULT_DB))
 
 
 def build_search_rules_tool():
@@ -44,7 +42,8 @@ def build_search_rules_tool():
         if limit > 50:
             limit = 50
         doc_type = args.get("doc_type", "sporting_code")
-        conn = _open_conn()
+        pool = _pool()
+        conn = pool.acquire()
         if conn is None:
             return {
                 "schema_version": 1,
@@ -56,10 +55,7 @@ def build_search_rules_tool():
                 "error": "database_missing",
             }
         try:
-            cur = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='documents_fts'"
-            )
-            if not cur.fetchone():
+            if not pool.has_table(conn, "documents_fts"):
                 return {
                     "schema_version": 1,
                     "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -94,7 +90,7 @@ def build_search_rules_tool():
                 "results": results,
             }
         finally:
-            conn.close()
+            pool.release(conn)
 
     return {
         "name": "search_rules",
@@ -110,4 +106,6 @@ def build_search_rules_tool():
         },
         "output_schema": {"type": "object"},
         "handler": handler,
+        # Synchronous SQLite: the server runs it on the tool worker pool
+        "blocking": True,
     }
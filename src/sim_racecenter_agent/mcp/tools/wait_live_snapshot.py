@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+# Tool: wait_live_snapshot
+# Long-poll variant of get_live_snapshot. With `after_version` (the `version` of a snapshot the
+# caller already has) it returns as soon as newer data exists, or a small "unchanged" body once
+# `wait_s` elapses. Without it the current snapshot is returned immediately. `fields` / `top_n` /
+# `max_bytes` shape the snapshot as in get_live_snapshot.
+
+import time
+from typing import Any, Dict
+
+from ...core.state_cache import SNAPSHOT_DOMAINS, StateCache
+from .get_live_snapshot import build_get_live_snapshot_tool
+
+MAX_WAIT_S = 60.0
+
+
+def build_wait_live_snapshot_tool(cache: StateCache):
+    snapshot_spec = build_get_live_snapshot_tool(cache)
+    snapshot = snapshot_spec["handler"]
+    shape_props = snapshot_spec["input_schema"]["properties"]
+
+    async def handler(args: Dict[str, Any]) -> Dict[str, Any]:
+        after = args.get("after_version")
+        wait_s = min(max(float(args.get("wait_s", 25.0)), 0.0), MAX_WAIT_S)
+        t0 = time.perf_counter()
+        changed = True
+        if after is not None and cache.snapshot_version() <= int(after):
+            await cache.wait_for_change(SNAPSHOT_DOMAINS, timeout=wait_s)
+            changed = cache.snapshot_version() > int(after)
+        if changed:
+            out = snapshot({k: args[k] for k in shape_props if k in args})
+        else:
+            out = {
+                "schema_version": 2,
+                "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "version": cache.snapshot_version(),
+            }
+        out["changed"] = changed
+        out["waited_s"] = round(time.perf_counter() - t0, 3)
+        return out
+
+    return {
+        "name": "wait_live_snapshot",
+        "description": (
+            "Long-poll live snapshot: returns once the snapshot is newer than after_version "
+            "(or immediately without it); changed=false after wait_s with no new data"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "after_version": {"type": "integer", "minimum": 0},
+                "wait_s": {"type": "number", "minimum": 0, "maximum": MAX_WAIT_S, "default": 25.0},
+                **shape_props,
+            },
+        },
+        "output_schema": {"type": "object"},
+        "handler": handler,
+    }
@@ -0,0 +1,261 @@
+"""Bounded worker pool for MCP tools that block on SQLite.
+
+FastMCP serves every tool on the event loop that also runs the NATS ingestor
+(see `sdk_server.lifespan`), so a synchronous FTS query over a large chat
+archive would stall telemetry ingest for its whole duration. Tools whose spec
+sets ``"blocking": True`` (and the persistence status tool) run their handler
+on a small ThreadPoolExecutor instead; cache-only tools stay inline. A
+cache-backed tool with an SQLite fallback returns an `Offload` for just that
+branch, so the cache is still read on the loop.
+
+Each tool has its own concurrency limit (calls running in a thread), a queue
+limit (calls waiting for a slot; further calls are rejected as busy) and a
+timeout covering queue wait plus run time. A call that times out returns an
+error to the client, but its thread runs to completion and keeps the tool's
+slot until it does, so the limit always bounds real threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from ..adapters.ingest_metrics import LatencyHistogram
+
+
+class ToolPoolError(Exception):
+    """A pooled call did not run to completion (see `error`)."""
+
+    error = "tool_pool_error"
+
+    def __init__(self, tool: str, **details: Any):
+        super().__init__(tool)
+        self.tool = tool
+        self.details = details
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"error": self.error, "tool": self.tool, **self.details}
+
+
+class ToolBusy(ToolPoolError):
+    error = "tool_busy"
+
+
+class ToolTimeout(ToolPoolError):
+    error = "tool_timeout"
+
+
+class Offload:
+    """Blocking remainder of a cache-backed tool call: ``fn(*args)``.
+
+    The dispatcher runs it on the tool pool; calling it runs it inline.
+    """
+
+    __slots__ = ("fn", "args")
+
+    def __init__(self, fn: Callable[..., Any], *args: Any):
+        self.fn = fn
+        self.args = args
+
+    def __call__(self) -> Any:
+        return self.fn(*self.args)
+
+
+class _ToolSlots:
+    __slots__ = (
+        "limit",
+        "timeout_s",
+        "queue_limit",
+        "active",
+        "waiters",
+        "max_queued",
+        "calls",
+        "completed",
+        "errors",
+        "timeouts",
+        "rejected",
+        "wait",
+        "run",
+    )
+
+    def __init__(self, limit: int, timeout_s: float, queue_limit: int):
+        self.limit = max(1, int(limit))
+        self.timeout_s = float(timeout_s)
+        self.queue_limit = max(0, int(queue_limit))
+        self.active = 0  # calls holding a slot (submitted to the executor, not finished)
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.max_queued = 0
+        self.calls = 0
+        self.completed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.wait = LatencyHistogram()
+        self.run = LatencyHistogram()
+
+    def release(self) -> None:
+        """Hand the slot to the next live waiter, or free it."""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # slot transfers: `active` is unchanged
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "timeout_s": self.timeout_s,
+            "queue_limit": self.queue_limit,
+            "active": self.active,
+            "queued": sum(1 for w in self.waiters if not w.done()),
+            "max_queued": self.max_queued,
+            "calls": self.calls,
+            "completed": self.completed,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "wait": self.wait.snapshot(),
+            "run": self.run.snapshot(),
+        }
+
+
+class ToolWorkerPool:
+    """Thread pool shared by blocking tools, with per-tool slots and metrics."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        limit: int = 2,
+        timeout_s: float = 10.0,
+        queue_limit: int = 32,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.default_limit = limit
+        self.default_timeout_s = timeout_s
+        self.default_queue_limit = queue_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tools: Dict[str, _ToolSlots] = {}
+        self._overrides: Dict[str, Dict[str, Any]] = {}
+
+    def configure(
+        self,
+        max_workers: Optional[int] = None,
+        limit: Optional[int] = None,
+        timeout_s: Optional[float] = None,
+        queue_limit: Optional[int] = None,
+    ) -> None:
+        """Apply pool-wide settings (the lifespan calls this before serving)."""
+        if max_workers is not None and int(max_workers) != self.max_workers:
+            self.shutdown()
+            self.max_workers = max(1, int(max_workers))
+        if limit is not None:
+            self.default_limit = limit
+        if timeout_s is not None:
+            self.default_timeout_s = timeout_s
+        if queue_limit is not None:
+            self.default_queue_limit = queue_limit
+        for name in list(self._tools):
+            self._apply(name)
+
+    def set_tool(self, name: str, **overrides: Any) -> None:
+        """Per-tool `limit` / `timeout_s` / `queue_limit`, kept across `configure`."""
+        self._overrides.setdefault(name, {}).update(overrides)
+        if name in self._tools:
+            self._apply(name)
+
+    def _apply(self, name: str) -> None:
+        opts = self._overrides.get(name, {})
+        slots = self._tools[name]
+        slots.limit = max(1, int(opts.get("limit", self.default_limit)))
+        slots.timeout_s = float(opts.get("timeout_s", self.default_timeout_s))
+        slots.queue_limit = max(0, int(opts.get("queue_limit", self.default_queue_limit)))
+
+    def _slots(self, name: str) -> _ToolSlots:
+        slots = self._tools.get(name)
+        if slots is None:
+            slots = self._tools[name] = _ToolSlots(
+                self.default_limit, self.default_timeout_s, self.default_queue_limit
+            )
+            self._apply(name)
+        return slots
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="mcp-tool"
+            )
+        return self._executor
+
+    async def run(self, tool: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """`fn(*args)` on a worker thread under `tool`'s slot, queue and timeout limits.
+
+        Raises ToolBusy when the tool's queue is full and ToolTimeout when the
+        call does not finish within the tool's timeout.
+        """
+        slots = self._slots(tool)
+        loop = asyncio.get_running_loop()
+        slots.calls += 1
+        deadline = time.perf_counter() + slots.timeout_s
+        t0 = time.perf_counter()
+        if slots.active >= slots.limit or slots.waiters:
+            queued = sum(1 for w in slots.waiters if not w.done())
+            if queued >= slots.queue_limit:
+                slots.rejected += 1
+                raise ToolBusy(tool, queued=queued)
+            waiter = loop.create_future()
+            slots.waiters.append(waiter)
+            slots.max_queued = max(slots.max_queued, queued + 1)
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), timeout=slots.timeout_s)
+            except asyncio.TimeoutError:
+                if waiter.done():  # granted a slot just as we gave up: pass it on
+                    slots.release()
+                else:
+                    waiter.cancel()
+                slots.timeouts += 1
+                raise ToolTimeout(tool, timeout_s=slots.timeout_s, stage="queued") from None
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    slots.release()
+                else:
+                    waiter.cancel()
+                raise
+        else:
+            slots.active += 1
+        t1 = time.perf_counter()
+        slots.wait.record(t1 - t0)
+
+        future = loop.run_in_executor(self._pool(), fn, *args)
+
+        def _done(fut: asyncio.Future) -> None:
+            slots.release()
+            slots.run.record(time.perf_counter() - t1)
+            if fut.cancelled() or fut.exception() is not None:
+                slots.errors += 1
+            else:
+                slots.completed += 1
+
+        future.add_done_callback(_done)
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), timeout=max(0.0, deadline - time.perf_counter())
+            )
+        except asyncio.TimeoutError:
+            slots.timeouts += 1
+            raise ToolTimeout(tool, timeout_s=slots.timeout_s, stage="running") from None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "tools": {name: slots.stats() for name, slots in self._tools.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting work; running threads finish in the background."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
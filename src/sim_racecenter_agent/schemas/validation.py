@@ -2,13 +2,27 @@
 
 Lightweight wrapper using jsonschema. Only validates structure for newly
 implemented extended metrics & event/history subjects.
+
+Each schema is compiled once into a cached validator instance (`compile_all`
+warms the cache at startup). `is_valid` honours a process-wide mode set via
+`configure`:
+
+  full     every message is checked against the full schema (default)
+  sampled  1-in-N messages per subject get the full check; the rest only the
+           type guard
+  off      type guard only
+
+The type guard is a small check generated from each schema: the payload must
+be an object whose required keys are present and whose top-level properties
+have the declared JSON types. It keeps handlers safe from malformed frames at
+a fraction of the full validation cost.
 """
 
 from __future__ import annotations
 import json
 from pathlib import Path
 from functools import lru_cache
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 try:
     import jsonschema
@@ -41,27 +55,135 @@ SCHEMA_MAP = {
 }
 
 
+VALIDATION_MODES = ("full", "sampled", "off")
+
+_MODE = "full"
+_SAMPLE_EVERY = 10
+_seen: Dict[str, int] = {}
+_full_checks: Dict[str, int] = {}
+_guard_checks: Dict[str, int] = {}
+
+_JSON_TYPES: Dict[str, tuple[type, ...]] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+
+def _schema_for(subject: str) -> Dict[str, Any]:
+    schema_file = SCHEMA_MAP.get(subject)
+    if not schema_file:
+        raise ValueError(f"No schema registered for subject {subject}")
+    return _load_schema(schema_file)
+
+
+@lru_cache(maxsize=64)
+def _validator(subject: str) -> Any:
+    """Compiled validator for `subject` (schema checked once, instance reused)."""
+    schema = _schema_for(subject)
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+@lru_cache(maxsize=64)
+def _type_guard(subject: str) -> Callable[[Any], bool]:
+    """Generate the cheap top-level shape check for `subject`."""
+    schema = _schema_for(subject)
+    required = tuple(schema.get("required", ()))
+    typed: list[tuple[str, tuple[type, ...], bool]] = []
+    for key, prop in (schema.get("properties") or {}).items():
+        declared = prop.get("type")
+        if not declared:
+            continue
+        names = declared if isinstance(declared, list) else [declared]
+        types: tuple[type, ...] = ()
+        for n in names:
+            types += _JSON_TYPES.get(n, ())
+        # bool is an int subclass; only accept it where the schema says boolean
+        typed.append((key, types, "boolean" in names))
+
+    def guard(payload: Any) -> bool:
+        if not isinstance(payload, dict):
+            return False
+        for key in required:
+            if key not in payload:
+                return False
+        for key, types, bool_ok in typed:
+            if key in payload:
+                value = payload[key]
+                if not isinstance(value, types) or (isinstance(value, bool) and not bool_ok):
+                    return False
+        return True
+
+    return guard
+
+
+def compile_all() -> int:
+    """Compile every registered schema up front; returns the number compiled."""
+    count = 0
+    for subject in SCHEMA_MAP:
+        _type_guard(subject)
+        if jsonschema is not None:
+            _validator(subject)
+        count += 1
+    return count
+
+
+def configure(mode: str = "full", sample_every: int = 10) -> None:
+    """Set the process-wide `is_valid` mode (full | sampled | off)."""
+    global _MODE, _SAMPLE_EVERY
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Unknown validation mode {mode!r}; expected one of {VALIDATION_MODES}")
+    _MODE = mode
+    _SAMPLE_EVERY = max(1, int(sample_every))
+    _seen.clear()
+
+
+def mode() -> str:
+    return _MODE
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "mode": _MODE,
+        "sample_every": _SAMPLE_EVERY,
+        "full_checks": dict(_full_checks),
+        "guard_checks": dict(_guard_checks),
+    }
+
+
 def validate(subject: str, payload: Dict[str, Any]) -> None:
-    """Validate payload against subject schema.
+    """Validate payload against subject schema (always the full check).
 
     Raises jsonschema.ValidationError on failure. If jsonschema is not
     installed, this function is a no-op.
     """
     if jsonschema is None:
         return
-    schema_file = SCHEMA_MAP.get(subject)
-    if not schema_file:
-        raise ValueError(f"No schema registered for subject {subject}")
-    schema = _load_schema(schema_file)
-    jsonschema.validate(instance=payload, schema=schema)
+    _validator(subject).validate(payload)
 
 
 def is_valid(subject: str, payload: Dict[str, Any]) -> bool:
-    try:
-        validate(subject, payload)
-        return True
-    except Exception:
+    if subject not in SCHEMA_MAP:
         return False
+    full = _MODE == "full"
+    if _MODE == "sampled":
+        n = _seen.get(subject, 0)
+        _seen[subject] = n + 1
+        full = n % _SAMPLE_EVERY == 0
+    if full and jsonschema is not None:
+        _full_checks[subject] = _full_checks.get(subject, 0) + 1
+        try:
+            return bool(_validator(subject).is_valid(payload))
+        except Exception:
+            return False
+    _guard_checks[subject] = _guard_checks.get(subject, 0) + 1
+    return _type_guard(subject)(payload)
 
 
 EXAMPLES: Dict[str, Dict[str, Any]] = {
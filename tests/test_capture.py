@@ -0,0 +1,92 @@
+import asyncio
+import json
+import os
+
+from sim_racecenter_agent.adapters.capture import (
+    CaptureReader,
+    CaptureWriter,
+    index_path,
+    replay,
+)
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.schemas.validation import EXAMPLES
+
+
+def _write(path, n=1000, start=1000.0, block_bytes=4096):
+    with CaptureWriter(str(path), block_bytes=block_bytes, flush_interval_s=0) as w:
+        for i in range(n):
+            subject = "iracing.standings" if i % 2 else "iracing.pit"
+            w.write(subject, json.dumps({"i": i}).encode(), ts=start + i * 0.1)
+    return w
+
+
+def test_roundtrip_preserves_order_and_payloads(tmp_path):
+    path = tmp_path / "race.cap"
+    w = _write(path)
+    assert w.stats()["blocks"] > 1 and w.stats()["ratio"] > 1
+    reader = CaptureReader(str(path))
+    recs = list(reader)
+    assert len(recs) == len(reader) == 1000
+    assert [json.loads(r.data)["i"] for r in recs] == list(range(1000))
+    assert recs[1].subject == "iracing.standings" and recs[1].ts == 1000.1
+    assert reader.summary()["subjects"] == {"iracing.pit": 500, "iracing.standings": 500}
+
+
+def test_time_window_and_subject_filter_use_index(tmp_path):
+    path = tmp_path / "race.cap"
+    _write(path)
+    reader = CaptureReader(str(path))
+    recs = list(reader.records(start_ts=1050.0, end_ts=1059.95, subjects=["iracing.pit"]))
+    assert [json.loads(r.data)["i"] for r in recs] == list(range(500, 600, 2))
+
+
+def test_append_after_torn_tail_and_missing_index(tmp_path):
+    path = tmp_path / "race.cap"
+    _write(path, n=100)
+    with open(path, "ab") as fh:
+        fh.write(b"\x10\x00\x00")  # interrupted block header
+    os.remove(index_path(str(path)))
+    _write(path, n=10, start=2000.0)
+    recs = list(CaptureReader(str(path)))
+    assert len(recs) == 110 and recs[-1].ts == 2000.9
+
+
+def test_replay_into_ingestor_handlers(tmp_path, monkeypatch):
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    path = tmp_path / "race.cap"
+    with CaptureWriter(str(path)) as w:
+        for subject in ("iracing.standings", "iracing.incident", "iracing.stint"):
+            w.write(subject, json.dumps(EXAMPLES[subject]).encode())
+    ing = NATSIngestor(StateCache(1, 50), Settings(sqlite_path=str(db)))
+    callbacks = ing.live_callbacks()
+
+    async def run():
+        ing.start_mailboxes()
+
+        async def sink(rec):
+            await callbacks[rec.subject](rec)
+
+        result = await replay(CaptureReader(str(path)), sink, speed=0)
+        await ing.close()
+        return result
+
+    result = asyncio.run(run())
+    assert result["records"] == 3
+    assert ing.cache.standings()
+    assert len(ing.cache.recent_incidents(10)) == 1
+    assert ing.cache.stint_for(EXAMPLES["iracing.stint"]["car_idx"]) is not None
+
+
+def test_replay_speed_scales_gaps():
+    recs = [type("R", (), {"ts": t})() for t in (0.0, 0.5, 1.0)]
+    seen = []
+
+    async def sink(rec):
+        seen.append(rec.ts)
+
+    result = asyncio.run(replay(recs, sink, speed=10.0))
+    assert seen == [0.0, 0.5, 1.0]
+    assert 0.09 <= result["elapsed_s"] < 0.5
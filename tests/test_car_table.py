@@ -0,0 +1,74 @@
+import math
+
+from sim_racecenter_agent.core.car_table import CarTable
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_fastest_practice import build_get_fastest_practice_tool
+
+
+def test_load_masks_and_missing_values():
+    table = CarTable(capacity=4)
+    n = table.load_lap_timing(
+        [
+            {"car_idx": 2, "lap": 3, "best_lap_s": 91.5, "last_lap_s": None},
+            {"car_idx": "x", "best_lap_s": 1.0},  # ignored
+            {"car_idx": 9, "lap": 3, "best_lap_s": 90.0},  # grows the table
+        ]
+    )
+    assert n == 2 and table.capacity >= 10
+    assert table.mask("lap_timing").nonzero()[0].tolist() == [2, 9]
+    assert math.isnan(table.column("timing_last_lap_s")[2])
+    assert table.value("timing_lap", 2) == 3 and table.value("timing_last_lap_s", 2) is None
+    assert table.ranked("best_lap_s", "lap_timing").tolist() == [9, 2]
+    # A new frame replaces the previous one entirely
+    table.load_lap_timing([{"car_idx": 1, "best_lap_s": 95.0}])
+    assert table.ranked("best_lap_s", "lap_timing").tolist() == [1]
+    assert table.count("lap_timing") == 1
+
+
+def test_stints_and_close_pairs():
+    table = CarTable()
+    table.update_stint(5, {"lap": 10, "fuel_level_l": 30.5, "stint_laps": 4})
+    assert table.value("fuel_level_l", 5) == 30.5 and table.count("stint") == 1
+    table.load_standings(
+        [
+            {"car_idx": 3, "pos": 2, "gap_ahead_s": 0.4},
+            {"car_idx": 1, "pos": 1, "gap_ahead_s": 0.0},
+            {"car_idx": 8, "pos": 3, "gap_ahead_s": 2.5},
+        ]
+    )
+    assert table.close_pairs(1.0) == [(3, 1, 0.4)]
+
+
+def test_cache_reloads_columns_once_per_version():
+    cache = StateCache(1, 10)
+    cache.set_standings(1.0, [{"car_idx": 4, "pos": 1, "last_lap_s": 88.0}])
+    table = cache.car_table()
+    col = table.column("last_lap_s")
+    assert col[4] == 88.0
+    col[4] = 1.0  # not reloaded while the version is unchanged
+    assert cache.car_table().column("last_lap_s")[4] == 1.0
+    cache.set_standings(2.0, [{"car_idx": 4, "pos": 1, "last_lap_s": 87.0}])
+    assert cache.car_table().column("last_lap_s")[4] == 87.0
+
+
+def test_fastest_practice_ranks_columns():
+    cache = StateCache(1, 10)
+    cache.update_roster([{"CarIdx": 7, "CarNumber": "77", "UserName": "Bea"}])
+    handler = build_get_fastest_practice_tool(cache)["handler"]
+    cache.set_standings(1.0, [{"car_idx": 7, "pos": 1, "lap": 4, "last_lap_s": 92.0}])
+    out = handler({"top_n": 2})
+    assert out["source"] == "standings" and out["fastest"]["best_lap_s"] == 92.0
+    cache.set_lap_timing(
+        2.0,
+        [
+            {"car_idx": 7, "lap": 5, "best_lap_s": 91.0, "last_lap_s": 91.4},
+            {"car_idx": 2, "lap": 5, "best_lap_s": 90.5},
+            {"car_idx": 3, "lap": -1, "best_lap_s": 80.0},  # sentinel lap
+            {"car_idx": 4, "lap": 5, "best_lap_s": 0},  # no time yet
+        ],
+    )
+    out = handler({"top_n": 5})
+    assert out["source"] == "lap_timing" and out["count"] == 2
+    assert [r["car_idx"] for r in out["top_n"]] == [2, 7]
+    second = out["top_n"][1]
+    assert second["gap_fastest_s"] == 0.5 and second["name"] == "Bea" and second["lap"] == 5
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.state_cache import StateCache
+
+
+def _chat(i: int) -> bytes:
+    return json.dumps(
+        {
+            "type": "youtube_chat_message",
+            "data": {
+                "id": f"m{i}",
+                "username": f"user{i % 7}",
+                "message": f"great battle number {i}",
+                "timestamp": "2025-01-01T12:00:00Z",
+            },
+        }
+    ).encode()
+
+
+class _JsMsg:
+    def __init__(self, data: bytes, num_pending: int):
+        self.data = data
+        self.metadata = SimpleNamespace(num_pending=num_pending)
+        self.acked = self.termed = self.naked = False
+
+    async def ack(self):
+        self.acked = True
+
+    async def term(self):
+        self.termed = True
+
+    async def nak(self):
+        self.naked = True
+
+
+class _PullSub:
+    """Serves queued messages in fetch-sized batches, then stops the ingestor."""
+
+    def __init__(self, ing: NATSIngestor, payloads: list[bytes]):
+        self.ing = ing
+        self.msgs = []
+        for i, data in enumerate(payloads):
+            self.msgs.append(_JsMsg(data, num_pending=len(payloads) - i - 1))
+        self.queue = list(self.msgs)
+        self.fetch_sizes: list[int] = []
+
+    async def fetch(self, n, timeout=None):
+        if not self.queue:
+            self.ing.stop()
+            raise asyncio.TimeoutError
+        self.fetch_sizes.append(n)
+        out, self.queue = self.queue[:n], self.queue[n:]
+        return out
+
+
+def test_pull_loop_batches_inserts_indexes_once_and_acks_all(tmp_path, monkeypatch):
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    settings = Settings(
+        sqlite_path=str(db), chat_pull_batch=10, chat_pull_batch_max=200, chat_pull_interval=0.1
+    )
+    ing = NATSIngestor(StateCache(1, 50), settings)
+    payloads = [_chat(i) for i in range(500)] + [_chat(3), b"{broken"]
+    sub = _PullSub(ing, payloads)
+    ing._js = object()
+    ing._chat_sub = sub
+
+    async def run():
+        await ing._chat_pull_loop()
+        await ing.close()
+
+    asyncio.run(run())
+    conn = sqlite3.connect(db)
+    rows = conn.execute("SELECT COUNT(*) FROM chat_messages").fetchone()[0]
+    fts = conn.execute(
+        "SELECT COUNT(*) FROM chat_messages_fts WHERE chat_messages_fts MATCH 'battle'"
+    ).fetchone()[0]
+    conn.close()
+    assert rows == fts == 500  # duplicate id ignored, FTS indexed once per row
+    m = ing.chat_persistence_metrics()
+    assert m["persisted"] == 500 and m["pulled"] == 502
+    # First fetch uses the base size, then grows to the backlog (capped)
+    assert sub.fetch_sizes[0] == 10 and max(sub.fetch_sizes) == 200
+    assert len(sub.fetch_sizes) < 10
+    assert all(msg.acked for msg in sub.msgs[:-1])
+    assert sub.msgs[-1].termed and not sub.msgs[-1].acked
+
+
+def test_pull_loop_commits_off_the_loop_and_acks_only_after_commit(tmp_path, monkeypatch):
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    ing = NATSIngestor(StateCache(1, 50), Settings(sqlite_path=str(db), chat_pull_interval=0.1))
+    sub = _PullSub(ing, [_chat(i) for i in range(5)])
+    ing._js = object()
+    ing._chat_sub = sub
+    threads = []
+
+    def failing_insert(rows):
+        threads.append(threading.get_ident())
+        assert not any(m.acked or m.naked for m in sub.msgs)
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(ing, "_persist_chat_rows", failing_insert)
+
+    async def run():
+        loop_thread = threading.get_ident()
+        await ing._chat_pull_loop()
+        await ing.close()
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    assert threads and loop_thread not in threads
+    assert all(m.naked and not m.acked for m in sub.msgs)
+    assert ing.chat_persistence_metrics()["persisted"] == 0
@@ -0,0 +1,60 @@
+import asyncio
+
+from sim_racecenter_agent.adapters.coalesce import LatestMailbox
+
+
+def test_burst_applies_only_newest():
+    applied = []
+
+    async def apply(msg):
+        applied.append(msg)
+
+    async def run():
+        mb = LatestMailbox("iracing.standings", apply)
+        mb.start()
+        for i in range(100):
+            mb.put(i)
+        await asyncio.sleep(0.01)
+        await mb.stop()
+        return mb
+
+    mb = asyncio.run(run())
+    assert applied == [99]
+    assert mb.metrics()["skipped"] == 99
+    assert mb.metrics()["applied"] == 1
+
+
+def test_stop_drains_pending_frame():
+    applied = []
+
+    async def apply(msg):
+        applied.append(msg)
+
+    async def run():
+        mb = LatestMailbox("iracing.lap_timing", apply)
+        mb.put("a")
+        mb.put("b")
+        await mb.stop(drain=True)
+        return mb
+
+    mb = asyncio.run(run())
+    assert applied == ["b"]
+    assert not mb.pending
+
+
+def test_frames_arriving_between_applies_are_each_applied():
+    applied = []
+
+    async def apply(msg):
+        applied.append(msg)
+
+    async def run():
+        mb = LatestMailbox("iracing.session_state", apply)
+        mb.start()
+        for i in range(3):
+            await mb.put_async(i)
+            await asyncio.sleep(0.005)
+        await mb.stop()
+
+    asyncio.run(run())
+    assert applied == [0, 1, 2]
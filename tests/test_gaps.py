@@ -0,0 +1,85 @@
+import pytest
+
+from sim_racecenter_agent.core.gaps import GapTracker
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_battles import build_get_battles_tool
+
+
+def _frame(order: list[int], gaps: dict[int, float], lap: int = 5, lap_s: float = 90.0):
+    return [
+        {
+            "car_idx": car_idx,
+            "pos": i + 1,
+            "lap": lap,
+            "gap_ahead_s": gaps.get(car_idx) if i else 0.0,
+            "last_lap_s": lap_s,
+        }
+        for i, car_idx in enumerate(order)
+    ]
+
+
+def test_closing_rate_and_projected_catch():
+    tracker = GapTracker(window=10)
+    # Car 2 closes 0.01 s per second on car 1; car 3 drops back 0.02 s/s from car 2
+    for i in range(20):
+        t = 100.0 + i
+        tracker.observe(t, _frame([1, 2, 3], {2: 1.0 - 0.01 * i, 3: 0.5 + 0.02 * i}))
+    pair = tracker.pair(2)
+    assert pair["ahead_car_idx"] == 1
+    assert pair["samples"] == 10 and pair["span_s"] == 9.0
+    assert pair["closing_rate_s_per_lap"] == pytest.approx(0.9)
+    assert pair["trend"] == "closing"
+    assert pair["laps_to_catch"] == pytest.approx(0.81 / 0.9, abs=0.05)
+    assert pair["projected_catch_lap"] == 6
+    behind = tracker.pair(3)
+    assert behind["trend"] == "pulling_away" and behind["laps_to_catch"] is None
+    assert tracker.pair(1) is None  # leader has no car ahead
+
+
+def test_pair_restarts_when_car_ahead_changes():
+    tracker = GapTracker(window=10)
+    for i in range(6):
+        tracker.observe(float(i), _frame([1, 2, 3], {2: 0.8, 3: 0.4}))
+    assert tracker.pair(3)["samples"] == 6
+    tracker.observe(6.0, _frame([1, 3, 2], {3: 0.7, 2: 0.2}))
+    assert tracker.pair(3)["ahead_car_idx"] == 1
+    assert tracker.pair(3)["samples"] == 1
+    assert tracker.pair(2)["samples"] == 1
+    # Stale frame ignored
+    assert tracker.observe(5.0, _frame([1, 2, 3], {2: 0.8, 3: 0.4})) == 0
+
+
+def test_ranking_by_gap_and_closing():
+    tracker = GapTracker(window=20)
+    for i in range(10):
+        gaps = {2: 0.9 - 0.02 * i, 3: 0.3, 4: 3.0, 5: 1.2 - 0.005 * i}
+        tracker.observe(float(i), _frame([1, 2, 3, 4, 5], gaps))
+    by_gap = [b["car_idx"] for b in tracker.battles(max_gap_s=1.5)]
+    assert by_gap == [3, 2, 5]  # car 4 is 3 s back
+    by_closing = [b["car_idx"] for b in tracker.battles(max_gap_s=1.5, sort_by="closing")]
+    assert by_closing == [2, 5, 3]
+    assert tracker.battles(max_gap_s=1.5, min_samples=11) == []
+
+
+def test_tool_and_cache_wiring():
+    cache = StateCache(1, 50)
+    cache.update_roster(
+        [
+            {"CarIdx": 1, "CarNumber": "11", "UserName": "Alpha"},
+            {"CarIdx": 2, "CarNumber": "22", "UserName": "Bravo"},
+        ]
+    )
+    for i in range(8):
+        cache.set_standings(10.0 + i, _frame([1, 2], {2: 1.0 - 0.05 * i}))
+    handler = build_get_battles_tool(cache)["handler"]
+    out = handler({})
+    assert out["count"] == 1
+    battle = out["battles"][0]
+    assert (battle["name"], battle["ahead_name"]) == ("Bravo", "Alpha")
+    assert battle["trend"] == "closing"
+    assert handler({"car_idx": 2})["battle"]["ahead_car_number"] == "11"
+    assert handler({"car_idx": 1})["battle"] is None
+    # A warm-restored frame does not seed a trend across the restart
+    cache.mark_restored("standings", 17.0)
+    cache.set_standings(300.0, _frame([1, 2], {2: 0.4}))
+    assert cache.gaps().pair(2)["samples"] == 1
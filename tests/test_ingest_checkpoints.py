@@ -0,0 +1,114 @@
+import asyncio
+import json
+import sqlite3
+
+from sim_racecenter_agent.adapters.jetstream_catchup import CatchupMsg
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.schemas.validation import EXAMPLES
+
+
+class _Msg:
+    def __init__(self, payload: dict):
+        self.data = json.dumps(payload).encode()
+
+
+def make_ingestor(tmp_path, monkeypatch):
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    settings = Settings(sqlite_path=str(db), checkpoint_interval_s=0.0)
+    return NATSIngestor(StateCache(1, 50), settings), db
+
+
+def test_replayed_incidents_are_not_duplicated(tmp_path, monkeypatch):
+    ing, _ = make_ingestor(tmp_path, monkeypatch)
+    inc = dict(EXAMPLES["iracing.incident"])
+    other_car = dict(inc, car_idx=7)  # same tick, different event
+
+    async def run():
+        await ing._handle_incident(_Msg(inc))
+        await ing._handle_incident(_Msg(other_car))
+        # Reconnect replay of the same messages
+        await ing._handle_incident(_Msg(inc))
+        await ing._handle_incident(_Msg(other_car))
+        await ing.close()
+
+    asyncio.run(run())
+    assert len(ing.cache.recent_incidents(10)) == 2
+    assert ing.catchup_metrics()["duplicates_skipped"]["iracing.incident"] == 2
+
+
+def test_resume_start_prefers_sequence_then_time(tmp_path, monkeypatch):
+    ing, _ = make_ingestor(tmp_path, monkeypatch)
+    # No checkpoint yet -> caller's default start point
+    assert ing._resume_start("iracing.stint", None) is None
+    ing._checkpoints["iracing.stint"] = {"seq": 41, "seq_at": 100.0, "updated_at": 100.0}
+    start = ing._resume_start("iracing.stint", None)
+    assert start.mode == "since_seq" and start.since_seq == 42
+    # A live message applied after the replayed sequence -> resume by time
+    ing._checkpoints["iracing.stint"]["updated_at"] = 200.0
+    start = ing._resume_start("iracing.stint", None)
+    assert start.mode == "since_ts" and start.since_ts == 200.0 - ing.settings.catchup_resume_skew_s
+
+
+def test_checkpoints_persist_across_restart(tmp_path, monkeypatch):
+    ing, db = make_ingestor(tmp_path, monkeypatch)
+    ing._note_seq("IRACING_HISTORY", "iracing.stint", 77)
+
+    async def run():
+        await ing._handle_stint(_Msg(EXAMPLES["iracing.stint"]))
+        await ing.close()
+
+    asyncio.run(run())
+    conn = sqlite3.connect(db)
+    row = conn.execute(
+        "SELECT seq, ts FROM ingest_checkpoints WHERE subject='iracing.stint'"
+    ).fetchone()
+    conn.close()
+    assert row == (77, EXAMPLES["iracing.stint"]["timestamp"])
+
+    restarted, _ = make_ingestor(tmp_path, monkeypatch)
+    restarted._load_checkpoints()
+    assert restarted._checkpoints["iracing.stint"]["seq"] == 77
+    # Events are deduplicated by identity, not by the persisted timestamp
+    asyncio.run(restarted._handle_stint(_Msg(EXAMPLES["iracing.stint"])))
+    assert restarted.cache.stint_for(EXAMPLES["iracing.stint"]["car_idx"]) is not None
+    asyncio.run(restarted.close())
+
+
+def test_late_events_apply_and_stale_snapshots_do_not(tmp_path, monkeypatch):
+    ing, _ = make_ingestor(tmp_path, monkeypatch)
+    inc = dict(EXAMPLES["iracing.incident"])
+    late = dict(inc, car_idx=9, timestamp=inc["timestamp"] - 5.0)
+    state = dict(EXAMPLES["iracing.session_state"])
+    stale = dict(state, timestamp=state["timestamp"] - 5.0)
+
+    async def run():
+        await ing._handle_incident(_Msg(inc))
+        await ing._handle_incident(_Msg(late))  # another car's event, delivered late
+        await ing._handle_session_state(_Msg(state))
+        await ing._handle_session_state(_Msg(stale))
+        await ing.close()
+
+    asyncio.run(run())
+    assert len(ing.cache.recent_incidents(10)) == 2
+    assert ing.cache.session_state()["timestamp"] == state["timestamp"]
+    assert ing.catchup_metrics()["duplicates_skipped"] == {"iracing.session_state": 1}
+
+
+def test_persisted_high_water_only_filters_replays(tmp_path, monkeypatch):
+    ing, _ = make_ingestor(tmp_path, monkeypatch)
+    state = dict(EXAMPLES["iracing.session_state"])
+    ing._checkpoints["iracing.session_state"] = {"ts": state["timestamp"] + 60.0}
+    replayed = CatchupMsg("iracing.session_state", 5, json.dumps(state).encode())
+
+    async def run():
+        await ing._handle_session_state(replayed)
+        assert ing.cache.session_state() is None
+        # A live feed behind the previous run's checkpoint (restarted / replayed source)
+        await ing._handle_session_state(_Msg(state))
+        await ing.close()
+
+    asyncio.run(run())
+    assert ing.cache.session_state()["timestamp"] == state["timestamp"]
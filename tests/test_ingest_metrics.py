@@ -0,0 +1,91 @@
+import asyncio
+import json
+import time
+
+from sim_racecenter_agent.adapters.ingest_metrics import LatencyHistogram, render_prometheus
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.schemas.validation import EXAMPLES
+
+
+class _Msg:
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def test_histogram_percentiles_within_bucket_error():
+    h = LatencyHistogram()
+    for us in range(1, 10001):
+        h.record(us / 1e6)
+    assert h.count == 10000
+    for q in (0.5, 0.9, 0.99):
+        exact = q * 10000 / 1e6
+        assert abs(h.percentile(q) - exact) / exact < 0.07
+    assert h.percentile(1.0) == 0.01
+    snap = h.snapshot()
+    assert snap["min_ms"] == 0.001 and snap["max_ms"] == 10.0
+
+
+def test_handlers_record_counts_stages_and_lag(tmp_path, monkeypatch):
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    ing = NATSIngestor(StateCache(1, 50), Settings(sqlite_path=str(db)))
+    live = dict(EXAMPLES["iracing.standings"], timestamp=time.time() - 0.5)
+
+    async def run():
+        await ing._handle_standings(_Msg(json.dumps(live).encode()))
+        await ing._handle_standings(_Msg(b"{not json"))
+        await ing._handle_standings(_Msg(json.dumps({"timestamp": 1.0}).encode()))
+        await ing.close()
+
+    asyncio.run(run())
+    m = ing.ingest_metrics()["subjects"]["iracing.standings"]
+    assert (m["received"], m["decode_errors"], m["invalid"], m["applied"]) == (3, 1, 1, 1)
+    assert set(m["stages"]) == {"decode", "validate", "apply", "persist"}
+    assert m["stages"]["validate"]["count"] == 2
+    assert 0.4 < m["last_lag_s"] < 5.0
+
+    text = ing.prometheus_metrics()
+    assert 'sim_ingest_received_total{subject="iracing.standings"} 3' in text
+    assert 'sim_ingest_stage_seconds_count{subject="iracing.standings",stage="apply"} 1' in text
+    assert 'sim_ingest_lag_seconds{subject="iracing.standings",quantile="0.99"}' in text
+
+
+def test_coalesced_frames_are_counted_on_arrival(tmp_path, monkeypatch):
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    ing = NATSIngestor(StateCache(1, 50), Settings(sqlite_path=str(db)))
+    put = ing.live_callbacks()["iracing.standings"]
+
+    async def run():
+        ing.start_mailboxes()
+        for i in range(5):
+            frame = dict(EXAMPLES["iracing.standings"], timestamp=time.time() + i)
+            msg = _Msg(json.dumps(frame).encode())
+            msg.subject = "iracing.standings"
+            await put(msg)
+        await asyncio.sleep(0.01)
+        await ing.close()
+
+    asyncio.run(run())
+    m = ing.ingest_metrics()["subjects"]["iracing.standings"]
+    assert (m["received"], m["superseded"], m["applied"]) == (5, 4, 1)
+    assert m["stages"]["decode"]["count"] == 1
+    assert 'sim_ingest_superseded_total{subject="iracing.standings"} 4' in ing.prometheus_metrics()
+
+
+def test_prometheus_renders_pending_and_slow_consumers():
+    snap = {"uptime_s": 1.0, "subjects": {}, "slow_consumers": {"iracing.standings": 2}}
+    text = render_prometheus(snap, pending={"iracing.pit": {"pending_msgs": 5, "pending_bytes": 9}})
+    assert 'sim_ingest_slow_consumer_total{subject="iracing.standings"} 2' in text
+    assert 'sim_nats_pending_messages{subject="iracing.pit"} 5' in text
+    assert "# TYPE sim_nats_pending_bytes gauge" in text
+
+
+def test_histogram_merge():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    a.record(0.001)
+    b.record(0.004)
+    a.merge(b)
+    assert a.count == 2 and a.max_us == 4000 and a.min_us == 1000
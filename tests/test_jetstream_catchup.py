@@ -0,0 +1,118 @@
+import asyncio
+from types import SimpleNamespace
+
+from sim_racecenter_agent.adapters.jetstream_catchup import (
+    CatchupStart,
+    FetchStats,
+    fetch_subject,
+    resolve_start,
+)
+
+
+class FakeJS:
+    """In-memory stand-in for the handful of JetStream calls catch-up makes."""
+
+    def __init__(self, subjects: list[str]):
+        self.msgs = [(seq, subj) for seq, subj in enumerate(subjects, start=1)]
+        self.consumers: dict[str, int] = {}
+
+    def _matching(self, subject, start_seq):
+        return [(seq, s) for seq, s in self.msgs if s == subject and seq >= start_seq]
+
+    async def stream_info(self, stream, subjects_filter=None):
+        counts = {}
+        for _, s in self.msgs:
+            if s == subjects_filter:
+                counts[s] = counts.get(s, 0) + 1
+        state = SimpleNamespace(first_seq=1, last_seq=len(self.msgs), subjects=counts)
+        return SimpleNamespace(state=state)
+
+    async def add_consumer(self, stream, config):
+        start = config.opt_start_seq or 1
+        self.consumers[config.name] = start
+        pending = len(self._matching(config.filter_subject, start))
+        self._filter = config.filter_subject
+        return SimpleNamespace(name=config.name, num_pending=pending)
+
+    async def delete_consumer(self, stream, name):
+        self.consumers.pop(name, None)
+
+    async def pull_subscribe_bind(self, consumer, stream):
+        remaining = self._matching(self._filter, self.consumers[consumer])
+
+        class _Sub:
+            async def fetch(_self, n, timeout=None):
+                out = remaining[:n]
+                del remaining[:n]
+                return [
+                    SimpleNamespace(
+                        subject=s,
+                        data=str(seq).encode(),
+                        metadata=SimpleNamespace(
+                            sequence=SimpleNamespace(stream=seq), timestamp=None
+                        ),
+                    )
+                    for seq, s in out
+                ]
+
+            async def unsubscribe(_self):
+                return None
+
+        return _Sub()
+
+    async def get_last_msg(self, stream, subject):
+        seq, _ = self._matching(subject, 1)[-1]
+        return SimpleNamespace(seq=seq, data=str(seq).encode(), time=None)
+
+
+def test_resolve_start_modes():
+    assert resolve_start("last_n", 0, 900, 0).mode == "last_n"
+    assert resolve_start("since_seq", 0, 900, 42).since_seq == 42
+    # since_seq without a sequence falls back to last_n
+    assert resolve_start("since_seq", 0, 900, 0).mode == "last_n"
+    st = resolve_start("since_ts", 0, 60, 0)
+    assert st.mode == "since_ts" and st.since_ts and st.since_ts > 0
+    assert resolve_start("bogus", 0, 0, 0).mode == "last_n"
+
+
+def test_fetch_last_n_returns_newest_in_order():
+    subjects = ["noise" if i % 10 else "stint" for i in range(1000)]
+    js = FakeJS(subjects)
+    stats = FetchStats()
+    msgs = asyncio.run(fetch_subject(js, "S", "stint", 7, CatchupStart(), batch=4, stats=stats))
+    seqs = [m.seq for m in msgs]
+    expected = [seq for seq, s in js.msgs if s == "stint"][-7:]
+    assert seqs == expected
+    # Server-side filtering: only a small slice of the subject is fetched
+    assert stats.fetched < 20
+    assert not js.consumers  # ephemeral consumers cleaned up
+
+
+def test_fetch_last_one_uses_direct_get():
+    js = FakeJS(["a", "b", "a", "b"])
+    msgs = asyncio.run(fetch_subject(js, "S", "a", 1, CatchupStart()))
+    assert [m.seq for m in msgs] == [3]
+
+
+def test_fetch_since_seq():
+    js = FakeJS(["a", "b", "a", "b", "a"])
+    msgs = asyncio.run(fetch_subject(js, "S", "a", 10, CatchupStart(mode="since_seq", since_seq=2)))
+    assert [m.seq for m in msgs] == [3, 5]
+
+
+def test_fetch_since_seq_backlog_reads_only_the_tail():
+    subjects = ["noise" if i % 4 else "a" for i in range(4000)]
+    js = FakeJS(subjects)
+    stats = FetchStats()
+    start = CatchupStart(mode="since_seq", since_seq=10)
+    msgs = asyncio.run(fetch_subject(js, "S", "a", 5, start, batch=8, stats=stats))
+    assert [m.seq for m in msgs] == [seq for seq, s in js.msgs if s == "a"][-5:]
+    assert stats.extra["backlog"] == 997 and stats.fetched < 20
+    assert not js.consumers
+    # Widening the tail consumer never starts before the checkpoint
+    js = FakeJS(["a"] * 1000 + ["noise" if i % 200 else "a" for i in range(1, 2001)])
+    stats = FetchStats()
+    start = CatchupStart(mode="since_seq", since_seq=1900)
+    msgs = asyncio.run(fetch_subject(js, "S", "a", 5, start, stats=stats))
+    assert [m.seq for m in msgs] == [2200, 2400, 2600, 2800, 3000]
+    assert stats.fetched <= stats.extra["backlog"] == 6
@@ -0,0 +1,58 @@
+import pytest
+
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_live_snapshot import (
+    SECTIONS,
+    _json_size,
+    build_get_live_snapshot_tool,
+)
+from sim_racecenter_agent.mcp.tools.wait_live_snapshot import build_wait_live_snapshot_tool
+
+
+def _cache(cars: int = 30) -> StateCache:
+    cache = StateCache(1, 50)
+    cache.update_roster(
+        [{"CarIdx": i, "UserName": f"Driver {i}", "CarNumber": str(i)} for i in range(cars)]
+    )
+    rows = [
+        {"car_idx": i, "position": i + 1, "lap": 12, "last_lap_s": 90.0 + i} for i in range(cars)
+    ]
+    cache.set_standings(1.0, rows)
+    cache.set_lap_timing(1.0, [dict(r, best_lap_s=89.0 + i) for i, r in enumerate(rows)])
+    cache.set_session_state({"session_type": "RACE", "flag_bits": 4})
+    for i in range(25):
+        cache.add_incident_event({"car_idx": i, "lap": i})
+    return cache
+
+
+def test_fields_and_top_n_select_sections():
+    handler = build_get_live_snapshot_tool(_cache())["handler"]
+    full = handler({})
+    assert set(SECTIONS) <= set(full)
+    assert len(full["leaderboard"]) == 30 and len(full["incidents_recent"]) == 20
+
+    out = handler({"fields": ["standings_top", "incidents_recent", "bogus"], "top_n": 3})
+    assert not set(SECTIONS) - {"standings_top", "incidents_recent"} & set(out)
+    assert [r["car_idx"] for r in out["standings_top"]] == [0, 1, 2]
+    # Event lists keep the most recent entries
+    assert [e["car_idx"] for e in out["incidents_recent"]] == [22, 23, 24]
+    assert out["unknown_fields"] == ["bogus"]
+    assert {"schema_version", "generated_at", "version", "roster_size"} <= set(out)
+
+
+@pytest.mark.asyncio
+async def test_max_bytes_trims_to_budget():
+    cache = _cache()
+    handler = build_get_live_snapshot_tool(cache)["handler"]
+    assert "truncated" not in handler({"max_bytes": 10**6})
+    for budget in (512, 2000, 6000):
+        out = handler({"max_bytes": budget})
+        assert _json_size(out) <= budget
+        assert out["truncated"]
+        if "incidents_recent" in out:
+            assert out["incidents_recent"][-1]["car_idx"] == 24
+    # The long-poll variant shapes its snapshot the same way
+    wait = build_wait_live_snapshot_tool(cache)["handler"]
+    out = await wait({"fields": ["session_state"]})
+    assert out["changed"] and out["session_state"]["session_type"] == "RACE"
+    assert "leaderboard" not in out
@@ -0,0 +1,54 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.models import StintRow, TelemetryFrame
+from sim_racecenter_agent.core.state_cache import StateCache
+
+
+def test_records_read_like_dicts():
+    frame = TelemetryFrame.from_payload(
+        {"display_name": "Alpha", "CarNumber": "11", "CarDistAhead": 12.5, "Speed": 80.0}
+    )
+    assert frame.driver_id == "Alpha" and frame["CarNumber"] == "11"
+    assert frame.get("CarDistAhead") == 12.5
+    assert frame.get("Speed") is None and frame.get("to_dict", 1) == 1
+    assert "CarNumber" in frame and "Speed" not in frame
+    with pytest.raises(KeyError):
+        frame["Speed"]
+    assert not hasattr(frame, "__dict__")
+    out = frame.to_dict()
+    assert set(out) == set(TelemetryFrame.__slots__) and out["display_name"] == "Alpha"
+
+    stint = StintRow.from_payload({"timestamp": 1.0, "car_idx": 4, "lap": 9, "fuel_pct": 0.4})
+    assert stint.car_idx == 4 and stint.get("tire_wear_pct") is None
+    json.dumps(stint.to_dict())
+
+
+def test_cache_stores_records_and_hands_out_dicts(tmp_path):
+    cache = StateCache(1, 50, telemetry_ttl_s=10)
+    ing = NATSIngestor(cache, Settings(sqlite_path=str(tmp_path / "agent.db")))
+    stint = {"timestamp": 1.0, "car_idx": 4, "lap": 9, "fuel_pct": 0.4, "stint_laps": 3}
+
+    async def run():
+        await ing._handle_telemetry(
+            SimpleNamespace(data=json.dumps({"display_name": "Alpha", "CarNumber": "11"}).encode())
+        )
+        await ing._handle_stint(SimpleNamespace(data=json.dumps(stint).encode()))
+        await ing.close()
+
+    asyncio.run(run())
+    (stored,) = cache.telemetry_view()
+    assert isinstance(stored, TelemetryFrame) and stored.updated_at is not None
+    (frame,) = cache.telemetry_frames()
+    assert isinstance(frame, dict) and frame["CarNumber"] == "11"
+    assert cache.stint_for(4)["fuel_pct"] == 0.4
+    table = cache.car_table()
+    assert table.value("stint_laps", 4) == 3
+    assert cache.memory_report()["domains"]["stints"]["approx_bytes"] > 0
+    assert cache.sweep(time.time() + 60)["telemetry"] == 1
@@ -22,6 +22,10 @@ async def test_operational_status_basic():
         assert "cache" in result
         cache = result["cache"]
         assert all(k in cache for k in ("roster_size", "lap_timing_records", "standings_records"))
+        assert "total_approx_bytes" in cache["memory"]
+        assert "ttl_s" in cache["eviction"]
+        assert "max_workers" in result["tool_pool"]
+        assert {"hits", "misses", "entries"} <= set(result["response_cache"])
         assert "uptime_s" in result
     finally:
         await client.close()
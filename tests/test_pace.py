@@ -0,0 +1,96 @@
+import statistics
+
+import pytest
+
+from sim_racecenter_agent.core.pace import PaceTracker
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_pace_analysis import build_get_pace_analysis_tool
+
+
+def _feed(cache: StateCache, car_idx: int, times: list[float], start_ts: float = 1000.0):
+    """One standings frame per completed lap: counter = laps done + 1, last_lap_s = that lap."""
+    cache.set_standings(start_ts, [{"car_idx": car_idx, "lap": 1, "last_lap_s": None}])
+    for i, t in enumerate(times, start=1):
+        cache.set_standings(start_ts + i, [{"car_idx": car_idx, "lap": i + 1, "last_lap_s": t}])
+
+
+def test_records_lap_on_counter_increment():
+    tracker = PaceTracker(history=10, window=5)
+    assert tracker.observe_frame(1.0, [{"car_idx": 3, "lap": 4, "last_lap_s": 90.0}]) == 1
+    # Same counter again: nothing new
+    assert tracker.observe_frame(2.0, [{"car_idx": 3, "lap": 4, "last_lap_s": 90.0}]) == 0
+    assert tracker.observe_frame(3.0, [{"car_idx": 3, "lap": 5, "last_lap_s": 89.5}]) == 1
+    laps = tracker.car(3).recent(10)
+    assert [(r["lap"], r["lap_time_s"]) for r in laps] == [(3, 90.0), (4, 89.5)]
+    assert tracker.laps_recorded == 2
+
+
+def test_counter_ahead_of_lap_time_is_held_until_time_changes():
+    tracker = PaceTracker()
+    tracker.observe_frame(1.0, [{"car_idx": 0, "lap": 2, "last_lap_s": 91.0}])
+    # Counter advanced but last_lap_s still shows the previous lap
+    assert tracker.observe_frame(2.0, [{"car_idx": 0, "lap": 3, "last_lap_s": 91.0}]) == 0
+    assert tracker.observe_frame(2.1, [{"car_idx": 0, "lap": 3, "last_lap_s": 90.2}]) == 1
+    assert tracker.car(0).recent(1)[0]["lap"] == 2
+    assert tracker.car(0).recent(1)[0]["lap_time_s"] == 90.2
+
+
+def test_rolling_stats_match_reference():
+    times = [92.0, 91.4, 91.9, 91.1, 90.8, 91.3, 90.9, 90.6]
+    cache = StateCache(1, 300, pace_history_laps=6, pace_window=4)
+    _feed(cache, 7, times)
+    car = cache.pace().car(7)
+    window = times[-4:]
+    assert car.window_laps == 4
+    assert len(car.laps) == 6  # ring bounded by history
+    assert car.rolling_mean() == pytest.approx(statistics.mean(window))
+    assert car.rolling_median() == pytest.approx(statistics.median(window))
+    assert car.std_dev() == pytest.approx(statistics.stdev(window))
+    assert car.best_n_avg() == pytest.approx(statistics.mean(sorted(times)[:5]))
+    slope = statistics.linear_regression(range(4), window).slope
+    assert car.trend_slope() == pytest.approx(slope)
+
+
+def test_slow_laps_kept_in_history_but_not_in_window():
+    cache = StateCache(1, 300)
+    _feed(cache, 1, [90.0, 90.4, 118.0, 90.2])  # lap 3 is an in-lap / pit stop
+    car = cache.pace().car(1)
+    assert [r["clean"] for r in car.recent(10)] == [True, True, False, True]
+    assert car.window_laps == 3
+    assert car.rolling_mean() == pytest.approx(statistics.mean([90.0, 90.4, 90.2]))
+
+
+def test_lap_timing_frames_feed_history_and_bump_version():
+    cache = StateCache(1, 300)
+    v0 = cache.version("pace")
+    cache.set_lap_timing(1.0, [{"car_idx": 2, "lap": 5, "last_lap_s": 88.0, "best_lap_s": 88.0}])
+    assert cache.version("pace") > v0
+    assert cache.pace().car(2).summary()["last_lap"] == 4
+
+
+def test_tool_field_and_car_modes():
+    cache = StateCache(1, 300)
+    cache.update_roster(
+        [
+            {"CarIdx": 1, "CarNumber": "11", "UserName": "Alpha"},
+            {"CarIdx": 2, "CarNumber": "22", "UserName": "Bravo"},
+        ]
+    )
+    _feed(cache, 1, [90.0, 90.5, 90.1, 90.3])
+    _feed(cache, 2, [89.5, 91.0, 89.4, 90.8])
+    _feed(cache, 3, [95.0])  # below min_laps
+    handler = build_get_pace_analysis_tool(cache)["handler"]
+
+    field = handler({"min_laps": 3})
+    assert [r["car_idx"] for r in field["cars"]] == [2, 1]
+    assert field["count"] == 2
+    assert field["quickest"]["car_idx"] == 2
+    assert field["most_consistent"]["car_idx"] == 1
+    assert field["cars"][0]["name"] == "Bravo"
+
+    one = handler({"car_idx": 1, "laps": 2})
+    assert one["car"]["car_number"] == "11"
+    assert [r["lap_time_s"] for r in one["laps"]] == [90.1, 90.3]
+
+    assert handler({"car_idx": 40})["car"] is None
+    assert handler({"min_laps": 10})["cars"] == []
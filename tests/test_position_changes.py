@@ -0,0 +1,167 @@
+import asyncio
+import json
+import sqlite3
+from types import SimpleNamespace
+
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.position_changes import PositionChangeDetector
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_recent_position_changes import (
+    build_get_recent_position_changes_tool,
+)
+
+
+def _frame(order: list[int], gap: float = 0.5) -> list[dict]:
+    """Standings rows for cars in running order, `gap` seconds apart."""
+    return [
+        {
+            "car_idx": car_idx,
+            "pos": i + 1,
+            "lap": 5,
+            "gap_leader_s": round(i * gap, 3),
+            "gap_ahead_s": gap if i else None,
+        }
+        for i, car_idx in enumerate(order)
+    ]
+
+
+def test_first_frame_seeds_without_events():
+    det = PositionChangeDetector()
+    assert det.apply(1.0, _frame([1, 2, 3])) == []
+    assert det.apply(2.0, _frame([1, 2, 3])) == []
+    assert det.last_id == 0
+
+
+def test_adjacent_swap_is_one_overtake_plus_gain_and_loss():
+    det = PositionChangeDetector()
+    det.apply(1.0, _frame([1, 2, 3]))
+    events = det.apply(2.0, _frame([1, 3, 2], gap=0.3))
+    by_type = {ev["type"]: ev for ev in events}
+    assert set(by_type) == {"overtake", "position_gain", "position_loss"}
+    ov = by_type["overtake"]
+    assert (ov["car_idx"], ov["passed_car_idx"], ov["position"]) == (3, 2, 2)
+    assert ov["gap_s"] == 0.3
+    assert by_type["position_gain"]["delta"] == 1
+    assert by_type["position_loss"]["car_idx"] == 2
+    assert [ev["id"] for ev in events] == [1, 2, 3]
+
+
+def test_multi_place_gain_passes_each_car_once():
+    det = PositionChangeDetector()
+    det.apply(1.0, _frame([1, 2, 3, 4, 5]))
+    events = det.apply(2.0, _frame([1, 5, 2, 3, 4]))
+    passes = sorted(
+        (ev["car_idx"], ev["passed_car_idx"]) for ev in events if ev["type"] == "overtake"
+    )
+    assert passes == [(5, 2), (5, 3), (5, 4)]
+    gap_to_4 = next(ev["gap_s"] for ev in events if ev.get("passed_car_idx") == 4)
+    assert gap_to_4 == 1.5  # derived from gap_leader_s when not adjacent
+    losses = [ev["car_idx"] for ev in events if ev["type"] == "position_loss"]
+    assert sorted(losses) == [2, 3, 4]
+
+
+def test_new_and_unclassified_cars_are_ignored():
+    det = PositionChangeDetector()
+    det.apply(1.0, _frame([1, 2]))
+    frame = _frame([7, 1, 2])
+    frame.append({"car_idx": 9, "pos": 0})
+    events = det.apply(2.0, frame)
+    # 1 and 2 lost a place to a car that was not in the previous frame: no overtake
+    assert {ev["type"] for ev in events} == {"position_loss"}
+
+
+def test_ring_is_bounded_and_filters_apply():
+    det = PositionChangeDetector(ring_size=4)
+    det.apply(0.0, _frame([1, 2, 3]))
+    det.apply(1.0, _frame([2, 1, 3]))
+    det.apply(2.0, _frame([2, 3, 1]))
+    assert len(det) == 4
+    assert det.last_id == 6
+    assert [ev["id"] for ev in det.since(4)] == [5, 6]
+    newest = det.recent(10, types=["overtake"])
+    assert [(ev["car_idx"], ev["passed_car_idx"]) for ev in newest] == [(3, 1)]
+    assert all(2 in (ev["car_idx"], ev.get("passed_car_idx")) for ev in det.recent(10, car_idx=2))
+
+
+def test_restored_standings_do_not_produce_events():
+    cache = StateCache(1, 50)
+    cache.set_standings(100.0, _frame([1, 2, 3]))
+    cache.mark_restored("standings", 100.0)
+    cache.set_standings(500.0, _frame([3, 2, 1]))
+    assert len(cache.position_changes()) == 0
+    v = cache.version("position_changes")
+    cache.set_standings(501.0, _frame([2, 3, 1]))
+    assert len(cache.position_changes()) > 0
+    assert cache.version("position_changes") == v + 1
+
+
+def test_tool_enriches_names_and_polls_since_id():
+    cache = StateCache(1, 50)
+    cache.update_roster(
+        [
+            {"CarIdx": 1, "CarNumber": "11", "UserName": "Alpha"},
+            {"CarIdx": 2, "CarNumber": "22", "UserName": "Bravo"},
+        ]
+    )
+    handler = build_get_recent_position_changes_tool(cache)["handler"]
+    cache.set_standings(1.0, _frame([1, 2]))
+    cache.set_standings(2.0, _frame([2, 1]))
+    out = handler({"types": ["overtake"]})
+    assert out["count"] == 1
+    ev = out["events"][0]
+    assert (ev["name"], ev["passed_name"], ev["passed_car_number"]) == ("Bravo", "Alpha", "11")
+    last = out["last_id"]
+    assert handler({"since_id": last})["events"] == []
+    cache.set_standings(3.0, _frame([1, 2]))
+    newer = handler({"since_id": last, "limit": 2})
+    assert newer["count"] == 2 and all(e["id"] > last for e in newer["events"])
+    assert handler({"since_ts": 3.0, "car_idx": 1})["count"] == 2
+
+
+def test_since_id_pages_through_every_event():
+    cache = StateCache(1, 50)
+    handler = build_get_recent_position_changes_tool(cache)["handler"]
+    cache.set_standings(0.0, _frame([1, 2]))
+    for ts in range(1, 10):  # each swap: one overtake plus a gain and a loss
+        cache.set_standings(float(ts), _frame([1, 2] if ts % 2 == 0 else [2, 1]))
+    assert cache.position_changes().last_id == 27
+    seen: list[int] = []
+    cursor = 0
+    while True:
+        page = handler({"since_id": cursor, "limit": 5})
+        seen += [e["id"] for e in page["events"]]
+        if not page["events"]:
+            break
+        cursor = page["last_id"]
+    assert seen == list(range(1, 28)) and cursor == 27
+    # Filters apply before the page is cut; a short page advances the cursor to the end
+    page = handler({"since_id": 0, "types": ["overtake"], "limit": 100})
+    assert page["count"] == 9 and page["last_id"] == 27
+
+
+def test_standings_handler_persists_events(tmp_path, monkeypatch):
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    ing = NATSIngestor(StateCache(1, 50), Settings(sqlite_path=str(db)))
+
+    def msg(ts: float, order: list[int]):
+        payload = {"timestamp": ts, "leader_car_idx": order[0], "cars": _frame(order)}
+        return SimpleNamespace(data=json.dumps(payload).encode())
+
+    async def run():
+        await ing._handle_standings(msg(1.0, [1, 2, 3]))
+        await ing._handle_standings(msg(2.0, [2, 1, 3]))
+        await ing.close()
+
+    asyncio.run(run())
+    conn = sqlite3.connect(db)
+    rows = conn.execute(
+        "SELECT type, car_idx, other_car_idx, to_pos FROM position_changes ORDER BY type"
+    ).fetchall()
+    conn.close()
+    assert rows == [
+        ("overtake", 2, 1, 1),
+        ("position_gain", 2, -1, 1),
+        ("position_loss", 1, -1, 2),
+    ]
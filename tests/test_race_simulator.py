@@ -0,0 +1,53 @@
+from collections import Counter
+
+from sim_racecenter_agent.adapters.race_simulator import RaceSimulator, TrafficRates
+from sim_racecenter_agent.schemas import validation
+
+
+def _traffic(seed=3, seconds=600.0):
+    sim = RaceSimulator(cars=24, seed=seed, base_lap_s=20.0, start_ts=1_700_000_000.0)
+    rates = TrafficRates(telemetry_hz=1.0, standings_hz=1.0, lap_timing_hz=1.0, chat_hz=0.5)
+    return sim, list(sim.traffic(seconds, rates))
+
+
+def test_every_generated_payload_is_schema_valid():
+    _, traffic = _traffic()
+    counts = Counter(subject for _, subject, _ in traffic)
+    # All subjects NATSIngestor consumes are produced, including lap-driven events
+    assert {
+        "iracing.session",
+        "iracing.telemetry",
+        "iracing.standings",
+        "iracing.lap_timing",
+        "iracing.session_state",
+        "iracing.track_conditions",
+        "iracing.stint",
+        "iracing.pit",
+        "youtube.chat.message",
+    } <= set(counts)
+    for _, subject, payload in traffic:
+        validation.validate(subject, payload)  # raises on schema errors
+
+
+def test_traffic_is_time_ordered_and_deterministic():
+    _, a = _traffic(seed=5, seconds=120.0)
+    _, b = _traffic(seed=5, seconds=120.0)
+    assert a == b
+    stamps = [ts for ts, _, _ in a]
+    assert stamps == sorted(stamps)
+
+
+def test_standings_are_consistent_race_order():
+    sim, traffic = _traffic()
+    standings = [p for _, s, p in traffic if s == "iracing.standings"]
+    last = standings[-1]["cars"]
+    assert [c["pos"] for c in last] == list(range(1, 25))
+    gaps = [c["gap_leader_s"] for c in last]
+    assert gaps == sorted(gaps) and gaps[0] == 0.0
+    # Positions change over a race and some cars run in close company
+    orders = {tuple(c["car_idx"] for c in p["cars"]) for p in standings}
+    assert len(orders) > 1
+    assert any(c["gap_ahead_s"] < 1.0 for c in last[1:])
+    # Pit stops reset fuel: exits report fuel added
+    exits = [p for _, s, p in traffic if s == "iracing.pit" and p["event"] == "exit"]
+    assert exits and all(p["fuel_added_l"] > 0 for p in exits)
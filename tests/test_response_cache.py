@@ -0,0 +1,67 @@
+import pytest
+
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp import sdk_server
+from sim_racecenter_agent.mcp.dispatch import ToolDispatcher
+from sim_racecenter_agent.mcp.response_cache import ResponseCache
+
+
+def _frame(car_idx: int, car: str, dist_ahead: float) -> dict:
+    return {
+        "CarIdx": car_idx,
+        "CarNumber": car,
+        "display_name": f"Driver {car}",
+        "CarDistAhead": dist_ahead,
+        "CarNumberAhead": "99",
+    }
+
+
+@pytest.mark.asyncio
+async def test_responses_reused_until_a_read_domain_changes():
+    cache = StateCache(1, 50)
+    cache.update_roster([{"CarIdx": 1, "UserName": "A", "CarNumber": "1"}])
+    responses = ResponseCache(max_entries=8)
+    d = ToolDispatcher(sdk_server._existing_builders, lambda s: cache, responses=responses)
+    roster, battle = d.wrapper("get_roster"), d.wrapper("get_current_battle")
+
+    first = await roster()
+    again = await roster()
+    assert again == first and again is not first
+    assert (responses.hits, responses.misses) == (1, 1)
+
+    # A domain the roster tool does not read leaves its entry valid
+    cache.upsert_telemetry_frame(_frame(1, "1", 10.0))
+    await roster()
+    assert responses.hits == 2
+
+    cache.update_roster([{"CarIdx": 2, "UserName": "B", "CarNumber": "2"}])
+    assert (await roster())["drivers"][0]["name"] == "B"
+    assert responses.invalidations == 1
+
+    # Arguments are part of the key, in any order
+    near = await battle(max_distance_m=20.0, top_n_pairs=1)
+    assert len(near["pairs"]) == 1
+    assert (await battle(top_n_pairs=1, max_distance_m=20.0))["pairs"] == near["pairs"]
+    assert (await battle(max_distance_m=5.0))["pairs"] == []
+    cache.upsert_telemetry_frame(_frame(1, "1", 4.0))
+    assert len((await battle(max_distance_m=5.0))["pairs"]) == 1
+
+
+def test_lru_bound_and_disabled_cache():
+    cache = StateCache(1, 50)
+    responses = ResponseCache(max_entries=2)
+    calls = []
+
+    def handler(args: dict) -> dict:
+        calls.append(args)
+        return {"n": args["n"]}
+
+    for n in (1, 2, 1, 3, 1, 2):
+        assert responses.fetch(cache, "t", {"n": n}, ("roster",), handler)["n"] == n
+    # 2 was the least recently used when 3 arrived, so only it was rebuilt
+    assert [c["n"] for c in calls] == [1, 2, 3, 2]
+    assert responses.evictions == 2 and responses.entries(cache) == 2
+
+    responses.configure(max_entries=0)
+    responses.fetch(cache, "t", {"n": 1}, ("roster",), handler)
+    assert len(calls) == 5 and responses.bypassed == 1
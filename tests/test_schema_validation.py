@@ -0,0 +1,51 @@
+import pytest
+
+from sim_racecenter_agent.schemas import validation
+
+
+@pytest.fixture(autouse=True)
+def _reset_mode():
+    yield
+    validation.configure("full")
+
+
+def test_examples_valid_in_every_mode():
+    assert validation.compile_all() == len(validation.SCHEMA_MAP)
+    for mode in validation.VALIDATION_MODES:
+        validation.configure(mode, 3)
+        for subject, payload in validation.EXAMPLES.items():
+            assert validation.is_valid(subject, payload), (mode, subject)
+
+
+def test_full_mode_rejects_nested_errors():
+    bad = {"timestamp": 1.0, "leader_car_idx": 1, "cars": [{"car_idx": "x", "pos": 1}]}
+    assert not validation.is_valid("iracing.standings", bad)
+    # The type guard only looks at top-level shape
+    validation.configure("off")
+    assert validation.is_valid("iracing.standings", bad)
+
+
+def test_type_guard_rejects_wrong_top_level_types():
+    validation.configure("off")
+    assert not validation.is_valid("iracing.standings", {"timestamp": 1.0, "cars": []})
+    assert not validation.is_valid(
+        "iracing.standings", {"timestamp": "now", "leader_car_idx": 1, "cars": []}
+    )
+    assert not validation.is_valid(
+        "iracing.standings", {"timestamp": 1.0, "leader_car_idx": True, "cars": []}
+    )
+    assert not validation.is_valid("iracing.standings", ["not", "a", "dict"])
+    assert not validation.is_valid("unknown.subject", {})
+
+
+def test_sampled_mode_runs_full_check_one_in_n():
+    validation.configure("sampled", 4)
+    before = validation.stats()["full_checks"].get("iracing.pit", 0)
+    for _ in range(8):
+        validation.is_valid("iracing.pit", validation.EXAMPLES["iracing.pit"])
+    assert validation.stats()["full_checks"]["iracing.pit"] - before == 2
+
+
+def test_configure_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        validation.configure("sometimes")
@@ -0,0 +1,106 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.session_registry import (
+    DEFAULT_SESSION,
+    SessionRegistry,
+    session_from_subject,
+)
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp import sdk_server
+
+
+def _registry(**kw) -> SessionRegistry:
+    return SessionRegistry(lambda: StateCache(1, 50), **kw)
+
+
+def test_session_from_subject():
+    assert session_from_subject("iracing.standings", "iracing.standings") is None
+    assert session_from_subject("iracing.standings", "iracing.standings.p2") == "p2"
+    assert session_from_subject("iracing.standings", "iracing.standings.a.b") is None
+    assert session_from_subject("iracing.standings", "iracing.standingsX.p2") is None
+    assert session_from_subject("iracing.standings", None) is None
+
+
+def test_route_caps_shards_and_evicts_idle_ones():
+    default = StateCache(1, 50)
+    reg = _registry(default=default, max_sessions=2, idle_ttl_s=60)
+    dropped: list[str] = []
+    reg.on_evict(dropped.append)
+    assert reg.route(None) is default and reg.get("") is default
+    a, b = reg.route("a"), reg.route("b")
+    assert a is not b and reg.get("a") is a and reg.get("nope") is None
+    reg.route("a")  # touch: "b" is now the least recently written
+    reg.route("c")
+    assert dropped == ["b"] and reg.sessions() == [DEFAULT_SESSION, "a", "c"]
+
+    assert reg.sweep() == []
+    assert sorted(reg.sweep(reg.stats()["sessions"]["a"]["created_at"] + 3600)) == ["a", "c"]
+    assert reg.sessions() == [DEFAULT_SESSION] and reg.get() is default
+    assert reg.stats()["evicted"] == 3
+
+
+def test_ingestor_routes_session_subjects_to_their_own_shard(tmp_path):
+    reg = _registry()
+    ing = NATSIngestor(reg.default, Settings(sqlite_path=str(tmp_path / "agent.db")), reg)
+    subjects = {s for s, _ in ing.subject_handlers()}
+    assert {"iracing.standings", "iracing.standings.*", "iracing.stint.*"} <= subjects
+    assert "youtube.chat.message.*" not in subjects
+
+    def msg(subject: str, ts: float, order: list[int]):
+        cars = [{"car_idx": c, "pos": i + 1, "lap": 2} for i, c in enumerate(order)]
+        payload = {"timestamp": ts, "leader_car_idx": order[0], "cars": cars}
+        return SimpleNamespace(subject=subject, data=json.dumps(payload).encode())
+
+    async def run():
+        await ing._handle_standings(msg("iracing.standings", 100.0, [1, 2]))
+        # Older timestamp but a different session: not stale
+        await ing._handle_standings(msg("iracing.standings.race", 50.0, [7, 8, 9]))
+        await ing._handle_standings(msg("iracing.standings.race", 40.0, [9, 8, 7]))
+        await ing.close()
+
+    asyncio.run(run())
+    race = reg.get("race")
+    assert [c["car_idx"] for c in reg.default.standings()] == [1, 2]
+    assert [c["car_idx"] for c in race.standings()] == [7, 8, 9]
+
+
+def test_rejected_messages_do_not_create_or_evict_shards(tmp_path):
+    reg = _registry(max_sessions=1)
+    ing = NATSIngestor(reg.default, Settings(sqlite_path=str(tmp_path / "agent.db")), reg)
+    payload = {"timestamp": 10.0, "leader_car_idx": 1, "cars": [{"car_idx": 1, "pos": 1, "lap": 2}]}
+    live = SimpleNamespace(subject="iracing.standings.live", data=json.dumps(payload).encode())
+
+    async def run():
+        await ing._handle_standings(live)
+        await ing._handle_standings(SimpleNamespace(subject="iracing.standings.junk", data=b"{"))
+        await ing._handle_standings(live)  # redelivery of the same frame
+        await ing.close()
+
+    asyncio.run(run())
+    assert reg.sessions() == [DEFAULT_SESSION, "live"]
+    assert reg.stats()["evicted"] == 0 and reg.created == 1
+    assert ing.ingest_metrics()["duplicates_skipped"] == {"iracing.standings.live": 1}
+
+
+@pytest.mark.asyncio
+async def test_tools_take_a_session_argument(monkeypatch):
+    reg = _registry()
+    reg.route("p2").update_roster([{"CarIdx": 3, "UserName": "Charlie", "CarNumber": "3"}])
+    ctx = SimpleNamespace(cache=reg.default, sessions=reg)
+    monkeypatch.setattr(sdk_server, "_LAST_APP_CONTEXT", ctx)
+
+    async def call(args: dict) -> dict:
+        raw = await sdk_server.mcp.call_tool("get_roster", args)
+        if isinstance(raw, tuple):  # (content, structured) on newer SDKs
+            raw = raw[0]
+        return json.loads(raw[0].text) if isinstance(raw, list) else raw
+
+    assert (await call({}))["count"] == 0
+    assert (await call({"session": "p2"}))["count"] == 1
+    assert (await call({"session": "gone"}))["error"] == "unknown_session"
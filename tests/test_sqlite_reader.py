@@ -0,0 +1,50 @@
+import os
+import sqlite3
+
+import pytest
+
+from sim_racecenter_agent.adapters.sqlite_reader import ReadPool
+
+
+def _make(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t(v TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(r,) for r in rows])
+    conn.commit()
+    conn.close()
+
+
+def test_connections_are_read_only_and_reused(tmp_path):
+    db = str(tmp_path / "a.db")
+    pool = ReadPool(db, max_idle=2)
+    assert pool.acquire() is None  # missing file
+    _make(db, ["x"])
+    for _ in range(3):
+        conn = pool.acquire()
+        assert conn.execute("SELECT v FROM t").fetchall() == [("x",)]
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO t VALUES ('y')")
+        pool.release(conn)
+    assert pool.stats()["opened"] == 1 and pool.stats()["reused"] == 2
+    assert conn.execute("PRAGMA temp_store").fetchone() == (2,)  # MEMORY
+    pool.close()
+
+
+def test_schema_cache_and_invalidation_on_file_replace(tmp_path):
+    db = str(tmp_path / "a.db")
+    _make(db, ["old"])
+    pool = ReadPool(db, recheck_s=60)
+    conn = pool.acquire()
+    assert pool.has_table(conn, "t") and pool.has_table(conn, "t")
+    assert not pool.has_table(conn, "fts") and not pool.has_table(conn, "fts")
+    assert pool.stats()["schema_queries"] == 2  # one lookup per table, then cached
+    pool.release(conn)
+
+    os.remove(db)
+    _make(db, ["new"])
+    conn = pool.acquire()
+    assert conn.execute("SELECT v FROM t").fetchall() == [("new",)]
+    assert pool.stats()["invalidations"] == 1 and pool.stats()["opened"] == 2
+    assert not pool.has_table(conn, "fts") and pool.stats()["schema_queries"] == 3
+    pool.release(conn)
+    pool.close()
@@ -0,0 +1,58 @@
+import sqlite3
+
+from sim_racecenter_agent.adapters.sqlite_writer import SnapshotWriter
+
+INSERT = "INSERT INTO t(ts, v) VALUES(?, ?)"
+
+
+def make_db(tmp_path):
+    db = tmp_path / "writer.db"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE t(ts REAL, v TEXT)")
+    conn.commit()
+    conn.close()
+    return str(db)
+
+
+def count_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_writer_batches_and_flushes(tmp_path):
+    path = make_db(tmp_path)
+    writer = SnapshotWriter(path, max_rows=1000, max_delay_s=60.0)
+    writer.start()
+    try:
+        for i in range(50):
+            assert writer.submit(INSERT, [(float(i), "a"), (float(i), "b")])
+        assert writer.flush(5.0)
+        assert count_rows(path) == 100
+        m = writer.metrics()
+        assert m["written_rows"] == 100
+        # Large max_delay / max_rows -> everything lands in one transaction
+        assert m["batches"] == 1
+    finally:
+        writer.close()
+
+
+def test_writer_drops_when_queue_full(tmp_path):
+    path = make_db(tmp_path)
+    writer = SnapshotWriter(path, queue_size=1)
+    # Not started: the queue fills and further submits are dropped without blocking
+    assert writer.submit(INSERT, [(1.0, "x")])
+    assert not writer.submit(INSERT, [(2.0, "y"), (3.0, "z")])
+    assert writer.metrics()["dropped_rows"] == 2
+
+
+def test_writer_close_flushes_pending(tmp_path):
+    path = make_db(tmp_path)
+    writer = SnapshotWriter(path, max_rows=10_000, max_delay_s=60.0)
+    writer.start()
+    writer.submit(INSERT, [(1.0, "x")])
+    writer.close()
+    assert not writer.running
+    assert count_rows(path) == 1
@@ -0,0 +1,149 @@
+import random
+import sqlite3
+
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.standings_history import StandingsHistory
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_gap_history import build_get_gap_history_tool
+from sim_racecenter_agent.mcp.tools.get_standings_at import build_get_standings_at_tool
+
+
+def _frames(n: int, cars: int = 6, seed: int = 3) -> list[tuple[float, list[dict]]]:
+    """Random running orders with a car leaving and a high car_idx joining midway."""
+    rng = random.Random(seed)
+    ids = list(range(cars))
+    out = []
+    for i in range(n):
+        if i == n // 2:
+            ids = ids[1:] + [100]
+        if rng.random() < 0.3:
+            j = rng.randrange(len(ids) - 1)
+            ids[j], ids[j + 1] = ids[j + 1], ids[j]
+        rows = []
+        gap = 0.0
+        for pos, car_idx in enumerate(ids, start=1):
+            step = round(rng.uniform(0.1, 2.0), 3) if pos > 1 else None
+            gap = round(gap + (step or 0.0), 3)
+            rows.append(
+                {
+                    "car_idx": car_idx,
+                    "pos": pos,
+                    "lap": 3 + i // 10,
+                    "gap_leader_s": gap,
+                    "gap_ahead_s": step,
+                    "last_lap_s": None if i < 5 else 90.0 + car_idx / 10,
+                }
+            )
+        out.append((1000.0 + i * 0.5, rows))
+    return out
+
+
+def _project(rows: list[dict]) -> list[tuple]:
+    return [(r["car_idx"], r.get("pos", r.get("position")), r["gap_leader_s"]) for r in rows]
+
+
+def test_state_at_reconstructs_every_frame_across_keyframes():
+    frames = _frames(40)
+    hist = StandingsHistory(window_s=3600, keyframe_every=7)
+    for ts, rows in frames:
+        assert hist.record(ts, rows)
+    for ts, rows in frames:
+        frame_ts, got = hist.state_at(ts + 0.1)
+        assert frame_ts == ts
+        assert _project(got) == _project(rows)
+    assert hist.state_at(999.0) is None
+    # Not newer than the last frame: ignored
+    assert not hist.record(frames[-1][0], frames[0][1])
+
+
+def test_window_evicts_whole_blocks_but_keeps_coverage():
+    frames = _frames(100)
+    hist = StandingsHistory(window_s=10.0, keyframe_every=5)
+    for ts, rows in frames:
+        hist.record(ts, rows)
+    newest = frames[-1][0]
+    assert hist.covers(newest - 10.0)
+    assert not hist.covers(frames[0][0])
+    assert hist.stats()["frames"] < 40
+    assert _project(hist.state_at(newest - 10.0)[1]) == _project(frames[-21][1])
+
+
+def test_gap_series_matches_frames():
+    frames = _frames(60)
+    hist = StandingsHistory(window_s=3600, keyframe_every=8)
+    for ts, rows in frames:
+        hist.record(ts, rows)
+    start, end = frames[10][0], frames[50][0]
+    series = hist.gap_series(2, 4, start, end)
+    expect = []
+    for ts, rows in frames[10:51]:
+        by_car = {r["car_idx"]: r for r in rows}
+        a, b = by_car.get(2), by_car.get(4)
+        gap = round(b["gap_leader_s"] - a["gap_leader_s"], 3) if a and b else None
+        expect.append((ts, gap, a["pos"] if a else None, b["pos"] if b else None))
+    assert series == expect
+
+
+def test_tools_answer_from_memory_and_fall_back_to_sqlite(tmp_path, monkeypatch):
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE standings_snapshots(ts REAL, car_idx INT, position INT, car_number TEXT, "
+        "driver TEXT, last_lap_s REAL, best_lap_s REAL, lap INT, created_at REAL, "
+        "gap_leader_s REAL, gap_ahead_s REAL, PRIMARY KEY(ts, car_idx))"
+    )
+    for ts, gap in ((500.0, 1.2), (501.0, 0.9)):
+        conn.executemany(
+            "INSERT INTO standings_snapshots(ts, car_idx, position, driver, lap, gap_leader_s) "
+            "VALUES(?,?,?,?,?,?)",
+            [(ts, 1, 1, "Alpha", 4, 0.0), (ts, 2, 2, "Bravo", 4, gap)],
+        )
+    conn.commit()
+    conn.close()
+
+    cache = StateCache(1, 50)
+    for ts, rows in _frames(20, cars=4):
+        cache.set_standings(ts, rows)
+    at = build_get_standings_at_tool(cache)["handler"]
+    gaps = build_get_gap_history_tool(cache)["handler"]
+
+    recent = at({"seconds_ago": 2.0})
+    assert recent["source"] == "memory" and recent["frame_ts"] == 1007.5
+    old = at({"ts": 500.5})()  # SQLite branch: an Offload, run inline here
+    assert old["source"] == "sqlite" and old["frame_ts"] == 500.0
+    assert [c["name"] for c in old["cars"]] == ["Alpha", "Bravo"]
+
+    mem = gaps({"car_a": 0, "car_b": 1, "seconds": 5})
+    assert mem["source"] == "memory" and mem["frames"] == 11
+    thin = gaps({"car_a": 0, "car_b": 1, "seconds": 5, "max_points": 3})
+    assert len(thin["points"]) == 3 and thin["summary"] == mem["summary"]
+    disk = gaps({"car_a": 1, "car_b": 2, "start_ts": 400.0, "end_ts": 600.0})()
+    assert disk["source"] == "sqlite"
+    assert [p["gap_s"] for p in disk["points"]] == [1.2, 0.9]
+    assert disk["summary"]["change_s"] == -0.3
+    assert "error" in gaps({"car_a": 1})
+
+
+def test_ingestor_migrates_old_standings_table(tmp_path, monkeypatch):
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE standings_snapshots(ts REAL, car_idx INT, position INT, car_number TEXT, "
+        "driver TEXT, last_lap_s REAL, best_lap_s REAL, lap INT, created_at REAL, "
+        "PRIMARY KEY(ts, car_idx))"
+    )
+    conn.commit()
+    conn.close()
+    ing = NATSIngestor(StateCache(1, 50), Settings(sqlite_path=str(db)))
+    ing._ensure_db()
+    ing._writer.close()
+    ing._chat_conn.close()
+    conn = sqlite3.connect(db)
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(standings_snapshots)")}
+    indexes = {r[1] for r in conn.execute("PRAGMA index_list(standings_snapshots)")}
+    conn.close()
+    assert {"gap_leader_s", "gap_ahead_s"} <= cols
+    assert "idx_standings_car_ts" in indexes
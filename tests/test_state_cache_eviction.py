@@ -0,0 +1,93 @@
+import time
+
+from sim_racecenter_agent.core.state_cache import StateCache
+
+
+def _standings(ts: float, order: list[int]) -> list[dict]:
+    return [
+        {"car_idx": c, "pos": p, "lap": 3, "gap_leader_s": p - 1.0, "gap_ahead_s": 1.0}
+        for p, c in enumerate(order, start=1)
+    ]
+
+
+def test_sweep_evicts_entries_past_their_ttl():
+    cache = StateCache(1, 50, telemetry_ttl_s=10, stint_ttl_s=10, names_ttl_s=10)
+    cache.update_roster([{"CarIdx": 1, "UserName": "Alpha", "CarNumber": "11"}])
+    cache.upsert_telemetry_frame({"driver_id": "a", "CarIdx": 1})
+    cache.upsert_telemetry_frame({"driver_id": "b", "CarIdx": 2, "display_name": "Bravo"})
+    cache.update_stint(2, {"car_idx": 2, "fuel_pct": 0.5})
+    now = time.time()
+    assert cache.sweep(now) == {"telemetry": 0, "stints": 0, "names": 0}
+
+    cache.upsert_telemetry_frame({"driver_id": "a", "CarIdx": 1})
+    before = cache.versions()
+    evicted = cache.sweep(now + 30)
+    # "a" was refreshed just now, but 30s later it is stale too; car 1 stays named via roster
+    assert evicted == {"telemetry": 2, "stints": 1, "names": 1}
+    assert cache.telemetry_frames() == [] and cache.stint_for(2) is None
+    assert not cache.car_table().mask("stint").any()
+    assert cache.car_number(1) == "11" and cache.car_number(2) is None
+    after = cache.versions()
+    assert after["telemetry"] > before["telemetry"] and after["stints"] > before["stints"]
+    stats = cache.eviction_stats()
+    assert stats["evicted_total"]["telemetry"] == 2 and stats["last_sweep"]["at"] == now + 30
+
+    keep = StateCache(1, 50, telemetry_ttl_s=0)
+    keep.upsert_telemetry_frame({"driver_id": "a"})
+    assert keep.sweep(time.time() + 1e6)["telemetry"] == 0
+
+
+def test_session_change_resets_live_state_but_keeps_history():
+    cache = StateCache(1, 50)
+    cache.update_roster([{"CarIdx": 1, "UserName": "Alpha", "CarNumber": "11"}])
+    cache.upsert_telemetry_frame({"driver_id": "x", "CarIdx": 7, "display_name": "Xray"})
+    cache.update_stint(1, {"car_idx": 1, "fuel_pct": 0.5})
+    cache.set_session_state({"timestamp": 1.0, "session_type": "Practice", "time_remaining_s": 600})
+    for i in range(5):
+        cache.set_standings(100.0 + i, _standings(100.0 + i, [1, 2, 3]))
+    cache.add_incident_event({"car_idx": 2})
+
+    # Same session counting down: no reset
+    cache.set_session_state({"timestamp": 2.0, "session_type": "Practice", "time_remaining_s": 590})
+    assert cache.eviction_stats()["session_resets"] == 0
+
+    cache.set_session_state({"timestamp": 3.0, "session_type": "Race", "time_remaining_s": 3600})
+    stats = cache.eviction_stats()
+    assert stats["session_resets"] == 1
+    assert stats["last_session_reset"]["reason"] == "session_type Practice -> Race"
+    assert cache.standings() == [] and cache.telemetry_frames() == []
+    assert cache.stint_for(1) is None and cache.pace().cars() == []
+    assert cache.gaps().pair(2) is None
+    assert cache.car_number(1) == "11" and cache.car_number(7) is None
+    assert cache.recent_incidents() and cache.standings_history().covers(102.0)
+    # The first frame of the new session only seeds the position baseline
+    last_id = cache.position_changes().last_id
+    cache.set_standings(200.0, _standings(200.0, [3, 2, 1]))
+    assert cache.position_changes().last_id == last_id
+
+    # Restart of the same session type: time remaining jumps back up
+    cache.set_session_state({"timestamp": 4.0, "session_type": "Race", "time_remaining_s": 3590})
+    cache.set_session_state({"timestamp": 5.0, "session_type": "Race", "time_remaining_s": 3600})
+    assert cache.eviction_stats()["session_resets"] == 1
+    cache.set_session_state({"timestamp": 6.0, "session_type": "Race", "time_remaining_s": 120})
+    cache.set_session_state({"timestamp": 7.0, "session_type": "Race", "time_remaining_s": 3600})
+    assert cache.eviction_stats()["session_resets"] == 2
+
+
+def test_memory_report_counts_entries_per_domain():
+    cache = StateCache(1, 50)
+    empty = cache.memory_report()
+    for i in range(40):
+        cache.upsert_telemetry_frame({"driver_id": f"d{i}", "CarIdx": i, "Speed": 50.0 + i})
+        cache.add_chat_message({"user": "u", "text": "hello " * 10})
+    for i in range(10):
+        cache.set_standings(10.0 + i, _standings(10.0 + i, list(range(20))))
+    report = cache.memory_report()
+    domains = report["domains"]
+    assert domains["telemetry"]["entries"] == 40 and domains["chat"]["entries"] == 40
+    assert domains["standings"]["entries"] == 20
+    assert domains["standings_history"]["entries"] == 10
+    assert domains["names"]["entries"] == 0  # telemetry frames carried no number / name
+    assert domains["telemetry"]["approx_bytes"] > 40 * 100
+    assert report["total_approx_bytes"] > empty["total_approx_bytes"]
+    assert report["total_approx_bytes"] == sum(d["approx_bytes"] for d in domains.values())
@@ -0,0 +1,44 @@
+from sim_racecenter_agent.core.state_cache import StateCache
+
+
+def _cache() -> StateCache:
+    cache = StateCache(1, 10)
+    cache.update_roster([{"CarIdx": 1, "CarNumber": "10", "UserName": "Alice"}])
+    cache.set_standings(1.0, [{"car_idx": 1, "pos": 1, "gap_leader_s": 0.0}])
+    return cache
+
+
+def test_writes_bump_domain_versions():
+    cache = _cache()
+    assert cache.version("standings") == 1 and cache.version("roster") == 1
+    cache.set_lap_timing(2.0, [])
+    cache.add_incident_event({"car_idx": 1})
+    versions = cache.versions()
+    assert versions["lap_timing"] == 1 and versions["incidents"] == 1
+    assert versions["standings"] == 1 and versions["telemetry"] == 0
+
+
+def test_views_are_shared_and_list_accessors_copy():
+    cache = _cache()
+    assert cache.standings_view() is cache.standings_view()
+    assert isinstance(cache.standings_view(), tuple)
+    assert cache.standings() is not cache.standings()
+    cache.add_pit_event({"car_idx": 1})
+    pits = cache.pits_view()
+    assert pits is cache.pits_view()
+    cache.add_pit_event({"car_idx": 2})
+    assert len(pits) == 1 and len(cache.pits_view()) == 2
+
+
+def test_leaderboard_memoized_per_version():
+    cache = _cache()
+    lb = cache.leaderboard_view()
+    assert lb is cache.leaderboard_view()
+    assert lb[0]["name"] == "Alice"
+    # Unchanged names do not invalidate; a renamed car does
+    cache.update_roster([{"CarIdx": 1, "CarNumber": "10", "UserName": "Alice"}])
+    assert cache.leaderboard_view() is lb
+    cache.update_roster([{"CarIdx": 1, "CarNumber": "10", "UserName": "Alicia"}])
+    assert cache.leaderboard_view()[0]["name"] == "Alicia"
+    cache.set_standings(2.0, [])
+    assert cache.snapshot_leaderboard() == []
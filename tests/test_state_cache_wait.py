@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.wait_live_snapshot import build_wait_live_snapshot_tool
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_immediately_when_already_newer():
+    cache = StateCache(1, 10)
+    seen = cache.versions()
+    cache.set_standings(1.0, [{"car_idx": 1, "pos": 1}])
+    out = await asyncio.wait_for(cache.wait_for_change(["standings"], after=seen), 0.1)
+    assert out == {"standings": 1}
+
+
+@pytest.mark.asyncio
+async def test_wait_wakes_on_watched_domain_only():
+    cache = StateCache(1, 10)
+    waiter = asyncio.create_task(cache.wait_for_change(["incidents"], timeout=1.0))
+    await asyncio.sleep(0)
+    cache.set_standings(1.0, [])  # not watched
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    cache.add_incident_event({"car_idx": 3})
+    assert await asyncio.wait_for(waiter, 0.1) == {"incidents": 1}
+    assert not cache._waiters
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_with_unchanged_versions():
+    cache = StateCache(1, 10)
+    assert await cache.wait_for_change(["pits"], timeout=0.01) == {"pits": 0}
+    assert not cache._waiters
+    with pytest.raises(ValueError):
+        await cache.wait_for_change(["nope"], timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_wait_live_snapshot_long_poll():
+    cache = StateCache(1, 10)
+    handler = build_wait_live_snapshot_tool(cache)["handler"]
+    first = await handler({})
+    assert first["changed"] and "standings_top" in first
+    idle = await handler({"after_version": first["version"], "wait_s": 0.01})
+    assert idle["changed"] is False and "standings_top" not in idle
+
+    async def publish():
+        await asyncio.sleep(0.02)
+        cache.set_standings(2.0, [{"car_idx": 5, "pos": 1}])
+
+    writer = asyncio.create_task(publish())
+    out = await handler({"after_version": first["version"], "wait_s": 5})
+    await writer
+    assert out["changed"] and out["version"] > first["version"]
+    assert out["standings_top"][0]["car_idx"] == 5
+    assert out["waited_s"] < 1.0
@@ -0,0 +1,42 @@
+import gc
+import inspect
+
+import pytest
+
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp import sdk_server
+from sim_racecenter_agent.mcp.dispatch import ToolDispatcher
+
+
+def _dispatcher(caches: dict) -> ToolDispatcher:
+    return ToolDispatcher(sdk_server._existing_builders, lambda session: caches.get(session or ""))
+
+
+@pytest.mark.asyncio
+async def test_handlers_bound_once_per_cache_and_routed_by_session():
+    main, shard = StateCache(1, 50), StateCache(1, 50)
+    main.update_roster([{"CarIdx": 1, "UserName": "Main", "CarNumber": "1"}])
+    caches = {"": main, "p2": shard}
+    d = _dispatcher(caches)
+    d.bind(main)
+    roster = d.wrapper("get_roster")
+    for _ in range(3):
+        assert len((await roster())["drivers"]) == 1
+    assert d.binds == 1
+    assert (await roster(session="p2"))["drivers"] == []
+    assert d.binds == 2
+    assert (await roster(session="gone"))["error"] == "unknown_session"
+    # Evicted shards take their handlers with them
+    del caches["p2"], shard
+    gc.collect()
+    assert d.bound_caches() == 1
+
+
+def test_wrapper_signature_is_typed_and_optional():
+    d = _dispatcher({})
+    params = inspect.signature(d.wrapper("get_battles")).parameters
+    assert set(params) >= {"top_n", "session"}
+    assert all(p.default is None for p in params.values())
+    assert "int" in str(params["top_n"].annotation)
+    # Tools without a cache do not take a session
+    assert "session" not in inspect.signature(d.wrapper("search_chat")).parameters
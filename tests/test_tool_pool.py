@@ -0,0 +1,114 @@
+import asyncio
+import threading
+
+import pytest
+
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.dispatch import ToolDispatcher
+from sim_racecenter_agent.mcp.tools.get_gap_history import build_get_gap_history_tool
+from sim_racecenter_agent.mcp.tools.get_standings_at import build_get_standings_at_tool
+from sim_racecenter_agent.mcp.worker_pool import Offload, ToolBusy, ToolTimeout, ToolWorkerPool
+
+
+@pytest.mark.asyncio
+async def test_per_tool_limit_queue_and_timeout():
+    pool = ToolWorkerPool(max_workers=4, limit=1, timeout_s=5.0, queue_limit=1)
+    gate = threading.Event()
+    running: list[int] = []
+
+    def slow(i: int) -> int:
+        running.append(i)
+        gate.wait(5)
+        return i
+
+    first = asyncio.create_task(pool.run("search_chat", slow, 1))
+    second = asyncio.create_task(pool.run("search_chat", slow, 2))
+    await asyncio.sleep(0.05)
+    assert running == [1]  # limit 1: the second call waits for the slot
+    with pytest.raises(ToolBusy):
+        await pool.run("search_chat", slow, 3)  # queue of 1 is full
+    gate.set()
+    assert await asyncio.gather(first, second) == [1, 2]
+    stats = pool.stats()["tools"]["search_chat"]
+    assert stats["completed"] == 2 and stats["rejected"] == 1 and stats["max_queued"] == 1
+    assert stats["active"] == 0 and stats["queued"] == 0
+
+    pool.set_tool("search_chat", timeout_s=0.05)
+    gate.clear()
+    with pytest.raises(ToolTimeout):
+        await pool.run("search_chat", slow, 4)
+    # The timed-out thread still holds the slot until it finishes
+    assert pool.stats()["tools"]["search_chat"]["active"] == 1
+    gate.set()
+    await asyncio.sleep(0.05)
+    assert pool.stats()["tools"]["search_chat"]["active"] == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_blocking_tools_run_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    seen: dict[str, int] = {}
+
+    def build_blocking_tool():
+        def handler(args):
+            seen["blocking"] = threading.get_ident()
+            return {"ok": args.get("query")}
+
+        return {
+            "name": "slow_search",
+            "input_schema": {"type": "object", "properties": {"query": {"type": "string"}}},
+            "handler": handler,
+            "blocking": True,
+        }
+
+    pool = ToolWorkerPool(max_workers=1)
+    d = ToolDispatcher([build_blocking_tool], lambda session: None, pool)
+    assert await d.wrapper("slow_search")(query="x") == {"ok": "x"}
+    assert seen["blocking"] != loop_thread
+    assert pool.stats()["tools"]["slow_search"]["completed"] == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cache_backed_tools_offload_only_their_sqlite_fallback(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "missing.db"))
+    loop_thread = threading.get_ident()
+    seen: list[int] = []
+
+    def fallback(ts: float) -> dict:
+        seen.append(threading.get_ident())
+        return {"from": "sqlite", "ts": ts}
+
+    def build_history_tool(cache):
+        def handler(args):
+            if args["ts"] < 100:
+                return Offload(fallback, args["ts"])
+            return {"from": "memory", "ts": args["ts"]}
+
+        return {
+            "name": "history",
+            "input_schema": {"type": "object", "properties": {"ts": {"type": "number"}}},
+            "handler": handler,
+        }
+
+    cache = StateCache(1, 50)
+    cache.set_standings(1000.0, [{"car_idx": 1, "pos": 1}])
+    pool = ToolWorkerPool(max_workers=1)
+    builders = [build_history_tool, build_get_standings_at_tool, build_get_gap_history_tool]
+    d = ToolDispatcher(builders, lambda session: cache, pool)
+    assert (await d.wrapper("history")(ts=500.0))["from"] == "memory"
+    assert (await d.wrapper("history")(ts=5.0))["from"] == "sqlite"
+    assert seen and loop_thread not in seen
+    assert (await d.wrapper("get_standings_at")(ts=1000.0))["source"] == "memory"
+    old = await d.wrapper("get_standings_at")(ts=5.0)
+    assert old["source"] is None and old["cars"] == []
+    gaps = await d.wrapper("get_gap_history")(car_a=1, car_b=2, start_ts=1.0, end_ts=5.0)
+    assert gaps["error"] == "database_missing"
+    tools = pool.stats()["tools"]
+    assert {n: tools[n]["completed"] for n in tools} == {
+        "history": 1,
+        "get_standings_at": 1,
+        "get_gap_history": 1,
+    }
+    pool.shutdown()
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import time
+
+from sim_racecenter_agent.adapters.nats_listener import NATSIngestor
+from sim_racecenter_agent.adapters.warm_restore import restore_state_cache
+from sim_racecenter_agent.config.settings import Settings
+from sim_racecenter_agent.core.state_cache import StateCache
+from sim_racecenter_agent.mcp.tools.get_fastest_practice import build_get_fastest_practice_tool
+from sim_racecenter_agent.schemas.validation import EXAMPLES
+
+
+class _Msg:
+    def __init__(self, payload: dict):
+        self.data = json.dumps(payload).encode()
+
+
+def _persist_examples(tmp_path, monkeypatch) -> str:
+    db = tmp_path / "agent.db"
+    monkeypatch.setenv("SQLITE_PATH", str(db))
+    ing = NATSIngestor(StateCache(1, 50), Settings(sqlite_path=str(db)))
+
+    async def run():
+        await ing._handle_session(_Msg(EXAMPLES["iracing.session"]))
+        await ing._handle_session_state(_Msg(EXAMPLES["iracing.session_state"]))
+        await ing._handle_standings(_Msg(EXAMPLES["iracing.standings"]))
+        await ing._handle_track_conditions(_Msg(EXAMPLES["iracing.track_conditions"]))
+        await ing.close()
+
+    asyncio.run(run())
+    return str(db)
+
+
+def test_restore_loads_latest_snapshots(tmp_path, monkeypatch):
+    db = _persist_examples(tmp_path, monkeypatch)
+    cache = StateCache(1, 50)
+    result = restore_state_cache(cache, db)
+    assert not result["errors"]
+    assert set(result["restored"]) == {"session", "session_state", "standings", "track_conditions"}
+    assert [c["car_idx"] for c in cache.standings()] == [12, 7]
+    assert cache.snapshot_leaderboard()[0]["pos"] == 1
+    assert cache.session_state()["session_type"] == "RACE"
+    assert cache.track_conditions()["track_temp_c"] == 31.2
+    assert cache.roster()[0]["display_name"] == "Driver A"
+    # Tools answer from restored data instead of "No lap timing data yet."
+    out = build_get_fastest_practice_tool(cache)["handler"]({"top_n": 3})
+    assert out["fastest"]["car_idx"] == 12
+
+
+def test_newer_frames_replace_restored_older_are_ignored(tmp_path, monkeypatch):
+    db = _persist_examples(tmp_path, monkeypatch)
+    cache = StateCache(1, 50)
+    restore_state_cache(cache, db)
+    ts = EXAMPLES["iracing.standings"]["timestamp"]
+    cache.set_standings(ts - 10, [{"car_idx": 99, "pos": 1}])
+    assert [c["car_idx"] for c in cache.standings()] == [12, 7]
+    assert "standings" in cache.restored()
+    cache.set_standings(ts + 1, [{"car_idx": 7, "pos": 1}])
+    assert [c["car_idx"] for c in cache.standings()] == [7]
+    assert "standings" not in cache.restored()
+    # Once live, ordinary updates apply regardless of timestamp
+    cache.set_standings(ts - 10, [{"car_idx": 99, "pos": 1}])
+    assert [c["car_idx"] for c in cache.standings()] == [99]
+
+
+def test_restore_missing_database(tmp_path):
+    cache = StateCache(1, 50)
+    result = restore_state_cache(cache, str(tmp_path / "missing.db"))
+    assert result["errors"] == {"sqlite": "sqlite_missing"}
+    assert cache.standings() == [] and not (tmp_path / "missing.db").exists()
+
+
+def test_restore_skips_snapshots_older_than_max_age(tmp_path, monkeypatch):
+    db = _persist_examples(tmp_path, monkeypatch)
+    cache = StateCache(1, 50)
+    result = restore_state_cache(cache, db, max_age_s=3600)
+    assert set(result["skipped"]) == {"session_state", "standings", "track_conditions"}
+    assert result["skipped"]["standings"]["age_s"] > 3600 and not result["errors"]
+    assert cache.standings() == [] and cache.restored() == {}
+    # The session payload has no timestamp: its row is dated by receipt, so it is fresh
+    assert set(result["restored"]) == {"session"}
+    # A limit wider than the snapshots' age restores them
+    age = time.time() - EXAMPLES["iracing.standings"]["timestamp"]
+    result = restore_state_cache(cache, db, max_age_s=age + 3600)
+    assert result["skipped"] == {} and "standings" in result["restored"]